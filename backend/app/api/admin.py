@@ -20,6 +20,11 @@ from app.utils.password import verify_password, hash_password
 from app.utils.token import create_access_token
 from app.utils.response_formatter import create_success_response, create_error_response
 from app.utils.logger import log_system_action
+from core.calendar_cache import calendar_cache
+from app.utils.cpu_executor import cpu_executor, CpuExecutorError
+from app.services.liuyao_service import liuyao_service
+from app.services.pan_service import paginate_keyset
+from app.services.pan_feed_cache import pan_feed_cache
 
 # 尝试导入openpyxl，如果失败则使用CSV作为备选
 try:
@@ -579,6 +584,7 @@ class PanRecordListQuery(BaseModel):
     page_size: int = 20
     audit_status: Optional[int] = None
     user_id: Optional[int] = None
+    cursor: Optional[str] = None  # 分页游标（上一页返回的next_cursor），提供时忽略page
 
 
 @router.get("/pan-records")
@@ -597,8 +603,10 @@ async def get_pan_record_list(
         query_obj = query_obj.filter(PanRecord.user_id == query.user_id)
     
     total = query_obj.count()
-    offset = (query.page - 1) * query.page_size
-    records = query_obj.order_by(PanRecord.create_time.desc()).offset(offset).limit(query.page_size).all()
+    try:
+        records, next_cursor = paginate_keyset(query_obj, "newest", query.page_size, query.cursor, (query.page - 1) * query.page_size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     record_list = []
     for record in records:
@@ -616,7 +624,8 @@ async def get_pan_record_list(
         "list": record_list,
         "total": total,
         "page": query.page,
-        "page_size": query.page_size
+        "page_size": query.page_size,
+        "next_cursor": next_cursor
     })
 
 
@@ -679,6 +688,7 @@ async def audit_pan_record(
     record.audit_time = int(time.time())
     record.audit_user_id = current_user.id
     db.commit()
+    pan_feed_cache.invalidate_feed(record.pan_type)
     
     return create_success_response(None, "审核成功")
 
@@ -700,6 +710,7 @@ async def delete_pan_record(
     
     record.deleted_at = int(time.time())
     db.commit()
+    pan_feed_cache.invalidate_feed(record.pan_type)
     
     return create_success_response(None, "删除成功")
 
@@ -738,11 +749,14 @@ async def batch_delete_pan_records(
     current_time = int(time.time())
     deleted_count = 0
     
+    pan_types = {record.pan_type for record in records}
     for record in records:
         record.deleted_at = current_time
         deleted_count += 1
     
     db.commit()
+    for pan_type in pan_types:
+        pan_feed_cache.invalidate_feed(pan_type)
     
     return create_success_response(
         {"deleted_count": deleted_count},
@@ -776,6 +790,7 @@ async def batch_audit_pan_records(
     current_time = int(time.time())
     audited_count = 0
     
+    pan_types = {record.pan_type for record in records}
     for record in records:
         record.audit_status = request.audit_status
         record.audit_remark = request.audit_remark
@@ -784,6 +799,8 @@ async def batch_audit_pan_records(
         audited_count += 1
     
     db.commit()
+    for pan_type in pan_types:
+        pan_feed_cache.invalidate_feed(pan_type)
     
     status_text = "通过" if request.audit_status == 1 else "拒绝"
     return create_success_response(
@@ -860,6 +877,7 @@ async def restore_pan_record(
     record.deleted_at = None
     record.update_time = int(time.time())
     db.commit()
+    pan_feed_cache.invalidate_feed(record.pan_type)
     
     return create_success_response(None, "恢复成功")
 
@@ -1319,3 +1337,57 @@ async def update_system_config(
     db.commit()
     
     return create_success_response(None, "更新成功")
+
+
+# ==================== 运行时缓存 ====================
+
+@router.get("/cache/calendar-stats")
+async def get_calendar_cache_stats(
+    current_user: User = Depends(get_current_admin_user)
+):
+    """获取历法信息共享缓存统计（命中、未命中、淘汰、过期次数）"""
+    return create_success_response(calendar_cache.stats())
+
+
+@router.get("/cache/pan-feed-stats")
+async def get_pan_feed_cache_stats(
+    current_user: User = Depends(get_current_admin_user)
+):
+    """获取公开排盘列表页缓存统计（命中率、占用字节、淘汰、过期、失效次数）"""
+    return create_success_response(pan_feed_cache.stats())
+
+
+@router.get("/cache/executor-stats")
+async def get_cpu_executor_stats(
+    current_user: User = Depends(get_current_admin_user)
+):
+    """获取CPU执行器统计（在途、完成、繁忙拒绝、超时次数）"""
+    return create_success_response(cpu_executor.stats())
+
+
+# ==================== 起卦分布分析 ====================
+
+class LiuyaoSimulationRequest(BaseModel):
+    count: int = Field(1000000, description="模拟起卦次数；上限见接口说明，与CPU执行器模式有关")
+    seed: Optional[int] = Field(None, description="随机种子，可选；相同种子和生成器可复现相同结果")
+
+
+@router.post("/analysis/liuyao-distribution")
+async def simulate_liuyao_distribution(
+    request: LiuyaoSimulationRequest,
+    current_user: User = Depends(get_current_admin_user)
+):
+    """
+    蒙特卡洛模拟随机数起卦，统计本卦、变卦、动爻数和卦宫分布，并与理论概率对照（卡方统计量）
+    
+    模拟为纯Python实现：CPU_EXECUTOR_MODE=process时分块在多个进程中并行，次数上限为LIUYAO_SIMULATION_MAX_COUNT；
+    thread/inline模式下受GIL限制不能并行，次数上限为LIUYAO_SIMULATION_MIN_RATE × CPU_EXECUTOR_TIMEOUT
+    （默认25万 × 10秒 = 250万次），超过上限返回400，需要更大次数时请使用process模式
+    """
+    try:
+        result = await liuyao_service.simulate_distribution_async(request.count, request.seed)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except CpuExecutorError as e:
+        raise HTTPException(status_code=e.status_code, detail=str(e))
+    return create_success_response(result)
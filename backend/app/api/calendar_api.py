@@ -2,18 +2,22 @@
 # 功能:提供REST API接口，供前端调用历法计算功能
 
 from fastapi import APIRouter, HTTPException  # 导入FastAPI的路由和异常处理类
-from pydantic import BaseModel  # 导入Pydantic的基础模型类，用于请求和响应模型定义
-from typing import Optional, Dict, Any  # 导入可选类型注解、字典类型和任意类型，用于标记可选参数和定义字典类型
+from fastapi.responses import StreamingResponse  # 导入流式响应类，用于NDJSON逐行输出大范围历法信息
+from pydantic import BaseModel, field_validator, model_validator  # 导入Pydantic的基础模型类、字段验证器和模型验证器，用于请求和响应模型定义
+from typing import Optional, Dict, Any, List  # 导入可选类型注解、字典类型、任意类型和列表类型，用于标记可选参数和定义字典类型
 import sys  # 导入系统模块，用于路径操作
 import os  # 导入操作系统模块，用于路径操作
 
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))  # 将backend目录添加到Python路径
 
-from core.calendar_algorithm_core import calendar_algorithm_core, CalendarError  # 导入历法算法核心实例和异常类
+from core.calendar_algorithm_core import calendar_algorithm_core, CalendarError, CALENDAR_PROFILES, resolve_projection  # 导入历法算法核心实例、异常类、输出配置表和输出投影解析函数
 from app.utils.error_codes import ErrorCode  # 导入标准错误码和响应格式化器
-from app.utils.response_formatter import ResponseFormatter  # 导入响应格式化器类
+from app.utils.response_formatter import ResponseFormatter, UTF8JSONResponse  # 导入响应格式化器类和UTF-8 JSON响应类
 from app.validators.calendar_validator import calendar_validator  # 导入统一的历法验证器实例
 from app.services.calendar_service import calendar_service  # 导入日历验证服务实例，用于统一处理验证和转换业务逻辑
+from app.utils.cpu_executor import CpuExecutorError  # 导入执行器拒绝任务异常，繁忙返回503、超时返回504
+from app.validators.four_pillars_validator import JIA_ZI_COMBINATIONS  # 导入六十甲子表，用于验证四柱
+from core.four_pillars_search import FOUR_PILLARS_SECTS  # 导入四柱反查流派列表
 
 router = APIRouter(tags=["历法计算"])  # 创建API路由实例，并设置标签为"历法计算"
 
@@ -33,8 +37,33 @@ class SolarValidationResponse(BaseModel):
     error: Optional[str] = None  # 错误信息，可选，默认为None
     message: Optional[str] = None  # 成功消息，可选，默认为None
 
-# 定义公历转换请求模型，继承自Pydantic的BaseModel
-class SolarConversionRequest(BaseModel):
+# 定义历法输出投影请求模型，继承自Pydantic的BaseModel（公历转换和农历转换请求共用）
+class CalendarProjectionRequest(BaseModel):
+    """历法输出投影请求模型"""
+    profile: Optional[str] = "full"  # 输出配置参数，可选，minimal（日柱时柱）、ganzhi（干支与节气）、full（完整信息，默认）
+    fields: Optional[List[str]] = None  # 输出字段参数，可选，区块名（如"ganzhi_info"）或"区块名.字段名"列表，提供时优先于profile
+    
+    @field_validator('profile')
+    @classmethod
+    def validate_profile(cls, v):
+        """验证输出配置名称"""
+        if v is not None and v not in CALENDAR_PROFILES:
+            raise ValueError(f"[API层验证] 输出配置必须是{list(CALENDAR_PROFILES)}中的一个")
+        return v or "full"
+    
+    @field_validator('fields')
+    @classmethod
+    def validate_fields(cls, v):
+        """验证输出字段名称"""
+        if v:
+            try:
+                resolve_projection(fields=v)
+            except CalendarError as e:
+                raise ValueError(f"[API层验证] {str(e).replace('[Core层验证] ', '')}")
+        return v
+
+# 定义公历转换请求模型，继承自历法输出投影请求模型
+class SolarConversionRequest(CalendarProjectionRequest):
     """公历转换请求模型"""
     year: int  # 公历年参数，整数类型
     month: int  # 公历月参数，整数类型
@@ -69,8 +98,8 @@ class LunarValidationResponse(BaseModel):
     error: Optional[str] = None  # 错误信息，可选，默认为None
     message: Optional[str] = None  # 成功消息，可选，默认为None
 
-# 定义农历转换请求模型，继承自Pydantic的BaseModel
-class LunarConversionRequest(BaseModel):
+# 定义农历转换请求模型，继承自历法输出投影请求模型
+class LunarConversionRequest(CalendarProjectionRequest):
     """农历转换请求模型"""
     lunar_year: int  # 农历年参数，整数类型
     lunar_month: int  # 农历月参数，整数类型
@@ -89,6 +118,86 @@ class LunarConversionResponse(BaseModel):
     timestamp: str  # 时间戳，字符串类型
 
 
+# 定义四柱反查请求模型，继承自Pydantic的BaseModel
+class FourPillarsSearchRequest(BaseModel):
+    """四柱反查请求模型"""
+    year_pillar: str  # 年柱，如"甲辰"
+    month_pillar: str  # 月柱，如"丙寅"
+    day_pillar: str  # 日柱，如"甲子"
+    time_pillar: str  # 时柱，如"甲子"
+    start_year: Optional[int] = 1900  # 查询起始公历年，可选，默认1900
+    end_year: Optional[int] = 2100  # 查询结束公历年（含），可选，默认2100
+    sect: Optional[int] = 1  # 晚子时流派，可选，1表示晚子时日柱算明天（默认），2表示晚子时日柱算当天
+    
+    @field_validator('year_pillar', 'month_pillar', 'day_pillar', 'time_pillar')
+    @classmethod
+    def validate_pillar(cls, v):
+        """验证四柱为六十甲子"""
+        if v not in JIA_ZI_COMBINATIONS:
+            raise ValueError(f"[API层验证] 无效的六十甲子组合: {v}")
+        return v
+    
+    @field_validator('sect')
+    @classmethod
+    def validate_sect(cls, v):
+        """验证晚子时流派"""
+        if v not in FOUR_PILLARS_SECTS:
+            raise ValueError(f"[API层验证] 流派必须是{list(FOUR_PILLARS_SECTS)}中的一个")
+        return v
+
+# 定义四柱反查响应模型，继承自Pydantic的BaseModel
+class FourPillarsSearchResponse(BaseModel):
+    """四柱反查响应模型"""
+    success: bool  # 反查是否成功，布尔类型
+    data: Dict[str, Any]  # 反查结果数据，包含匹配区间列表
+    message: str  # 响应消息，字符串类型
+    timestamp: str  # 时间戳，字符串类型
+
+# 定义日期范围参数模型，继承自Pydantic的BaseModel，供历法日期范围和节日范围请求共用
+class DateRangeRequest(BaseModel):
+    """日期范围参数模型：提供year时为整年，同时提供month时为整月，否则为start_date~end_date"""
+    year: Optional[int] = None  # 公历年，可选
+    month: Optional[int] = None  # 公历月，可选，需同时提供year
+    start_date: Optional[str] = None  # 起始日期，可选，格式YYYY-MM-DD
+    end_date: Optional[str] = None  # 结束日期（含），可选，格式YYYY-MM-DD
+    
+    @model_validator(mode='after')
+    def validate_range(self):
+        """验证日期范围参数组合"""
+        if self.month is not None and self.year is None:
+            raise ValueError("[API层验证] 提供month时必须同时提供year")
+        if self.year is None and (self.start_date is None or self.end_date is None):
+            raise ValueError("[API层验证] 必须提供year（可选month）或start_date和end_date")
+        if self.year is not None and (self.start_date is not None or self.end_date is not None):
+            raise ValueError("[API层验证] 不能同时提供year和start_date/end_date，请选择其中一种")
+        return self
+
+# 定义历法日期范围请求模型，继承自日期范围参数模型
+class CalendarRangeRequest(DateRangeRequest):
+    """历法日期范围请求模型：提供year时为整年，同时提供month时为整月，否则为start_date~end_date"""
+    format: Optional[str] = "json"  # 输出格式，可选，json（默认）或ndjson（每天一行，流式输出）
+    
+    @field_validator('format')
+    @classmethod
+    def validate_format(cls, v):
+        """验证输出格式"""
+        if v not in (None, "json", "ndjson"):
+            raise ValueError("[API层验证] 输出格式必须是json或ndjson")
+        return v or "json"
+
+# 定义节日范围请求模型，继承自日期范围参数模型
+class FestivalRangeRequest(DateRangeRequest):
+    """节日范围请求模型：日期范围参数同历法日期范围，kinds为要返回的节日类别"""
+    kinds: Optional[List[str]] = None  # 节日类别，可选，默认四类全部（solar_festivals、solar_other_festivals、lunar_festivals、lunar_other_festivals）
+
+# 定义节日范围响应模型，继承自Pydantic的BaseModel
+class FestivalRangeResponse(BaseModel):
+    """节日范围响应模型"""
+    success: bool  # 查询是否成功，布尔类型
+    data: Dict[str, Any]  # 查询结果数据，包含有节日的日期列表
+    message: str  # 响应消息，字符串类型
+    timestamp: str  # 时间戳，字符串类型
+
 @router.post("/validate-solar", response_model=SolarValidationResponse)  # 定义POST路由，路径为"/validate-solar"，指定响应模型
 async def validate_solar_time(request: SolarValidationRequest):  # 定义公历时间验证的异步处理函数
     
@@ -115,16 +224,18 @@ async def validate_solar_time(request: SolarValidationRequest):  # 定义公历
 async def convert_solar_calendar(request: SolarConversionRequest):  # 定义历法转换的异步处理函数
     # 尝试执行历法转换操作
     try:
-        result = calendar_service.convert_solar_to_lunar(  # 通过服务层调用公历转农历方法
+        result = await calendar_service.convert_solar_to_lunar_async(  # 通过服务层在CPU执行器中调用公历转农历方法
             year=request.year,  # 传入公历年参数
             month=request.month,  # 传入公历月参数
             day=request.day,  # 传入公历日参数
             hour=request.hour,  # 传入小时参数
             minute=request.minute,  # 传入分钟参数
-            second=request.second  # 传入秒数参数
+            second=request.second,  # 传入秒数参数
+            profile=request.profile,  # 传入输出配置参数
+            fields=request.fields  # 传入输出字段参数
         )
         
-        return ResponseFormatter.create_success_response(result.dict(), "历法转换成功")  # 返回成功响应，包含转换结果和成功消息
+        return ResponseFormatter.create_success_response(result.model_dump(exclude_none=True), "历法转换成功")  # 返回成功响应，省略输出投影之外的区块
         
     # 捕获历法计算异常
     except CalendarError as e:
@@ -133,6 +244,13 @@ async def convert_solar_calendar(request: SolarConversionRequest):  # 定义历
             str(e)  # 传入异常消息
         )
         raise HTTPException(status_code=400, detail=error_response)  # 抛出HTTP异常，状态码400，包含错误响应
+    # 捕获执行器繁忙或超时异常
+    except CpuExecutorError as e:
+        error_response = ResponseFormatter.create_error_response(  # 创建错误响应对象
+            ErrorCode.SERVICE_UNAVAILABLE.code,  # 使用错误码获取整数错误码
+            str(e)  # 传入异常消息
+        )
+        raise HTTPException(status_code=e.status_code, detail=error_response)  # 抛出HTTP异常，繁忙503、超时504
     # 捕获其他未知异常
     except Exception as e:
         error_response = ResponseFormatter.create_error_response(  # 创建错误响应对象
@@ -170,18 +288,20 @@ async def convert_lunar_calendar(request: LunarConversionRequest):  # 定义农
 
     # 尝试执行历法转换操作
     try:
-        # 通过服务层调用农历转公历方法
-        result = calendar_service.convert_lunar_to_solar(
+        # 通过服务层在CPU执行器中调用农历转公历方法
+        result = await calendar_service.convert_lunar_to_solar_async(
             lunar_year=request.lunar_year,  # 传入农历年参数
             lunar_month=request.lunar_month,  # 传入农历月参数
             lunar_day=request.lunar_day,  # 传入农历日参数
             hour=request.hour,  # 传入小时参数
             minute=request.minute,  # 传入分钟参数
             second=request.second,  # 传入秒数参数
-            is_leap_month=request.is_leap_month  # 传入是否闰月参数
+            is_leap_month=request.is_leap_month,  # 传入是否闰月参数
+            profile=request.profile,  # 传入输出配置参数
+            fields=request.fields  # 传入输出字段参数
         )
         
-        return ResponseFormatter.create_success_response(result.dict(), "农历转换成功")  # 返回成功响应，包含转换结果和成功消息
+        return ResponseFormatter.create_success_response(result.model_dump(exclude_none=True), "农历转换成功")  # 返回成功响应，省略输出投影之外的区块
         
     # 捕获历法计算异常
     except CalendarError as e:
@@ -190,6 +310,13 @@ async def convert_lunar_calendar(request: LunarConversionRequest):  # 定义农
             str(e)  # 传入异常消息
         )
         raise HTTPException(status_code=400, detail=error_response)  # 抛出HTTP异常，状态码400，包含错误响应
+    # 捕获执行器繁忙或超时异常
+    except CpuExecutorError as e:
+        error_response = ResponseFormatter.create_error_response(  # 创建错误响应对象
+            ErrorCode.SERVICE_UNAVAILABLE.code,  # 使用错误码获取整数错误码
+            str(e)  # 传入异常消息
+        )
+        raise HTTPException(status_code=e.status_code, detail=error_response)  # 抛出HTTP异常，繁忙503、超时504
     except Exception as e:  # 捕获其他未知异常
         # 创建错误响应对象
         error_response = ResponseFormatter.create_error_response(
@@ -199,6 +326,129 @@ async def convert_lunar_calendar(request: LunarConversionRequest):  # 定义农
         raise HTTPException(status_code=500, detail=error_response)  # 抛出HTTP异常，状态码500，包含错误响应
 
 
+
+
+@router.post("/calendar-range")  # 定义POST路由，路径为"/calendar-range"（json和ndjson两种响应，不指定响应模型）
+async def get_calendar_range(request: CalendarRangeRequest):  # 定义历法日期范围的异步处理函数
+    
+    # 尝试生成历法日期范围
+    try:
+        if request.format == "ndjson":
+            # 先验证范围（验证失败时仍可返回400），再按块在CPU执行器中生成并逐行输出
+            start_jdn, end_jdn = calendar_service.resolve_calendar_range(
+                year=request.year, month=request.month, start_date=request.start_date, end_date=request.end_date, stream=True
+            )
+            return StreamingResponse(calendar_service.iter_calendar_range_ndjson(start_jdn, end_jdn), media_type="application/x-ndjson")
+        
+        # 通过服务层在CPU执行器中生成整个范围
+        result = await calendar_service.get_calendar_range_async(
+            year=request.year,  # 传入公历年参数
+            month=request.month,  # 传入公历月参数
+            start_date=request.start_date,  # 传入起始日期参数
+            end_date=request.end_date  # 传入结束日期参数
+        )
+        # 结果只包含JSON基础类型，直接返回响应对象，避免jsonable_encoder逐字段遍历数百天的历法信息
+        return UTF8JSONResponse(content=ResponseFormatter.create_success_response(result, "历法日期范围生成成功"))
+        
+    # 捕获参数验证异常
+    except ValueError as e:
+        error_response = ResponseFormatter.create_error_response(  # 创建错误响应对象
+            ErrorCode.INVALID_DATE_FORMAT.code,  # 使用错误码获取整数错误码
+            str(e)  # 传入异常消息
+        )
+        raise HTTPException(status_code=400, detail=error_response)  # 抛出HTTP异常，状态码400，包含错误响应
+    # 捕获执行器繁忙或超时异常
+    except CpuExecutorError as e:
+        error_response = ResponseFormatter.create_error_response(  # 创建错误响应对象
+            ErrorCode.SERVICE_UNAVAILABLE.code,  # 使用错误码获取整数错误码
+            str(e)  # 传入异常消息
+        )
+        raise HTTPException(status_code=e.status_code, detail=error_response)  # 抛出HTTP异常，繁忙503、超时504
+    # 捕获其他未知异常
+    except Exception as e:
+        error_response = ResponseFormatter.create_error_response(  # 创建错误响应对象
+            ErrorCode.CALENDAR_CONVERSION_FAILED.code,  # 使用错误码获取整数错误码
+            f"服务器内部错误: {str(e)}"  # 传入服务器内部错误消息
+        )
+        raise HTTPException(status_code=500, detail=error_response)  # 抛出HTTP异常，状态码500，包含错误响应
+
+@router.post("/festivals-range", response_model=FestivalRangeResponse)  # 定义POST路由，路径为"/festivals-range"，指定响应模型
+async def get_festival_range(request: FestivalRangeRequest):  # 定义节日范围查询的异步处理函数
+    
+    # 尝试查询节日范围
+    try:
+        # 通过服务层在CPU执行器中一次遍历整个范围
+        result = await calendar_service.get_festival_range_async(
+            year=request.year,  # 传入公历年参数
+            month=request.month,  # 传入公历月参数
+            start_date=request.start_date,  # 传入起始日期参数
+            end_date=request.end_date,  # 传入结束日期参数
+            kinds=request.kinds  # 传入节日类别参数
+        )
+        return ResponseFormatter.create_success_response(result, "节日范围查询成功")  # 返回成功响应
+        
+    # 捕获参数验证异常
+    except ValueError as e:
+        error_response = ResponseFormatter.create_error_response(  # 创建错误响应对象
+            ErrorCode.INVALID_DATE_FORMAT.code,  # 使用错误码获取整数错误码
+            str(e)  # 传入异常消息
+        )
+        raise HTTPException(status_code=400, detail=error_response)  # 抛出HTTP异常，状态码400，包含错误响应
+    # 捕获执行器繁忙或超时异常
+    except CpuExecutorError as e:
+        error_response = ResponseFormatter.create_error_response(  # 创建错误响应对象
+            ErrorCode.SERVICE_UNAVAILABLE.code,  # 使用错误码获取整数错误码
+            str(e)  # 传入异常消息
+        )
+        raise HTTPException(status_code=e.status_code, detail=error_response)  # 抛出HTTP异常，繁忙503、超时504
+    # 捕获其他未知异常
+    except Exception as e:
+        error_response = ResponseFormatter.create_error_response(  # 创建错误响应对象
+            ErrorCode.CALENDAR_CONVERSION_FAILED.code,  # 使用错误码获取整数错误码
+            f"服务器内部错误: {str(e)}"  # 传入服务器内部错误消息
+        )
+        raise HTTPException(status_code=500, detail=error_response)  # 抛出HTTP异常，状态码500，包含错误响应
+
+@router.post("/search-four-pillars", response_model=FourPillarsSearchResponse)  # 定义POST路由，路径为"/search-four-pillars"，指定响应模型
+async def search_four_pillars(request: FourPillarsSearchRequest):  # 定义四柱反查的异步处理函数
+    
+    # 尝试执行四柱反查操作
+    try:
+        # 通过服务层在CPU执行器中调用四柱反查方法
+        result = await calendar_service.search_four_pillars_async(
+            year_pillar=request.year_pillar,  # 传入年柱参数
+            month_pillar=request.month_pillar,  # 传入月柱参数
+            day_pillar=request.day_pillar,  # 传入日柱参数
+            time_pillar=request.time_pillar,  # 传入时柱参数
+            start_year=request.start_year,  # 传入查询起始年参数
+            end_year=request.end_year,  # 传入查询结束年参数
+            sect=request.sect  # 传入晚子时流派参数
+        )
+        
+        return ResponseFormatter.create_success_response(result, "四柱反查完成")  # 返回成功响应
+        
+    # 捕获参数验证异常
+    except ValueError as e:
+        error_response = ResponseFormatter.create_error_response(  # 创建错误响应对象
+            ErrorCode.INVALID_PILLARS_FORMAT.code,  # 使用错误码获取整数错误码
+            str(e)  # 传入异常消息
+        )
+        raise HTTPException(status_code=400, detail=error_response)  # 抛出HTTP异常，状态码400，包含错误响应
+    # 捕获执行器繁忙或超时异常
+    except CpuExecutorError as e:
+        error_response = ResponseFormatter.create_error_response(  # 创建错误响应对象
+            ErrorCode.SERVICE_UNAVAILABLE.code,  # 使用错误码获取整数错误码
+            str(e)  # 传入异常消息
+        )
+        raise HTTPException(status_code=e.status_code, detail=error_response)  # 抛出HTTP异常，繁忙503、超时504
+    # 捕获其他未知异常
+    except Exception as e:
+        error_response = ResponseFormatter.create_error_response(  # 创建错误响应对象
+            ErrorCode.PILLARS_CONVERSION_FAILED.code,  # 使用错误码获取整数错误码
+            f"服务器内部错误: {str(e)}"  # 传入服务器内部错误消息
+        )
+        raise HTTPException(status_code=500, detail=error_response)  # 抛出HTTP异常，状态码500，包含错误响应
+
 # ========== API文档描述 ==========
 
 # 设置公历时间验证函数的文档字符串
@@ -248,6 +498,8 @@ convert_solar_calendar.__doc__ = """
 - hour: 小时 (0-23, 可选，默认0)
 - minute: 分钟 (0-59, 可选，默认0)
 - second: 秒 (0-59, 可选，默认0)
+- profile: 输出配置 (minimal/ganzhi/full, 可选，默认full)：minimal只含公历时刻与日柱、时柱；ganzhi含公历时刻、四柱干支和节气；full为完整信息
+- fields: 输出字段 (可选)：区块名或"区块名.字段名"列表，如["ganzhi_info", "solar_info.solar_YmdHms"]，提供时优先于profile
 
 **返回示例:**
 ```json
@@ -335,6 +587,8 @@ convert_lunar_calendar.__doc__ = """
 - minute: 分钟 (0-59, 可选，默认0)
 - second: 秒 (0-59, 可选，默认0)
 - is_leap_month: 是否闰月 (true/false, 可选，默认false)
+- profile: 输出配置 (minimal/ganzhi/full, 可选，默认full)
+- fields: 输出字段 (可选)：区块名或"区块名.字段名"列表，提供时优先于profile
 
 **返回示例:**
 ```json
@@ -371,3 +625,127 @@ convert_lunar_calendar.__doc__ = """
 }
 ```
 """
+
+# 设置历法日期范围函数的文档字符串
+get_calendar_range.__doc__ = """
+一次返回整月、整年或任意日期区间的逐日历法信息（月历、年历视图），代替逐日调用/convert-solar
+
+按儒略日数逐日推进：农历、干支和节日读取逐日历法表（范围之外按农历年逐月逐日生成），节气按区间一次查询标注。
+
+**参数说明:**
+- year: 公历年 (2-9998)；只提供year时返回整年
+- month: 公历月 (1-12, 可选)；与year同时提供时返回整月
+- start_date / end_date: 起止日期 (YYYY-MM-DD, 含两端)；不提供year时必填
+- format: 输出格式 (json: 默认，最多366天; ndjson: 每天一行JSON，流式输出，最多3660天)
+
+**返回示例（json）:**
+```json
+{
+    "success": true,
+    "data": {
+        "start_date": "2024-02-01",
+        "end_date": "2024-02-29",
+        "total_days": 29,
+        "days": [
+            {
+                "solar_Ymd": "2024-02-04",
+                "solar_year": 2024,
+                "solar_month": 2,
+                "solar_day": 4,
+                "solar_week": 0,
+                "lunar_year": 2023,
+                "lunar_month": 12,
+                "lunar_day": 25,
+                "lunar_month_in_Chinese": "腊",
+                "lunar_day_in_Chinese": "廿五",
+                "lunar_month_days": 30,
+                "lunar_year_in_GanZhi": "癸卯",
+                "lunar_month_in_GanZhi": "丙寅",
+                "lunar_day_in_GanZhi": "戊戌",
+                "jieqi": "立春",
+                "jieqi_time": "2024-02-04 16:27:07",
+                "solar_festivals": [],
+                "solar_other_festivals": ["世界抗癌日"],
+                "lunar_festivals": [],
+                "lunar_other_festivals": []
+            }
+        ]
+    },
+    "message": "历法日期范围生成成功"
+}
+```
+"""
+
+# 设置节日范围查询函数的文档字符串
+get_festival_range.__doc__ = """
+一次遍历整月、整年或任意日期区间，列出有节日的日期（代替逐日调用/convert-solar读取节日字段）
+
+节日在启动时编译为按(月, 日)索引的查找表（公历节日、按星期的公历节日如母亲节、农历节日、农历其他节日），逐日记录直接读取，不逐日调用getFestivals()。
+
+**参数说明:**
+- year / month / start_date / end_date: 日期范围，规则同/calendar-range，最多3660天
+- kinds: 节日类别 (可选，默认全部): solar_festivals、solar_other_festivals、lunar_festivals、lunar_other_festivals
+
+**返回示例:**
+```json
+{
+    "success": true,
+    "data": {
+        "start_date": "2024-05-01",
+        "end_date": "2024-05-31",
+        "total_days": 31,
+        "kinds": ["solar_festivals", "lunar_festivals"],
+        "total_festival_days": 4,
+        "days": [
+            {
+                "solar_Ymd": "2024-05-12",
+                "solar_week": 0,
+                "lunar_month_in_Chinese": "四",
+                "lunar_day_in_Chinese": "初五",
+                "solar_festivals": ["母亲节"],
+                "lunar_festivals": []
+            }
+        ]
+    },
+    "message": "节日范围查询成功"
+}
+```
+"""
+
+# 设置四柱反查函数的文档字符串
+search_four_pillars.__doc__ = """
+按年、月、日、时四柱反查公历时间
+
+年柱按六十甲子序号定位精确干支年（以立春为界），月柱按节令交接时刻定位区间，日柱和时柱按六十甲子循环和五鼠遁直接推算，不逐日扫描。
+
+**参数说明:**
+- year_pillar: 年柱 (如"甲辰")
+- month_pillar: 月柱 (如"丙寅")
+- day_pillar: 日柱 (如"甲子")
+- time_pillar: 时柱 (如"甲子")
+- start_year: 查询起始公历年 (1-9999, 可选，默认1900)
+- end_year: 查询结束公历年，含 (1-9999, 可选，默认2100)
+- sect: 晚子时流派 (1: 晚子时日柱算明天，默认; 2: 晚子时日柱算当天)
+
+**返回说明:**
+- matches中每项为左闭右开的时间区间[start, end)，区间内每一时刻的四柱都与请求一致；时辰被节令交接时刻截断时，区间从交接时刻开始或到交接时刻结束
+
+**返回示例:**
+```json
+{
+    "success": true,
+    "data": {
+        "pillars": ["甲辰", "丙寅", "甲子", "甲子"],
+        "start_year": 1900,
+        "end_year": 2100,
+        "sect": 1,
+        "total_matches": 2,
+        "matches": [
+            {"start": "2024-02-29 23:00:00", "end": "2024-03-01 01:00:00"},
+            {"start": "2084-02-14 23:00:00", "end": "2084-02-15 01:00:00"}
+        ]
+    },
+    "message": "四柱反查完成"
+}
+```
+"""
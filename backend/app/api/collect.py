@@ -3,7 +3,7 @@
 * @description     收藏相关接口实现
 * @author          Gordon <gordon_cao@qq.com>
 * @createTime      2026-03-05 13:35:00
-* @lastModified    2026-03-05 13:35:00
+* @lastModified    2026-10-18 21:40:00
 * Copyright © All rights reserved
 """
 
@@ -62,10 +62,13 @@ async def toggle_collect(
     """
     # 调用服务层
     collect_service = CollectService(db)
-    data = collect_service.toggle_collect(
-        user_id=current_user.id,
-        pan_id=request.pan_id
-    )
+    try:
+        data = collect_service.toggle_collect(
+            user_id=current_user.id,
+            pan_id=request.pan_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     return ToggleCollectResponse(data=data)
 
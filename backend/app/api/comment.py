@@ -9,6 +9,7 @@ from app.models.comment import Comment
 from app.models.user import User
 from app.middleware.auth import get_current_user
 from app.utils.dependencies import rate_limit_dependency, security_validation_dependency
+from app.services.hot_score_service import HotScoreService
 
 router = APIRouter(prefix="/comment", tags=["comment"])
 
@@ -93,6 +94,7 @@ async def add_comment(request: AddCommentRequest, current_user: User = Depends(g
         is_public=request.is_public
     )
     db.add(new_comment)
+    HotScoreService(db).add_event(request.pan_record_id, "comment")  # 评论计入排盘记录热度分
     db.commit()
     db.refresh(new_comment)
     
@@ -3,7 +3,7 @@
 * @description     点赞相关接口实现
 * @author          Gordon <gordon_cao@qq.com>
 * @createTime      2026-03-05 13:30:00
-* @lastModified    2026-03-05 13:30:00
+* @lastModified    2026-10-18 21:40:00
 * Copyright © All rights reserved
 """
 
@@ -62,10 +62,13 @@ async def toggle_like(
     """
     # 调用服务层
     like_service = LikeService(db)
-    data = like_service.toggle_like(
-        user_id=current_user.id,
-        pan_id=request.pan_id
-    )
+    try:
+        data = like_service.toggle_like(
+            user_id=current_user.id,
+            pan_id=request.pan_id
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     return ToggleLikeResponse(data=data)
 
@@ -2,14 +2,19 @@
 # 功能：六爻占卜API接口，提供六爻起卦功能
 
 from fastapi import APIRouter, HTTPException  # 导入FastAPI路由器和HTTP异常类
-from pydantic import BaseModel, field_validator, model_validator  # 导入Pydantic基础模型类、字段验证器和模型验证器，用于数据验证
+from pydantic import BaseModel, ValidationError, field_validator, model_validator  # 导入Pydantic基础模型类、验证异常、字段验证器和模型验证器，用于数据验证
 
 # 导入类型提示：列表、字典、任意类型、可选类型
 from typing import List, Dict, Any, Optional  # 导入类型提示：列表、字典、任意类型、可选类型
 
 # 导入六爻排盘服务和验证器
-from app.services.liuyao_service import liuyao_service  # 导入六爻排盘服务实例，用于Service层验证和排盘计算
+from app.services.liuyao_service import liuyao_service, LiuyaoValidationException  # 导入六爻排盘服务实例和验证异常，用于Service层验证和排盘计算
 from app.validators.liuyao_validator import liuyao_validator  # 导入六爻验证器实例，用于测试验证功能
+from app.validators.validated_types import ValidatedCast  # 导入已验证的起卦请求类型，API层验证一次后直接传入Service层
+from app.utils.cpu_executor import CpuExecutorError  # 导入执行器拒绝任务异常，繁忙返回503、超时返回504
+from app.utils.response_formatter import UTF8JSONResponse  # 导入UTF-8 JSON响应类，批量结果直接序列化，跳过逐字段编码
+from config import settings  # 导入应用配置对象，用于读取批量排盘条数上限
+from core.calendar_algorithm_core import CALENDAR_PROFILES  # 导入历法输出配置表，用于验证calendar_profile
 
 router = APIRouter()  # 创建FastAPI路由器实例
 
@@ -65,6 +70,17 @@ class LiuyaoRequest(BaseModel):
     # 农历专用字段
     is_leap_month: bool = False  # 是否为闰月（仅农历有效，默认False）
     
+    # 历法信息输出配置：full（完整信息，默认）、ganzhi（干支与节气）、minimal（日柱时柱）
+    calendar_profile: str = "full"
+    
+    @field_validator('calendar_profile')
+    @classmethod
+    def validate_calendar_profile(cls, v):
+        """验证历法信息输出配置"""
+        if v not in CALENDAR_PROFILES:
+            raise ValueError(f"[API层验证] calendar_profile必须是{list(CALENDAR_PROFILES)}中的一个")
+        return v
+    
     @field_validator('numbers')
     @classmethod
     def validate_numbers(cls, v):
@@ -144,45 +160,29 @@ class LiuyaoRequest(BaseModel):
             raise ValueError("[API层验证] 不能同时提供公历和农历日期，请选择其中一种")
         
         return self
+    
+    # 验证日期取值范围并转换为已验证的起卦请求，验证失败时抛出带API层标识的ValueError
+    def to_cast(self) -> ValidatedCast:
+        try:
+            return ValidatedCast.from_values(self.model_dump())
+        except ValueError as e:
+            raise ValueError(f"[API层验证] {str(e)}")
 
 @router.post("/assemble-liuya")  # 定义POST路由，路径为/assemble-liuya
 # 异步函数，处理六爻起卦请求
 async def divine_liuyao(request: LiuyaoRequest):
     # 开始异常处理块
     try:
-        # 获取爻位数据
-        yao_list = request.numbers  # 使用原始字符串列表
-        
-        # 判断历法类型并准备参数
-        has_solar = request.year is not None and request.month is not None and request.day is not None
-        has_lunar = request.lunar_year is not None and request.lunar_month is not None and request.lunar_day is not None
-        
-        if has_solar:
-            # 使用公历日期调用Service层进行六爻排盘计算
-            paipan_result = liuyao_service.calculate_liuyao_with_solar_calendar(
-                yao_list=yao_list,
-                year=request.year,
-                month=request.month,
-                day=request.day,
-                hour=request.hour,
-                minute=request.minute,
-                second=request.second
-            )
-        else:
-            # 使用农历日期调用Service层进行六爻排盘计算
-            paipan_result = liuyao_service.calculate_liuyao_with_lunar_calendar(
-                yao_list=yao_list,
-                lunar_year=request.lunar_year,
-                lunar_month=request.lunar_month,
-                lunar_day=request.lunar_day,
-                hour=request.hour,
-                minute=request.minute,
-                second=request.second,
-                is_leap_month=request.is_leap_month
-            )
+        # API层验证一次，得到已验证的起卦请求
+        cast = request.to_cast()
+        
+        # 调用Service层在CPU执行器中进行六爻排盘计算（公历和农历均由起卦请求中的时刻决定）
+        paipan_result = await liuyao_service.calculate_liuyao_cast_async(cast)
         
         # 直接返回Core层的结果，不额外包装，避免多层嵌套和重复字段
         return paipan_result
+    except CpuExecutorError as e:  # 捕获执行器繁忙或超时异常
+        raise HTTPException(status_code=e.status_code, detail=f"[API层处理] {str(e)}")  # 抛出HTTP异常，繁忙503、超时504
     except ValueError as e:  # 捕获值错误异常
         error_msg = str(e)
         # 检查错误消息是否包含层标识，如果没有则添加API层标识
@@ -193,3 +193,88 @@ async def divine_liuyao(request: LiuyaoRequest):
         # 对于非预期的异常，添加API层标识并记录详细错误信息
         error_msg = f"[API层处理] 服务器内部错误: {str(e)}"
         raise HTTPException(status_code=500, detail=error_msg)  # 抛出HTTP异常，状态码500
+
+
+# 定义批量六爻请求模型（条目逐条校验，单条失败不影响其他条目）
+class LiuyaoBatchRequest(BaseModel):
+    items: List[Dict[str, Any]]  # 排盘条目列表，每项字段与/assemble-liuya请求相同
+    
+    @field_validator('items')
+    @classmethod
+    def validate_items(cls, v):
+        """验证批量条数"""
+        if not v:
+            raise ValueError("[API层验证] 批量排盘条目不能为空")
+        if len(v) > settings.LIUYAO_BATCH_MAX_SIZE:
+            raise ValueError(f"[API层验证] 批量排盘条数不能超过{settings.LIUYAO_BATCH_MAX_SIZE}条")
+        return v
+
+
+# 将Pydantic验证异常转换为带层标识的错误消息
+def _format_item_validation_error(e: ValidationError) -> str:
+    error = e.errors()[0]  # 只取第一条错误，与单条接口的错误粒度保持一致
+    error_msg = str(error.get("ctx", {}).get("error", error.get("msg", "")))  # 优先使用验证器抛出的原始消息
+    if "[API层验证]" not in error_msg:
+        location = ".".join(str(loc) for loc in error.get("loc", ()))  # 错误字段位置
+        error_msg = f"[API层验证] {location}: {error_msg}" if location else f"[API层验证] {error_msg}"
+    return error_msg
+
+
+@router.post("/assemble-liuya/batch")  # 定义POST路由，路径为/assemble-liuya/batch
+# 异步函数，处理批量六爻起卦请求
+async def divine_liuyao_batch(request: LiuyaoBatchRequest):
+    """
+    批量六爻排盘：相同时间的条目只做一次历法转换，结果顺序与请求一致，单条错误不影响其他条目
+    
+    Args:
+        request: 批量六爻请求模型，包含排盘条目列表
+        
+    Returns:
+        Dict: 批量结果，包含results（每项含index、success、data或error）和成功/失败统计
+    """
+    try:
+        results: List[Optional[Dict[str, Any]]] = [None] * len(request.items)  # 预分配结果列表
+        valid_indexes: List[int] = []  # 通过API层验证的条目下标
+        valid_casts: List[ValidatedCast] = []  # 通过API层验证的起卦请求
+        
+        # API层验证：逐条使用单条请求模型校验
+        for index, item in enumerate(request.items):
+            try:
+                cast = LiuyaoRequest.model_validate(item).to_cast()
+            except ValidationError as e:
+                results[index] = {"index": index, "success": False, "error": _format_item_validation_error(e)}
+                continue
+            except ValueError as e:  # 日期取值范围验证失败
+                results[index] = {"index": index, "success": False, "error": str(e)}
+                continue
+            valid_indexes.append(index)
+            valid_casts.append(cast)
+        
+        # 调用Service层在CPU执行器中整批计算，并按原始下标回填结果
+        batch_results = await liuyao_service.calculate_liuyao_batch_async(valid_casts)
+        for index, item_result in zip(valid_indexes, batch_results):
+            item_result["index"] = index
+            results[index] = item_result
+        
+        success_count = sum(1 for result in results if result["success"])  # 统计成功条数
+        # 结果只包含JSON基础类型，直接返回响应对象，避免jsonable_encoder逐字段遍历数百份排盘结果
+        return UTF8JSONResponse(content={
+            "results": results,  # 与请求顺序一致的结果列表
+            "total": len(results),  # 总条数
+            "success_count": success_count,  # 成功条数
+            "failed_count": len(results) - success_count,  # 失败条数
+            "message": "批量六爻排盘计算完成"
+        })
+    except LiuyaoValidationException as e:  # 捕获Service层批量验证异常
+        raise HTTPException(status_code=400, detail=e.message)  # 抛出HTTP异常，状态码400
+    except CpuExecutorError as e:  # 捕获执行器繁忙或超时异常
+        raise HTTPException(status_code=e.status_code, detail=f"[API层处理] {str(e)}")  # 抛出HTTP异常，繁忙503、超时504
+    except ValueError as e:  # 捕获值错误异常
+        error_msg = str(e)
+        # 检查错误消息是否包含层标识，如果没有则添加API层标识
+        if not any(layer in error_msg for layer in ["[API层验证]", "[Service层验证]", "[Core层验证]"]):
+            error_msg = f"[API层处理] {error_msg}"
+        raise HTTPException(status_code=400, detail=error_msg)  # 抛出HTTP异常，状态码400
+    except Exception as e:  # 捕获其他异常
+        error_msg = f"[API层处理] 服务器内部错误: {str(e)}"
+        raise HTTPException(status_code=500, detail=error_msg)  # 抛出HTTP异常，状态码500
@@ -3,11 +3,11 @@
  * @description     排盘记录相关接口实现
  * @author          Gordon <gordon_cao@qq.com>
  * @createTime      2026-02-27 10:00:00
- * @lastModified    2026-03-02 18:25:40
+ * @lastModified    2026-10-18 21:00:00
  * Copyright © All rights reserved
 """
 
-from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field
 from app.db.database import get_db
@@ -15,7 +15,10 @@ from app.models.pan_record import PanRecord
 from app.models.user import User
 from app.middleware.auth import get_current_user
 from app.utils.dependencies import rate_limit_dependency, security_validation_dependency
-from app.services.pan_service import PanService
+from app.services.pan_service import PanService, PAN_SORT_KEYS, paginate_keyset
+from app.services.hot_score_service import HOT_SCORE_WEIGHTS
+from app.services.pan_feed_cache import pan_feed_cache
+from app.utils.response_formatter import UTF8JSONResponse
 import json
 import time
 
@@ -63,6 +66,7 @@ class ListPanResponse(BaseModel):
     code: int = 200
     msg: str = "查询成功"
     data: list[PanRecordResponse]
+    next_cursor: str | None = None
 
 # 根据payload获取当前用户
 def get_current_user_from_payload(payload: dict = Depends(get_current_user, use_cache=False), db: Session = Depends(get_db)):
@@ -85,21 +89,24 @@ async def save_pan(request: SavePanRequest, current_user: User = Depends(get_cur
         pan_type=request.pan_type,
         pan_params=request.pan_params,
         pan_result=request.pan_result,
-        supplement=request.supplement
+        supplement=request.supplement,
+        hot_score=HOT_SCORE_WEIGHTS["publish"]
     )
     db.add(new_pan)
     db.commit()
     db.refresh(new_pan)
+    pan_feed_cache.invalidate_feed(new_pan.pan_type)
     
     return SavePanResponse(data={"record_id": new_pan.id})
 
 @router.get("/list", response_model=ListPanResponse)
 async def list_pan(
     pan_type: str = Query(default="liuyao", description="排盘类型"),
-    page: int = Query(default=1, ge=1, description="页码"),
+    page: int = Query(default=1, ge=1, description="页码（仅在没有游标时生效）"),
     size: int = Query(default=10, ge=1, le=100, description="每页数量"),
     start_time: int | None = Query(default=None, description="开始时间戳"),
     end_time: int | None = Query(default=None, description="结束时间戳"),
+    cursor: str | None = Query(default=None, description="分页游标（上一页返回的next_cursor）"),
     current_user: User = Depends(get_current_user_from_payload),
     db: Session = Depends(get_db),
     req: Request = Depends(rate_limit_dependency)
@@ -107,9 +114,6 @@ async def list_pan(
     """
     查询用户排盘记录
     """
-    # 计算偏移量
-    offset = (page - 1) * size
-    
     # 构建查询条件
     query = db.query(PanRecord).filter(
         PanRecord.user_id == current_user.id,
@@ -124,8 +128,11 @@ async def list_pan(
     if end_time:
         query = query.filter(PanRecord.create_time <= end_time)
     
-    # 执行查询
-    records = query.order_by(PanRecord.create_time.desc()).offset(offset).limit(size).all()
+    # 执行查询（按(create_time, id)游标分页）
+    try:
+        records, next_cursor = paginate_keyset(query, "newest", size, cursor, (page - 1) * size)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     # 构建响应数据
     data = []
@@ -155,7 +162,7 @@ async def list_pan(
             comment_count=comment_count
         ))
     
-    return ListPanResponse(data=data)
+    return ListPanResponse(data=data, next_cursor=next_cursor)
 
 @router.put("/update/{record_id}", response_model=UpdatePanResponse)
 async def update_pan(
@@ -190,6 +197,7 @@ async def update_pan(
     
     db.commit()
     db.refresh(record)
+    pan_feed_cache.invalidate_feed(record.pan_type)
     
     return UpdatePanResponse(data={"record_id": record.id})
 
@@ -218,34 +226,73 @@ async def delete_pan(
     record.update_time = int(time.time())
     
     db.commit()
+    pan_feed_cache.invalidate_feed(record.pan_type)
     
     return DeletePanResponse(data={"record_id": record_id})
 
 @router.get("/public/list")
 async def get_public_pan_list(
     pan_type: str = Query(default="liuyao", description="排盘类型"),
-    page: int = Query(default=1, ge=1, description="页码"),
+    page: int = Query(default=1, ge=1, description="页码（仅在没有游标时生效）"),
     size: int = Query(default=12, ge=1, le=50, description="每页数量"),
     sort: str = Query(default="newest", description="排序方式：newest=最新，hottest=最热"),
-    current_user: User = Depends(get_current_user_from_payload, use_cache=False),
+    cursor: str | None = Query(default=None, description="分页游标（上一页返回的next_cursor）"),
     db: Session = Depends(get_db),
     req: Request = Depends(rate_limit_dependency)
 ):
     """
     获取公开排盘记录列表
+    
+    返回与用户无关的共享页（不含is_liked、is_collected），匿名和登录用户读取同一份页缓存；
+    登录用户的点赞/收藏状态通过 /public/interactions 按本页记录ID单独查询后叠加
     """
-    # 获取当前用户ID（可选）
-    user_id = current_user.id if current_user else None
+    # 读取列表页缓存，命中时直接返回已序列化的响应字节
+    cache_key = (pan_type, sort if sort in PAN_SORT_KEYS else "newest", cursor, 1 if cursor else page, size)
+    body, generation = pan_feed_cache.get(cache_key)
+    if body is not None:
+        return Response(content=body, media_type=UTF8JSONResponse.media_type)
     
     # 调用服务层
     pan_service = PanService(db)
-    data = pan_service.get_public_pan_list(
-        pan_type=pan_type,
-        page=page,
-        size=size,
-        sort=sort,
-        user_id=user_id
-    )
+    try:
+        result = pan_service.get_public_pan_page(
+            pan_type=pan_type,
+            size=size,
+            sort=sort,
+            cursor=cursor,
+            page=page
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    content = {
+        "code": 200,
+        "msg": "查询成功",
+        "data": result["list"],
+        "next_cursor": result["next_cursor"]
+    }
+    
+    # 序列化一次后写入缓存
+    body = UTF8JSONResponse(content).body
+    pan_feed_cache.put(cache_key, body, [item["id"] for item in result["list"]], generation)
+    return Response(content=body, media_type=UTF8JSONResponse.media_type)
+
+@router.get("/public/interactions")
+async def get_pan_interactions(
+    pan_ids: list[int] = Query(..., min_length=1, max_length=100, description="排盘记录ID列表（最多100个）"),
+    payload: dict = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    req: Request = Depends(rate_limit_dependency)
+):
+    """
+    获取当前用户对一组排盘记录的点赞/收藏状态
+    
+    liked、collected为与pan_ids顺序一致的位串，第i位为"1"表示已点赞（或已收藏）；
+    未登录时全部为"0"，不查询数据库
+    """
+    user_id = payload.get("user_id") if payload else None
+    pan_service = PanService(db)
+    data = pan_service.get_interaction_bits(user_id, pan_ids)
     
     return {
         "code": 200,
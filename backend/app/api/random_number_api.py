@@ -1,10 +1,18 @@
 # backend/src/api/random_number_api.py 2026-02-11 12:30:00
 # 功能：随机数生成API接口层，专注于HTTP请求处理
 
-from fastapi import APIRouter  # 导入FastAPI路由器，用于定义API路由
+from fastapi import APIRouter, HTTPException, Query  # 导入FastAPI路由器、HTTP异常类和查询参数声明，用于定义API路由和返回错误响应
+from fastapi.responses import StreamingResponse  # 导入流式响应类，用于NDJSON逐行输出批量随机结果
+from pydantic import BaseModel, field_validator, model_validator  # 导入Pydantic基础模型类、字段验证器和模型验证器
+from typing import Optional  # 导入可选类型注解
 from app.services.random_number_service import random_number_service  # 导入随机数生成服务实例
+from app.divination.random_number_divination import RandomDrawStream  # 导入可复现随机整数块生成器，用于在响应头中返回生成器名称
+from app.validators.validated_types import ValidatedDateTime  # 导入已验证的时刻类型，API层验证一次后直接传入Service层
+from app.utils.cpu_executor import CpuExecutorError  # 导入执行器拒绝任务异常，繁忙返回503、超时返回504
+from app.utils.error_codes import ErrorCode  # 导入标准错误码
+from core.calendar_algorithm_core import CALENDAR_PROFILES  # 导入历法输出配置表，用于验证calendar_profile
 
-from app.utils.response_formatter import ResponseFormatter  # 导入响应格式化工具
+from app.utils.response_formatter import ResponseFormatter, UTF8JSONResponse  # 导入响应格式化工具和UTF-8 JSON响应类
 from app.utils.api_decorators import (  # 导入统一错误处理装饰器
     handle_random_digit_errors,  # 随机数字错误处理装饰器
     handle_random_three_digits_errors,  # 三个随机数字错误处理装饰器
@@ -54,4 +62,116 @@ async def get_random_jiazi_api():
     return ResponseFormatter.create_success_response(
         result,  # 服务层返回的随机六十甲子数据
         "随机一个六十甲子干支选择成功"  # 成功消息
-    )
\ No newline at end of file
+    )
+
+
+@router.get("/bulk")  # 定义GET路由，路径为/bulk，用于一次批量生成多个随机结果
+
+# 异步函数，批量随机抽取API接口（json一次返回，ndjson每个结果一行流式输出）
+async def generate_bulk_draws_api(
+    kind: str = Query("three-digits", description="抽取类型：digit、three-digits、sixty-jiazi、six-yao"),
+    count: int = Query(6, description="抽取个数"),
+    seed: Optional[int] = Query(None, description="随机种子，可选；相同种子和生成器可复现相同结果"),
+    format: str = Query("json", description="输出格式：json或ndjson")
+):
+    
+    try:
+        if format not in ("json", "ndjson"):
+            raise ValueError("[API层验证] 输出格式必须是json或ndjson")
+        if format == "ndjson":
+            # 先验证参数（验证失败时仍可返回400），种子和生成器通过响应头返回，再按块在CPU执行器中生成并逐行输出
+            kind, count, seed = random_number_service.resolve_bulk_params(kind, count, seed, stream=True)
+            return StreamingResponse(
+                random_number_service.iter_bulk_draws_ndjson(kind, count, seed),
+                media_type="application/x-ndjson",
+                headers={"X-Random-Seed": str(seed), "X-Random-Generator": RandomDrawStream(seed).generator}
+            )
+        
+        result = await random_number_service.get_bulk_draws_async(kind=kind, count=count, seed=seed)  # 通过服务层在CPU执行器中批量生成
+        # 结果只包含JSON基础类型，直接返回响应对象，避免jsonable_encoder逐项遍历
+        return UTF8JSONResponse(content=ResponseFormatter.create_success_response(result, "批量随机抽取成功"))
+    except ValueError as e:  # 捕获参数验证异常
+        error_response = ResponseFormatter.create_error_response(ErrorCode.INVALID_PARAMETER.code, str(e))
+        raise HTTPException(status_code=400, detail=error_response)  # 抛出HTTP异常，状态码400
+    except CpuExecutorError as e:  # 捕获执行器繁忙或超时异常
+        error_response = ResponseFormatter.create_error_response(ErrorCode.SERVICE_UNAVAILABLE.code, str(e))
+        raise HTTPException(status_code=e.status_code, detail=error_response)  # 抛出HTTP异常，繁忙503、超时504
+    except Exception as e:  # 捕获其他异常
+        error_response = ResponseFormatter.create_error_response(ErrorCode.RANDOM_THREE_DIGITS_GENERATION_FAILED.code, f"[API层处理] 批量随机抽取失败: {str(e)}")
+        raise HTTPException(status_code=500, detail=error_response)  # 抛出HTTP异常，状态码500
+
+
+# 定义随机起卦排盘请求模型：不提供日期时按服务器当前时间起卦
+class RandomCastRequest(BaseModel):
+    # 公历日期字段（可选）
+    year: Optional[int] = None  # 公历年份
+    month: Optional[int] = None  # 公历月份
+    day: Optional[int] = None  # 公历日期
+    
+    # 农历日期字段（可选）
+    lunar_year: Optional[int] = None  # 农历年份
+    lunar_month: Optional[int] = None  # 农历月份
+    lunar_day: Optional[int] = None  # 农历日期
+    is_leap_month: bool = False  # 是否为闰月（仅农历有效，默认False）
+    
+    # 公用时间字段（仅在提供日期时有效，默认0）
+    hour: int = 0  # 小时
+    minute: int = 0  # 分钟
+    second: int = 0  # 秒
+    
+    # 历法信息输出配置：full（完整信息，默认）、ganzhi（干支与节气）、minimal（日柱时柱）
+    calendar_profile: str = "full"
+    
+    @field_validator('calendar_profile')
+    @classmethod
+    def validate_calendar_profile(cls, v):
+        """验证历法信息输出配置"""
+        if v not in CALENDAR_PROFILES:
+            raise ValueError(f"[API层验证] calendar_profile必须是{list(CALENDAR_PROFILES)}中的一个")
+        return v
+    
+    @model_validator(mode='after')
+    def validate_calendar_type(self):
+        """验证日期字段：公历或农历必须完整提供，不能同时提供两种，都不提供时按当前时间起卦"""
+        solar_values = [self.year, self.month, self.day]
+        lunar_values = [self.lunar_year, self.lunar_month, self.lunar_day]
+        if any(v is not None for v in solar_values) and None in solar_values:
+            raise ValueError("[API层验证] 公历日期必须完整提供year、month、day三个字段")
+        if any(v is not None for v in lunar_values) and None in lunar_values:
+            raise ValueError("[API层验证] 农历日期必须完整提供lunar_year、lunar_month、lunar_day三个字段")
+        if self.year is not None and self.lunar_year is not None:
+            raise ValueError("[API层验证] 不能同时提供公历和农历日期，请选择其中一种")
+        return self
+    
+    # 验证日期取值范围并转换为已验证的时刻；未提供日期时返回None（按当前时间起卦）
+    def to_moment(self) -> Optional[ValidatedDateTime]:
+        if self.year is None and self.lunar_year is None:
+            return None
+        try:
+            return ValidatedDateTime.from_values(self.model_dump())
+        except ValueError as e:
+            raise ValueError(f"[API层验证] {str(e)}")
+
+@router.post("/cast-liuyao")  # 定义POST路由，路径为/cast-liuyao，用于随机起卦并排盘
+
+# 异步函数，随机生成六个爻位并排盘API接口（一次请求代替六次/three-digits请求和一次/liuyao/assemble-liuya请求）
+async def cast_liuyao_api(request: RandomCastRequest):
+    
+    try:
+        moment = request.to_moment()  # API层验证一次，得到已验证的起卦时刻
+        result = await random_number_service.cast_liuyao_async(moment, request.calendar_profile)  # 调用服务层生成随机数字并排盘
+        
+        # 返回标准化的成功响应
+        return ResponseFormatter.create_success_response(
+            result,  # 六个爻位的随机数字和排盘结果
+            "随机起卦排盘成功"  # 成功消息
+        )
+    except ValueError as e:  # 捕获日期取值范围验证异常
+        error_response = ResponseFormatter.create_error_response(ErrorCode.INVALID_DATE_FORMAT.code, str(e))
+        raise HTTPException(status_code=400, detail=error_response)  # 抛出HTTP异常，状态码400
+    except CpuExecutorError as e:  # 捕获执行器繁忙或超时异常
+        error_response = ResponseFormatter.create_error_response(ErrorCode.SERVICE_UNAVAILABLE.code, str(e))
+        raise HTTPException(status_code=e.status_code, detail=error_response)  # 抛出HTTP异常，繁忙503、超时504
+    except Exception as e:  # 捕获其他异常
+        error_response = ResponseFormatter.create_error_response(ErrorCode.LIUYAO_DIVINATION_FAILED.code, f"[API层处理] 随机起卦排盘失败: {str(e)}")
+        raise HTTPException(status_code=500, detail=error_response)  # 抛出HTTP异常，状态码500
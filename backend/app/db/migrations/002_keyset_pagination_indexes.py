@@ -0,0 +1,100 @@
+"""
+数据库迁移脚本：重建排盘记录游标分页索引
+
+@file            backend/app/db/migrations/002_keyset_pagination_indexes.py
+@description     数据库迁移脚本，按游标分页的查询条件重建pan_record的时间、热度、用户和后台管理列表索引
+@author          Gordon <gordon_cao@qq.com>
+@createTime      2026-10-18 20:00:00
+@lastModified    2026-10-18 22:00:00
+Copyright © All rights reserved
+"""
+
+import os
+import sqlite3
+import time
+
+# 数据库文件路径
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DB_PATH = os.path.join(BASE_DIR, "db", "yyggywh.db")
+
+# 索引名称 → 列定义（与PanRecord模型的__table_args__保持一致）
+PAN_RECORD_INDEXES = {
+    "idx_pan_user_type": "user_id, pan_type, create_time, id",
+    "idx_pan_record_time": "pan_type, is_public, audit_status, is_visible, deleted_at, create_time, id",
+    "idx_pan_record_hot": "pan_type, is_public, audit_status, is_visible, deleted_at, like_count, create_time, id",
+    "idx_pan_record_admin": "deleted_at, create_time, id",
+}
+
+
+def backup_database():
+    """备份数据库"""
+    try:
+        # 备份文件路径
+        backup_path = f"{DB_PATH}.bak.{int(time.time())}"
+
+        # 读取原数据库
+        with open(DB_PATH, 'rb') as source:
+            source_content = source.read()
+
+        # 写入备份文件
+        with open(backup_path, 'wb') as backup:
+            backup.write(source_content)
+
+        print(f"数据库备份成功: {backup_path}")
+        return True
+    except Exception as e:
+        print(f"数据库备份失败: {e}")
+        return False
+
+
+def rebuild_indexes(cursor):
+    """删除旧的排序索引并按游标分页的查询条件重建"""
+    print("开始重建pan_record索引...")
+
+    for name, columns in PAN_RECORD_INDEXES.items():
+        try:
+            cursor.execute(f"DROP INDEX IF EXISTS {name}")
+            cursor.execute(f"CREATE INDEX {name} ON pan_record({columns})")
+        except Exception as e:
+            print(f"重建索引{name}失败: {e}")
+            return False
+
+    print("pan_record索引重建成功")
+    return True
+
+
+def main():
+    """主函数"""
+    print("开始执行数据库迁移...")
+
+    # 备份数据库
+    if not backup_database():
+        print("数据库备份失败，终止迁移")
+        return
+
+    # 连接数据库
+    conn = None
+    try:
+        conn = sqlite3.connect(DB_PATH)
+        cursor = conn.cursor()
+
+        if not rebuild_indexes(cursor):
+            print("执行步骤 rebuild_indexes 失败，回滚操作")
+            conn.rollback()
+            return
+
+        # 提交事务
+        conn.commit()
+        print("数据库迁移成功完成！")
+
+    except Exception as e:
+        print(f"迁移过程中发生错误: {e}")
+        if conn:
+            conn.rollback()
+    finally:
+        if conn:
+            conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+数据库迁移脚本：添加排盘记录热度分
+
+@file            backend/app/db/migrations/003_add_hot_score.py
+@description     数据库迁移脚本，为pan_record添加hot_score字段、按热度分重建最热索引，并按已有互动计数回填热度分
+@author          Gordon <gordon_cao@qq.com>
+@createTime      2026-10-18 20:20:00
+@lastModified    2026-10-18 20:20:00
+Copyright © All rights reserved
+"""
+
+import os
+import sys
+import sqlite3
+import time
+
+# 数据库文件路径
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+DB_PATH = os.path.join(BASE_DIR, "db", "yyggywh.db")
+
+# 添加backend目录到Python路径，复用热度分权重和衰减系数
+sys.path.append(os.path.dirname(BASE_DIR))
+
+from app.services.hot_score_service import HOT_SCORE_WEIGHTS, DECAYED_AT_KEY, decay_factor
+
+
+def backup_database():
+    """备份数据库"""
+    try:
+        # 备份文件路径
+        backup_path = f"{DB_PATH}.bak.{int(time.time())}"
+
+        # 读取原数据库
+        with open(DB_PATH, 'rb') as source:
+            source_content = source.read()
+
+        # 写入备份文件
+        with open(backup_path, 'wb') as backup:
+            backup.write(source_content)
+
+        print(f"数据库备份成功: {backup_path}")
+        return True
+    except Exception as e:
+        print(f"数据库备份失败: {e}")
+        return False
+
+
+def add_hot_score_column(cursor):
+    """为pan_record表添加hot_score字段"""
+    print("开始为pan_record表添加hot_score字段...")
+
+    try:
+        cursor.execute("ALTER TABLE pan_record ADD COLUMN hot_score REAL DEFAULT 0")
+    except Exception as e:
+        if "duplicate column name" in str(e).lower():
+            print("hot_score字段已存在，跳过")
+        else:
+            print(f"添加hot_score字段失败: {e}")
+            return False
+
+    print("hot_score字段添加成功")
+    return True
+
+
+def rebuild_hot_index(cursor):
+    """按热度分重建最热索引"""
+    print("开始重建idx_pan_record_hot索引...")
+
+    try:
+        cursor.execute("DROP INDEX IF EXISTS idx_pan_record_hot")
+        cursor.execute(
+            "CREATE INDEX idx_pan_record_hot ON pan_record"
+            "(pan_type, is_public, audit_status, is_visible, deleted_at, hot_score, create_time, id)"
+        )
+    except Exception as e:
+        print(f"重建索引失败: {e}")
+        return False
+
+    print("idx_pan_record_hot索引重建成功")
+    return True
+
+
+def backfill_hot_score(cursor):
+    """按已有互动计数回填热度分（互动时间未知，按发布时间计算衰减）"""
+    print("开始回填热度分...")
+
+    now = int(time.time())
+    rows = cursor.execute(
+        "SELECT id, create_time, like_count, collect_count, comment_count, view_count FROM pan_record"
+    ).fetchall()
+    updates = []
+    for record_id, create_time, like_count, collect_count, comment_count, view_count in rows:
+        score = (
+            HOT_SCORE_WEIGHTS["publish"]
+            + HOT_SCORE_WEIGHTS["like"] * (like_count or 0)
+            + HOT_SCORE_WEIGHTS["collect"] * (collect_count or 0)
+            + HOT_SCORE_WEIGHTS["comment"] * (comment_count or 0)
+            + HOT_SCORE_WEIGHTS["view"] * (view_count or 0)
+        ) * decay_factor(now - int(create_time or now))
+        updates.append((score, record_id))
+    cursor.executemany("UPDATE pan_record SET hot_score = ? WHERE id = ?", updates)
+
+    # 记录衰减起点，后台任务从此时开始衰减
+    cursor.execute("DELETE FROM system_config WHERE key = ?", (DECAYED_AT_KEY,))
+    cursor.execute(
+        "INSERT INTO system_config (key, value, description, create_time, update_time) VALUES (?, ?, ?, ?, ?)",
+        (DECAYED_AT_KEY, str(now), "热度分最近一次衰减时间", now, now)
+    )
+
+    print(f"热度分回填成功，共{len(updates)}条记录")
+    return True
+
+
+def main():
+    """主函数"""
+    print("开始执行数据库迁移...")
+
+    # 备份数据库
+    if not backup_database():
+        print("数据库备份失败，终止迁移")
+        return
+
+    # 连接数据库
+    conn = None
+    try:
+        conn = sqlite3.connect(DB_PATH)
+        cursor = conn.cursor()
+
+        # 执行迁移步骤
+        steps = [
+            add_hot_score_column,
+            rebuild_hot_index,
+            backfill_hot_score
+        ]
+
+        for step in steps:
+            if not step(cursor):
+                print(f"执行步骤 {step.__name__} 失败，回滚操作")
+                conn.rollback()
+                return
+
+        # 提交事务
+        conn.commit()
+        print("数据库迁移成功完成！")
+
+    except Exception as e:
+        print(f"迁移过程中发生错误: {e}")
+        if conn:
+            conn.rollback()
+    finally:
+        if conn:
+            conn.close()
+
+
+if __name__ == "__main__":
+    main()
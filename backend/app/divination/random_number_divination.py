@@ -1,10 +1,47 @@
 # backend/src/divination/random_number_divination.py 2026-02-11 12:15:00
-# 功能：随机数起卦法实现，提供六爻起卦所需的随机数生成
+# 功能：随机数起卦法实现，提供六爻起卦所需的随机数生成；批量模式按整块生成随机整数并查表得到结果，可指定种子复现
 
 import random  # 导入随机数模块，用于生成随机数
-from typing import Tuple  # 导入类型提示模块，用于类型注解
+from typing import Any, Dict, List, Tuple  # 导入类型提示模块，用于类型注解
 from data.sixty_jiazi_data import SIXTY_JIAZI  # 导入六十甲子静态数据
 
+# 尝试导入NumPy，如果失败则使用Python标准库随机数生成器
+try:
+    import numpy as np
+    HAS_NUMPY = True
+except ImportError:
+    HAS_NUMPY = False
+
+# 批量抽取类型：单个数字、三个数字（一个爻位）、六十甲子、六个爻位（一次起卦）
+BULK_DRAW_KINDS = ("digit", "three-digits", "sixty-jiazi", "six-yao")
+
+# 三个数字查表：0~999 → (数字字符串, 背正字符串, 奇数个数)；三个独立的0~9随机数字等价于一个0~999的随机整数
+_THREE_DIGIT_VALUES: Tuple[Tuple[str, str, int], ...] = tuple(
+    ("%03d" % value, "".join("背" if int(d) % 2 else "正" for d in "%03d" % value), sum(int(d) % 2 for d in "%03d" % value))
+    for value in range(1000)
+)
+
+THREE_DIGIT_ODD_COUNTS: Tuple[int, ...] = tuple(odd_count for _, _, odd_count in _THREE_DIGIT_VALUES)  # 0~999 → 三个数字中奇数的个数
+
+
+# 可复现的随机整数块生成器：同一种子和块序号总是得到相同的随机整数序列；有NumPy时整块向量化生成，否则使用Python标准库
+class RandomDrawStream:
+    __slots__ = ("seed", "generator")
+
+    def __init__(self, seed: int):
+        self.seed = seed  # 随机种子
+        self.generator = "numpy" if HAS_NUMPY else "python"  # 随机数生成器（同一种子在不同生成器下的序列不同）
+
+    # 生成第chunk_index块的count个[0, upper)随机整数；每块独立播种，分块生成和流式输出可以按块并行且结果不变
+    def integers(self, upper: int, count: int, chunk_index: int = 0) -> List[int]:
+        if HAS_NUMPY:
+            return np.random.default_rng([self.seed, chunk_index]).integers(0, upper, size=count).tolist()
+        return random.Random(f"{self.seed}-{chunk_index}").choices(range(upper), k=count)
+
+    # 生成与integers()相同的随机整数序列，以NumPy数组返回（仅在有NumPy时可用），供向量化统计使用
+    def integer_array(self, upper: int, count: int, chunk_index: int = 0):
+        return np.random.default_rng([self.seed, chunk_index]).integers(0, upper, size=count)
+
 
 # 随机数起卦法类，提供起卦、起局等所需的随机数生成功能
 class RandomNumberDivination:
@@ -39,5 +76,27 @@ class RandomNumberDivination:
         result = random.choice(SIXTY_JIAZI)  # 从六十甲子静态数据中随机选择一个干支组合
         return result  # 返回随机选择的六十甲子字符串
 
+    
+
+    @staticmethod
+    # 批量生成count个指定类型的随机结果（第chunk_index块），每个结果为可直接序列化的基础类型
+    def generate_bulk_draws(stream: RandomDrawStream, kind: str, count: int, chunk_index: int = 0) -> List[Any]:
+
+        if kind == "digit":  # 单个数字：0~9
+            return stream.integers(10, count, chunk_index)
+        if kind == "three-digits":  # 三个数字：一个0~999的随机整数查表
+            return [{"three_digits": digit_str, "parity_str": parity_str, "odd_count": odd_count}
+                    for digit_str, parity_str, odd_count in map(_THREE_DIGIT_VALUES.__getitem__, stream.integers(1000, count, chunk_index))]
+        if kind == "sixty-jiazi":  # 六十甲子：序号从1开始
+            return [{"jiazi": SIXTY_JIAZI[index], "index": index + 1} for index in stream.integers(60, count, chunk_index)]
+        if kind == "six-yao":  # 六个爻位（从初爻到上爻）：每次起卦6个0~999的随机整数
+            values = stream.integers(1000, count * 6, chunk_index)
+            casts: List[Dict[str, List[Any]]] = []
+            for start in range(0, count * 6, 6):
+                yao_values = [_THREE_DIGIT_VALUES[value] for value in values[start:start + 6]]
+                casts.append({"numbers": [yao[0] for yao in yao_values], "odd_counts": [yao[2] for yao in yao_values]})
+            return casts
+        raise ValueError(f"批量抽取类型必须是{list(BULK_DRAW_KINDS)}中的一个，当前值：{kind}")
+
 
-__all__ = ['RandomNumberDivination']  # 默认导出列表，指定模块的公开接口
\ No newline at end of file
+__all__ = ['RandomNumberDivination', 'RandomDrawStream', 'BULK_DRAW_KINDS', 'THREE_DIGIT_ODD_COUNTS', 'HAS_NUMPY']  # 默认导出列表，指定模块的公开接口
\ No newline at end of file
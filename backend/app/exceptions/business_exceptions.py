@@ -2,6 +2,13 @@
 # 功能：业务异常类定义，用于服务层抛出业务相关的异常
 
 
+def _rebuild_business_exception(exception_class, message, code):
+    """绕过子类构造函数，按消息和错误码重建业务异常（供pickle反序列化使用）"""
+    exception = exception_class.__new__(exception_class)
+    BusinessException.__init__(exception, message, code)
+    return exception
+
+
 class BusinessException(Exception):
     """业务异常基类"""
     
@@ -9,6 +16,10 @@ class BusinessException(Exception):
         super().__init__(message)
         self.message = message
         self.code = code
+    
+    def __reduce__(self):
+        """按基类构造参数序列化，子类构造函数签名不同也能在进程池中传回主进程"""
+        return _rebuild_business_exception, (type(self), self.message, self.code)
 
 
 class RandomNumberGenerationException(BusinessException):
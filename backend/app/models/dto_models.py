@@ -48,10 +48,10 @@ class SolarConversionDTO(BaseModel):
     valid: bool  # 数据是否有效：表示输入数据是否有效，布尔类型
     input_type: str  # 输入类型：表示原始输入的类型，字符串类型
     conversion_type: str  # 转换类型：表示执行的转换操作类型，字符串类型
-    solar_info: Dict[str, Any]  # 公历信息：包含所有公历相关的详细信息，字典类型
-    lunar_info: Dict[str, Any]  # 农历信息：包含所有农历相关的详细信息，字典类型
-    ganzhi_info: Dict[str, Any]  # 干支信息：包含所有干支相关的详细信息，字典类型
-    jieqi_info: Dict[str, Any]  # 节气信息：包含所有节气相关的详细信息，字典类型
+    solar_info: Optional[Dict[str, Any]] = None  # 公历信息：包含所有公历相关的详细信息，字典类型（按输出配置可省略）
+    lunar_info: Optional[Dict[str, Any]] = None  # 农历信息：包含所有农历相关的详细信息，字典类型（按输出配置可省略）
+    ganzhi_info: Optional[Dict[str, Any]] = None  # 干支信息：包含所有干支相关的详细信息，字典类型（按输出配置可省略）
+    jieqi_info: Optional[Dict[str, Any]] = None  # 节气信息：包含所有节气相关的详细信息，字典类型（按输出配置可省略）
     method: str = "公历转农历"  # 转换方法：描述公历转农历的方式，默认值为"公历转农历"，字符串类型
     description: str = "将公历日期转换为农历信息"  # 描述信息：对公历转农历的详细说明，默认值为"将公历日期转换为农历信息"，字符串类型
 
@@ -61,10 +61,10 @@ class LunarConversionDTO(BaseModel):
     valid: bool  # 数据是否有效：表示输入数据是否有效，布尔类型
     input_type: str  # 输入类型：表示原始输入的类型，字符串类型
     conversion_type: str  # 转换类型：表示执行的转换操作类型，字符串类型
-    solar_info: Dict[str, Any]  # 公历信息：包含所有公历相关的详细信息，字典类型
-    lunar_info: Dict[str, Any]  # 农历信息：包含所有农历相关的详细信息，字典类型
-    ganzhi_info: Dict[str, Any]  # 干支信息：包含所有干支相关的详细信息，字典类型
-    jieqi_info: Dict[str, Any]  # 节气信息：包含所有节气相关的详细信息，字典类型
+    solar_info: Optional[Dict[str, Any]] = None  # 公历信息：包含所有公历相关的详细信息，字典类型（按输出配置可省略）
+    lunar_info: Optional[Dict[str, Any]] = None  # 农历信息：包含所有农历相关的详细信息，字典类型（按输出配置可省略）
+    ganzhi_info: Optional[Dict[str, Any]] = None  # 干支信息：包含所有干支相关的详细信息，字典类型（按输出配置可省略）
+    jieqi_info: Optional[Dict[str, Any]] = None  # 节气信息：包含所有节气相关的详细信息，字典类型（按输出配置可省略）
     method: str = "农历转公历"  # 转换方法：描述农历转公历的方式，默认值为"农历转公历"，字符串类型
     description: str = "将农历日期转换为公历信息"  # 描述信息：对农历转公历的详细说明，默认值为"将农历日期转换为公历信息"，字符串类型
 
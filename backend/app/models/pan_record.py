@@ -3,11 +3,11 @@
  * @description     排盘记录数据模型
  * @author          Gordon <gordon_cao@qq.com>
  * @createTime      2026-02-26 14:15:00
- * @lastModified    2026-03-02 17:02:00
+ * @lastModified    2026-10-18 22:00:00
  * Copyright © All rights reserved
 """
 
-from sqlalchemy import Column, Integer, String, ForeignKey, func, Index
+from sqlalchemy import Column, Integer, Float, String, ForeignKey, func, Index
 from sqlalchemy.orm import relationship
 from app.db.database import Base
 import time
@@ -34,6 +34,7 @@ class PanRecord(Base):
     view_count = Column(Integer, default=0)
     comment_count = Column(Integer, default=0)
     is_public = Column(Integer, default=1)
+    hot_score = Column(Float, default=0.0)  # 热度分：互动事件增量累加，后台任务按半衰期定期衰减
     
     # 关联关系
     user = relationship("User", foreign_keys=[user_id], back_populates="pan_records")
@@ -42,10 +43,12 @@ class PanRecord(Base):
     likes = relationship("PanLike", back_populates="pan_record", cascade="all, delete-orphan")
     collects = relationship("PanCollect", back_populates="pan_record", cascade="all, delete-orphan")
     
-    # 联合索引
+    # 联合索引（时间和热度索引以公开列表的等值条件开头、以游标分页的排序键结尾，与游标查询条件完全一致，最热列表为纯索引范围扫描；
+    # 后台管理列表只按deleted_at等值过滤，审核状态和用户条件在按时间倒序扫描时逐行过滤，由idx_pan_record_admin提供排序）
     __table_args__ = (
-        Index('idx_pan_user_type', 'user_id', 'pan_type'),
+        Index('idx_pan_user_type', 'user_id', 'pan_type', 'create_time', 'id'),
         Index('idx_pan_record_public', 'is_public', 'audit_status', 'is_visible', 'deleted_at'),
-        Index('idx_pan_record_time', 'create_time'),
-        Index('idx_pan_record_hot', 'like_count', 'create_time'),
+        Index('idx_pan_record_time', 'pan_type', 'is_public', 'audit_status', 'is_visible', 'deleted_at', 'create_time', 'id'),
+        Index('idx_pan_record_hot', 'pan_type', 'is_public', 'audit_status', 'is_visible', 'deleted_at', 'hot_score', 'create_time', 'id'),
+        Index('idx_pan_record_admin', 'deleted_at', 'create_time', 'id'),
     )
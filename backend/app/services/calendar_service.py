@@ -1,11 +1,20 @@
 # backend/src/services/calendar_service.py 2026-02-13 13:00:00
 # 功能：日历验证服务模块，封装时间验证业务逻辑和错误处理
 
+import json  # 导入JSON模块，用于把历法日期范围逐行序列化为NDJSON
 import logging  # 导入Python标准日志模块，用于记录服务运行日志
 from datetime import datetime  # 导入datetime模块，用于生成时间戳
 from app.validators.calendar_validator import calendar_validator  # 导入日历验证器实例，用于验证公历和农历时间参数
+from app.validators.validated_types import ValidatedDateTime  # 导入已验证的时刻类型，验证一次后直接传入共享缓存和Core层
 from app.models.dto_models import SolarValidationDTO, LunarValidationDTO, SolarConversionDTO, LunarConversionDTO  # 导入数据传输对象模型，用于标准化API响应格式
-from core.calendar_algorithm_core import calendar_algorithm_core  # 导入历法算法核心实例，用于执行历法转换计算
+from core.calendar_cache import calendar_cache  # 导入历法信息共享缓存实例，与六爻排盘服务共用转换结果
+from core.four_pillars_search import search_four_pillars, FOUR_PILLARS_SECTS  # 导入四柱反查函数和流派列表
+from core.calendar_range import CALENDAR_RANGE_YEARS, get_calendar_days, get_festival_days, month_span, year_span  # 导入历法日期范围和节日范围生成函数
+from core.festival_index import FESTIVAL_KINDS  # 导入四类节日名称，用于验证节日类别
+from core.ganzhi_arithmetic import julian_day_number, date_from_julian_day_number  # 导入儒略日数与公历日期的互相换算
+from app.validators.four_pillars_validator import JIA_ZI_COMBINATIONS  # 导入六十甲子表，用于验证四柱
+from config import settings  # 导入应用配置对象，用于读取四柱反查年跨度上限
+from app.utils.cpu_executor import cpu_executor, CpuExecutorError  # 导入CPU密集型任务执行器实例和拒绝任务异常，用于把转换计算卸载出事件循环
 # 导入服务层错误处理装饰器，提供统一的异常处理机制
 from app.utils.service_decorators import (
     handle_solar_validation_service_errors,  # 公历时间验证错误处理装饰器
@@ -16,6 +25,14 @@ from app.utils.service_decorators import (
 
 logger = logging.getLogger(__name__)  # 配置日志系统，获取当前模块的日志记录器实例
 
+_CALENDAR_RANGE_CHUNK_DAYS = 62  # NDJSON流式输出时每次提交到CPU执行器的天数
+
+
+# 执行器任务函数：在工作线程或工作进程中调用全局服务实例的方法（模块级函数，进程池模式下可被pickle）
+def _call_calendar_service(method_name: str, kwargs: dict):
+    return getattr(calendar_service, method_name)(**kwargs)
+
+
 # 日历验证服务类，封装所有时间验证相关的业务逻辑
 class CalendarService:
     # 私有方法：构建标准化的验证结果DTO
@@ -47,14 +64,6 @@ class CalendarService:
         except (ValueError, TypeError) as e:  # 捕获类型转换异常
             raise ValueError(f"参数类型转换失败：{str(e)}")  # 抛出新的ValueError异常，包含具体错误信息
     
-    # 私有方法：确保所有参数为整数类型
-    def _ensure_int_params(self, *params):
-        
-        try:
-            return tuple(int(param) for param in params)  # 遍历所有参数，转换为整数并返回元组
-        except (ValueError, TypeError) as e:  # 捕获类型转换异常
-            raise ValueError(f"参数类型转换失败：{str(e)}")  # 抛出新的ValueError异常，包含具体错误信息
-    
     # 公历时间验证服务方法
     @handle_solar_validation_service_errors  # 应用错误处理装饰器，自动处理异常和日志记录
 
@@ -130,33 +139,19 @@ class CalendarService:
     @handle_solar_conversion_service_errors  # 应用错误处理装饰器，自动处理异常和日志记录
 
     # 返回类型为公历转换结果DTO对象
-    def convert_solar_to_lunar(self, year, month, day, hour=0, minute=0, second=0) -> SolarConversionDTO:
+    def convert_solar_to_lunar(self, year, month, day, hour=0, minute=0, second=0, profile="full", fields=None) -> SolarConversionDTO:
         logger.info(f"公历转农历: {year}-{month}-{day} {hour}:{minute}:{second}")  # 记录转换请求的信息日志
         
         try:
-            # 确保所有参数为整数类型
-            year, month, day, hour, minute, second = self._ensure_int_params(
-                year, month, day, hour, minute, second
-            )
-            
-            # 第一层验证：在Service层验证公历时间参数
-            validation_result = calendar_validator.validate_solar_input(
-                str(year), str(month), str(day), str(hour), str(minute), str(second)
-            )
-            if not validation_result["valid"]:
-                error_msg = validation_result.get('error', '公历时间验证失败')
-                logger.warning(f"公历时间验证失败: {error_msg}")
-                raise ValueError(f"[Service层验证] {error_msg}")
+            # 第一层验证：在Service层验证公历时间参数，得到已验证的时刻，下游不再重复验证
+            try:
+                moment = ValidatedDateTime.solar(year, month, day, hour, minute, second)
+            except ValueError as e:
+                logger.warning(f"公历时间验证失败: {str(e)}")
+                raise ValueError(f"[Service层验证] {str(e)}")
             
-            # 调用核心算法进行转换
-            result = calendar_algorithm_core.convert_solar_to_lunar(
-                year=year,  # 传入公历年参数
-                month=month,  # 传入公历月参数
-                day=day,  # 传入公历日参数
-                hour=hour,  # 传入小时参数
-                minute=minute,  # 传入分钟参数
-                second=second  # 传入秒数参数
-            )
+            # 通过共享缓存调用核心算法进行转换
+            result = calendar_cache.get_validated(moment, profile=profile, fields=fields)
             
             logger.debug("公历转农历成功")  # 记录转换成功的调试日志
             return SolarConversionDTO(**result)  # 构建并返回转换成功的DTO对象
@@ -169,35 +164,19 @@ class CalendarService:
     @handle_lunar_conversion_service_errors  # 应用错误处理装饰器，自动处理异常和日志记录
 
     # 返回类型为农历转换结果DTO对象
-    def convert_lunar_to_solar(self, lunar_year, lunar_month, lunar_day, hour=0, minute=0, second=0, is_leap_month=False) -> LunarConversionDTO:
+    def convert_lunar_to_solar(self, lunar_year, lunar_month, lunar_day, hour=0, minute=0, second=0, is_leap_month=False, profile="full", fields=None) -> LunarConversionDTO:
         logger.info(f"农历转公历: {lunar_year}年{lunar_month}月{lunar_day}日 (闰月: {is_leap_month}) {hour}:{minute}:{second}")  # 记录转换请求的信息日志
         
         try:
-            # 确保所有参数为整数类型
-            lunar_year, lunar_month, lunar_day, hour, minute, second = self._ensure_int_params(
-                lunar_year, lunar_month, lunar_day, hour, minute, second
-            )
-            
-            # 第一层验证：在Service层验证农历时间参数
-            validation_result = calendar_validator.validate_lunar_input(
-                str(lunar_year), str(lunar_month), str(lunar_day),
-                str(hour), str(minute), str(second), str(is_leap_month)
-            )
-            if not validation_result["valid"]:
-                error_msg = validation_result.get('error', '农历时间验证失败')
-                logger.warning(f"农历时间验证失败: {error_msg}")
-                raise ValueError(f"[Service层验证] {error_msg}")
+            # 第一层验证：在Service层验证农历时间参数，得到已验证的时刻，下游不再重复验证
+            try:
+                moment = ValidatedDateTime.lunar(lunar_year, lunar_month, lunar_day, hour, minute, second, is_leap_month)
+            except ValueError as e:
+                logger.warning(f"农历时间验证失败: {str(e)}")
+                raise ValueError(f"[Service层验证] {str(e)}")
             
-            # 调用核心算法进行转换
-            result = calendar_algorithm_core.convert_lunar_to_solar(
-                lunar_year=lunar_year,  # 传入农历年参数
-                lunar_month=lunar_month,  # 传入农历月参数
-                lunar_day=lunar_day,  # 传入农历日参数
-                hour=hour,  # 传入小时参数
-                minute=minute,  # 传入分钟参数
-                second=second,  # 传入秒数参数
-                is_leap_month=is_leap_month  # 传入是否闰月参数
-            )
+            # 通过共享缓存调用核心算法进行转换（农历先映射到公历日期，与公历输入共用缓存条目）
+            result = calendar_cache.get_validated(moment, profile=profile, fields=fields)
             
             logger.debug("农历转公历成功")  # 记录转换成功的调试日志
             return LunarConversionDTO(**result)  # 构建并返回转换成功的DTO对象
@@ -205,6 +184,135 @@ class CalendarService:
         except Exception as e:  # 捕获转换过程中可能发生的所有异常
             logger.error(f"转换过程中发生错误: {str(e)}")  # 记录转换错误的错误日志
             raise ValueError(f"转换过程中发生错误: {str(e)}")  # 抛出新的ValueError异常，包含具体错误信息
+    
+    # 私有方法：解析"YYYY-MM-DD"公历日期并验证，返回儒略日数
+    def _parse_range_date(self, name, value) -> int:
+        try:
+            year, month, day = (int(part) for part in str(value).split("-"))
+            moment = ValidatedDateTime.solar(year, month, day)
+        except ValueError as e:
+            raise ValueError(f"[Service层验证] {name}必须是有效的YYYY-MM-DD日期，当前值：{value}，{str(e)}")
+        return julian_day_number(moment.year, moment.month, moment.day)
+    
+    # 解析并验证历法日期范围：提供year时为整年，同时提供month时为整月，否则为start_date~end_date（含两端）；返回(起始儒略日数, 结束儒略日数)
+    # max_days为最大天数，未提供时按输出方式取历法日期范围接口的JSON或NDJSON上限
+    def resolve_calendar_range(self, year=None, month=None, start_date=None, end_date=None, stream=False, max_days=None):
+        min_year, max_year = CALENDAR_RANGE_YEARS
+        if year is not None:
+            if not min_year <= year <= max_year:
+                raise ValueError(f"[Service层验证] 年份范围必须是{min_year}-{max_year}，当前值：{year}")
+            if month is not None and not 1 <= month <= 12:
+                raise ValueError(f"[Service层验证] 月份范围必须是1-12，当前值：{month}")
+            start_jdn, end_jdn = month_span(year, month) if month is not None else year_span(year)
+        elif start_date is not None and end_date is not None:
+            start_jdn, end_jdn = self._parse_range_date("start_date", start_date), self._parse_range_date("end_date", end_date)
+            if start_jdn > end_jdn:
+                raise ValueError(f"[Service层验证] 起始日期不能晚于结束日期: {start_date} > {end_date}")
+            if not (min_year <= date_from_julian_day_number(start_jdn)[0] and date_from_julian_day_number(end_jdn)[0] <= max_year):
+                raise ValueError(f"[Service层验证] 年份范围必须是{min_year}-{max_year}")
+        else:
+            raise ValueError("[Service层验证] 必须提供year（可选month）或start_date和end_date")
+        
+        hint = ""
+        if max_days is None:
+            max_days = settings.CALENDAR_RANGE_STREAM_MAX_DAYS if stream else settings.CALENDAR_RANGE_MAX_DAYS
+            hint = "" if stream else "，更大的范围请使用NDJSON流式输出"
+        if end_jdn - start_jdn + 1 > max_days:
+            raise ValueError(f"[Service层验证] 日期范围不能超过{max_days}天" + hint)
+        return start_jdn, end_jdn
+    
+    # 生成儒略日数区间[start_jdn, end_jdn]的逐日历法信息（供CPU执行器分块调用）
+    def get_calendar_days(self, start_jdn, end_jdn) -> list:
+        return get_calendar_days(start_jdn, end_jdn)
+    
+    # 历法日期范围服务方法：返回整月、整年或任意日期区间的逐日历法信息
+    def get_calendar_range(self, year=None, month=None, start_date=None, end_date=None) -> dict:
+        start_jdn, end_jdn = self.resolve_calendar_range(year, month, start_date, end_date)
+        days = get_calendar_days(start_jdn, end_jdn)
+        logger.debug(f"历法日期范围生成完成: {days[0]['solar_Ymd']}~{days[-1]['solar_Ymd']}，共{len(days)}天")
+        return {
+            "start_date": days[0]["solar_Ymd"],  # 起始日期
+            "end_date": days[-1]["solar_Ymd"],  # 结束日期
+            "total_days": len(days),  # 天数
+            "days": days  # 逐日历法信息
+        }
+    
+    # 历法日期范围的异步版本：在CPU执行器中执行，不阻塞事件循环
+    async def get_calendar_range_async(self, **kwargs) -> dict:
+        return await cpu_executor.run(_call_calendar_service, "get_calendar_range", kwargs)
+    
+    # 历法日期范围的NDJSON流式输出：按块在CPU执行器中生成，每天一行JSON；执行器繁忙或超时时输出一行error后结束
+    async def iter_calendar_range_ndjson(self, start_jdn, end_jdn):
+        for chunk_start in range(start_jdn, end_jdn + 1, _CALENDAR_RANGE_CHUNK_DAYS):
+            chunk_end = min(chunk_start + _CALENDAR_RANGE_CHUNK_DAYS - 1, end_jdn)
+            try:
+                days = await cpu_executor.run(_call_calendar_service, "get_calendar_days", {"start_jdn": chunk_start, "end_jdn": chunk_end})
+            except CpuExecutorError as e:
+                logger.warning(f"历法日期范围流式输出中断: {str(e)}")
+                yield (json.dumps({"error": str(e)}, ensure_ascii=False) + "\n").encode("utf-8")
+                return
+            yield "".join(json.dumps(day, ensure_ascii=False) + "\n" for day in days).encode("utf-8")
+    
+    # 节日范围服务方法：一次遍历整月、整年或任意日期区间，返回有节日的日期；kinds为要返回的节日类别（默认四类全部）
+    def get_festival_range(self, year=None, month=None, start_date=None, end_date=None, kinds=None) -> dict:
+        kinds = list(kinds) if kinds else list(FESTIVAL_KINDS)
+        invalid_kinds = [kind for kind in kinds if kind not in FESTIVAL_KINDS]
+        if invalid_kinds:
+            raise ValueError(f"[Service层验证] 节日类别必须是{list(FESTIVAL_KINDS)}中的一个，当前值：{invalid_kinds}")
+        start_jdn, end_jdn = self.resolve_calendar_range(year, month, start_date, end_date, max_days=settings.FESTIVAL_RANGE_MAX_DAYS)
+        days = get_festival_days(start_jdn, end_jdn, kinds)
+        logger.debug(f"节日范围查询完成: 共{end_jdn - start_jdn + 1}天，其中{len(days)}天有节日")
+        return {
+            "start_date": "%04d-%02d-%02d" % date_from_julian_day_number(start_jdn),  # 起始日期
+            "end_date": "%04d-%02d-%02d" % date_from_julian_day_number(end_jdn),  # 结束日期
+            "total_days": end_jdn - start_jdn + 1,  # 天数
+            "kinds": kinds,  # 节日类别
+            "total_festival_days": len(days),  # 有节日的天数
+            "days": days  # 有节日的日期及节日名称
+        }
+    
+    # 节日范围查询的异步版本：在CPU执行器中执行，不阻塞事件循环
+    async def get_festival_range_async(self, **kwargs) -> dict:
+        return await cpu_executor.run(_call_calendar_service, "get_festival_range", kwargs)
+    
+    # 四柱反查服务方法：返回start_year~end_year（公历年，含两端）内与四柱匹配的全部公历时间区间
+    def search_four_pillars(self, year_pillar, month_pillar, day_pillar, time_pillar, start_year=1900, end_year=2100, sect=1) -> dict:
+        logger.info(f"四柱反查: {year_pillar} {month_pillar} {day_pillar} {time_pillar}，{start_year}~{end_year}年，流派{sect}")  # 记录反查请求的信息日志
+        
+        # 在Service层验证四柱、流派和年份范围
+        for pillar in (year_pillar, month_pillar, day_pillar, time_pillar):
+            if pillar not in JIA_ZI_COMBINATIONS:
+                raise ValueError(f"[Service层验证] 无效的六十甲子组合: {pillar}")
+        if sect not in FOUR_PILLARS_SECTS:
+            raise ValueError(f"[Service层验证] 流派必须是{list(FOUR_PILLARS_SECTS)}中的一个，当前值：{sect}")
+        if not (1 <= start_year <= end_year <= 9999):
+            raise ValueError(f"[Service层验证] 年份范围必须在1-9999之间且起始年不大于结束年，当前值：{start_year}~{end_year}")
+        if end_year - start_year + 1 > settings.FOUR_PILLARS_SEARCH_MAX_YEARS:
+            raise ValueError(f"[Service层验证] 年份跨度不能超过{settings.FOUR_PILLARS_SEARCH_MAX_YEARS}年")
+        
+        # 调用核心算法按节令月区间和日柱循环推算匹配区间
+        matches = search_four_pillars(year_pillar, month_pillar, day_pillar, time_pillar, start_year, end_year, sect)
+        logger.debug(f"四柱反查完成，共{len(matches)}个匹配区间")  # 记录反查结果的调试日志
+        return {
+            "pillars": [year_pillar, month_pillar, day_pillar, time_pillar],  # 查询的四柱
+            "start_year": start_year,  # 查询起始年
+            "end_year": end_year,  # 查询结束年
+            "sect": sect,  # 晚子时流派
+            "total_matches": len(matches),  # 匹配区间数
+            "matches": matches  # 匹配区间列表，每项为左闭右开的[start, end)
+        }
+    
+    # 四柱反查的异步版本：在CPU执行器中执行，不阻塞事件循环
+    async def search_four_pillars_async(self, **kwargs) -> dict:
+        return await cpu_executor.run(_call_calendar_service, "search_four_pillars", kwargs)
+    
+    # 公历转农历的异步版本：在CPU执行器中执行，不阻塞事件循环
+    async def convert_solar_to_lunar_async(self, **kwargs) -> SolarConversionDTO:
+        return await cpu_executor.run(_call_calendar_service, "convert_solar_to_lunar", kwargs)
+    
+    # 农历转公历的异步版本：在CPU执行器中执行，不阻塞事件循环
+    async def convert_lunar_to_solar_async(self, **kwargs) -> LunarConversionDTO:
+        return await cpu_executor.run(_call_calendar_service, "convert_lunar_to_solar", kwargs)
 
 
 calendar_service = CalendarService()  # 创建服务实例，采用单例模式提供全局服务访问（实例化服务类，供API层调用）
@@ -3,15 +3,18 @@
 * @description     收藏服务层，封装收藏相关业务逻辑
 * @author          Gordon <gordon_cao@qq.com>
 * @createTime      2026-03-05 13:25:00
-* @lastModified    2026-03-05 13:25:00
+* @lastModified    2026-10-18 21:40:00
 * Copyright © All rights reserved
 """
 
 from typing import Optional, Dict, Any
+from sqlalchemy import delete
+from sqlalchemy.dialects.sqlite import insert
 from sqlalchemy.orm import Session
 from app.models.pan_collect import PanCollect
 from app.models.pan_record import PanRecord
 from app.services.pan_service import PanService
+from app.services.pan_feed_cache import pan_feed_cache
 
 
 class CollectService:
@@ -31,45 +34,41 @@ class CollectService:
         
         Returns:
             操作结果（is_collected, collect_count）
+        
+        Raises:
+            ValueError: 收藏的排盘记录不存在
         """
-        # 查询是否已收藏
-        collect = self.db.query(PanCollect).filter(
-            PanCollect.user_id == user_id,
-            PanCollect.pan_id == pan_id
-        ).first()
+        # 一个事务内完成：删除收藏记录，没有可删除的记录时插入（唯一约束冲突时不插入），
+        # 再用 UPDATE ... RETURNING 原子地累加收藏数和热度分，并发收藏不会丢失更新
+        deleted = self.db.execute(
+            delete(PanCollect).where(PanCollect.user_id == user_id, PanCollect.pan_id == pan_id)
+        ).rowcount
+        if deleted:
+            is_collected, delta = False, -1
+        else:
+            inserted = self.db.execute(
+                insert(PanCollect).values(user_id=user_id, pan_id=pan_id).on_conflict_do_nothing(
+                    index_elements=[PanCollect.user_id, PanCollect.pan_id]
+                )
+            ).rowcount
+            # 同一用户的并发请求已先插入时，本次请求不再重复计数
+            is_collected, delta = True, 1 if inserted else 0
         
-        if collect:
-            # 取消收藏
-            self.db.delete(collect)
-            self.pan_service.decrement_collect_count(pan_id)
-            self.db.commit()
-            
-            # 获取当前收藏数
-            record = self.db.query(PanRecord).filter(PanRecord.id == pan_id).first()
-            collect_count = record.collect_count if record else 0
-            
-            return {
-                "is_collected": False,
-                "collect_count": collect_count
-            }
+        if delta:
+            collect_count = self.pan_service.add_interaction_count(pan_id, "collect", delta)
+            if collect_count is None and delta > 0:
+                self.db.rollback()
+                raise ValueError("[Service层验证] 排盘记录不存在")
+            collect_count = collect_count or 0
         else:
-            # 收藏
-            new_collect = PanCollect(
-                user_id=user_id,
-                pan_id=pan_id
-            )
-            self.db.add(new_collect)
-            self.pan_service.increment_collect_count(pan_id)
-            self.db.commit()
-            
-            # 获取当前收藏数
-            record = self.db.query(PanRecord).filter(PanRecord.id == pan_id).first()
-            collect_count = record.collect_count if record else 0
-            
-            return {
-                "is_collected": True,
-                "collect_count": collect_count
-            }
+            collect_count = self.db.query(PanRecord.collect_count).filter(PanRecord.id == pan_id).scalar() or 0
+        self.db.commit()
+        pan_feed_cache.invalidate_pans(pan_id)
+        
+        return {
+            "is_collected": is_collected,
+            "collect_count": collect_count
+        }
     
     def get_collect_status(self, user_id: int, pan_id: int) -> bool:
         """
@@ -0,0 +1,183 @@
+"""
+* @file            backend/app/services/hot_score_service.py
+* @description     排盘记录热度分服务层，互动事件增量累加热度分，后台任务按半衰期定期整体衰减
+* @author          Gordon <gordon_cao@qq.com>
+* @createTime      2026-10-18 20:20:00
+* @lastModified    2026-10-18 21:40:00
+* Copyright © All rights reserved
+"""
+
+import asyncio
+import logging
+import time
+from typing import Optional
+from sqlalchemy import case
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+from app.db.database import SessionLocal
+from app.models.pan_record import PanRecord
+from app.models.system_config import SystemConfig
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# 各类互动事件的热度分权重：发布时的初始分，以及每次点赞、收藏、评论、浏览的加分
+HOT_SCORE_WEIGHTS = {
+    "publish": 2.0,
+    "like": 1.0,
+    "collect": 2.0,
+    "comment": 1.5,
+    "view": 0.05,
+}
+
+# 衰减后低于该值的热度分直接归零，之后的衰减不再改写这些记录
+HOT_SCORE_MIN = 0.001
+
+# 系统配置中记录最近一次衰减时间的键
+DECAYED_AT_KEY = "hot_score_decayed_at"
+
+
+def decay_factor(seconds: float) -> float:
+    """
+    经过seconds秒后热度分的衰减系数（按配置的半衰期）
+
+    Args:
+        seconds: 经过的秒数
+
+    Returns:
+        衰减系数（0~1）
+    """
+    return 0.5 ** (max(seconds, 0) / (settings.HOT_SCORE_HALF_LIFE_HOURS * 3600))
+
+
+def hot_score_increment(event: str, count: int = 1):
+    """
+    累加互动事件热度分的SQL表达式，可与计数更新放在同一条UPDATE中
+
+    Args:
+        event: 事件类型（like、collect、comment、view）
+        count: 事件次数，取消点赞/收藏时为负数，热度分不会减到0以下
+
+    Returns:
+        hot_score的新值表达式
+    """
+    score = PanRecord.hot_score + HOT_SCORE_WEIGHTS[event] * count
+    return case((score < 0, 0.0), else_=score)
+
+
+class HotScoreService:
+    """排盘记录热度分服务类
+
+    热度分表示"截至最近一次衰减时刻"的热度：互动事件直接加上权重，后台任务每隔一段时间把全部热度分
+    乘以同一个衰减系数。两次衰减之间的排序与按事件发生时刻精确衰减的差别不超过一个衰减间隔。
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def add_event(self, pan_id: int, event: str, count: int = 1):
+        """
+        累加互动事件的热度分（不提交事务，由调用方与计数更新一起提交）
+
+        Args:
+            pan_id: 排盘记录ID
+            event: 事件类型（like、collect、comment、view）
+            count: 事件次数，取消点赞/收藏时为负数，热度分不会减到0以下
+        """
+        self.db.query(PanRecord).filter(PanRecord.id == pan_id).update(
+            {PanRecord.hot_score: hot_score_increment(event, count)},
+            synchronize_session=False
+        )
+
+    def decay(self, now: Optional[int] = None) -> int:
+        """
+        把全部热度分衰减到当前时刻
+
+        先以比较并交换的方式更新系统配置中的最近衰减时间，多个进程同时执行时只有一个进程的衰减生效。
+
+        Args:
+            now: 当前时间戳（可选，默认取系统时间）
+
+        Returns:
+            被衰减的记录数
+        """
+        now = int(time.time()) if now is None else now
+        config = self.db.query(SystemConfig).filter(SystemConfig.key == DECAYED_AT_KEY).first()
+        if config is None:
+            # 第一次运行只记录起点
+            try:
+                self.db.add(SystemConfig(key=DECAYED_AT_KEY, value=str(now), description="热度分最近一次衰减时间"))
+                self.db.commit()
+            except IntegrityError:
+                self.db.rollback()
+            return 0
+
+        last = int(config.value)
+        if now <= last:
+            return 0
+        claimed = self.db.query(SystemConfig).filter(
+            SystemConfig.key == DECAYED_AT_KEY,
+            SystemConfig.value == config.value
+        ).update({SystemConfig.value: str(now)}, synchronize_session=False)
+        if not claimed:
+            self.db.rollback()
+            return 0
+
+        decayed = PanRecord.hot_score * decay_factor(now - last)
+        updated = self.db.query(PanRecord).filter(PanRecord.hot_score > 0).update(
+            {PanRecord.hot_score: case((decayed < HOT_SCORE_MIN, 0.0), else_=decayed)},
+            synchronize_session=False
+        )
+        self.db.commit()
+        return updated
+
+
+class HotScoreDecayTask:
+    """热度分后台衰减任务，随应用启动和关闭"""
+
+    def __init__(self):
+        self._task: Optional[asyncio.Task] = None
+
+    @staticmethod
+    def _decay_once() -> int:
+        """使用独立会话执行一次衰减"""
+        db = SessionLocal()
+        try:
+            return HotScoreService(db).decay()
+        finally:
+            db.close()
+
+    async def _run(self, interval: float):
+        """每隔interval秒衰减一次，单次失败只记录日志"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self._decay_once)
+            except Exception as e:
+                logger.error(f"热度分衰减失败: {e}")
+
+    def start(self, interval: Optional[float] = None):
+        """
+        启动后台衰减任务（必须在事件循环中调用）
+
+        Args:
+            interval: 衰减间隔秒数（可选，默认取配置；0表示不启动）
+        """
+        interval = settings.HOT_SCORE_DECAY_INTERVAL if interval is None else interval
+        if interval > 0 and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run(interval))
+
+    async def stop(self):
+        """停止后台衰减任务"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+
+# 创建全局热度分后台衰减任务实例
+hot_score_decay_task = HotScoreDecayTask()
@@ -3,15 +3,18 @@
 * @description     点赞服务层，封装点赞相关业务逻辑
 * @author          Gordon <gordon_cao@qq.com>
 * @createTime      2026-03-05 13:20:00
-* @lastModified    2026-03-05 13:20:00
+* @lastModified    2026-10-18 21:40:00
 * Copyright © All rights reserved
 """
 
 from typing import Optional, Dict, Any
+from sqlalchemy import delete
+from sqlalchemy.dialects.sqlite import insert
 from sqlalchemy.orm import Session
 from app.models.pan_like import PanLike
 from app.models.pan_record import PanRecord
 from app.services.pan_service import PanService
+from app.services.pan_feed_cache import pan_feed_cache
 
 
 class LikeService:
@@ -31,45 +34,41 @@ class LikeService:
         
         Returns:
             操作结果（is_liked, like_count）
+        
+        Raises:
+            ValueError: 点赞的排盘记录不存在
         """
-        # 查询是否已点赞
-        like = self.db.query(PanLike).filter(
-            PanLike.user_id == user_id,
-            PanLike.pan_id == pan_id
-        ).first()
+        # 一个事务内完成：删除点赞记录，没有可删除的记录时插入（唯一约束冲突时不插入），
+        # 再用 UPDATE ... RETURNING 原子地累加点赞数和热度分，并发点赞不会丢失更新
+        deleted = self.db.execute(
+            delete(PanLike).where(PanLike.user_id == user_id, PanLike.pan_id == pan_id)
+        ).rowcount
+        if deleted:
+            is_liked, delta = False, -1
+        else:
+            inserted = self.db.execute(
+                insert(PanLike).values(user_id=user_id, pan_id=pan_id).on_conflict_do_nothing(
+                    index_elements=[PanLike.user_id, PanLike.pan_id]
+                )
+            ).rowcount
+            # 同一用户的并发请求已先插入时，本次请求不再重复计数
+            is_liked, delta = True, 1 if inserted else 0
         
-        if like:
-            # 取消点赞
-            self.db.delete(like)
-            self.pan_service.decrement_like_count(pan_id)
-            self.db.commit()
-            
-            # 获取当前点赞数
-            record = self.db.query(PanRecord).filter(PanRecord.id == pan_id).first()
-            like_count = record.like_count if record else 0
-            
-            return {
-                "is_liked": False,
-                "like_count": like_count
-            }
+        if delta:
+            like_count = self.pan_service.add_interaction_count(pan_id, "like", delta)
+            if like_count is None and delta > 0:
+                self.db.rollback()
+                raise ValueError("[Service层验证] 排盘记录不存在")
+            like_count = like_count or 0
         else:
-            # 点赞
-            new_like = PanLike(
-                user_id=user_id,
-                pan_id=pan_id
-            )
-            self.db.add(new_like)
-            self.pan_service.increment_like_count(pan_id)
-            self.db.commit()
-            
-            # 获取当前点赞数
-            record = self.db.query(PanRecord).filter(PanRecord.id == pan_id).first()
-            like_count = record.like_count if record else 0
-            
-            return {
-                "is_liked": True,
-                "like_count": like_count
-            }
+            like_count = self.db.query(PanRecord.like_count).filter(PanRecord.id == pan_id).scalar() or 0
+        self.db.commit()
+        pan_feed_cache.invalidate_pans(pan_id)
+        
+        return {
+            "is_liked": is_liked,
+            "like_count": like_count
+        }
     
     def get_like_status(self, user_id: int, pan_id: int) -> bool:
         """
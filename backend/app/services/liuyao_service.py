@@ -1,12 +1,18 @@
 # backend/src/services/liuyao_service.py 2026-02-14 12:15:00
 # 功能：六爻排盘服务模块，封装六爻排盘业务逻辑和Service层验证
 
+import asyncio  # 导入asyncio模块，用于并发提交起卦分布模拟的分块任务
 import logging  # 导入Python标准日志模块，用于记录服务运行日志
-from typing import Dict, Any  # 导入类型注解工具，用于字典和任意类型定义
-from app.validators.liuyao_validator import liuyao_validator  # 导入六爻验证器实例，用于验证爻位数据
-from app.validators.calendar_validator import calendar_validator  # 导入日历验证器实例，用于验证时间参数
+import secrets  # 导入secrets模块，用于未指定种子时生成随机种子
+import time  # 导入时间模块，用于统计模拟耗时
+from typing import Dict, Any, List, Optional, Tuple, Union  # 导入类型注解工具，用于字典、任意类型、列表、可选类型、元组和联合类型定义
+from app.validators.validated_types import ValidatedCast, ValidatedDateTime  # 导入已验证起卦请求和时刻值类型，验证一次后传入Core层
 from core.liuyao_algorithm_core import LiuYaoAlgorithmCore  # 导入六爻算法核心实例，用于执行六爻排盘计算
+from core.liuyao_distribution import simulate_pattern_counts, merge_pattern_counts, summarize_pattern_counts  # 导入起卦分布模拟函数
+from app.divination.random_number_divination import RandomDrawStream  # 导入可复现随机整数块生成器，用于返回生成器名称
 from app.exceptions.business_exceptions import BusinessException  # 导入业务异常基类，用于定义六爻相关异常
+from app.utils.cpu_executor import cpu_executor  # 导入CPU密集型任务执行器实例，用于把排盘计算卸载出事件循环
+from config import settings  # 导入应用配置对象，用于读取卦象模板模式
 
 logger = logging.getLogger(__name__)  # 配置日志系统，获取当前模块的日志记录器实例
 
@@ -60,12 +66,19 @@ handle_liuyao_calculation_service_errors = handle_liuyao_service_errors(
 )
 
 
+# 执行器任务函数：在工作线程或工作进程中调用全局服务实例的方法（模块级函数，进程池模式下可被pickle）
+def _call_liuyao_service(method_name: str, args: tuple, kwargs: dict):
+    return getattr(liuyao_service, method_name)(*args, **kwargs)
+
+
 # 六爻排盘服务类，封装所有六爻排盘相关的业务逻辑
 class LiuYaoService:
     
     # 初始化六爻排盘服务类
     def __init__(self):
-        self.liuyao_algorithm_core = LiuYaoAlgorithmCore()  # 创建六爻算法核心实例，用于执行排盘计算
+        self.liuyao_algorithm_core = LiuYaoAlgorithmCore(
+            gua_template_mode=settings.LIUYAO_GUA_TEMPLATE_MODE  # 卦象模板模式，eager模式在服务实例化（应用启动）时预编译全部模板
+        )  # 创建六爻算法核心实例，用于执行排盘计算
     
     # 六爻排盘计算服务方法
     @handle_liuyao_calculation_service_errors  # 应用错误处理装饰器，自动处理异常和日志记录
@@ -77,38 +90,18 @@ class LiuYaoService:
         day: int,
         hour: int = 0,
         minute: int = 0,
-        second: int = 0
+        second: int = 0,
+        calendar_profile: str = "full"
     ) -> Dict[str, Any]:
         """使用公历日期计算六爻排盘"""
-        # 第一层验证：在Service层验证爻位数据
-        validation_result = liuyao_validator.validate_yao_data(yao_list)
-        if not validation_result["valid"]:
-            error_msg = validation_result.get("error", "爻位数据验证失败")
-            logger.warning(f"Service层验证失败: {error_msg}")
-            raise ValueError(f"[Service层验证] {error_msg}")
+        # Service层验证：依次验证爻位数据、公历时间和输出配置，得到已验证起卦请求
+        cast = self._build_cast({
+            "yao_list": yao_list, "year": year, "month": month, "day": day,
+            "hour": hour, "minute": minute, "second": second, "calendar_profile": calendar_profile
+        })
         
-        # 第二层验证：在Service层验证公历时间参数
-        time_validation_result = calendar_validator.validate_solar_input(
-            str(year), str(month), str(day), str(hour), str(minute), str(second)
-        )
-        if not time_validation_result["valid"]:
-            error_msg = time_validation_result.get('error', '公历时间验证失败')
-            logger.warning(f"Service层验证失败: {error_msg}")
-            raise ValueError(f"[Service层验证] {error_msg}")
-        
-        # 调用Core层进行六爻排盘计算（跳过Core层重复验证）
-        paipan_result = self.liuyao_algorithm_core.calculate_paipan_with_solar_calendar(
-            yao_list=yao_list,
-            year=year,
-            month=month,
-            day=day,
-            hour=hour,
-            minute=minute,
-            second=second,
-            validate=False  # Service层已验证，跳过Core层重复验证
-        )
-        
-        return paipan_result  # 返回排盘结果
+        # 调用Core层进行六爻排盘计算（已验证请求跳过Core层重复验证）
+        return self.liuyao_algorithm_core.calculate_paipan_with_cast(cast)  # 返回排盘结果
     
     # 六爻排盘计算服务方法（农历）
     @handle_liuyao_calculation_service_errors  # 应用错误处理装饰器，自动处理异常和日志记录
@@ -121,40 +114,134 @@ class LiuYaoService:
         hour: int = 0,
         minute: int = 0,
         second: int = 0,
-        is_leap_month: bool = False
+        is_leap_month: bool = False,
+        calendar_profile: str = "full"
     ) -> Dict[str, Any]:
         """使用农历日期计算六爻排盘"""
-        # 第一层验证：在Service层验证爻位数据
-        validation_result = liuyao_validator.validate_yao_data(yao_list)
-        if not validation_result["valid"]:
-            error_msg = validation_result.get("error", "爻位数据验证失败")
-            logger.warning(f"Service层验证失败: {error_msg}")
-            raise ValueError(f"[Service层验证] {error_msg}")
+        # Service层验证：依次验证爻位数据、农历时间和输出配置，得到已验证起卦请求
+        cast = self._build_cast({
+            "yao_list": yao_list, "lunar_year": lunar_year, "lunar_month": lunar_month, "lunar_day": lunar_day,
+            "hour": hour, "minute": minute, "second": second, "is_leap_month": is_leap_month, "calendar_profile": calendar_profile
+        })
+        
+        # 调用Core层进行六爻排盘计算（已验证请求跳过Core层重复验证）
+        return self.liuyao_algorithm_core.calculate_paipan_with_cast(cast)  # 返回排盘结果
+    
+    # 按已验证起卦请求计算六爻排盘（API层已完成验证，Service层和Core层不再重复验证）
+    @handle_liuyao_calculation_service_errors  # 应用错误处理装饰器，自动处理异常和日志记录
+    def calculate_liuyao_cast(self, cast: ValidatedCast) -> Dict[str, Any]:
+        return self.liuyao_algorithm_core.calculate_paipan_with_cast(cast)  # 返回排盘结果
+    
+    # 私有方法：依次验证爻位数据、时间和输出配置，创建已验证起卦请求；验证失败时抛出带Service层标识的ValueError
+    def _build_cast(self, values: Dict[str, Any]) -> ValidatedCast:
+        try:
+            return ValidatedCast.from_values(values)
+        except ValueError as e:
+            logger.warning(f"Service层验证失败: {str(e)}")
+            raise ValueError(f"[Service层验证] {str(e)}")
+    
+    # 批量六爻排盘计算服务方法
+    def calculate_liuyao_batch(self, items: List[Union[ValidatedCast, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        """
+        批量计算六爻排盘，按时刻和输出配置分组，每个不同的时间只做一次历法转换
+        
+        Args:
+            items: 排盘条目列表，每项为API层已验证的起卦请求（ValidatedCast），或包含yao_list，以及公历（year、month、day）或农历（lunar_year、lunar_month、lunar_day、is_leap_month）日期和时分秒、可选calendar_profile的字典（在Service层验证）
+            
+        Returns:
+            List[Dict]: 与输入顺序一致的结果列表，每项包含index、success，以及data（成功）或error（失败）
+        """
+        if len(items) > settings.LIUYAO_BATCH_MAX_SIZE:  # 检查批量条数上限
+            raise LiuyaoValidationException(f"[Service层验证] 批量排盘条数不能超过{settings.LIUYAO_BATCH_MAX_SIZE}条")
         
-        # 第二层验证：在Service层验证农历时间参数
-        time_validation_result = calendar_validator.validate_lunar_input(
-            str(lunar_year), str(lunar_month), str(lunar_day), str(hour), str(minute), str(second), str(is_leap_month)
-        )
-        if not time_validation_result["valid"]:
-            error_msg = time_validation_result.get('error', '农历时间验证失败')
-            logger.warning(f"Service层验证失败: {error_msg}")
-            raise ValueError(f"[Service层验证] {error_msg}")
+        results: List[Dict[str, Any]] = [None] * len(items)  # 预分配结果列表，保证输出顺序与输入一致
+        groups: Dict[Tuple[ValidatedDateTime, str], List[Tuple[int, ValidatedCast]]] = {}  # 历法分组：(时刻, 输出配置) → [(条目下标, 起卦请求)]
         
-        # 调用Core层进行六爻排盘计算（跳过Core层重复验证）
-        paipan_result = self.liuyao_algorithm_core.calculate_paipan_with_lunar_calendar(
-            yao_list=yao_list,
-            lunar_year=lunar_year,
-            lunar_month=lunar_month,
-            lunar_day=lunar_day,
-            hour=hour,
-            minute=minute,
-            second=second,
-            is_leap_month=is_leap_month,
-            validate=False  # Service层已验证，跳过Core层重复验证
-        )
+        # 逐条验证（已验证的起卦请求直接使用），并按时刻和输出配置分组
+        for index, item in enumerate(items):
+            if isinstance(item, ValidatedCast):
+                cast = item
+            else:
+                try:
+                    cast = ValidatedCast.from_values(item)
+                except ValueError as e:
+                    results[index] = {"index": index, "success": False, "error": f"[Service层验证] {str(e)}"}
+                    continue
+            groups.setdefault((cast.moment, cast.calendar_profile), []).append((index, cast))  # 加入对应历法分组
         
-        return paipan_result  # 返回排盘结果
+        # 每个历法分组转换一次
+        for group_key, members in groups.items():
+            try:
+                paipan_results = self.liuyao_algorithm_core.calculate_paipan_with_casts([cast for _, cast in members])
+            except Exception as e:  # 历法转换失败时，整个分组记为失败
+                logger.error(f"批量六爻排盘分组计算失败: {group_key}, {str(e)}")
+                for index, _ in members:
+                    results[index] = {"index": index, "success": False, "error": str(e)}
+                continue
+            
+            for (index, _), paipan_result in zip(members, paipan_results):
+                results[index] = {"index": index, "success": True, "data": paipan_result}
+        
+        success_count = sum(1 for result in results if result["success"])  # 统计成功条数
+        logger.info(f"成功计算批量六爻排盘: 共{len(items)}条，成功{success_count}条，历法分组{len(groups)}个")  # 只记录汇总信息，避免批量结果写满日志
+        return results  # 返回批量排盘结果
+    
+    # 已验证起卦请求排盘的异步版本：在CPU执行器中执行，不阻塞事件循环
+    async def calculate_liuyao_cast_async(self, cast: ValidatedCast) -> Dict[str, Any]:
+        return await cpu_executor.run(_call_liuyao_service, "calculate_liuyao_cast", (cast,), {})
+    
+    # 批量排盘的异步版本：在CPU执行器中整批执行，不阻塞事件循环
+    async def calculate_liuyao_batch_async(self, items: List[Union[ValidatedCast, Dict[str, Any]]]) -> List[Dict[str, Any]]:
+        return await cpu_executor.run(_call_liuyao_service, "calculate_liuyao_batch", (items,), {})
 
+    
+    # 模拟第chunk_index块的count次起卦，返回奇数个数组合出现次数（供CPU执行器分块调用）
+    def simulate_pattern_chunk(self, count: int, seed: int, chunk_index: int) -> List[int]:
+        return simulate_pattern_counts(count, seed, chunk_index)
+    
+    # 汇总奇数个数组合出现次数为本卦、变卦、动爻数和卦宫分布（供CPU执行器调用）
+    def summarize_pattern_counts(self, pattern_counts: List[int]) -> Dict[str, Any]:
+        return summarize_pattern_counts(pattern_counts)
+    
+    # 当前执行器模式下单次起卦分布模拟的最大次数：process模式下分块在多个进程中并行，由分块超时兜底；
+    # thread/inline模式下纯Python模拟受GIL限制不能并行，全部分块的总耗时须在执行器默认超时内完成
+    def simulation_max_count(self) -> int:
+        if cpu_executor.mode == "process" or cpu_executor.timeout <= 0:
+            return settings.LIUYAO_SIMULATION_MAX_COUNT
+        return min(settings.LIUYAO_SIMULATION_MAX_COUNT, int(settings.LIUYAO_SIMULATION_MIN_RATE * cpu_executor.timeout))
+    
+    # 一轮分块的超时时间（秒）：按保守模拟速度估算，thread/inline模式下同一轮的分块共用一个GIL，耗时按整轮次数计算；不低于执行器默认超时，执行器不限时时返回0
+    def _simulation_wave_timeout(self, wave: List[Tuple[int, int, int]]) -> float:
+        if cpu_executor.timeout <= 0:
+            return 0
+        casts = max(args[0] for args in wave) if cpu_executor.mode == "process" else sum(args[0] for args in wave)
+        return max(cpu_executor.timeout, casts / settings.LIUYAO_SIMULATION_MIN_RATE)
+    
+    # 起卦分布模拟：分块提交到CPU执行器模拟（process模式下多进程并行；每轮不超过工作者数量，避免超出排队上限），合并后汇总；未指定种子时生成随机种子
+    async def simulate_distribution_async(self, count: int, seed: Optional[int] = None) -> Dict[str, Any]:
+        max_count = self.simulation_max_count()
+        if not 1 <= count <= max_count:
+            raise ValueError(f"[Service层验证] 模拟次数范围必须是1-{max_count}（{cpu_executor.mode}模式），当前值：{count}")
+        if seed is None:
+            seed = secrets.randbelow(2 ** 53)
+        elif not 0 <= seed < 2 ** 53:
+            raise ValueError(f"[Service层验证] 随机种子范围必须是0-{2 ** 53 - 1}，当前值：{seed}")
+        
+        started = time.perf_counter()
+        chunk_size = settings.LIUYAO_SIMULATION_CHUNK_SIZE
+        chunk_args = [(min(chunk_size, count - start), seed, index) for index, start in enumerate(range(0, count, chunk_size))]
+        chunks = []
+        for wave_start in range(0, len(chunk_args), cpu_executor.max_workers):
+            wave = chunk_args[wave_start:wave_start + cpu_executor.max_workers]
+            timeout = self._simulation_wave_timeout(wave)  # 按本轮模拟次数确定超时，不沿用执行器默认的单次计算超时
+            chunks.extend(await asyncio.gather(*(
+                cpu_executor.run(_call_liuyao_service, "simulate_pattern_chunk", args, {}, timeout=timeout)
+                for args in wave
+            )))
+        summary = await cpu_executor.run(_call_liuyao_service, "summarize_pattern_counts", (merge_pattern_counts(chunks),), {})
+        elapsed = time.perf_counter() - started
+        logger.info(f"起卦分布模拟完成: {count}次，{len(chunk_args)}块，种子{seed}，耗时{elapsed:.2f}秒")
+        return {"seed": seed, "generator": RandomDrawStream(seed).generator, "chunks": len(chunk_args), "elapsed_seconds": round(elapsed, 3), **summary}
 
 # 创建全局服务实例，便于其他模块直接使用
 liuyao_service = LiuYaoService()  # 实例化LiuYaoService类，创建全局服务实例供其他模块使用
@@ -0,0 +1,144 @@
+# backend/src/services/pan_feed_cache.py 2026-10-18 20:40:00
+# 功能：公开排盘列表页缓存，按(排盘类型, 排序方式, 游标, 页码, 每页数量)缓存已序列化的JSON响应字节，按内存预算LRU淘汰，保存、审核、删除、可见性变化和点赞/收藏事件主动失效，带过期时间和命中统计
+
+import threading  # 导入线程模块，保护缓存在并发请求下的一致性
+import time  # 导入时间模块，用于计算缓存条目过期时间
+from collections import OrderedDict  # 导入有序字典，用于实现LRU淘汰
+from typing import Any, Dict, Iterable, Optional, Set, Tuple  # 导入类型注解工具
+from config import settings  # 导入应用配置对象，用于读取内存预算和过期时间
+
+# 每个条目除响应字节外的估算开销（键、集合、字典槽位），计入内存预算
+_ENTRY_OVERHEAD = 256
+
+# 页缓存键：(排盘类型, 排序方式, 游标, 页码, 每页数量)
+FeedKey = Tuple[str, str, Optional[str], int, int]
+
+
+# 公开排盘列表页缓存类：条目为 键 → (过期时间, 响应字节, 页内排盘记录ID)，另维护排盘记录ID → 键的反向索引用于按记录失效
+class PanFeedCache:
+
+    # 初始化页缓存
+    def __init__(self, max_bytes: int = 8 * 1024 * 1024, ttl_seconds: float = 30):
+        if max_bytes <= 0:  # 检查内存预算是否有效
+            raise ValueError(f"[Service层验证] 列表页缓存内存预算必须大于0，当前值：{max_bytes}")
+        self.max_bytes = max_bytes  # 内存预算（字节）
+        self.ttl_seconds = ttl_seconds  # 缓存条目存活时间（秒），小于等于0表示永不过期
+        self._entries: "OrderedDict[FeedKey, Tuple[float, bytes, Tuple[int, ...]]]" = OrderedDict()  # 缓存条目
+        self._pages_by_pan: Dict[int, Set[FeedKey]] = {}  # 反向索引：排盘记录ID → 包含该记录的页键集合
+        self._lock = threading.Lock()  # 缓存锁，只保护字典读写，查询和序列化在锁外执行
+        self.size_bytes = 0  # 当前占用字节数（含估算开销）
+        self.generation = 0  # 失效代数，每次失效加1；未命中后写入时代数已变化则放弃写入，避免写回失效前查出的旧数据
+        self.hits = 0  # 命中次数
+        self.misses = 0  # 未命中次数
+        self.evictions = 0  # 因内存预算淘汰的条目数
+        self.expirations = 0  # 因过期移除的条目数
+        self.invalidations = 0  # 因事件失效移除的条目数
+
+    # 私有方法：移除条目并维护反向索引和占用字节数（持锁调用）
+    def _remove(self, key: FeedKey) -> None:
+        _, body, pan_ids = self._entries.pop(key)
+        self.size_bytes -= len(body) + _ENTRY_OVERHEAD
+        for pan_id in pan_ids:
+            pages = self._pages_by_pan.get(pan_id)
+            if pages is not None:
+                pages.discard(key)
+                if not pages:
+                    del self._pages_by_pan[pan_id]
+
+    # 查询缓存，返回(响应字节, 失效代数)；未命中时响应字节为None，调用方写入时传回失效代数
+    def get(self, key: FeedKey) -> Tuple[Optional[bytes], int]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():  # 条目已过期
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None, self.generation
+            self._entries.move_to_end(key)  # 移动到末尾（最近使用）
+            self.hits += 1
+            return entry[1], self.generation
+
+    # 写入缓存：generation为查询时返回的失效代数，期间发生过失效则不写入；单页超过内存预算时不缓存
+    def put(self, key: FeedKey, body: bytes, pan_ids: Iterable[int], generation: int) -> bool:
+        cost = len(body) + _ENTRY_OVERHEAD
+        if cost > self.max_bytes:
+            return False
+        pan_ids = tuple(pan_ids)
+        expire_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds > 0 else float("inf")
+        with self._lock:
+            if generation != self.generation:
+                return False
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expire_at, body, pan_ids)
+            self.size_bytes += cost
+            for pan_id in pan_ids:
+                self._pages_by_pan.setdefault(pan_id, set()).add(key)
+            while self.size_bytes > self.max_bytes:  # 超过内存预算时淘汰最久未使用的条目
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+            return True
+
+    # 按排盘记录失效：移除包含这些记录的页（点赞/收藏等只改变记录内容、不改变列表成员的事件）
+    def invalidate_pans(self, *pan_ids: int) -> int:
+        with self._lock:
+            self.generation += 1
+            keys = set()
+            for pan_id in pan_ids:
+                keys.update(self._pages_by_pan.get(pan_id, ()))
+            for key in keys:
+                self._remove(key)
+            self.invalidations += len(keys)
+            return len(keys)
+
+    # 按排盘类型失效：移除该类型的全部页（保存、审核、删除、可见性变化等改变列表成员的事件）；pan_type为None时移除全部页
+    def invalidate_feed(self, pan_type: Optional[str] = None) -> int:
+        with self._lock:
+            self.generation += 1
+            keys = [key for key in self._entries if pan_type is None or key[0] == pan_type]
+            for key in keys:
+                self._remove(key)
+            self.invalidations += len(keys)
+            return len(keys)
+
+    # 清空缓存和统计计数
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._pages_by_pan.clear()
+            self.size_bytes = 0
+            self.generation += 1
+            self.hits = self.misses = self.evictions = self.expirations = self.invalidations = 0
+
+    # 获取缓存统计信息
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),  # 当前缓存页数
+                "size_bytes": self.size_bytes,  # 当前占用字节数（含估算开销）
+                "max_bytes": self.max_bytes,  # 内存预算（字节）
+                "ttl_seconds": self.ttl_seconds,  # 条目存活时间（秒）
+                "hits": self.hits,  # 命中次数
+                "misses": self.misses,  # 未命中次数
+                "evictions": self.evictions,  # 内存预算淘汰次数
+                "expirations": self.expirations,  # 过期移除次数
+                "invalidations": self.invalidations,  # 事件失效移除次数
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0  # 命中率
+            }
+
+
+# 创建全局公开排盘列表页缓存实例
+pan_feed_cache = PanFeedCache(
+    max_bytes=settings.PAN_FEED_CACHE_MAX_BYTES,  # 内存预算（字节）
+    ttl_seconds=settings.PAN_FEED_CACHE_TTL  # 缓存条目存活时间（秒），兜底浏览数和热度衰减等不触发失效的变化
+)
+
+
+# 默认导出列表，指定模块的公开接口
+__all__ = [
+    'PanFeedCache',
+    'pan_feed_cache'
+]
@@ -3,105 +3,213 @@
 * @description     排盘记录服务层，封装排盘记录相关业务逻辑
 * @author          Gordon <gordon_cao@qq.com>
 * @createTime      2026-03-05 13:15:00
-* @lastModified    2026-03-05 13:15:00
+* @lastModified    2026-10-18 21:40:00
 * Copyright © All rights reserved
 """
 
-from typing import List, Optional, Dict, Any
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from typing import List, Optional, Dict, Any, Set, Tuple
+from sqlalchemy.orm import Session, Query
+from sqlalchemy import and_, or_, tuple_, select, literal, union_all, update, case
 from app.models.pan_record import PanRecord
 from app.models.pan_like import PanLike
 from app.models.pan_collect import PanCollect
 from app.models.user import User
+from app.services.hot_score_service import hot_score_increment
+from app.services.view_counter import view_counter
+import base64
+import binascii
 import json
 
 
+# 游标分页的排序键：newest按(create_time, id)降序，hottest按(hot_score, create_time, id)降序，
+# 与索引idx_pan_record_time、idx_pan_record_hot的末尾列一致
+PAN_SORT_KEYS = {
+    "newest": (PanRecord.create_time, PanRecord.id),
+    "hottest": (PanRecord.hot_score, PanRecord.create_time, PanRecord.id),
+}
+
+
+def encode_cursor(sort: str, record: PanRecord) -> str:
+    """
+    把一页最后一条记录的排序键编码为不透明游标
+    
+    Args:
+        sort: 排序方式
+        record: 本页最后一条排盘记录
+    
+    Returns:
+        URL安全的Base64游标字符串
+    """
+    values = [sort] + [getattr(record, column.key) for column in PAN_SORT_KEYS[sort]]
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(sort: str, cursor: str) -> Tuple[int, ...]:
+    """
+    解码游标，得到上一页最后一条记录的排序键
+    
+    Args:
+        sort: 排序方式（必须与生成游标时一致）
+        cursor: 游标字符串
+    
+    Returns:
+        排序键元组（热度分为浮点数，其余为整数）
+    
+    Raises:
+        ValueError: 游标格式无效或与排序方式不匹配
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw.decode("utf-8"))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError("[Service层验证] 无效的分页游标")
+    if (not isinstance(values, list) or len(values) != len(PAN_SORT_KEYS[sort]) + 1 or values[0] != sort
+            or not all(type(value) in (int, float) for value in values[1:])):
+        raise ValueError("[Service层验证] 无效的分页游标")
+    return tuple(values[1:])
+
+
+def paginate_keyset(
+    query: Query,
+    sort: str = "newest",
+    size: int = 12,
+    cursor: Optional[str] = None,
+    offset: int = 0
+) -> Tuple[List[PanRecord], Optional[str]]:
+    """
+    按排序键游标分页：WHERE (排序键) < (游标值) ORDER BY 排序键 DESC LIMIT size+1，
+    多取一条用于判断是否还有下一页，不再随页码增大扫描并丢弃前面的行
+    
+    Args:
+        query: 已加过滤条件的PanRecord查询
+        sort: 排序方式（newest=最新，hottest=最热，其他值按最新处理）
+        size: 每页数量
+        cursor: 上一页返回的游标（为空时从第一条开始）
+        offset: 兼容旧版页码分页的偏移量（仅在没有游标时生效）
+    
+    Returns:
+        (本页记录列表, 下一页游标)，没有下一页时游标为None
+    """
+    sort = sort if sort in PAN_SORT_KEYS else "newest"
+    keys = PAN_SORT_KEYS[sort]
+    if cursor:
+        query = query.filter(tuple_(*keys) < tuple_(*decode_cursor(sort, cursor)))
+    query = query.order_by(*[key.desc() for key in keys])
+    if offset and not cursor:
+        query = query.offset(offset)
+    records = query.limit(size + 1).all()
+    if len(records) <= size:
+        return records, None
+    records = records[:size]
+    return records, encode_cursor(sort, records[-1])
+
+
 class PanService:
     """排盘记录服务类"""
     
     def __init__(self, db: Session):
         self.db = db
     
-    def get_public_pan_list(
-        self,
-        pan_type: str = "liuyao",
-        page: int = 1,
-        size: int = 12,
-        sort: str = "newest",
-        user_id: Optional[int] = None
-    ) -> List[Dict[str, Any]]:
+    @staticmethod
+    def _parse_json(value: Optional[str]) -> Any:
+        """解析JSON字符串，解析失败时原样返回"""
+        try:
+            return json.loads(value)
+        except (TypeError, ValueError):
+            return value
+    
+    def _load_users(self, records: List[PanRecord]) -> Dict[int, User]:
         """
-        获取公开排盘记录列表
+        一次IN查询批量加载排盘记录的作者
         
         Args:
-            pan_type: 排盘类型
-            page: 页码
-            size: 每页数量
-            sort: 排序方式（newest=最新，hottest=最热）
-            user_id: 当前用户ID（可选，用于查询点赞/收藏状态）
+            records: 排盘记录列表
         
         Returns:
-            排盘记录列表
+            用户ID到用户的映射
         """
-        offset = (page - 1) * size
+        author_ids = {record.user_id for record in records}
+        if not author_ids:
+            return {}
+        users = self.db.query(User).filter(User.id.in_(author_ids)).all()
+        return {user.id: user for user in users}
+    
+    def get_interactions(self, user_id: Optional[int], pan_ids: List[int]) -> Tuple[Set[int], Set[int]]:
+        """
+        一次UNION ALL查询获取当前用户点赞、收藏过的排盘记录ID，两个分支分别走
+        pan_like、pan_collect的(user_id, pan_id)唯一索引
         
-        # 构建查询条件
-        query = self.db.query(PanRecord).filter(
-            PanRecord.pan_type == pan_type,
-            PanRecord.is_public == 1,
-            PanRecord.audit_status == 1,
-            PanRecord.is_visible == 1,
-            PanRecord.deleted_at.is_(None)
+        Args:
+            user_id: 当前用户ID（为空时不查询）
+            pan_ids: 排盘记录ID列表
+        
+        Returns:
+            (点赞过的排盘记录ID集合, 收藏过的排盘记录ID集合)
+        """
+        if not user_id or not pan_ids:
+            return set(), set()
+        liked = select(literal(1).label("kind"), PanLike.pan_id).where(
+            PanLike.user_id == user_id,
+            PanLike.pan_id.in_(pan_ids)
+        )
+        collected = select(literal(2).label("kind"), PanCollect.pan_id).where(
+            PanCollect.user_id == user_id,
+            PanCollect.pan_id.in_(pan_ids)
         )
+        liked_ids, collected_ids = set(), set()
+        for kind, pan_id in self.db.execute(union_all(liked, collected)):
+            (liked_ids if kind == 1 else collected_ids).add(pan_id)
+        return liked_ids, collected_ids
+    
+    def get_interaction_bits(self, user_id: Optional[int], pan_ids: List[int]) -> Dict[str, Any]:
+        """
+        获取当前用户对一组排盘记录的点赞/收藏位图，供公开列表页（与用户无关、可缓存）叠加个人状态
         
-        # 排序
-        if sort == "hottest":
-            query = query.order_by(PanRecord.like_count.desc(), PanRecord.create_time.desc())
-        else:
-            query = query.order_by(PanRecord.create_time.desc())
+        Args:
+            user_id: 当前用户ID（为空时全部为0，不查询数据库）
+            pan_ids: 排盘记录ID列表（保持调用方顺序）
         
-        # 执行查询
-        records = query.offset(offset).limit(size).all()
+        Returns:
+            {"pan_ids": 排盘记录ID列表, "liked": 点赞位串, "collected": 收藏位串}，
+            位串第i位为"1"表示pan_ids[i]已点赞（或已收藏）
+        """
+        liked_ids, collected_ids = self.get_interactions(user_id, pan_ids)
+        return {
+            "pan_ids": pan_ids,
+            "liked": "".join("1" if pan_id in liked_ids else "0" for pan_id in pan_ids),
+            "collected": "".join("1" if pan_id in collected_ids else "0" for pan_id in pan_ids)
+        }
+    
+    def _build_pan_items(
+        self,
+        records: List[PanRecord],
+        user_id: Optional[int] = None,
+        with_interactions: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        组装排盘记录响应数据，作者和点赞/收藏状态按页批量查询，查询次数与记录数无关
+        
+        Args:
+            records: 排盘记录列表
+            user_id: 当前用户ID（可选，用于查询点赞/收藏状态）
+            with_interactions: 是否包含is_liked、is_collected字段（与用户无关的共享页不包含）
+        
+        Returns:
+            排盘记录响应数据列表
+        """
+        users = self._load_users(records)
+        if with_interactions:
+            liked_ids, collected_ids = self.get_interactions(user_id, [record.id for record in records])
         
-        # 构建响应数据
         data = []
         for record in records:
-            # 解析JSON字符串
-            try:
-                pan_params = json.loads(record.pan_params)
-            except:
-                pan_params = record.pan_params
-            
-            try:
-                pan_result = json.loads(record.pan_result)
-            except:
-                pan_result = record.pan_result
-            
-            # 获取用户信息
-            user = self.db.query(User).filter(User.id == record.user_id).first()
-            
-            # 查询点赞/收藏状态
-            is_liked = False
-            is_collected = False
-            if user_id:
-                like = self.db.query(PanLike).filter(
-                    PanLike.user_id == user_id,
-                    PanLike.pan_id == record.id
-                ).first()
-                is_liked = like is not None
-                
-                collect = self.db.query(PanCollect).filter(
-                    PanCollect.user_id == user_id,
-                    PanCollect.pan_id == record.id
-                ).first()
-                is_collected = collect is not None
-            
+            user = users.get(record.user_id)
             data.append({
                 "id": record.id,
                 "pan_type": record.pan_type,
-                "pan_params": pan_params,
-                "pan_result": pan_result,
+                "pan_params": self._parse_json(record.pan_params),
+                "pan_result": self._parse_json(record.pan_result),
                 "supplement": record.supplement,
                 "like_count": record.like_count,
                 "collect_count": record.collect_count,
@@ -112,27 +220,93 @@ class PanService:
                     "id": user.id if user else None,
                     "nickname": user.nickname if user and user.nickname else "六爻用户",
                     "avatar_url": user.avatar if user else None
-                },
-                "is_liked": is_liked,
-                "is_collected": is_collected
+                }
             })
+            if with_interactions:
+                data[-1]["is_liked"] = record.id in liked_ids
+                data[-1]["is_collected"] = record.id in collected_ids
         
         return data
     
+    def get_public_pan_page(
+        self,
+        pan_type: str = "liuyao",
+        size: int = 12,
+        sort: str = "newest",
+        user_id: Optional[int] = None,
+        cursor: Optional[str] = None,
+        page: int = 1
+    ) -> Dict[str, Any]:
+        """
+        按游标获取一页公开排盘记录
+        
+        Args:
+            pan_type: 排盘类型
+            size: 每页数量
+            sort: 排序方式（newest=最新，hottest=按时间衰减的热度分最热）
+            user_id: 当前用户ID（可选，为空时返回与用户无关的共享页，不含is_liked、is_collected）
+            cursor: 上一页返回的游标（可选）
+            page: 页码（兼容旧版分页，仅在没有游标时生效）
+        
+        Returns:
+            {"list": 排盘记录列表, "next_cursor": 下一页游标}
+        """
+        # 构建查询条件
+        query = self.db.query(PanRecord).filter(
+            PanRecord.pan_type == pan_type,
+            PanRecord.is_public == 1,
+            PanRecord.audit_status == 1,
+            PanRecord.is_visible == 1,
+            PanRecord.deleted_at.is_(None)
+        )
+        
+        # 执行查询
+        records, next_cursor = paginate_keyset(query, sort, size, cursor, (page - 1) * size)
+        
+        return {
+            "list": self._build_pan_items(records, user_id, with_interactions=user_id is not None),
+            "next_cursor": next_cursor
+        }
+    
+    def get_public_pan_list(
+        self,
+        pan_type: str = "liuyao",
+        page: int = 1,
+        size: int = 12,
+        sort: str = "newest",
+        user_id: Optional[int] = None,
+        cursor: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        获取公开排盘记录列表
+        
+        Args:
+            pan_type: 排盘类型
+            page: 页码（仅在没有游标时生效）
+            size: 每页数量
+            sort: 排序方式（newest=最新，hottest=最热）
+            user_id: 当前用户ID（可选，用于查询点赞/收藏状态）
+            cursor: 上一页返回的游标（可选）
+        
+        Returns:
+            排盘记录列表
+        """
+        return self.get_public_pan_page(pan_type, size, sort, user_id, cursor, page)["list"]
+    
     def get_pan_detail(
         self,
         record_id: int,
         user_id: Optional[int] = None
     ) -> Optional[Dict[str, Any]]:
         """
-        获取排盘记录详情
+        获取排盘记录详情（只读，浏览数在内存中累加后由后台任务批量写回）
         
         Args:
             record_id: 排盘记录ID
-            user_id: 当前用户ID（可选，用于查询点赞/收藏状态）
+            user_id: 当前用户ID（可选，用于查询点赞/收藏状态和浏览去重）
         
         Returns:
-            排盘记录详情
+            排盘记录详情，浏览数包含尚未写回的部分
         """
         # 查询排盘记录
         record = self.db.query(PanRecord).filter(
@@ -144,84 +318,31 @@ class PanService:
         if not record:
             return None
         
-        # 增加浏览数
-        record.view_count += 1
-        self.db.commit()
+        # 记录浏览（浏览热度分在写回时与浏览数一起累加）
+        view_counter.record(record.id, user_id)
         
-        # 解析JSON字符串
-        try:
-            pan_params = json.loads(record.pan_params)
-        except:
-            pan_params = record.pan_params
+        data = self._build_pan_items([record], user_id)[0]
+        data["view_count"] = (record.view_count or 0) + view_counter.pending(record.id)
+        return data
+    
+    def add_interaction_count(self, record_id: int, event: str, delta: int) -> Optional[int]:
+        """
+        在一条 UPDATE ... RETURNING 中累加点赞数（或收藏数）和热度分，计数不会减到0以下（不提交事务）
         
-        try:
-            pan_result = json.loads(record.pan_result)
-        except:
-            pan_result = record.pan_result
-        
-        # 获取用户信息
-        user = self.db.query(User).filter(User.id == record.user_id).first()
-        
-        # 查询点赞/收藏状态
-        is_liked = False
-        is_collected = False
-        if user_id:
-            like = self.db.query(PanLike).filter(
-                PanLike.user_id == user_id,
-                PanLike.pan_id == record.id
-            ).first()
-            is_liked = like is not None
-            
-            collect = self.db.query(PanCollect).filter(
-                PanCollect.user_id == user_id,
-                PanCollect.pan_id == record.id
-            ).first()
-            is_collected = collect is not None
+        Args:
+            record_id: 排盘记录ID
+            event: 事件类型（like、collect）
+            delta: 计数变化量（点赞/收藏为1，取消为-1）
         
-        return {
-            "id": record.id,
-            "pan_type": record.pan_type,
-            "pan_params": pan_params,
-            "pan_result": pan_result,
-            "supplement": record.supplement,
-            "like_count": record.like_count,
-            "collect_count": record.collect_count,
-            "comment_count": record.comment_count,
-            "view_count": record.view_count,
-            "create_time": record.create_time,
-            "user": {
-                "id": user.id if user else None,
-                "nickname": user.nickname if user and user.nickname else "六爻用户",
-                "avatar_url": user.avatar if user else None
-            },
-            "is_liked": is_liked,
-            "is_collected": is_collected
-        }
-    
-    def increment_like_count(self, record_id: int):
-        """增加点赞数"""
-        record = self.db.query(PanRecord).filter(PanRecord.id == record_id).first()
-        if record:
-            record.like_count += 1
-            self.db.commit()
-    
-    def decrement_like_count(self, record_id: int):
-        """减少点赞数"""
-        record = self.db.query(PanRecord).filter(PanRecord.id == record_id).first()
-        if record and record.like_count > 0:
-            record.like_count -= 1
-            self.db.commit()
-    
-    def increment_collect_count(self, record_id: int):
-        """增加收藏数"""
-        record = self.db.query(PanRecord).filter(PanRecord.id == record_id).first()
-        if record:
-            record.collect_count += 1
-            self.db.commit()
-    
-    def decrement_collect_count(self, record_id: int):
-        """减少收藏数"""
-        record = self.db.query(PanRecord).filter(PanRecord.id == record_id).first()
-        if record and record.collect_count > 0:
-            record.collect_count -= 1
-            self.db.commit()
+        Returns:
+            更新后的计数，排盘记录不存在时返回None
+        """
+        column = {"like": PanRecord.like_count, "collect": PanRecord.collect_count}[event]
+        count = column + delta
+        return self.db.execute(
+            update(PanRecord)
+            .where(PanRecord.id == record_id)
+            .values({column: case((count < 0, 0), else_=count), PanRecord.hot_score: hot_score_increment(event, delta)})
+            .returning(column)
+            .execution_options(synchronize_session=False)
+        ).scalar()
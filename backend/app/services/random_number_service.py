@@ -1,8 +1,16 @@
 # backend/src/services/random_number_service.py 2026-02-11 12:30:00
 # 功能：随机数生成服务模块，封装业务逻辑和错误处理
 
+import json  # 导入JSON模块，用于把批量随机结果逐行序列化为NDJSON
 import logging  # 导入Python标准日志模块，用于记录服务运行日志
-from app.divination.random_number_divination import RandomNumberDivination  # 导入随机数起卦法核心算法类
+import secrets  # 导入secrets模块，用于未指定种子时生成随机种子
+from datetime import datetime  # 导入datetime模块，用于未指定起卦时间时取当前时间
+from typing import Any, Dict, List, Optional  # 导入类型注解工具
+from app.divination.random_number_divination import RandomNumberDivination, RandomDrawStream, BULK_DRAW_KINDS  # 导入随机数起卦法核心算法类、可复现随机整数块生成器和批量抽取类型
+from app.services.liuyao_service import liuyao_service  # 导入六爻排盘服务实例，用于随机起卦后直接排盘
+from app.validators.validated_types import ValidatedCast, ValidatedDateTime  # 导入已验证的起卦请求和时刻类型
+from app.utils.cpu_executor import cpu_executor, CpuExecutorError  # 导入CPU密集型任务执行器实例和拒绝任务异常，用于把批量生成卸载出事件循环
+from config import settings  # 导入应用配置对象，用于读取批量抽取个数上限
 from data.sixty_jiazi_data import SIXTY_JIAZI  # 导入六十甲子静态数据，包含60个干支组合
 from app.models.dto_models import RandomDigitDTO, RandomThreeDigitsDTO, RandomJiaziDTO  # 导入数据传输对象模型，用于标准化API响应格式
 # 导入服务层错误处理装饰器，提供统一的异常处理机制
@@ -17,6 +25,15 @@ logger = logging.getLogger(__name__)  # 使用模块名作为日志记录器名
 
 # 时间戳将在API层统一处理，服务层专注于业务逻辑和数据转换
 
+_BULK_CHUNK_SIZE = 10000  # 批量抽取每块的个数（每块独立播种，JSON和NDJSON按相同的块生成，同一种子结果一致）
+_BULK_SEED_MAX = 2 ** 53 - 1  # 种子上限（JSON数字在JavaScript中可精确表示的最大整数）
+
+
+# 执行器任务函数：在工作线程或工作进程中调用全局服务实例的方法（模块级函数，进程池模式下可被pickle）
+def _call_random_number_service(method_name: str, kwargs: dict):
+    return getattr(random_number_service, method_name)(**kwargs)
+
+
 # 随机数生成服务类，封装所有（三种）随机数生成相关的业务逻辑
 class RandomNumberService:
     
@@ -56,6 +73,75 @@ class RandomNumberService:
             total_count=len(SIXTY_JIAZI)  # 干支总数，固定为60
         )
 
+    
+    # 随机生成六个爻位的三个随机数字（从初爻到上爻），返回六个三个随机数字DTO对象
+    def draw_six_yao(self) -> List[RandomThreeDigitsDTO]:
+        return [self.get_random_three_digits() for _ in range(6)]  # 每个爻位调用一次三个随机数字服务方法
+    
+    # 随机起卦并排盘：服务端生成六个爻位，与起卦时刻（未提供时为当前时间）组成已验证的起卦请求，在CPU执行器中排盘
+    async def cast_liuyao_async(self, moment: Optional[ValidatedDateTime] = None, calendar_profile: str = "full") -> Dict[str, Any]:
+        if moment is None:  # 未指定起卦时间时取服务器当前时间
+            now = datetime.now()
+            moment = ValidatedDateTime.solar(now.year, now.month, now.day, now.hour, now.minute, now.second)
+        draws = self.draw_six_yao()  # 步骤1：生成六个爻位的随机数字
+        cast = ValidatedCast.create([draw.three_digits for draw in draws], moment, calendar_profile)  # 步骤2：组成起卦请求
+        paipan = await liuyao_service.calculate_liuyao_cast_async(cast)  # 步骤3：在CPU执行器中排盘
+        
+        # 返回随机数字和排盘结果，一次请求代替六次随机数字请求和一次排盘请求
+        return {
+            "draws": [draw.model_dump() for draw in draws],  # 六个爻位的随机数字（从初爻到上爻）
+            "numbers": list(cast.numbers),  # 起卦数列，可直接用于/liuyao/assemble-liuya复现排盘
+            "paipan": paipan  # 六爻排盘结果
+        }
+    
+    # 验证批量抽取参数，未指定种子时生成随机种子（返回给调用方，可用于复现）；返回(类型, 个数, 种子)
+    def resolve_bulk_params(self, kind: str, count: int, seed: Optional[int] = None, stream: bool = False):
+        if kind not in BULK_DRAW_KINDS:
+            raise ValueError(f"[Service层验证] 批量抽取类型必须是{list(BULK_DRAW_KINDS)}中的一个，当前值：{kind}")
+        max_count = settings.RANDOM_BULK_STREAM_MAX_COUNT if stream else settings.RANDOM_BULK_MAX_COUNT
+        if not 1 <= count <= max_count:
+            raise ValueError(f"[Service层验证] 批量抽取个数范围必须是1-{max_count}，当前值：{count}" + ("" if stream else "，更多个数请使用NDJSON流式输出"))
+        if seed is None:
+            seed = secrets.randbelow(_BULK_SEED_MAX + 1)
+        elif not 0 <= seed <= _BULK_SEED_MAX:
+            raise ValueError(f"[Service层验证] 随机种子范围必须是0-{_BULK_SEED_MAX}，当前值：{seed}")
+        return kind, count, seed
+    
+    # 生成第chunk_index块的批量随机结果（供CPU执行器分块调用）
+    def get_bulk_chunk(self, kind: str, count: int, seed: int, chunk_index: int) -> List[Any]:
+        return RandomNumberDivination.generate_bulk_draws(RandomDrawStream(seed), kind, count, chunk_index)
+    
+    # 批量随机抽取服务方法：按块生成count个结果，返回类型、个数、种子、生成器和结果列表
+    def get_bulk_draws(self, kind: str, count: int, seed: Optional[int] = None) -> Dict[str, Any]:
+        kind, count, seed = self.resolve_bulk_params(kind, count, seed)
+        stream = RandomDrawStream(seed)
+        draws: List[Any] = []
+        for chunk_index, chunk_start in enumerate(range(0, count, _BULK_CHUNK_SIZE)):
+            draws.extend(RandomNumberDivination.generate_bulk_draws(stream, kind, min(_BULK_CHUNK_SIZE, count - chunk_start), chunk_index))
+        logger.info(f"成功批量随机抽取: 类型{kind}，{count}个，种子{seed}，生成器{stream.generator}")
+        return {
+            "kind": kind,  # 抽取类型
+            "count": count,  # 个数
+            "seed": seed,  # 随机种子（相同种子和生成器可复现相同结果）
+            "generator": stream.generator,  # 随机数生成器：numpy或python
+            "draws": draws  # 抽取结果列表
+        }
+    
+    # 批量随机抽取的异步版本：在CPU执行器中执行，不阻塞事件循环
+    async def get_bulk_draws_async(self, **kwargs) -> Dict[str, Any]:
+        return await cpu_executor.run(_call_random_number_service, "get_bulk_draws", kwargs)
+    
+    # 批量随机抽取的NDJSON流式输出：参数须已经resolve_bulk_params验证；按块在CPU执行器中生成，每个结果一行JSON；执行器繁忙或超时时输出一行error后结束
+    async def iter_bulk_draws_ndjson(self, kind: str, count: int, seed: int):
+        for chunk_index, chunk_start in enumerate(range(0, count, _BULK_CHUNK_SIZE)):
+            kwargs = {"kind": kind, "count": min(_BULK_CHUNK_SIZE, count - chunk_start), "seed": seed, "chunk_index": chunk_index}
+            try:
+                draws = await cpu_executor.run(_call_random_number_service, "get_bulk_chunk", kwargs)
+            except CpuExecutorError as e:
+                logger.warning(f"批量随机抽取流式输出中断: {str(e)}")
+                yield (json.dumps({"error": str(e)}, ensure_ascii=False) + "\n").encode("utf-8")
+                return
+            yield "".join(json.dumps(draw, ensure_ascii=False) + "\n" for draw in draws).encode("utf-8")
 
 random_number_service = RandomNumberService()  # 创建服务实例，采用单例模式提供全局服务访问（实例化服务类，供API层调用）
 
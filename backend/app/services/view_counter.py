@@ -0,0 +1,176 @@
+"""
+* @file            backend/app/services/view_counter.py
+* @description     排盘记录浏览数写回缓冲，详情读取只在内存中累加浏览数，后台任务定期把累计增量批量写回数据库
+* @author          Gordon <gordon_cao@qq.com>
+* @createTime      2026-10-18 21:20:00
+* @lastModified    2026-10-18 21:20:00
+* Copyright © All rights reserved
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Hashable, Optional, Tuple
+from sqlalchemy import bindparam, update
+from sqlalchemy.orm import Session
+from app.db.database import SessionLocal
+from app.models.pan_record import PanRecord
+from app.services.hot_score_service import HOT_SCORE_WEIGHTS
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ViewCounter:
+    """排盘记录浏览数写回缓冲类
+
+    详情读取调用record()在内存中累加浏览数，不开启写事务；flush()把累计增量一次性写回：
+    UPDATE pan_record SET view_count = view_count + ?, hot_score = hot_score + ? WHERE id = ?（executemany），
+    多个进程各自累加、各自写回，增量更新互不覆盖。进程异常退出时最多丢失一个写回间隔内的浏览数。
+    """
+
+    def __init__(self, dedup_seconds: float = 0, max_dedup_entries: int = 100000):
+        """
+        Args:
+            dedup_seconds: 同一登录用户重复浏览同一记录的去重窗口（秒），0表示不去重
+            max_dedup_entries: 去重记录的最大条数，超过时丢弃最早的记录
+        """
+        self.dedup_seconds = dedup_seconds
+        self.max_dedup_entries = max_dedup_entries
+        self._pending: Dict[int, int] = {}  # 排盘记录ID → 尚未写回的浏览数
+        self._seen: "OrderedDict[Tuple[Hashable, int], float]" = OrderedDict()  # (用户, 排盘记录ID) → 最近计数时间，按时间先后排列
+        self._lock = threading.Lock()
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, pan_id: int, viewer: Optional[Hashable] = None) -> bool:
+        """
+        记录一次浏览（只修改内存）
+
+        Args:
+            pan_id: 排盘记录ID
+            viewer: 浏览者标识（可选，通常为登录用户ID；为空时不去重）
+
+        Returns:
+            是否计入浏览数（去重窗口内的重复浏览返回False）
+        """
+        with self._lock:
+            if viewer is not None and self.dedup_seconds > 0:
+                now = time.monotonic()
+                self._prune_seen(now)
+                key = (viewer, pan_id)
+                if key in self._seen:
+                    return False
+                self._seen[key] = now
+                if len(self._seen) > self.max_dedup_entries:
+                    self._seen.popitem(last=False)
+            self._pending[pan_id] = self._pending.get(pan_id, 0) + 1
+            return True
+
+    def _prune_seen(self, now: float):
+        """移除已超出去重窗口的记录（持锁调用）"""
+        while self._seen:
+            key, seen_at = next(iter(self._seen.items()))
+            if now - seen_at < self.dedup_seconds:
+                break
+            del self._seen[key]
+
+    def pending(self, pan_id: int) -> int:
+        """
+        获取尚未写回的浏览数，详情接口返回 数据库浏览数 + 未写回浏览数
+
+        Args:
+            pan_id: 排盘记录ID
+
+        Returns:
+            尚未写回的浏览数
+        """
+        with self._lock:
+            return self._pending.get(pan_id, 0)
+
+    def flush(self, db: Optional[Session] = None) -> int:
+        """
+        把累计的浏览数增量批量写回数据库，写回失败时增量放回缓冲，下次继续写回
+
+        Args:
+            db: 数据库会话（可选，默认使用独立会话）
+
+        Returns:
+            写回的记录数
+        """
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+
+        session = db if db is not None else SessionLocal()
+        try:
+            table = PanRecord.__table__
+            session.connection().execute(
+                update(table)
+                .where(table.c.id == bindparam("pan_id"))
+                .values(
+                    view_count=table.c.view_count + bindparam("views"),
+                    hot_score=table.c.hot_score + bindparam("score")
+                ),
+                [
+                    {"pan_id": pan_id, "views": views, "score": HOT_SCORE_WEIGHTS["view"] * views}
+                    for pan_id, views in pending.items()
+                ]
+            )
+            session.commit()
+        except Exception:
+            session.rollback()
+            with self._lock:
+                for pan_id, views in pending.items():
+                    self._pending[pan_id] = self._pending.get(pan_id, 0) + views
+            raise
+        finally:
+            if db is None:
+                session.close()
+        return len(pending)
+
+    def clear(self):
+        """丢弃未写回的浏览数和去重记录"""
+        with self._lock:
+            self._pending.clear()
+            self._seen.clear()
+
+    async def _run(self, interval: float):
+        """每隔interval秒写回一次，单次失败只记录日志"""
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.flush)
+            except Exception as e:
+                logger.error(f"浏览数写回失败: {e}")
+
+    def start(self, interval: Optional[float] = None):
+        """
+        启动后台写回任务（必须在事件循环中调用）
+
+        Args:
+            interval: 写回间隔秒数（可选，默认取配置；0表示不启动，只在关闭时写回）
+        """
+        interval = settings.VIEW_COUNT_FLUSH_INTERVAL if interval is None else interval
+        if interval > 0 and self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self._run(interval))
+
+    async def stop(self):
+        """停止后台写回任务，并写回剩余的浏览数"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        try:
+            await asyncio.to_thread(self.flush)
+        except Exception as e:
+            logger.error(f"关闭时浏览数写回失败: {e}")
+
+
+# 创建全局浏览数写回缓冲实例
+view_counter = ViewCounter(dedup_seconds=settings.VIEW_COUNT_DEDUP_SECONDS)
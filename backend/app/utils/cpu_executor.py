@@ -0,0 +1,171 @@
+# backend/src/utils/cpu_executor.py 2026-10-18 16:20:00
+# 功能：CPU密集型任务执行器，把历法转换和六爻排盘从事件循环卸载到线程池或进程池，限制排队深度并为每次调用设置超时
+
+import asyncio  # 导入asyncio模块，用于在事件循环中等待执行器结果
+import logging  # 导入Python标准日志模块，用于记录执行器运行日志
+import os  # 导入os模块，用于读取CPU核数
+import threading  # 导入threading模块，用于保护排队计数
+from concurrent.futures import Executor, ThreadPoolExecutor, ProcessPoolExecutor  # 导入线程池和进程池执行器
+from typing import Any, Callable, Dict, Optional  # 导入类型注解工具
+from config import settings  # 导入应用配置对象，用于读取执行器模式、工作者数量、排队上限和超时
+
+logger = logging.getLogger(__name__)  # 配置日志系统，获取当前模块的日志记录器实例
+
+# 支持的执行器模式：inline（在事件循环中直接执行，用于调试和测试）、thread（线程池）、process（进程池）
+CPU_EXECUTOR_MODES = ("inline", "thread", "process")
+
+
+# 执行器拒绝任务异常基类，status_code为API层返回的HTTP状态码
+class CpuExecutorError(Exception):
+    """执行器拒绝任务异常"""
+
+    status_code = 503
+
+
+# 执行器繁忙异常：排队任务数达到上限
+class CpuExecutorBusyError(CpuExecutorError):
+    """执行器繁忙异常"""
+
+    status_code = 503
+
+
+# 执行器超时异常：任务在超时时间内没有完成
+class CpuExecutorTimeoutError(CpuExecutorError):
+    """执行器超时异常"""
+
+    status_code = 504
+
+
+# 工作者预热函数：导入并初始化排盘核心、历法表和节气索引，使第一个请求不承担冷启动开销
+def warm_up_worker() -> None:
+    try:
+        from app.services.liuyao_service import liuyao_service  # 导入六爻服务（eager模式下预编译全部卦象模板）
+        from core.calendar_algorithm_core import calendar_algorithm_core  # 导入历法算法核心实例（加载逐日历法表和节气索引）
+        calendar_algorithm_core.convert_solar_to_lunar(2000, 1, 1, 12, 0, 0)  # 执行一次完整转换，预热lunar-python内部缓存
+        logger.debug(f"执行器工作者预热完成: pid={os.getpid()}, service={type(liuyao_service).__name__}")
+    except Exception as e:  # 预热失败不影响工作者处理请求
+        logger.warning(f"执行器工作者预热失败: {str(e)}")
+
+
+# CPU密集型任务执行器，封装线程池/进程池、排队上限和调用超时
+class CpuExecutor:
+
+    # 初始化执行器；max_workers为空时按CPU核数，max_pending为空时为工作者数量的4倍
+    def __init__(self, mode: str = "thread", max_workers: Optional[int] = None,
+                 max_pending: Optional[int] = None, timeout: float = 10.0):
+        if mode not in CPU_EXECUTOR_MODES:
+            raise ValueError(f"执行器模式必须是{'、'.join(CPU_EXECUTOR_MODES)}之一，当前为{mode}")
+        self.mode = mode  # 执行器模式
+        self.max_workers = max_workers or os.cpu_count() or 1  # 工作者数量
+        self.max_pending = max_pending or self.max_workers * 4  # 最大在途任务数（执行中 + 排队中）
+        self.timeout = timeout  # 默认调用超时（秒），0表示不限时
+        self._executor: Optional[Executor] = None  # 底层线程池或进程池，start()时创建
+        self._lock = threading.Lock()  # 保护在途计数和统计数据
+        self._pending = 0  # 当前在途任务数
+        self._completed = 0  # 完成任务数
+        self._rejected = 0  # 因繁忙被拒绝的任务数
+        self._timeouts = 0  # 超时任务数
+
+    # 创建底层执行器并预热工作者；重复调用无副作用
+    def start(self) -> None:
+        with self._lock:
+            if self._executor is not None or self.mode == "inline":
+                return
+            if self.mode == "process":
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers,
+                    initializer=warm_up_worker  # 每个工作进程启动时预热
+                )
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="cpu-executor"
+                )
+        if self.mode == "process":
+            # 进程池按需启动工作进程，提交空任务使全部工作进程在第一个请求之前启动并完成预热
+            for future in [self._executor.submit(os.getpid) for _ in range(self.max_workers)]:
+                future.result()
+        else:
+            warm_up_worker()  # 线程共享进程内的模块和缓存，预热一次即可
+        logger.info(f"CPU执行器已启动: mode={self.mode}, workers={self.max_workers}, max_pending={self.max_pending}")
+
+    # 关闭底层执行器
+    def shutdown(self, wait: bool = True) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+            logger.info("CPU执行器已关闭")
+
+    # 任务结束回调：释放在途名额（任务真正结束时才释放，超时放弃等待的任务仍占用名额直到执行完）
+    def _release(self, future) -> None:
+        with self._lock:
+            self._pending -= 1
+            if not future.cancelled():
+                self._completed += 1
+
+    # 在执行器中运行函数并等待结果；进程模式下func和参数必须可被pickle（模块级函数和基本类型）
+    async def run(self, func: Callable[..., Any], *args: Any, timeout: Optional[float] = None, **kwargs: Any) -> Any:
+        if self.mode == "inline":
+            return func(*args, **kwargs)  # 直接执行，不卸载
+        if self._executor is None:
+            self.start()  # 未经应用生命周期启动时（如脚本、测试）按需启动
+
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self._rejected += 1
+                raise CpuExecutorBusyError(f"服务繁忙，排队任务数已达上限{self.max_pending}，请稍后重试")
+            self._pending += 1
+
+        try:
+            future = self._executor.submit(func, *args, **kwargs)
+        except Exception:  # 提交失败（如执行器已关闭）时归还名额
+            with self._lock:
+                self._pending -= 1
+            raise
+        future.add_done_callback(self._release)
+
+        timeout = self.timeout if timeout is None else timeout
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout or None)
+        except asyncio.TimeoutError:
+            future.cancel()  # 仍在排队的任务直接取消；已开始执行的任务无法中断，结束后释放名额
+            with self._lock:
+                self._timeouts += 1
+            raise CpuExecutorTimeoutError(f"计算超时，{timeout}秒内未完成")
+
+    # 获取执行器统计信息
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "mode": self.mode,  # 执行器模式
+                "started": self._executor is not None or self.mode == "inline",  # 是否已启动
+                "max_workers": self.max_workers,  # 工作者数量
+                "max_pending": self.max_pending,  # 最大在途任务数
+                "timeout": self.timeout,  # 默认调用超时（秒）
+                "pending": self._pending,  # 当前在途任务数
+                "completed": self._completed,  # 完成任务数
+                "rejected": self._rejected,  # 因繁忙被拒绝的任务数
+                "timeouts": self._timeouts,  # 超时任务数
+            }
+
+
+# 创建全局执行器实例，由应用生命周期负责启动和关闭
+cpu_executor = CpuExecutor(
+    mode=settings.CPU_EXECUTOR_MODE,
+    max_workers=settings.CPU_EXECUTOR_WORKERS,
+    max_pending=settings.CPU_EXECUTOR_MAX_PENDING,
+    timeout=settings.CPU_EXECUTOR_TIMEOUT
+)
+
+
+# 默认导出列表，指定模块的公开接口
+__all__ = [
+    'CPU_EXECUTOR_MODES',
+    'CpuExecutorError',
+    'CpuExecutorBusyError',
+    'CpuExecutorTimeoutError',
+    'CpuExecutor',
+    'warm_up_worker',
+    'cpu_executor'
+]
@@ -3,6 +3,8 @@
 
 from typing import Any, Dict, Optional  # 导入类型注解工具，用于任意类型、字典和可选类型定义
 from datetime import datetime  # 导入日期时间模块，用于生成时间戳
+import json  # 导入json模块，用于JSON序列化
+from fastapi.responses import JSONResponse  # 导入JSONResponse类，用于自定义JSON响应
 
 # 定义标准化响应格式类
 class StandardizedResponse:
@@ -110,4 +112,18 @@ def create_success_response(data: Any = None, message: Optional[str] = None) ->
 
 # 定义向后兼容的错误响应函数
 def create_error_response(error_code: int, error_message: str, data: Optional[Any] = None) -> Dict[str, Any]:
-    return ResponseFormatter.create_error_response(error_code, error_message, data)  # 调用ResponseFormatter类的静态方法
\ No newline at end of file
+    return ResponseFormatter.create_error_response(error_code, error_message, data)  # 调用ResponseFormatter类的静态方法
+
+
+# 创建自定义JSON响应类，继承自FastAPI的JSONResponse类（应用默认响应类；接口直接返回该类实例时可跳过jsonable_encoder逐字段转换）
+class UTF8JSONResponse(JSONResponse):
+    # 重写render方法，自定义JSON响应的渲染逻辑
+    def render(self, content: Any) -> bytes:
+        # 使用json.dumps序列化内容，确保UTF-8编码正确
+        return json.dumps(
+            content,  # 要序列化的内容
+            ensure_ascii=False,  # 确保中文字符不被转义，保持原样输出
+            allow_nan=False,  # 不允许NaN值，避免JSON格式错误
+            indent=None,  # 不缩进，压缩JSON输出
+            separators=(",", ":"),  # 使用紧凑的分隔符，减少JSON文件大小
+        ).encode("utf-8")  # 将JSON字符串编码为UTF-8字节
@@ -1,7 +1,7 @@
 # backend/src/validators/calendar_validator.py 2026-02-12 15:30:00
 # 功能：统一的历法验证器，专门验证公历时间参数的有效性和合法性
 
-from typing import Dict  # 导入字典类型注解
+from typing import Dict, Optional  # 导入字典类型和可选类型注解
 from lunar_python.util import SolarUtil, LunarUtil  # 导入lunar-python库的SolarUtil类，用于获取月份天数
 from lunar_python import LunarYear, LunarMonth  # 导入lunar-python库的LunarYear类和LunarMonth类，用于获取农历年天数和月天数
 
@@ -28,112 +28,64 @@ class CalendarValidator:
             self._lunar_month_cache[cache_key] = LunarMonth.fromYm(lunar_year, lunar_month)
         return self._lunar_month_cache[cache_key]
 
-    # 公开方法：验证公历时间参数
-    def validate_solar_input(self, year, month, day, hour, minute, second) -> Dict:
+    # 公开方法：按整数验证公历时间取值范围，返回错误信息，验证通过时返回None（不做字符串转换，供已完成类型转换的调用方使用）
+    def check_solar_values(self, year: int, month: int, day: int, hour: int, minute: int, second: int) -> Optional[str]:
         
-        # ====== 步骤1：验证参数类型和正负性 ======
-        try:
-            # 1.1 验证所有参数是否为字符串
-            if not all(isinstance(x, str) for x in [year, month, day, hour, minute, second]):
-                return {"valid": False, "error": "年、月、日、时、分、秒必须是字符串类型"}
-            
-            # 1.2 转换为整数
-            year = int(year)
-            month = int(month)
-            day = int(day)
-            hour = int(hour)
-            minute = int(minute)
-            second = int(second)
-            
-            # 1.3 验证转换后是否为非负数
-            if any(x < 0 for x in [year, month, day, hour, minute, second]):
-                return {"valid": False, "error": "年、月、日、时、分、秒转换后不能为负数"}
-            
-        # 捕获字符串转整数时可能出现的值错误或类型错误
-        except (ValueError, TypeError) as e:            
-            return {"valid": False, "error": f"参数类型转换失败：{str(e)}"}
+        # ====== 步骤1：验证正负性 ======
+        if any(x < 0 for x in [year, month, day, hour, minute, second]):
+            return "年、月、日、时、分、秒转换后不能为负数"
         
         # ====== 步骤2：验证年、月范围 ======
         # 2.1 验证年份范围 1-9999
         if not (1 <= year <= 9999):
-            return {"valid": False, "error": f"年份范围必须是1-9999，当前值：{year}"}
+            return f"年份范围必须是1-9999，当前值：{year}"
         
         # 2.2 验证月份范围 1-12
         if not (1 <= month <= 12):
-            return {"valid": False, "error": f"月份范围必须是1-12，当前值：{month}"}
+            return f"月份范围必须是1-12，当前值：{month}"
         
         # ====== 步骤3：验证日值范围 ======
         try:
             # 3.1 使用SolarUtil.getDaysOfMonth获取当月总天数
             days_of_month = SolarUtil.getDaysOfMonth(year, month)
             
-            # 3.2 验证日值是否小于等于当月总天数
+            # 3.2 验证日值是否大于等于1且小于等于当月总天数
+            if day < 1:
+                return f"日期必须大于等于1，当前值：{day}"
             if day > days_of_month:
-                return {"valid": False, "error": f"{year}年{month}月只有{days_of_month}天，当前值：{day}"}
+                return f"{year}年{month}月只有{days_of_month}天，当前值：{day}"
                 
         except Exception as e:
-            return {"valid": False, "error": f"获取当月总天数失败：{str(e)}"}
+            return f"获取当月总天数失败：{str(e)}"
         
         # ====== 步骤4：验证小时范围 ======
         if not (0 <= hour <= 23):
-            return {"valid": False, "error": f"小时范围必须是0-23，当前值：{hour}"}
+            return f"小时范围必须是0-23，当前值：{hour}"
         
         # ====== 步骤5：验证分钟和秒数范围 ======
         if not (0 <= minute <= 59):
-            return {"valid": False, "error": f"分钟范围必须是0-59，当前值：{minute}"}
+            return f"分钟范围必须是0-59，当前值：{minute}"
         
         if not (0 <= second <= 59):
-            return {"valid": False, "error": f"秒数范围必须是0-59，当前值：{second}"}
+            return f"秒数范围必须是0-59，当前值：{second}"
         
-        # ====== 步骤6：验证完成 ======
-        return {"valid": True, "message": "公历时间验证通过"}
+        return None
 
-    # 公开方法：验证农历时间参数
-    def validate_lunar_input(self, lunar_year, lunar_month, lunar_day, hour, minute, second, is_leap_month) -> Dict:
+    # 公开方法：按整数验证农历时间取值范围，返回错误信息，验证通过时返回None（不做字符串转换，供已完成类型转换的调用方使用）
+    def check_lunar_values(self, lunar_year: int, lunar_month: int, lunar_day: int, hour: int, minute: int, second: int, is_leap_month: bool) -> Optional[str]:
         
-        # ====== 步骤1：验证参数类型和正负性 ======
-        try:
-            # 1.1 验证年、月、日、时、分、秒是否为字符串
-            if not all(isinstance(x, str) for x in [lunar_year, lunar_month, lunar_day, hour, minute, second]):
-                return {"valid": False, "error": "年、月、日、时、分、秒必须是字符串类型"}
-            
-            # 1.2 验证is_leap_month是否为字符串
-            if not isinstance(is_leap_month, str):
-                return {"valid": False, "error": "is_leap_month必须是字符串类型"}
-            
-            # 1.3 转换年、月、日、时、分、秒为整数
-            lunar_year = int(lunar_year)
-            lunar_month = int(lunar_month)
-            lunar_day = int(lunar_day)
-            hour = int(hour)
-            minute = int(minute)
-            second = int(second)
-            
-            # 1.4 验证转换后是否为非负数
-            if any(x < 0 for x in [lunar_year, lunar_month, lunar_day, hour, minute, second]):
-                return {"valid": False, "error": "年、月、日、时、分、秒转换后不能为负数"}
-            
-            # 1.5 转换is_leap_month为布尔值
-            is_leap_month_lower = is_leap_month.lower()
-            if is_leap_month_lower == "true":
-                is_leap_month = True
-            elif is_leap_month_lower == "false":
-                is_leap_month = False
-            else:
-                return {"valid": False, "error": "is_leap_month必须是字符串'true'或'false'"}
-            
-        # 捕获字符串转整数时可能出现的值错误或类型错误
-        except (ValueError, TypeError) as e:            
-            return {"valid": False, "error": f"参数类型转换失败：{str(e)}"}
+        # ====== 步骤1：验证正负性 ======
+        if any(x < 0 for x in [lunar_year, lunar_month, lunar_day, hour, minute, second]):
+            return "年、月、日、时、分、秒转换后不能为负数"
         
         # ====== 步骤2：验证年、月范围 ======
         # 2.1 验证年份范围 1-9999
         if not (1 <= lunar_year <= 9999):
-            return {"valid": False, "error": f"年份范围必须是1-9999，当前值：{lunar_year}"}
+            return f"年份范围必须是1-9999，当前值：{lunar_year}"
         
         # 2.2 验证月份范围 1-12
         if not (1 <= lunar_month <= 12):
-            return {"valid": False, "error": f"月份范围必须是1-12，当前值：{lunar_month}"}
+            return f"月份范围必须是1-12，当前值：{lunar_month}"
         
         # ====== 步骤3：验证闰月 ======
         # 3.1 如果is_leap_month为true，验证当年是否有该闰月
@@ -144,35 +96,107 @@ class CalendarValidator:
             
             # 3.3 验证当年闰月月份是否等于传参的月值
             if leap_month == 0:
-                return {"valid": False, "error": f"{lunar_year}年没有闰月"}
+                return f"{lunar_year}年没有闰月"
             elif leap_month != lunar_month:
-                return {"valid": False, "error": f"{lunar_year}年的闰月是{leap_month}月，当前值：{lunar_month}月"}
+                return f"{lunar_year}年的闰月是{leap_month}月，当前值：{lunar_month}月"
         
         # ====== 步骤4：验证日值范围 ======
         try:
-            # 4.1 使用缓存获取LunarMonth对象
-            lunar_month_obj = self._get_lunar_month_obj(lunar_year, lunar_month)
+            # 4.1 使用缓存获取LunarMonth对象（闰月按lunar-python约定用负数获取，闰月天数可能与同数字的正常月不同）
+            lunar_month_obj = self._get_lunar_month_obj(lunar_year, -lunar_month if is_leap_month else lunar_month)
             
             # 4.2 使用getDayCount获取当月总天数
             days_of_month = lunar_month_obj.getDayCount()
             
-            # 4.3 验证日值是否小于等于当月总天数
+            # 4.3 验证日值是否大于等于1且小于等于当月总天数
+            if lunar_day < 1:
+                return f"日期必须大于等于1，当前值：{lunar_day}"
             if lunar_day > days_of_month:
-                return {"valid": False, "error": f"{lunar_year}年{lunar_month}月只有{days_of_month}天，当前值：{lunar_day}"}
+                return f"{lunar_year}年{lunar_month}月只有{days_of_month}天，当前值：{lunar_day}"
                 
         except Exception as e:
-            return {"valid": False, "error": f"获取农历当月总天数失败：{str(e)}"}
+            return f"获取农历当月总天数失败：{str(e)}"
         
         # ====== 步骤5：验证小时范围 ======
         if not (0 <= hour <= 23):
-            return {"valid": False, "error": f"小时范围必须是0-23，当前值：{hour}"}
+            return f"小时范围必须是0-23，当前值：{hour}"
         
         # ====== 步骤6：验证分钟和秒数范围 ======
         if not (0 <= minute <= 59):
-            return {"valid": False, "error": f"分钟范围必须是0-59，当前值：{minute}"}
+            return f"分钟范围必须是0-59，当前值：{minute}"
         
         if not (0 <= second <= 59):
-            return {"valid": False, "error": f"秒数范围必须是0-59，当前值：{second}"}
+            return f"秒数范围必须是0-59，当前值：{second}"
+        
+        return None
+
+    # 公开方法：验证公历时间参数
+    def validate_solar_input(self, year, month, day, hour, minute, second) -> Dict:
+        
+        # ====== 步骤1：验证参数类型和正负性 ======
+        try:
+            # 1.1 验证所有参数是否为字符串
+            if not all(isinstance(x, str) for x in [year, month, day, hour, minute, second]):
+                return {"valid": False, "error": "年、月、日、时、分、秒必须是字符串类型"}
+            
+            # 1.2 转换为整数
+            year = int(year)
+            month = int(month)
+            day = int(day)
+            hour = int(hour)
+            minute = int(minute)
+            second = int(second)
+            
+        # 捕获字符串转整数时可能出现的值错误或类型错误
+        except (ValueError, TypeError) as e:            
+            return {"valid": False, "error": f"参数类型转换失败：{str(e)}"}
+        
+        # ====== 步骤2~5：按整数验证取值范围 ======
+        error = self.check_solar_values(year, month, day, hour, minute, second)
+        if error:
+            return {"valid": False, "error": error}
+        
+        # ====== 步骤6：验证完成 ======
+        return {"valid": True, "message": "公历时间验证通过"}
+
+    # 公开方法：验证农历时间参数
+    def validate_lunar_input(self, lunar_year, lunar_month, lunar_day, hour, minute, second, is_leap_month) -> Dict:
+        
+        # ====== 步骤1：验证参数类型和正负性 ======
+        try:
+            # 1.1 验证年、月、日、时、分、秒是否为字符串
+            if not all(isinstance(x, str) for x in [lunar_year, lunar_month, lunar_day, hour, minute, second]):
+                return {"valid": False, "error": "年、月、日、时、分、秒必须是字符串类型"}
+            
+            # 1.2 验证is_leap_month是否为字符串
+            if not isinstance(is_leap_month, str):
+                return {"valid": False, "error": "is_leap_month必须是字符串类型"}
+            
+            # 1.3 转换年、月、日、时、分、秒为整数
+            lunar_year = int(lunar_year)
+            lunar_month = int(lunar_month)
+            lunar_day = int(lunar_day)
+            hour = int(hour)
+            minute = int(minute)
+            second = int(second)
+            
+            # 1.5 转换is_leap_month为布尔值
+            is_leap_month_lower = is_leap_month.lower()
+            if is_leap_month_lower == "true":
+                is_leap_month = True
+            elif is_leap_month_lower == "false":
+                is_leap_month = False
+            else:
+                return {"valid": False, "error": "is_leap_month必须是字符串'true'或'false'"}
+            
+        # 捕获字符串转整数时可能出现的值错误或类型错误
+        except (ValueError, TypeError) as e:            
+            return {"valid": False, "error": f"参数类型转换失败：{str(e)}"}
+        
+        # ====== 步骤2~6：按整数验证取值范围 ======
+        error = self.check_lunar_values(lunar_year, lunar_month, lunar_day, hour, minute, second, is_leap_month)
+        if error:
+            return {"valid": False, "error": error}
         
         # ====== 步骤7：验证完成 ======
         return {"valid": True, "message": "农历时间验证通过"}
@@ -0,0 +1,124 @@
+# backend/src/validators/validated_types.py 2026-10-18 17:40:00
+# 功能：已验证的请求值类型，在边界处验证一次后以不可变对象传入Service层和Core层，下游不再重复验证和做字符串往返转换
+
+from dataclasses import dataclass  # 导入数据类装饰器，用于定义不可变、带__slots__的值类型
+from typing import Any, Dict, Optional, Sequence, Tuple  # 导入类型注解工具
+from app.validators.calendar_validator import calendar_validator  # 导入日历验证器实例，按整数验证时间取值范围
+from app.validators.liuyao_validator import liuyao_validator  # 导入六爻验证器实例，验证起卦数列
+
+
+# 私有函数：把参数转换为整数，兼容整数和数字字符串
+def _to_ints(*values: Any) -> Tuple[int, ...]:
+    try:
+        return tuple(int(value) for value in values)
+    except (ValueError, TypeError) as e:
+        raise ValueError(f"参数类型转换失败：{str(e)}")
+
+
+# 私有函数：把闰月标志转换为布尔值，兼容布尔值和字符串'true'/'false'
+def _to_bool(value: Any) -> bool:
+    if isinstance(value, str):
+        if value.lower() not in ("true", "false"):
+            raise ValueError("is_leap_month必须是字符串'true'或'false'")
+        return value.lower() == "true"
+    return bool(value)
+
+
+# 已验证的时刻：calendar为solar（公历）或lunar（农历），字段均已通过取值范围验证
+# 只应通过solar()、lunar()或from_values()创建；直接调用构造函数表示调用方保证数据有效（如由已验证的时刻推导）
+@dataclass(frozen=True, slots=True)
+class ValidatedDateTime:
+    calendar: str  # 历法类型：solar或lunar
+    year: int  # 年（农历时为农历年）
+    month: int  # 月（农历时为农历月，闰月为正数并由is_leap_month标识）
+    day: int  # 日
+    hour: int = 0  # 小时
+    minute: int = 0  # 分钟
+    second: int = 0  # 秒
+    is_leap_month: bool = False  # 是否为闰月（仅农历）
+
+    # 验证并创建公历时刻，验证失败时抛出ValueError（错误信息不含层标识，由调用方添加）
+    @classmethod
+    def solar(cls, year: Any, month: Any, day: Any, hour: Any = 0, minute: Any = 0, second: Any = 0) -> "ValidatedDateTime":
+        values = _to_ints(year, month, day, hour, minute, second)
+        error = calendar_validator.check_solar_values(*values)
+        if error:
+            raise ValueError(error)
+        return cls("solar", *values)
+
+    # 验证并创建农历时刻，验证失败时抛出ValueError（错误信息不含层标识，由调用方添加）
+    @classmethod
+    def lunar(cls, lunar_year: Any, lunar_month: Any, lunar_day: Any, hour: Any = 0, minute: Any = 0, second: Any = 0,
+              is_leap_month: bool = False) -> "ValidatedDateTime":
+        values = _to_ints(lunar_year, lunar_month, lunar_day, hour, minute, second)
+        is_leap_month = _to_bool(is_leap_month)
+        error = calendar_validator.check_lunar_values(*values, is_leap_month)
+        if error:
+            raise ValueError(error)
+        return cls("lunar", *values, is_leap_month)
+
+    # 按请求字段创建时刻：提供lunar_year时按农历处理，否则按公历处理
+    @classmethod
+    def from_values(cls, values: Dict[str, Any]) -> "ValidatedDateTime":
+        time_values = (values.get("hour", 0), values.get("minute", 0), values.get("second", 0))
+        if values.get("lunar_year") is not None:
+            return cls.lunar(values["lunar_year"], values["lunar_month"], values["lunar_day"], *time_values,
+                             is_leap_month=values.get("is_leap_month", False))
+        return cls.solar(values["year"], values["month"], values["day"], *time_values)
+
+    # 是否为农历时刻
+    @property
+    def is_lunar(self) -> bool:
+        return self.calendar == "lunar"
+
+    # 时分秒元组
+    @property
+    def time(self) -> Tuple[int, int, int]:
+        return self.hour, self.minute, self.second
+
+
+# 已验证的起卦请求：起卦数列、奇数个数、时刻和历法信息输出配置均已验证
+@dataclass(frozen=True, slots=True)
+class ValidatedCast:
+    numbers: Tuple[str, ...]  # 六个三位数字符串（从初爻到上爻）
+    odd_counts: Tuple[int, ...]  # 每个爻位中奇数的个数
+    moment: ValidatedDateTime  # 起卦时刻
+    calendar_profile: str = "full"  # 历法信息输出配置
+
+    # 私有方法：验证起卦数列并统计每个爻位中奇数的个数
+    @staticmethod
+    def _count_odd_digits(numbers: Sequence[str]) -> Tuple[int, ...]:
+        validation_result = liuyao_validator.validate_yao_data(list(numbers) if isinstance(numbers, tuple) else numbers)
+        if not validation_result["valid"]:
+            raise ValueError(validation_result.get("error", "爻位数据验证失败"))
+        return tuple(sum(1 for digit in yao if int(digit) % 2 == 1) for yao in numbers)
+
+    # 私有方法：验证历法信息输出配置
+    @staticmethod
+    def _check_profile(calendar_profile: Optional[str]) -> str:
+        from core.calendar_algorithm_core import CALENDAR_PROFILES  # 延迟导入，避免Core层导入本模块时循环依赖
+        calendar_profile = calendar_profile or "full"
+        if calendar_profile not in CALENDAR_PROFILES:
+            raise ValueError(f"calendar_profile必须是{list(CALENDAR_PROFILES)}中的一个")
+        return calendar_profile
+
+    # 验证并创建起卦请求，验证失败时抛出ValueError（错误信息不含层标识，由调用方添加）
+    @classmethod
+    def create(cls, numbers: Sequence[str], moment: ValidatedDateTime, calendar_profile: Optional[str] = "full") -> "ValidatedCast":
+        odd_counts = cls._count_odd_digits(numbers)
+        return cls(tuple(numbers), odd_counts, moment, cls._check_profile(calendar_profile))
+
+    # 按请求字段验证并创建起卦请求：起卦数列取numbers或yao_list，先验证起卦数列，再验证时刻和输出配置
+    @classmethod
+    def from_values(cls, values: Dict[str, Any]) -> "ValidatedCast":
+        numbers = values.get("numbers", values.get("yao_list", []))
+        odd_counts = cls._count_odd_digits(numbers)
+        moment = ValidatedDateTime.from_values(values)
+        return cls(tuple(numbers), odd_counts, moment, cls._check_profile(values.get("calendar_profile")))
+
+
+# 默认导出列表，指定模块的公开接口
+__all__ = [
+    'ValidatedDateTime',
+    'ValidatedCast'
+]
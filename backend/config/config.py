@@ -20,6 +20,36 @@ class Settings:
     # API配置
     API_V1_STR: str = "/api/v1"
     
+    # 六爻排盘配置
+    LIUYAO_GUA_TEMPLATE_MODE: str = os.getenv("LIUYAO_GUA_TEMPLATE_MODE", "lazy")  # 卦象模板模式：off（不使用模板）、lazy（按需构建）、eager（启动时预编译）
+    LIUYAO_BATCH_MAX_SIZE: int = int(os.getenv("LIUYAO_BATCH_MAX_SIZE", "500"))  # 批量排盘单次请求最大条数
+    
+    # 历法缓存配置
+    CALENDAR_CACHE_SIZE: int = int(os.getenv("CALENDAR_CACHE_SIZE", "4096"))  # 历法信息共享缓存最大条目数
+    CALENDAR_CACHE_TTL: float = float(os.getenv("CALENDAR_CACHE_TTL", "3600"))  # 历法信息缓存条目存活时间（秒），0表示永不过期
+    CALENDAR_CACHE_MODE: str = os.getenv("CALENDAR_CACHE_MODE", "shichen")  # 历法缓存模式：exact（精确到秒）、shichen（按时辰分桶，以节气交接时刻划分区间）
+    CALENDAR_TABLE_PATH: str = os.getenv("CALENDAR_TABLE_PATH", "")  # 逐日历法表文件路径，为空时使用data/calendar_table.bin；由scripts/build_calendar_table.py生成，文件不存在时回退到lunar-python
+    JIEQI_INDEX_PATH: str = os.getenv("JIEQI_INDEX_PATH", "")  # 节气交接时刻索引文件路径，为空时使用data/jieqi_index.bin；由scripts/build_jieqi_index.py生成
+    FOUR_PILLARS_SEARCH_MAX_YEARS: int = int(os.getenv("FOUR_PILLARS_SEARCH_MAX_YEARS", "1000"))  # 四柱反查单次请求最大公历年跨度（节气索引范围之外每个匹配年需调用一次lunar-python）
+    CALENDAR_RANGE_MAX_DAYS: int = int(os.getenv("CALENDAR_RANGE_MAX_DAYS", "366"))  # 历法日期范围接口单次JSON响应最大天数，超过时需使用NDJSON流式输出
+    CALENDAR_RANGE_STREAM_MAX_DAYS: int = int(os.getenv("CALENDAR_RANGE_STREAM_MAX_DAYS", "3660"))  # 历法日期范围接口单次NDJSON流式输出最大天数
+    RANDOM_BULK_MAX_COUNT: int = int(os.getenv("RANDOM_BULK_MAX_COUNT", "10000"))  # 批量随机抽取单次JSON响应最大个数，超过时需使用NDJSON流式输出
+    RANDOM_BULK_STREAM_MAX_COUNT: int = int(os.getenv("RANDOM_BULK_STREAM_MAX_COUNT", "1000000"))  # 批量随机抽取单次NDJSON流式输出最大个数
+    LIUYAO_SIMULATION_MAX_COUNT: int = int(os.getenv("LIUYAO_SIMULATION_MAX_COUNT", "10000000"))  # 起卦分布模拟管理接口单次最大模拟次数
+    LIUYAO_SIMULATION_CHUNK_SIZE: int = int(os.getenv("LIUYAO_SIMULATION_CHUNK_SIZE", "500000"))  # 起卦分布模拟每个执行器任务的模拟次数（无NumPy时每50万次约1秒）
+    LIUYAO_SIMULATION_MIN_RATE: int = int(os.getenv("LIUYAO_SIMULATION_MIN_RATE", "250000"))  # 单个工作者每秒至少可模拟的起卦次数（保守估计），用于计算分块超时；thread/inline模式下全部分块共用一个GIL，单次模拟次数上限为该值乘以CPU_EXECUTOR_TIMEOUT
+    FESTIVAL_RANGE_MAX_DAYS: int = int(os.getenv("FESTIVAL_RANGE_MAX_DAYS", "3660"))  # 节日范围查询接口单次请求最大天数（只返回有节日的日期）
+    PAN_FEED_CACHE_MAX_BYTES: int = int(os.getenv("PAN_FEED_CACHE_MAX_BYTES", str(8 * 1024 * 1024)))  # 公开排盘列表页缓存内存预算（字节），按已序列化响应字节计
+    PAN_FEED_CACHE_TTL: float = float(os.getenv("PAN_FEED_CACHE_TTL", "30"))  # 公开排盘列表页缓存条目存活时间（秒），兜底浏览数和热度衰减等不触发失效的变化
+    HOT_SCORE_HALF_LIFE_HOURS: float = float(os.getenv("HOT_SCORE_HALF_LIFE_HOURS", "24"))  # 排盘记录热度分半衰期（小时）
+    HOT_SCORE_DECAY_INTERVAL: float = float(os.getenv("HOT_SCORE_DECAY_INTERVAL", "600"))  # 热度分后台衰减间隔（秒），0表示不启动后台衰减
+    VIEW_COUNT_FLUSH_INTERVAL: float = float(os.getenv("VIEW_COUNT_FLUSH_INTERVAL", "5"))  # 排盘记录浏览数批量写回间隔（秒），0表示只在应用关闭时写回
+    VIEW_COUNT_DEDUP_SECONDS: float = float(os.getenv("VIEW_COUNT_DEDUP_SECONDS", "0"))  # 同一登录用户重复浏览同一排盘记录的去重窗口（秒），0表示不去重
+    CPU_EXECUTOR_MODE: str = os.getenv("CPU_EXECUTOR_MODE", "thread")  # CPU密集型任务执行器模式：inline（事件循环内直接执行）、thread（线程池）、process（进程池，启动时预热工作进程）
+    CPU_EXECUTOR_WORKERS: int = int(os.getenv("CPU_EXECUTOR_WORKERS", "0"))  # 执行器工作者数量，0表示按CPU核数
+    CPU_EXECUTOR_MAX_PENDING: int = int(os.getenv("CPU_EXECUTOR_MAX_PENDING", "0"))  # 执行器最大在途任务数，超过时返回503，0表示工作者数量的4倍
+    CPU_EXECUTOR_TIMEOUT: float = float(os.getenv("CPU_EXECUTOR_TIMEOUT", "10"))  # 单次计算超时时间（秒），超时返回504，0表示不限时
+    
     # CORS配置
     BACKEND_CORS_ORIGINS: list = [
         "http://localhost:3000",  # React开发服务器
@@ -2,8 +2,13 @@
 # 功能：历法算法核心模块，处理公历农历转换和干支计算
 
 from lunar_python import Solar, Lunar, LunarMonth  # 导入lunar-python库的核心类：Solar（公历）、Lunar（农历）、LunarMonth（农历月份）
-from typing import Dict, List, Union  # 导入类型注解工具：Dict（字典类型）、List（列表类型）、Union（联合类型）
-from app.validators.calendar_validator import calendar_validator  # 导入统一的历法验证器实例，用于验证公历和农历时间参数的有效性和合法性
+from functools import lru_cache  # 导入LRU缓存装饰器，用于缓存输出投影的解析结果
+from typing import Dict, List, Optional, Tuple, Union  # 导入类型注解工具：Dict（字典类型）、List（列表类型）、Optional（可选类型）、Tuple（元组类型）、Union（联合类型）
+from app.validators.validated_types import ValidatedDateTime  # 导入已验证时刻值类型，公历和农历输入都先归一为已验证时刻
+from core.ganzhi_arithmetic import day_hour_ganzhi_fields  # 导入纯整数日柱时柱计算函数，日柱和时柱字段不需要构造农历对象
+from core.jieqi_index import jieqi_index, lunar_jieqi_terms  # 导入节气交接时刻索引实例和lunar-python回退计算函数
+from core.calendar_table import calendar_table  # 导入逐日历法表实例，日期级农历字段按日期下标直接读取
+from core.festival_index import festival_index  # 导入节日查找表实例，公历节日按(月, 日)键直接读取
 
 # 定义历法计算异常类，继承自Python标准异常类（用于处理历法计算相关的异常）
 class CalendarError(Exception):
@@ -18,107 +23,281 @@ def handle_calendar_errors(func):
             raise CalendarError(f'历法计算错误：{str(e)}')  # 捕获异常并转换为统一的历法计算错误
     return wrapper  # 返回包装函数
 
+# 定义历法计算上下文类：公历对象立即创建，农历对象只在投影到农历相关字段时才创建
+class _CalendarContext:
+    __slots__ = ("solar", "_lunar", "_lunar_day", "_pillars", "_jieqi_terms", "_year_month_pillars")  # 使用__slots__减少每次请求的对象开销
+
+    def __init__(self, solar_date: Solar):
+        self.solar = solar_date  # 公历对象
+        self._lunar = None  # 农历对象（按需创建）
+        self._lunar_day = None  # 日期级农历信息（按需读取）
+        self._pillars = None  # 日柱时柱字段（按需计算）
+        self._jieqi_terms = None  # 前后节令和气令（按需查询）
+        self._year_month_pillars = None  # 年柱和月柱（按需查询）
+
+    @property
+    def lunar(self) -> Lunar:
+        if self._lunar is None:  # 首次访问时通过公历对象的getLunar()方法获取对应的农历日期对象
+            self._lunar = self.solar.getLunar()
+        return self._lunar
+
+    @property
+    def lunar_day(self):
+        if self._lunar_day is None:  # 首次访问时读取逐日历法表记录，超出历法表范围时回退到农历对象
+            self._lunar_day = calendar_table.lookup(self.solar.getYear(), self.solar.getMonth(), self.solar.getDay()) or self.lunar
+        return self._lunar_day
+
+    # 农历月份天数（历法表记录自带，回退时按农历月计算）
+    @property
+    def lunar_month_days(self) -> int:
+        lunar_day = self.lunar_day
+        if lunar_day is self._lunar:
+            return LunarMonth.fromYm(lunar_day.getYear(), lunar_day.getMonth()).getDayCount()
+        return lunar_day.getMonthDayCount()
+
+    @property
+    def pillars(self) -> Dict[str, str]:
+        if self._pillars is None:  # 首次访问时按儒略日数整数运算日柱和时柱
+            self._pillars = day_hour_ganzhi_fields(self.solar.getYear(), self.solar.getMonth(), self.solar.getDay(), self.solar.getHour())
+        return self._pillars
+
+    # 公历时刻元组(年, 月, 日, 时, 分, 秒)
+    @property
+    def instant(self) -> Tuple[int, ...]:
+        solar = self.solar
+        return solar.getYear(), solar.getMonth(), solar.getDay(), solar.getHour(), solar.getMinute(), solar.getSecond()
+
+    @property
+    def jieqi_terms(self):
+        if self._jieqi_terms is None:  # 首次访问时查节气索引，超出索引范围时回退到农历对象逐次计算
+            self._jieqi_terms = jieqi_index.find_terms(*self.instant) or lunar_jieqi_terms(self.lunar)
+        return self._jieqi_terms
+
+    @property
+    def year_month_pillars(self) -> Tuple[str, str]:
+        if self._year_month_pillars is None:  # 首次访问时查节气索引，超出索引范围时回退到农历对象逐次计算
+            self._year_month_pillars = jieqi_index.find_year_month_pillars(*self.instant) or (self.lunar.getYearInGanZhiExact(), self.lunar.getMonthInGanZhiExact())
+        return self._year_month_pillars
+
+
+# 公历信息字段表：字段名 → 取值函数（顺序即输出顺序）
+SOLAR_INFO_FIELDS = {
+    "solar_year": lambda c: c.solar.getYear(),  # 公历年份：获取公历对象的年份 2026
+    "solar_month": lambda c: c.solar.getMonth(),  # 公历月份：获取公历对象的月份 1
+    "solar_day": lambda c: c.solar.getDay(),  # 公历日期：获取公历对象的日期 1
+    "solar_hour": lambda c: c.solar.getHour(),  # 公历小时：获取公历对象的小时 1
+    "solar_minute": lambda c: c.solar.getMinute(),  # 公历分钟：获取公历对象的分钟 0
+    "solar_second": lambda c: c.solar.getSecond(),  # 公历秒数：获取公历对象的秒数 0
+    "solar_String": lambda c: c.solar.toString(),  # 公历字符串：获取简化的公历日期字符串 "2026-01-01"
+    "solar_FullString": lambda c: c.solar.toFullString(),  # 公历完整字符串：获取详细的公历日期字符串 "2026-01-01 01:00:00 星期四 (元旦节) 摩羯座"
+    "solar_Ymd": lambda c: c.solar.toYmd(),  # 公历年月日：获取年月日格式的字符串 "2026-01-01"
+    "solar_YmdHms": lambda c: c.solar.toYmdHms(),  # 公历年月日时分秒：获取完整时间格式的字符串 "2026-01-01 01:00:00"
+    "solar_week": lambda c: c.solar.getWeek(),  # 公历星期：获取星期几的数字表示 4
+    "solar_week_chinese": lambda c: c.solar.getWeekInChinese(),  # 公历星期中文：获取星期几的中文表示 "四"
+    "solar_leap_year": lambda c: c.solar.isLeapYear(),  # 公历闰年标志：判断是否为闰年 false
+    "solar_festivals": lambda c: festival_index.solar_festivals(c.solar.getYear(), c.solar.getMonth(), c.solar.getDay()),  # 公历节日：按节日查找表获取公历相关的节日列表 ["元旦节"]
+    "solar_other_festivals": lambda c: festival_index.solar_other_festivals(c.solar.getMonth(), c.solar.getDay()),  # 公历其他节日：按节日查找表获取其他相关节日列表 []
+}
+
+# 农历信息字段表
+LUNAR_INFO_FIELDS = {
+    "lunar_year": lambda c: c.lunar_day.getYear(),  # 农历年份：获取农历对象的年份 2025
+    "lunar_year_in_Chinese": lambda c: c.lunar_day.getYearInChinese(),  # 农历年份中文：获取农历年份的中文表示 "二〇二五"
+    "lunar_year_in_GanZhi": lambda c: c.lunar_day.getYearInGanZhi(),  # 农历年干支：获取农历年份（以正月初一起算）的干支表示 "乙巳"
+    "lunar_year_in_Gan": lambda c: c.lunar_day.getYearGan(),  # 农历年天干：获取农历年份（以正月初一起算）的天干 "乙"
+    "lunar_year_in_Zhi": lambda c: c.lunar_day.getYearZhi(),  # 农历年地支：获取农历年份（以正月初一起算）的地支 "巳"
+    "lunar_year_shengxiao": lambda c: c.lunar_day.getYearShengXiao(),  # 农历年生肖：获取农历年份对应的生肖 "蛇"
+    "lunar_year_shengxiao_by_lichun": lambda c: c.lunar_day.getYearShengXiaoByLiChun(),  # 农历年立春生肖：按立春划分的生肖 "蛇"
+    "lunar_month": lambda c: c.lunar_day.getMonth(),  # 农历月份：获取农历对象的月份 11（闰月为负数）
+    "lunar_month_in_Chinese": lambda c: c.lunar_day.getMonthInChinese(),  # 农历月份中文：获取农历月份的中文表示 "冬"
+    "lunar_month_days": lambda c: c.lunar_month_days,  # 农历月份天数：获取该农历月的总天数 30
+    "lunar_day": lambda c: c.lunar_day.getDay(),  # 农历日期：获取农历对象的日期 13
+    "lunar_day_in_Chinese": lambda c: c.lunar_day.getDayInChinese(),  # 农历日期中文：获取农历日期的中文表示 "十三"
+    "lunar_time_Zhi": lambda c: c.pillars["lunar_time_in_zhi_exact"],  # 农历时辰地支：获取时辰对应的地支 "丑"
+    "lunar_string": lambda c: c.lunar_day.toString(),  # 农历字符串：获取简化的农历日期字符串 "二〇二五年冬月十三"
+    "lunar_full_string": lambda c: c.lunar.toFullString(),  # 农历完整字符串：获取详细的农历日期字符串 "二〇二五年冬月十三 乙巳(蛇)年 戊子(鼠)月 乙亥(猪)日 丑(牛)时 纳音[...] 星期四 ..."
+    "lunar_festivals": lambda c: c.lunar_day.getFestivals(),  # 农历节日：获取农历相关的节日列表 []
+    "lunar_other_festivals": lambda c: c.lunar_day.getOtherFestivals(),  # 农历其他节日：获取其他相关节日列表 []
+}
+
+# 干支信息字段表
+GANZHI_INFO_FIELDS = {
+    "lunar_year_in_ganzhi_exact": lambda c: c.year_month_pillars[0],  # 农历年精确干支：获取精确的年干支（以立春节气交接的时刻） "乙巳"
+    "lunar_year_gan_exact": lambda c: c.year_month_pillars[0][0],  # 农历年精确天干：获取精确的年天干（以立春节气交接的时刻） "乙"
+    "lunar_year_zhi_exact": lambda c: c.year_month_pillars[0][1],  # 农历年精确地支：获取精确的年地支（以立春节气交接的时刻） "巳"
+    "lunar_month_in_ganzhi_exact": lambda c: c.year_month_pillars[1],  # 农历月精确干支：获取精确的月干支 "戊子"
+    "lunar_month_gan_exact": lambda c: c.year_month_pillars[1][0],  # 农历月精确天干：获取精确的月天干 "戊"
+    "lunar_month_zhi_exact": lambda c: c.year_month_pillars[1][1],  # 农历月精确地支：获取精确的月地支 "子"
+    "lunar_day_in_ganzhi_exact": lambda c: c.pillars["lunar_day_in_ganzhi_exact"],  # 农历日精确干支：获取精确的日干支 "乙亥"
+    "lunar_day_in_gan_exact": lambda c: c.pillars["lunar_day_in_gan_exact"],  # 农历日精确天干：获取精确的日天干 "乙"
+    "lunar_day_in_zhi_exact": lambda c: c.pillars["lunar_day_in_zhi_exact"],  # 农历日精确地支：获取精确的日地支 "亥"
+    "lunar_day_in_ganzhi_exact2": lambda c: c.pillars["lunar_day_in_ganzhi_exact2"],  # 农历日精确干支2：获取第二种精确的日干支 "乙亥"
+    "lunar_day_in_gan_exact2": lambda c: c.pillars["lunar_day_in_gan_exact2"],  # 农历日精确天干2：获取第二种精确的日天干 "乙"
+    "lunar_day_in_zhi_exact2": lambda c: c.pillars["lunar_day_in_zhi_exact2"],  # 农历日精确地支2：获取第二种精确的日地支 "亥"
+    "lunar_time_in_gan_exact": lambda c: c.pillars["lunar_time_in_gan_exact"],  # 农历时辰天干：获取时辰对应的天干 "丙"
+    "lunar_time_in_zhi_exact": lambda c: c.pillars["lunar_time_in_zhi_exact"],  # 农历时辰地支：获取时辰对应的地支 "丑"
+    "lunar_time_in_ganzhi_exact": lambda c: c.pillars["lunar_time_in_ganzhi_exact"],  # 农历时辰干支：获取时辰对应的干支 "丙丑"
+}
+
+# 节气信息字段表
+JIEQI_INFO_FIELDS = {
+    "jieqi_result_a": lambda c: CalendarAlgorithmCore._get_jieqi_combination(c),  # 节气组合结果：调用内部方法获取节气排列组合信息
+}
+
+# 输出区块表：区块名 → 字段表（顺序即输出顺序）
+CALENDAR_SECTIONS = {
+    "solar_info": SOLAR_INFO_FIELDS,  # 公历信息子字典：包含所有公历相关的详细信息
+    "lunar_info": LUNAR_INFO_FIELDS,  # 农历信息子字典：包含所有农历相关的详细信息
+    "ganzhi_info": GANZHI_INFO_FIELDS,  # 干支信息子字典：包含所有干支相关的详细信息
+    "jieqi_info": JIEQI_INFO_FIELDS,  # 节气信息子字典：包含所有节气相关的详细信息
+}
+
+# 公历时刻基础字段（各精简配置都保留，用于标识请求时刻）
+_SOLAR_INSTANT_FIELDS = ("solar_year", "solar_month", "solar_day", "solar_hour", "solar_minute", "solar_second", "solar_YmdHms")
+
+# 输出配置：配置名 → {区块名: 字段名元组（None表示整个区块）}
+CALENDAR_PROFILES = {
+    # 精简配置：只含公历时刻与日柱、时柱（六爻排盘只需要日干）
+    "minimal": {
+        "solar_info": _SOLAR_INSTANT_FIELDS,
+        "ganzhi_info": (
+            "lunar_day_in_ganzhi_exact", "lunar_day_in_gan_exact", "lunar_day_in_zhi_exact",
+            "lunar_time_in_gan_exact", "lunar_time_in_zhi_exact", "lunar_time_in_ganzhi_exact"
+        ),
+    },
+    # 干支配置：公历时刻、完整四柱干支和节气信息，不计算节日和完整字符串
+    "ganzhi": {
+        "solar_info": _SOLAR_INSTANT_FIELDS,
+        "ganzhi_info": None,
+        "jieqi_info": None,
+    },
+    # 完整配置：全部区块全部字段（默认，与原有输出一致）
+    "full": {section: None for section in CALENDAR_SECTIONS},
+}
+
+
+# 解析输出投影：fields优先（元素为区块名或"区块名.字段名"），否则使用profile；返回可哈希的((区块名, (字段名, ...)), ...)，可直接作为缓存键的一部分
+@lru_cache(maxsize=256)
+def _resolve_projection_cached(profile: str, fields: Optional[Tuple[str, ...]]) -> Tuple[Tuple[str, Tuple[str, ...]], ...]:
+    if fields:
+        selected: Dict[str, set] = {}  # 区块名 → 选中的字段名集合（None表示整个区块）
+        for field in fields:
+            section, _, field_name = field.partition(".")
+            if section not in CALENDAR_SECTIONS:
+                raise CalendarError(f"[Core层验证] 未知的输出区块: {section}，必须是{list(CALENDAR_SECTIONS)}中的一个")
+            if field_name and field_name not in CALENDAR_SECTIONS[section]:
+                raise CalendarError(f"[Core层验证] 未知的输出字段: {field}")
+            if not field_name:
+                selected[section] = None
+            elif section not in selected or selected[section] is not None:
+                selected.setdefault(section, set()).add(field_name)
+        sections = {section: (None if names is None else tuple(names)) for section, names in selected.items()}
+    else:
+        if profile not in CALENDAR_PROFILES:
+            raise CalendarError(f"[Core层验证] 无效的输出配置: {profile}，必须是{list(CALENDAR_PROFILES)}中的一个")
+        sections = CALENDAR_PROFILES[profile]
+
+    # 按区块表和字段表的原有顺序输出，保证不同写法得到相同的投影
+    return tuple(
+        (section, tuple(name for name in section_fields if sections[section] is None or name in sections[section]))
+        for section, section_fields in CALENDAR_SECTIONS.items() if section in sections
+    )
+
+
+# 解析输出投影（对外接口，fields接受列表或元组）
+def resolve_projection(profile: str = "full", fields: Optional[List[str]] = None) -> Tuple[Tuple[str, Tuple[str, ...]], ...]:
+    return _resolve_projection_cached(profile, tuple(fields) if fields else None)
+
+
+# 将农历日期映射为公历日期(年, 月, 日)：优先在逐日历法表中二分查找，超出范围时按农历月首日儒略日推算，不构造Lunar对象（调用方负责验证农历日期）
+def resolve_lunar_date(lunar_year: int, lunar_month: int, lunar_day: int, is_leap_month: bool = False) -> Tuple[int, int, int]:
+    solar_date = calendar_table.find_lunar_date(lunar_year, lunar_month, lunar_day, is_leap_month)
+    if solar_date is not None:
+        return solar_date
+    lunar_month_obj = LunarMonth.fromYm(lunar_year, -lunar_month if is_leap_month else lunar_month)  # lunar-python库约定用负数表示闰月
+    solar = Solar.fromJulianDay(lunar_month_obj.getFirstJulianDay() + lunar_day - 1)
+    return solar.getYear(), solar.getMonth(), solar.getDay()
+
+
 # 定义历法算法核心类，包含所有历法计算的核心方法
 class CalendarAlgorithmCore:
     
     @staticmethod  # 静态方法装饰器：表示此方法不依赖于类实例，可以直接通过类名调用
     @handle_calendar_errors  # 错误处理装饰器：自动处理历法计算过程中可能出现的异常
 
-    # 定义公历转农历的核心方法（创建lunar公历对象，并转换为lunar农历对象）
+    # 定义公历转农历的核心方法（创建lunar公历对象，按输出投影逐字段计算，农历对象按需创建）
     def convert_solar_to_lunar(
         year: int,   # 参数：公历年份，整数类型
         month: int,  # 参数：公历月份，整数类型
         day: int,    # 参数：公历日期，整数类型
         hour: int = 0,     # 参数：小时（可选，默认0），整数类型，范围0-23
         minute: int = 0,   # 参数：分钟（可选，默认0），整数类型，范围0-59
-        second: int = 0   # 参数：秒（可选，默认0），整数类型，范围0-59
+        second: int = 0,   # 参数：秒（可选，默认0），整数类型，范围0-59
+        profile: str = "full",  # 参数：输出配置（可选，默认full），minimal、ganzhi或full
+        fields: Optional[List[str]] = None  # 参数：输出字段（可选），区块名或"区块名.字段名"列表，提供时优先于profile
     ) -> Dict[str, Union[str, int, List[str]]]:  # 返回值类型注解：返回包含多种数据类型的字典
         
-        # 验证输入数据格式：调用统一验证器的validate_solar_input方法检查输入参数有效性
-        validation_result = calendar_validator.validate_solar_input(
-            str(year), str(month), str(day), str(hour), str(minute), str(second)
-        )
-        if not validation_result["valid"]:  # 如果验证结果无效
-            raise CalendarError(f"[Core层验证] {validation_result.get('error', '未知错误')}")  # 抛出数据格式错误异常
+        # 验证输入数据：按整数验证取值范围，得到已验证时刻
+        try:
+            moment = ValidatedDateTime.solar(year, month, day, hour, minute, second)
+        except ValueError as e:  # 如果验证结果无效
+            raise CalendarError(f"[Core层验证] {str(e)}")  # 抛出数据格式错误异常
+        
+        return CalendarAlgorithmCore._convert_moment(moment, resolve_projection(profile, fields))  # 按已验证时刻构建历法信息字典
+    
+    @staticmethod  # 静态方法装饰器：表示此方法不依赖于类实例
+    @handle_calendar_errors  # 错误处理装饰器：自动处理历法计算过程中可能出现的异常
+    # 按已验证时刻计算历法信息（调用方已完成验证，不再重复验证；农历时刻先映射到公历日期）
+    def convert_validated(
+        moment: ValidatedDateTime,  # 参数：已验证的公历或农历时刻
+        profile: str = "full",  # 参数：输出配置（可选，默认full），minimal、ganzhi或full
+        fields: Optional[List[str]] = None  # 参数：输出字段（可选），区块名或"区块名.字段名"列表，提供时优先于profile
+    ) -> Dict[str, Union[str, int, List[str]]]:
+        return CalendarAlgorithmCore._convert_moment(moment, resolve_projection(profile, fields))
+    
+    @staticmethod  # 静态方法装饰器：表示此方法不依赖于类实例
+    # 按已验证时刻和已解析的输出投影构建历法信息字典（公历和农历入口共用）
+    def _convert_moment(moment: ValidatedDateTime, projection: Tuple[Tuple[str, Tuple[str, ...]], ...]) -> Dict[str, Union[str, int, List[str]]]:
         
-        # 创建公历对象：使用lunar-python库的Solar类创建公历日期对象
-        solar_date = Solar.fromYmdHms(year, month, day, hour, minute, second)
+        # 农历时刻映射到公历日期：已验证的农历日期必然存在，映射得到的公历日期也必然有效
+        if moment.is_lunar:
+            year, month, day = resolve_lunar_date(moment.year, moment.month, moment.day, moment.is_leap_month)
+        else:
+            year, month, day = moment.year, moment.month, moment.day
         
-        # 转换为农历对象：通过公历对象的getLunar()方法获取对应的农历日期对象
-        lunar_date = solar_date.getLunar()
+        # 创建计算上下文：使用lunar-python库的Solar类创建公历日期对象，农历对象按需创建
+        context = _CalendarContext(Solar.fromYmdHms(year, month, day, *moment.time))
+        return CalendarAlgorithmCore._build_result(context, projection)  # 返回构建完成的历法信息字典
+    
+    @staticmethod  # 静态方法装饰器：表示此方法不依赖于类实例
+    # 按输出投影从计算上下文构建历法信息字典（公历和农历输入共用）
+    def _build_result(context: _CalendarContext, projection: Tuple[Tuple[str, Tuple[str, ...]], ...]) -> Dict[str, Union[str, int, List[str]]]:
         
-        # 使用lunar-python库的方法构建历法信息
-        # 构建返回结果：创建包含所有历法信息的字典
-        # 开始构建结果字典
+        # 构建返回结果：创建包含所请求历法信息的字典
         result = {
             "success": True,  # 成功标志：表示计算成功完成
             "valid": True,  # 数据有效性标志：表示输入数据经过验证且有效
             "input_type": "solar",  # 输入类型标识：表示原始输入是公历日期
             "conversion_type": "from_solar_to_info",  # 转换类型标识：表示执行的是公历求详情操作
-            # 公历信息子字典：包含所有公历相关的详细信息
-            "solar_info": {
-                "solar_year": solar_date.getYear(),  # 公历年份：获取公历对象的年份 2026
-                "solar_month": solar_date.getMonth(),  # 公历月份：获取公历对象的月份 1
-                "solar_day": solar_date.getDay(),  # 公历日期：获取公历对象的日期 1
-                "solar_hour": solar_date.getHour(),  # 公历小时：获取公历对象的小时 1
-                "solar_minute": solar_date.getMinute(),  # 公历分钟：获取公历对象的分钟 0
-                "solar_second": solar_date.getSecond(),  # 公历秒数：获取公历对象的秒数 0
-                "solar_String": solar_date.toString(),  # 公历字符串：获取简化的公历日期字符串 “2026-01-01”
-                "solar_FullString": solar_date.toFullString(),  # 公历完整字符串：获取详细的公历日期字符串 "2026-01-01 01:00:00 星期四 (元旦节) 摩羯座"
-                "solar_Ymd": solar_date.toYmd(),  # 公历年月日：获取年月日格式的字符串 "2026-01-01"
-                "solar_YmdHms": solar_date.toYmdHms(),  # 公历年月日时分秒：获取完整时间格式的字符串 "2026-01-01 01:00:00"
-                "solar_week": solar_date.getWeek(),  # 公历星期：获取星期几的数字表示 4
-                "solar_week_chinese": solar_date.getWeekInChinese(),  # 公历星期中文：获取星期几的中文表示 "四"
-                "solar_leap_year": solar_date.isLeapYear(),  # 公历闰年标志：判断是否为闰年 false
-                "solar_festivals": solar_date.getFestivals(),  # 公历节日：获取公历相关的节日列表 ["元旦节"]
-                "solar_other_festivals": solar_date.getOtherFestivals()  # 公历其他节日：获取其他相关节日列表 []
-            },
-            # 农历信息子字典：包含所有农历相关的详细信息
-            "lunar_info": {
-                "lunar_year": lunar_date.getYear(),  # 农历年份：获取农历对象的年份 2025
-                "lunar_year_in_Chinese": lunar_date.getYearInChinese(),  # 农历年份中文：获取农历年份的中文表示 "二〇二五"
-                "lunar_year_in_GanZhi": lunar_date.getYearInGanZhi(),  # 农历年干支：获取农历年份（以正月初一起算）的干支表示 "乙巳"
-                "lunar_year_in_Gan": lunar_date.getYearGan(),  # 农历年天干：获取农历年份（以正月初一起算）的天干 "乙"
-                "lunar_year_in_Zhi": lunar_date.getYearZhi(),  # 农历年地支：获取农历年份（以正月初一起算）的地支 "巳"
-                "lunar_year_shengxiao": lunar_date.getYearShengXiao(),  # 农历年生肖：获取农历年份对应的生肖 "蛇"
-                "lunar_year_shengxiao_by_lichun": lunar_date.getYearShengXiaoByLiChun(),  # 农历年立春生肖：按立春划分的生肖 "蛇"
-                "lunar_month": lunar_date.getMonth(),  # 农历月份：获取农历对象的月份 11（闰月为负数）
-                "lunar_month_in_Chinese": lunar_date.getMonthInChinese(),  # 农历月份中文：获取农历月份的中文表示 "冬"
-                "lunar_month_days": LunarMonth.fromYm(lunar_date.getYear(), lunar_date.getMonth()).getDayCount() if lunar_date else 0,  # 农历月份天数：获取该农历月的总天数 30
-                "lunar_day": lunar_date.getDay(),  # 农历日期：获取农历对象的日期 13
-                "lunar_day_in_Chinese": lunar_date.getDayInChinese(),  # 农历日期中文：获取农历日期的中文表示 "十三"
-                "lunar_time_Zhi": lunar_date.getTimeZhi(),  # 农历时辰地支：获取时辰对应的地支 "丑"
-                "lunar_string": lunar_date.toString(),  # 农历字符串：获取简化的农历日期字符串 "二〇二五年冬月十三"
-                "lunar_full_string": lunar_date.toFullString(),  # 农历完整字符串：获取详细的农历日期字符串 "二〇二五年冬月十三 乙巳(蛇)年 戊子(鼠)月 乙亥(猪)日 丑(牛)时 纳音[覆灯火 霹雳火 山头火 涧下水] 星期四 南方朱雀 星宿[井木犴](吉) 彭祖百忌[乙不栽植千株不长 亥不嫁娶不利新郎] 喜神方位[乾](西北) 阳贵神方位[坤](西南) 阴贵神方位[坎](正北) 福神方位[坤](西南) 财神方位[艮](东北) 冲[(己巳)蛇] 煞[西]"
-                "lunar_festivals": lunar_date.getFestivals(),  # 农历节日：获取农历相关的节日列表 []
-                "lunar_other_festivals": lunar_date.getOtherFestivals()  # 农历其他节日：获取其他相关节日列表 []
-            },            
-            # 干支信息子字典：包含所有干支相关的详细信息
-            "ganzhi_info": {
-                "lunar_year_in_ganzhi_exact": lunar_date.getYearInGanZhiExact(),  # 农历年精确干支：获取精确的年干支（以立春节气交接的时刻） "乙巳"
-                "lunar_year_gan_exact": lunar_date.getYearGanExact(),  # 农历年精确天干：获取精确的年天干（以立春节气交接的时刻） "乙"
-                "lunar_year_zhi_exact": lunar_date.getYearZhiExact(),  # 农历年精确地支：获取精确的年地支（以立春节气交接的时刻） "巳"
-                "lunar_month_in_ganzhi_exact": lunar_date.getMonthInGanZhiExact(),  # 农历月精确干支：获取精确的月干支 "戊子"
-                "lunar_month_gan_exact": lunar_date.getMonthGanExact(),  # 农历月精确天干：获取精确的月天干 "戊"
-                "lunar_month_zhi_exact": lunar_date.getMonthZhiExact(),  # 农历月精确地支：获取精确的月地支 "子"
-                "lunar_day_in_ganzhi_exact": lunar_date.getDayInGanZhiExact(),  # 农历日精确干支：获取精确的日干支 "乙亥"
-                "lunar_day_in_gan_exact": lunar_date.getDayGanExact(),  # 农历日精确天干：获取精确的日天干 "乙"
-                "lunar_day_in_zhi_exact": lunar_date.getDayZhiExact(),  # 农历日精确地支：获取精确的日地支 "亥"
-                "lunar_day_in_ganzhi_exact2": lunar_date.getDayInGanZhiExact2(),  # 农历日精确干支2：获取第二种精确的日干支 "乙亥"
-                "lunar_day_in_gan_exact2": lunar_date.getDayGanExact2(),  # 农历日精确天干2：获取第二种精确的日天干 "乙"
-                "lunar_day_in_zhi_exact2": lunar_date.getDayZhiExact2(),  # 农历日精确地支2：获取第二种精确的日地支 "亥"
-                "lunar_time_in_gan_exact": lunar_date.getTimeGan(),  # 农历时辰天干：获取时辰对应的天干 "丙"
-                "lunar_time_in_zhi_exact": lunar_date.getTimeZhi(),  # 农历时辰地支：获取时辰对应的地支 "丑"
-                "lunar_time_in_ganzhi_exact": lunar_date.getTimeInGanZhi(),  # 农历时辰干支：获取时辰对应的干支 "丙丑"
-            },            
-            # 节气信息子字典：包含所有节气相关的详细信息
-            "jieqi_info": {
-                "jieqi_result_a": CalendarAlgorithmCore._get_jieqi_combination(lunar_date)  # 节气组合结果：调用内部方法获取节气排列组合信息
-            }
         }
+        for section, field_names in projection:  # 只计算投影中的区块和字段
+            section_fields = CALENDAR_SECTIONS[section]
+            result[section] = {name: section_fields[name](context) for name in field_names}
         
         return result  # 返回构建完成的历法信息字典
     
+    @staticmethod  # 静态方法装饰器：表示此方法不依赖于类实例
+    @handle_calendar_errors  # 错误处理装饰器：自动处理历法计算过程中可能出现的异常
+    # 获取公历时刻所在的节气区间[最近一次节气交接时刻, 下一次节气交接时刻)，供时辰分桶缓存判断区间（不依赖输出投影）
+    def get_jieqi_window(year: int, month: int, day: int, hour: int = 0, minute: int = 0, second: int = 0) -> Tuple[str, str]:
+        window = jieqi_index.find_window(year, month, day, hour, minute, second)  # 优先二分查找节气索引
+        if window is not None:
+            return window
+        lunar_date = Solar.fromYmdHms(year, month, day, hour, minute, second).getLunar()  # 超出索引范围时回退到lunar-python
+        window_start = max(lunar_date.getPrevJie().getSolar().toYmdHms(), lunar_date.getPrevQi().getSolar().toYmdHms())
+        window_end = min(lunar_date.getNextJie().getSolar().toYmdHms(), lunar_date.getNextQi().getSolar().toYmdHms())
+        return window_start, window_end
+    
     @staticmethod  # 静态方法装饰器：表示此方法不依赖于类实例
     # 定义农历转公历的核心方法
     def convert_lunar_to_solar(
@@ -128,62 +307,36 @@ class CalendarAlgorithmCore:
         hour: int = 0,  # 参数：小时（可选，默认0），整数类型，范围0-23
         minute: int = 0,  # 参数：分钟（可选，默认0），整数类型，范围0-59
         second: int = 0,  # 参数：秒（可选，默认0），整数类型，范围0-59
-        is_leap_month: bool = False  # 参数：是否为闰月（可选，默认False），布尔类型
+        is_leap_month: bool = False,  # 参数：是否为闰月（可选，默认False），布尔类型
+        profile: str = "full",  # 参数：输出配置（可选，默认full），minimal、ganzhi或full
+        fields: Optional[List[str]] = None  # 参数：输出字段（可选），区块名或"区块名.字段名"列表，提供时优先于profile
     ) -> Dict:  # 返回值类型注解：返回包含历法信息的字典
         
-        # 验证输入数据格式：调用统一验证器的validate_lunar_input方法检查输入参数有效性
-        validation_result = calendar_validator.validate_lunar_input(
-            str(lunar_year), str(lunar_month), str(lunar_day), 
-            str(hour), str(minute), str(second), 
-            str(is_leap_month)
-        )
-        if not validation_result["valid"]:  # 如果验证结果无效
-            raise CalendarError(f"[Core层验证] {validation_result.get('error', '未知错误')}")  # 抛出数据格式错误异常
+        # 验证输入数据：按整数验证取值范围，得到已验证时刻
+        try:
+            moment = ValidatedDateTime.lunar(lunar_year, lunar_month, lunar_day, hour, minute, second, is_leap_month)
+        except ValueError as e:  # 如果验证结果无效
+            raise CalendarError(f"[Core层验证] {str(e)}")  # 抛出数据格式错误异常
         
-        # 尝试执行农历转换操作
+        projection = resolve_projection(profile, fields)  # 解析输出投影
+        
+        # 尝试执行农历转换操作：按已验证时刻映射到公历日期并构建结果，与公历输入共用同一套字段表
         try:
-            # 创建农历对象，支持闰月
-            if is_leap_month:  # 如果指定为闰月
-                # 对于闰月，使用lunar_month的负数表示：lunar-python库约定用负数表示闰月
-                lunar_date = Lunar.fromYmdHms(lunar_year, -lunar_month, lunar_day, hour, minute, second)
-            else:  # 如果是普通月份
-                lunar_date = Lunar.fromYmdHms(lunar_year, lunar_month, lunar_day, hour, minute, second)
-            
-            # 转换为公历：通过农历对象的getSolar()方法获取对应的公历日期对象
-            solar_date = lunar_date.getSolar()
-            
-            # 调用现有的公历转换方法获取完整信息：复用convert_solar_to_lunar方法
-            return CalendarAlgorithmCore.convert_solar_to_lunar(
-                solar_date.getYear(),
-                solar_date.getMonth(),
-                solar_date.getDay(),  # 传入公历年月日
-                hour, minute, second  # 传入时间参数
-            )
+            return CalendarAlgorithmCore._convert_moment(moment, projection)
         # 捕获转换过程中可能出现的异常
         except Exception as e:
             raise CalendarError(f"农历转换失败: {str(e)}")  # 抛出农历转换失败异常，包含具体错误信息
 
     @staticmethod
     # 定义内部方法_get_jieqi_combination，用于获取节气组合信息
-    def _get_jieqi_combination(lunar_date: Lunar) -> Dict:
+    def _get_jieqi_combination(context: _CalendarContext) -> Dict:
         
         try:
-            # 获取所有节气的基本信息
-            prev_jie_time = lunar_date.getPrevJie().getSolar().toYmdHms()  # 获取前一个节令的公历时间
-            prev_jie_name = lunar_date.getPrevJie().getName()  # 获取前一个节令的名称
-            next_jie_time = lunar_date.getNextJie().getSolar().toYmdHms()  # 获取后一个节令的公历时间
-            next_jie_name = lunar_date.getNextJie().getName()  # 获取后一个节令的名称
-            prev_qi_time = lunar_date.getPrevQi().getSolar().toYmdHms()  # 获取前一个气令的公历时间
-            prev_qi_name = lunar_date.getPrevQi().getName()  # 获取前一个气令的名称
-            next_qi_time = lunar_date.getNextQi().getSolar().toYmdHms()  # 获取后一个气令的公历时间
-            next_qi_name = lunar_date.getNextQi().getName()  # 获取后一个气令的名称
-
-            # 获取Solar对象用于时间比较
-            prev_jie_solar = lunar_date.getPrevJie().getSolar()  # 获取前一个节令的Solar对象
-            prev_qi_solar = lunar_date.getPrevQi().getSolar()  # 获取前一个气令的Solar对象
-
-            # 根据时间顺序确定节气排列
-            if prev_jie_solar.isBefore(prev_qi_solar):
+            # 获取所有节气的基本信息（节气索引二分查找，超出索引范围时由上下文回退到lunar-python计算）
+            (prev_jie_name, prev_jie_time), (next_jie_name, next_jie_time), (prev_qi_name, prev_qi_time), (next_qi_name, next_qi_time) = context.jieqi_terms
+
+            # 根据时间顺序确定节气排列（时刻字符串格式固定，可直接按字符串比较先后）
+            if prev_jie_time < prev_qi_time:
                 # 节在气之前：节 → 气 → 下一个节
                 jieqi_result_a = {
                     "prev_jie": {
@@ -196,7 +349,7 @@ class CalendarAlgorithmCore:
                     },
                     "new":{
                         "name": "占时",  # 当前时间的标记
-                        "time": lunar_date.getSolar().toYmdHms()  # 当前时间的公历表示
+                        "time": context.solar.toYmdHms()  # 当前时间的公历表示
                     },
                     "next_jie": {
                         "name": next_jie_name,  # 下一个节令的名称
@@ -220,7 +373,7 @@ class CalendarAlgorithmCore:
                     },
                     "new":{
                         "name": "占时",  # 当前时间的标记
-                        "time": lunar_date.getSolar().toYmdHms()  # 当前时间的公历表示
+                        "time": context.solar.toYmdHms()  # 当前时间的公历表示
                     },
                     "next_qi": {
                         "name": next_qi_name,  # 下一个气令的名称
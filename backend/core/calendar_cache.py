@@ -0,0 +1,272 @@
+# backend/src/core/calendar_cache.py 2026-10-18 13:00:00
+# 功能：历法信息共享缓存，公历与农历输入统一归一到公历时刻作为键，线程安全、有界、带过期时间和命中统计；支持按时辰分桶并以节气交接时刻划分有效区间
+
+import threading  # 导入线程模块，用于保护缓存在线程池并发访问下的一致性
+import time  # 导入时间模块，用于计算缓存条目过期时间
+from collections import OrderedDict  # 导入有序字典，用于实现LRU淘汰
+from typing import Any, Dict, List, Optional, Tuple  # 导入类型注解工具：Any（任意类型）、Dict（字典类型）、List（列表类型）、Optional（可选类型）、Tuple（元组类型）
+from core.calendar_algorithm_core import calendar_algorithm_core, CalendarError, resolve_projection, resolve_lunar_date  # 导入历法算法核心实例、历法计算异常、输出投影解析函数和农历日期映射函数
+from app.validators.calendar_validator import calendar_validator  # 导入统一的历法验证器实例，用于农历日期映射前的验证
+from app.validators.validated_types import ValidatedDateTime  # 导入已验证时刻值类型，已验证的请求跳过Core层重复验证
+from core.ganzhi_arithmetic import DAY_HOUR_GANZHI_FIELDS  # 导入只随日期和小时变化的日柱时柱字段名
+from config import settings  # 导入应用配置对象，用于读取缓存大小和过期时间
+
+# 缓存模式：exact（按精确到秒的公历时刻缓存）、shichen（按公历日期+时辰分桶，桶内以节气交接时刻划分有效区间）
+CALENDAR_CACHE_MODES = ("exact", "shichen")
+
+
+# 日柱时柱字段集合，投影只含这些干支字段时结果与节气无关
+_DAY_HOUR_FIELD_SET = frozenset(DAY_HOUR_GANZHI_FIELDS)
+
+# 覆盖整个时辰桶的有效区间（按YmdHms字符串比较）
+_WHOLE_BUCKET = ("0000-00-00 00:00:00", "9999-99-99 99:99:99")
+
+
+# 计算时辰分桶序号：0点为早子时（0），1~22点每两小时一个时辰（1~11），23点为晚子时（12，日柱按次日计算，单独成桶）
+def shichen_bucket(hour: int) -> int:
+    return (hour + 1) // 2 if hour < 23 else 12
+
+
+# 历法信息缓存类：键为公历时刻元组(年, 月, 日, 时, 分, 秒)加输出投影，农历输入先映射到公历日期再查询同一份缓存
+class CalendarCache:
+
+    # 初始化历法信息缓存
+    def __init__(self, max_size: int = 1024, ttl_seconds: float = 3600, mode: str = "exact"):
+        if max_size <= 0:  # 检查缓存大小是否有效
+            raise ValueError(f"[Core层验证] 历法缓存大小必须大于0，当前值：{max_size}")
+        if mode not in CALENDAR_CACHE_MODES:  # 检查缓存模式是否有效
+            raise ValueError(f"[Core层验证] 无效的历法缓存模式: {mode}，必须是{CALENDAR_CACHE_MODES}中的一个")
+        self.mode = mode  # 缓存模式
+        self.max_size = max_size  # 最大缓存条目数
+        self.ttl_seconds = ttl_seconds  # 缓存条目存活时间（秒），小于等于0表示永不过期
+        self._entries: "OrderedDict[Tuple[int, ...], Tuple[float, Any]]" = OrderedDict()  # 缓存条目：exact模式为公历时刻键 → (过期时间, 历法信息)；shichen模式为(年, 月, 日, 时辰) → (过期时间, 区间变体元组)
+        self._lunar_dates: "OrderedDict[Tuple[int, int, int, bool], Tuple[int, int, int]]" = OrderedDict()  # 农历日期映射：(农历年, 月, 日, 是否闰月) → 公历(年, 月, 日)
+        self._lock = threading.Lock()  # 缓存锁，只保护字典读写，历法计算在锁外执行
+        self.hits = 0  # 命中次数
+        self.misses = 0  # 未命中次数
+        self.evictions = 0  # 因容量淘汰的条目数
+        self.expirations = 0  # 因过期移除的条目数
+
+    # 私有方法：计算条目过期时间
+    def _expire_at(self) -> float:
+        return time.monotonic() + self.ttl_seconds if self.ttl_seconds > 0 else float("inf")
+
+    # 私有方法：按键查询缓存（持锁调用），命中时移动到末尾，过期时移除
+    def _lookup(self, key: Tuple[int, ...]):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expire_at, calendar_info = entry
+        if expire_at <= time.monotonic():  # 条目已过期
+            del self._entries[key]
+            self.expirations += 1
+            return None
+        self._entries.move_to_end(key)  # 移动到末尾（最近使用）
+        return calendar_info
+
+    # 私有方法：写入缓存（持锁调用），超过容量时淘汰最久未使用的条目
+    def _store(self, key: Tuple[int, ...], value: Any) -> None:
+        self._entries[key] = (self._expire_at(), value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_size:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    # 获取公历时刻对应的历法信息（返回的字典为多个请求共享，调用方只读使用；不同输出投影分别缓存）
+    def get_solar(self, year: int, month: int, day: int, hour: int = 0, minute: int = 0, second: int = 0,
+                  profile: str = "full", fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        instant = (int(year), int(month), int(day), int(hour), int(minute), int(second))  # 归一化为整数元组
+        return self._get_instant(instant, profile, fields, validated=False)
+
+    # 获取已验证时刻对应的历法信息（农历时刻先映射到公历日期；缓存未命中时调用Core层不再重复验证）
+    def get_validated(self, moment: ValidatedDateTime, profile: str = "full", fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        if moment.is_lunar:
+            year, month, day = self._map_lunar_date((moment.year, moment.month, moment.day, moment.is_leap_month))
+        else:
+            year, month, day = moment.year, moment.month, moment.day
+        return self._get_instant((year, month, day) + moment.time, profile, fields, validated=True)
+
+    # 私有方法：按公历时刻查询缓存；validated为True表示时刻已验证，未命中时跳过Core层验证
+    def _get_instant(self, instant: Tuple[int, ...], profile: str, fields: Optional[List[str]], validated: bool) -> Dict[str, Any]:
+        projection = resolve_projection(profile, fields)  # 解析输出投影（可哈希，作为键的一部分）
+        if self.mode == "shichen":  # 时辰分桶模式
+            return self._get_solar_by_shichen(instant, projection, profile, fields, validated)
+        key = instant + (projection,)  # 精确模式键：公历时刻 + 输出投影
+        with self._lock:
+            calendar_info = self._lookup(key)
+            if calendar_info is not None:
+                self.hits += 1
+                return calendar_info
+            self.misses += 1
+
+        # 缓存未命中，在锁外调用历法核心计算，避免阻塞其他线程的命中路径
+        calendar_info = self._compute(instant, profile, fields, validated)
+        with self._lock:
+            self._store(key, calendar_info)
+        return calendar_info
+
+    # 私有方法：调用历法核心按输出配置计算；已验证的时刻直接按已验证时刻计算，不再重复验证
+    @staticmethod
+    def _compute(instant: Tuple[int, ...], profile: str, fields: Optional[List[str]], validated: bool = False) -> Dict[str, Any]:
+        if validated:
+            return calendar_algorithm_core.convert_validated(ValidatedDateTime("solar", *instant), profile=profile, fields=fields)
+        return calendar_algorithm_core.convert_solar_to_lunar(*instant, profile=profile, fields=fields)
+
+    # 私有方法：判断输出投影是否与节气交接时刻无关（只含公历信息和日柱时柱字段），此时整个时辰桶共用一个结果
+    @staticmethod
+    def _is_jieqi_free(projection: Tuple) -> bool:
+        for section, field_names in projection:
+            if section == "solar_info":
+                continue
+            if section != "ganzhi_info" or not set(field_names) <= _DAY_HOUR_FIELD_SET:
+                return False
+        return True
+
+    # 私有方法：提取节气有效区间[左端, 右端)，区间内前后节气不变，年、月精确干支与节气信息也不变
+    @staticmethod
+    def _get_jieqi_window(calendar_info: Dict[str, Any], instant: Tuple[int, ...]) -> Optional[Tuple[str, str]]:
+        jieqi_result = calendar_info.get("jieqi_info", {}).get("jieqi_result_a", {})
+        try:
+            window_start = max(jieqi_result["prev_jie"]["time"], jieqi_result["prev_qi"]["time"])  # 最近一次节气交接时刻（不晚于占时）
+            window_end = min(jieqi_result["next_jie"]["time"], jieqi_result["next_qi"]["time"])  # 下一次节气交接时刻（晚于占时）
+            return window_start, window_end
+        except KeyError:  # 输出投影不含节气信息时单独计算节气区间
+            pass
+        try:
+            return calendar_algorithm_core.get_jieqi_window(*instant)
+        except CalendarError:  # 节气区间无法计算时不做分桶缓存
+            return None
+
+    # 私有方法：把桶内缓存的历法信息改写为请求时刻（只复制随时分秒变化的子字典，其余子字典共享；投影中不存在的字段跳过）
+    @staticmethod
+    def _apply_instant(calendar_info: Dict[str, Any], instant: Tuple[int, ...], instant_str: str) -> Dict[str, Any]:
+        result = dict(calendar_info)
+        solar_info = calendar_info.get("solar_info")
+        if solar_info is not None:
+            new_solar_info = dict(solar_info)
+            time_values = {"solar_hour": instant[3], "solar_minute": instant[4], "solar_second": instant[5], "solar_YmdHms": instant_str}  # 公历时、分、秒和年月日时分秒
+            for name, value in time_values.items():
+                if name in new_solar_info:
+                    new_solar_info[name] = value
+            if "solar_FullString" in new_solar_info:  # 公历完整字符串以YmdHms开头，替换其中的时间部分
+                new_solar_info["solar_FullString"] = instant_str + solar_info["solar_FullString"][len(instant_str):]
+            result["solar_info"] = new_solar_info
+        jieqi_result = calendar_info.get("jieqi_info", {}).get("jieqi_result_a")
+        if jieqi_result and "new" in jieqi_result:
+            jieqi_result = dict(jieqi_result)
+            jieqi_result["new"] = {"name": jieqi_result["new"]["name"], "time": instant_str}  # 占时改为请求时刻
+            result["jieqi_info"] = {**calendar_info["jieqi_info"], "jieqi_result_a": jieqi_result}
+        return result
+
+    # 私有方法：时辰分桶模式查询，同一日期同一时辰内按节气区间复用计算结果，跨越节气交接时刻时拆分为新的区间变体
+    def _get_solar_by_shichen(self, instant: Tuple[int, ...], projection: Tuple, profile: str, fields: Optional[List[str]], validated: bool = False) -> Dict[str, Any]:
+        if not (0 <= instant[3] <= 23 and 0 <= instant[4] <= 59 and 0 <= instant[5] <= 59):  # 时分秒越界时不查桶，交由Core层验证并抛出异常
+            return self._compute(instant, profile, fields)
+        key = (instant[0], instant[1], instant[2], shichen_bucket(instant[3]), projection)  # 分桶键：(年, 月, 日, 时辰, 输出投影)
+        instant_str = "%04d-%02d-%02d %02d:%02d:%02d" % instant  # 与lunar-python的toYmdHms格式一致，可直接按字符串比较
+        calendar_info = None
+        with self._lock:
+            for window_start, window_end, cached_info in self._lookup(key) or ():
+                if window_start <= instant_str < window_end:  # 请求时刻落在已缓存的节气区间内
+                    calendar_info = cached_info
+                    break
+            if calendar_info is not None:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if calendar_info is not None:
+            if calendar_info.get("solar_info", {}).get("solar_YmdHms") == instant_str:  # 与缓存计算时刻相同，直接返回
+                return calendar_info
+            return self._apply_instant(calendar_info, instant, instant_str)
+
+        # 缓存未命中（新时辰或跨越节气交接时刻），在锁外精确计算
+        calendar_info = self._compute(instant, profile, fields, validated)
+        window = _WHOLE_BUCKET if self._is_jieqi_free(projection) else self._get_jieqi_window(calendar_info, instant)
+        if window is not None:
+            with self._lock:
+                variants = self._lookup(key) or ()
+                self._store(key, variants + ((window[0], window[1], calendar_info),))  # 追加区间变体
+        return calendar_info
+
+    # 将农历日期映射为公历日期（带缓存，映射与时分秒无关）
+    def resolve_lunar_date(self, lunar_year: int, lunar_month: int, lunar_day: int, is_leap_month: bool = False) -> Tuple[int, int, int]:
+        lunar_key = (int(lunar_year), int(lunar_month), int(lunar_day), bool(is_leap_month))
+        with self._lock:
+            solar_date = self._lunar_dates.get(lunar_key)
+            if solar_date is not None:
+                self._lunar_dates.move_to_end(lunar_key)
+                return solar_date
+
+        # 验证农历日期（时分秒在公历查询时由Core层统一验证）
+        error = calendar_validator.check_lunar_values(*lunar_key[:3], 0, 0, 0, lunar_key[3])
+        if error:  # 如果验证结果无效
+            raise CalendarError(f"[Core层验证] {error}")
+        return self._map_lunar_date(lunar_key)
+
+    # 私有方法：将已验证的农历日期映射为公历日期（带缓存）
+    def _map_lunar_date(self, lunar_key: Tuple[int, int, int, bool]) -> Tuple[int, int, int]:
+        with self._lock:
+            solar_date = self._lunar_dates.get(lunar_key)
+            if solar_date is not None:
+                self._lunar_dates.move_to_end(lunar_key)
+                return solar_date
+
+        solar_date = resolve_lunar_date(*lunar_key)  # 查逐日历法表或按农历月首日推算，不构造Lunar对象
+        with self._lock:
+            self._lunar_dates[lunar_key] = solar_date
+            while len(self._lunar_dates) > self.max_size:
+                self._lunar_dates.popitem(last=False)
+        return solar_date
+
+    # 获取农历时刻对应的历法信息（先映射到公历日期，与公历输入共用同一缓存条目）
+    def get_lunar(self, lunar_year: int, lunar_month: int, lunar_day: int, hour: int = 0, minute: int = 0, second: int = 0, is_leap_month: bool = False,
+                  profile: str = "full", fields: Optional[List[str]] = None) -> Dict[str, Any]:
+        year, month, day = self.resolve_lunar_date(lunar_year, lunar_month, lunar_day, is_leap_month)
+        return self.get_solar(year, month, day, hour, minute, second, profile, fields)
+
+    # 按关键字参数获取历法信息（包含lunar_year时按农历处理，否则按公历处理）
+    def get(self, **kwargs) -> Dict[str, Any]:
+        if 'lunar_year' in kwargs:
+            return self.get_lunar(**kwargs)
+        return self.get_solar(**kwargs)
+
+    # 清空缓存和统计计数
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._lunar_dates.clear()
+            self.hits = self.misses = self.evictions = self.expirations = 0
+
+    # 获取缓存统计信息
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "mode": self.mode,  # 缓存模式
+                "size": len(self._entries),  # 当前条目数（shichen模式为时辰分桶数）
+                "max_size": self.max_size,  # 最大条目数
+                "ttl_seconds": self.ttl_seconds,  # 条目存活时间（秒）
+                "lunar_date_size": len(self._lunar_dates),  # 农历日期映射条目数
+                "hits": self.hits,  # 命中次数
+                "misses": self.misses,  # 未命中次数
+                "evictions": self.evictions,  # 容量淘汰次数
+                "expirations": self.expirations,  # 过期移除次数
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0  # 命中率
+            }
+
+
+# 创建全局共享缓存实例：CalendarService与LiuYaoService共用
+calendar_cache = CalendarCache(
+    max_size=settings.CALENDAR_CACHE_SIZE,  # 最大缓存条目数
+    ttl_seconds=settings.CALENDAR_CACHE_TTL,  # 缓存条目存活时间（秒）
+    mode=settings.CALENDAR_CACHE_MODE  # 缓存模式
+)
+
+
+# 默认导出列表，定义模块的公开接口
+__all__ = [
+    'CALENDAR_CACHE_MODES',  # 导出缓存模式列表
+    'shichen_bucket',  # 导出时辰分桶函数
+    'CalendarCache',  # 导出缓存类，便于测试和独立实例化
+    'calendar_cache'  # 导出全局共享缓存实例
+]
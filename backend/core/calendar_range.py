@@ -0,0 +1,102 @@
+# backend/src/core/calendar_range.py 2026-10-18 18:40:00
+# 功能：历法日期范围（月历、年历、任意日期区间）生成，按儒略日数逐日推进，日期级农历、干支和节日字段读取逐日历法表（范围之外按农历年逐月逐日生成），节气按一次区间查询标注，不逐日构造Solar/Lunar对象
+
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple  # 导入类型注解工具
+from lunar_python.util import SolarUtil  # 导入lunar-python公历工具类，用于获取公历月天数（含1582年10月的历法切换）
+from core.calendar_table import lookup_calendar_day  # 导入逐日记录查询函数（历法表优先，范围之外按农历年生成）
+from core.festival_index import FESTIVAL_KINDS  # 导入四类节日名称
+from core.ganzhi_arithmetic import julian_day_number, date_from_julian_day_number  # 导入儒略日数与公历日期的互相换算
+from core.jieqi_index import JieqiIndex, encode_instant, format_instant, jieqi_index  # 导入节气交接时刻索引
+
+# 支持的公历年范围：逐日记录生成需要前后相邻农历年的节气表
+CALENDAR_RANGE_YEARS = (2, 9998)
+
+
+# 计算公历月的首日和末日儒略日数（含两端）
+def month_span(year: int, month: int) -> Tuple[int, int]:
+    return julian_day_number(year, month, 1), julian_day_number(year, month, SolarUtil.getDaysOfMonth(year, month))
+
+
+# 计算公历年的首日和末日儒略日数（含两端）
+def year_span(year: int) -> Tuple[int, int]:
+    return julian_day_number(year, 1, 1), julian_day_number(year, 12, 31)
+
+
+# 私有函数：查询日期区间内的全部节气，返回儒略日数 → (节气名称, 交接时刻)；节气索引范围之外按所涉公历年临时计算
+def _jieqi_by_day(start_jdn: int, end_jdn: int) -> Dict[int, Tuple[str, str]]:
+    start, end = date_from_julian_day_number(start_jdn), date_from_julian_day_number(end_jdn)
+    start_code, end_code = encode_instant(*start), encode_instant(*end, 23, 59, 59)
+    terms = jieqi_index.find_terms_between(start_code, end_code)
+    if terms is None:
+        terms = JieqiIndex.build(start[0], end[0]).find_terms_between(start_code, end_code)
+    by_day = {}
+    for code, name in terms:
+        year, month, day = code // 10 ** 10, code // 10 ** 8 % 100, code // 10 ** 6 % 100
+        by_day[julian_day_number(year, month, day)] = (name, format_instant(code))
+    return by_day
+
+
+# 逐日生成日期区间[start_jdn, end_jdn]（儒略日数，含两端）的历法信息，每天一个字典，字段名与历法转换结果保持一致
+def iter_calendar_days(start_jdn: int, end_jdn: int) -> Iterator[Dict[str, object]]:
+    jieqi_days = _jieqi_by_day(start_jdn, end_jdn)  # 区间内的节气一次查出
+    for jdn in range(start_jdn, end_jdn + 1):
+        year, month, day = date_from_julian_day_number(jdn)
+        record = lookup_calendar_day(year, month, day)
+        jieqi: Optional[Tuple[str, str]] = jieqi_days.get(jdn)
+        yield {
+            "solar_Ymd": "%04d-%02d-%02d" % (year, month, day),  # 公历年月日
+            "solar_year": year,  # 公历年份
+            "solar_month": month,  # 公历月份
+            "solar_day": day,  # 公历日期
+            "solar_week": (jdn + 1) % 7,  # 公历星期（0为星期日，与lunar-python的getWeek一致）
+            "lunar_year": record.getYear(),  # 农历年份
+            "lunar_month": record.getMonth(),  # 农历月份（闰月为负数）
+            "lunar_day": record.getDay(),  # 农历日期
+            "lunar_month_in_Chinese": record.getMonthInChinese(),  # 农历月份中文
+            "lunar_day_in_Chinese": record.getDayInChinese(),  # 农历日期中文
+            "lunar_month_days": record.getMonthDayCount(),  # 农历月份天数
+            "lunar_year_in_GanZhi": record.getYearInGanZhi(),  # 农历年干支（正月初一起算）
+            "lunar_month_in_GanZhi": record.getMonthInGanZhi(),  # 农历月干支（节令当天起算）
+            "lunar_day_in_GanZhi": record.getDayInGanZhi(),  # 农历日干支
+            "jieqi": jieqi[0] if jieqi else None,  # 当天交接的节气名称
+            "jieqi_time": jieqi[1] if jieqi else None,  # 当天节气交接时刻
+            "solar_festivals": list(record.festivals["solar_festivals"]),  # 公历节日
+            "solar_other_festivals": list(record.festivals["solar_other_festivals"]),  # 公历其他节日
+            "lunar_festivals": record.getFestivals(),  # 农历节日
+            "lunar_other_festivals": record.getOtherFestivals(),  # 农历其他节日
+        }
+
+
+# 生成日期区间的历法信息列表
+def get_calendar_days(start_jdn: int, end_jdn: int) -> List[Dict[str, object]]:
+    return list(iter_calendar_days(start_jdn, end_jdn))
+
+
+# 一次遍历日期区间，列出有节日的日期：kinds为要返回的节日类别（默认四类全部），节日读取逐日记录（由节日查找表编译）
+def get_festival_days(start_jdn: int, end_jdn: int, kinds: Sequence[str] = FESTIVAL_KINDS) -> List[Dict[str, object]]:
+    festival_days = []
+    for jdn in range(start_jdn, end_jdn + 1):
+        year, month, day = date_from_julian_day_number(jdn)
+        record = lookup_calendar_day(year, month, day)
+        festivals = {kind: list(record.festivals[kind]) for kind in kinds}
+        if not any(festivals.values()):
+            continue
+        festival_days.append({
+            "solar_Ymd": "%04d-%02d-%02d" % (year, month, day),  # 公历年月日
+            "solar_week": (jdn + 1) % 7,  # 公历星期（0为星期日）
+            "lunar_month_in_Chinese": record.getMonthInChinese(),  # 农历月份中文
+            "lunar_day_in_Chinese": record.getDayInChinese(),  # 农历日期中文
+            **festivals,  # 各类节日名称列表
+        })
+    return festival_days
+
+
+# 默认导出列表，指定模块的公开接口
+__all__ = [
+    'CALENDAR_RANGE_YEARS',
+    'month_span',
+    'year_span',
+    'iter_calendar_days',
+    'get_calendar_days',
+    'get_festival_days'
+]
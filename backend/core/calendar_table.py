@@ -0,0 +1,358 @@
+# backend/src/core/calendar_table.py 2026-10-18 15:40:00
+# 功能：逐日历法表，构建步骤为指定公历年份范围内的每一天写入一条定长二进制记录（农历年月日、闰月标志、月天数、年月日干支序号和节日编号），运行时通过mmap按日期下标直接读取，多个工作进程共享同一份页缓存
+
+import datetime  # 导入日期模块，用于日期与记录下标的换算
+import logging  # 导入Python标准日志模块，用于记录历法表加载情况
+import mmap  # 导入内存映射模块，用于零拷贝读取历法表文件
+import os  # 导入操作系统模块，用于处理历法表文件路径
+import struct  # 导入结构体模块，用于读写文件头和定长记录
+from functools import lru_cache  # 导入LRU缓存装饰器，用于缓存历法表范围之外最近生成的农历年记录
+from typing import Dict, Iterable, List, Optional, Tuple  # 导入类型注解工具：Dict（字典类型）、Iterable（可迭代类型）、List（列表类型）、Optional（可选类型）、Tuple（元组类型）
+from lunar_python import Lunar, LunarYear, Solar  # 导入lunar-python库的农历类、农历年类和公历类，用于生成和校验历法表
+from lunar_python.util import LunarUtil  # 导入lunar-python工具类，提供干支、生肖和中文数字
+from data.sixty_jiazi_data import SIXTY_JIAZI  # 导入六十甲子循环表
+from core.ganzhi_arithmetic import day_pillar_index  # 导入纯整数日柱序号计算函数
+from core.festival_index import FESTIVAL_KINDS, festival_index  # 导入四类节日名称和节日查找表实例
+from config import settings  # 导入应用配置对象，用于读取历法表文件路径
+
+logger = logging.getLogger(__name__)  # 获取当前模块的日志记录器实例
+
+# 文件头：魔数、格式版本、起始年、结束年、记录条数、四类节日的槽位数、节日名称表字节数（小端序）
+_HEADER = struct.Struct("<4sHhhIBBBBI")
+_MAGIC = b"CLTB"
+_VERSION = 1
+
+# 记录固定字段：农历年、农历月（绝对值）、农历日、闰月标志、月天数、年干支序号（正月初一起算）、年干支序号（立春当天起算）、月干支序号（节令当天起算）、日干支序号
+_RECORD_FIELDS = "hBBBBBBBB"
+
+# 记录前缀：农历年、农历月（绝对值）、农历日、闰月标志，用于按农历日期二分查找记录
+_LUNAR_DATE = struct.Struct("<hBBB")
+
+# 默认历法表文件路径（由scripts/build_calendar_table.py生成，不纳入版本库）
+DEFAULT_TABLE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "calendar_table.bin")
+
+
+# 逐日记录视图：字段来自历法表的一条定长记录，方法名与lunar-python的Lunar保持一致，可替代Lunar对象提供日期级农历字段
+class CalendarDay:
+    __slots__ = ("year", "month", "day", "is_leap", "month_day_count", "year_ganzhi_index", "year_ganzhi_index_by_lichun",
+                 "month_ganzhi_index", "day_ganzhi_index", "festivals")
+
+    def __init__(self, values: Tuple[int, ...], festivals: Dict[str, List[str]]):
+        (self.year, self.month, self.day, self.is_leap, self.month_day_count, self.year_ganzhi_index,
+         self.year_ganzhi_index_by_lichun, self.month_ganzhi_index, self.day_ganzhi_index) = values
+        self.festivals = festivals  # 节日名称列表：节日类别 → 名称列表
+
+    def getYear(self) -> int:
+        return self.year
+
+    def getMonth(self) -> int:
+        return -self.month if self.is_leap else self.month  # 与lunar-python一致，闰月用负数表示
+
+    def getDay(self) -> int:
+        return self.day
+
+    def getMonthDayCount(self) -> int:
+        return self.month_day_count
+
+    def getYearInChinese(self) -> str:
+        return "".join(LunarUtil.NUMBER[ord(digit) - 48] for digit in str(self.year))
+
+    def getMonthInChinese(self) -> str:
+        return ("闰" if self.is_leap else "") + LunarUtil.MONTH[self.month]
+
+    def getDayInChinese(self) -> str:
+        return LunarUtil.DAY[self.day]
+
+    def getYearInGanZhi(self) -> str:
+        return SIXTY_JIAZI[self.year_ganzhi_index]
+
+    def getYearGan(self) -> str:
+        return SIXTY_JIAZI[self.year_ganzhi_index][0]
+
+    def getYearZhi(self) -> str:
+        return SIXTY_JIAZI[self.year_ganzhi_index][1]
+
+    def getYearShengXiao(self) -> str:
+        return LunarUtil.SHENGXIAO[self.year_ganzhi_index % 12 + 1]
+
+    def getYearShengXiaoByLiChun(self) -> str:
+        return LunarUtil.SHENGXIAO[self.year_ganzhi_index_by_lichun % 12 + 1]
+
+    def getMonthInGanZhi(self) -> str:
+        return SIXTY_JIAZI[self.month_ganzhi_index]
+
+    def getDayInGanZhi(self) -> str:
+        return SIXTY_JIAZI[self.day_ganzhi_index]
+
+    def getFestivals(self) -> List[str]:
+        return list(self.festivals["lunar_festivals"])
+
+    def getOtherFestivals(self) -> List[str]:
+        return list(self.festivals["lunar_other_festivals"])
+
+    def toString(self) -> str:
+        return "%s年%s月%s" % (self.getYearInChinese(), self.getMonthInChinese(), self.getDayInChinese())
+
+
+# 逐日历法表类：文件通过mmap只读映射，按(公历日期序数 - 起始日期序数) × 记录长度定位记录
+class CalendarTable:
+
+    # 初始化空历法表（文件缺失时使用，全部查询返回None）
+    def __init__(self):
+        self.start_year = 0  # 覆盖的起始公历年
+        self.end_year = -1  # 覆盖的结束公历年
+        self.record_count = 0  # 记录条数
+        self._start_ordinal = 0  # 起始日期（start_year-01-01）的序数
+        self._record = struct.Struct("<" + _RECORD_FIELDS)  # 记录结构
+        self._slots = (0, 0, 0, 0)  # 四类节日的槽位数
+        self._names: Tuple[str, ...] = ("",)  # 节日名称表（编号0表示空槽位）
+        self._data_offset = 0  # 记录区在文件中的起始位置
+        self._mmap: Optional[mmap.mmap] = None  # 内存映射对象
+
+    # 记录条数
+    def __len__(self) -> int:
+        return self.record_count
+
+    # 私有方法：根据各类节日槽位数生成记录结构
+    @staticmethod
+    def _record_struct(slots: Tuple[int, ...]) -> struct.Struct:
+        return struct.Struct("<" + _RECORD_FIELDS + "H" * sum(slots))
+
+    # 以只读内存映射方式打开历法表文件
+    @classmethod
+    def open(cls, path: str) -> "CalendarTable":
+        table = cls()
+        with open(path, "rb") as table_file:
+            table._mmap = mmap.mmap(table_file.fileno(), 0, access=mmap.ACCESS_READ)  # 映射后即可关闭文件描述符
+        magic, version, start_year, end_year, count, *slots, names_size = _HEADER.unpack_from(table._mmap, 0)
+        if magic != _MAGIC or version != _VERSION:  # 检查文件格式
+            table.close()
+            raise ValueError(f"[Core层验证] 历法表文件格式无效: {path}")
+        table.start_year, table.end_year, table.record_count = start_year, end_year, count
+        table._start_ordinal = datetime.date(start_year, 1, 1).toordinal()
+        table._slots = tuple(slots)
+        table._record = cls._record_struct(table._slots)
+        names_start = _HEADER.size
+        table._names = ("",) + tuple(bytes(table._mmap[names_start:names_start + names_size]).decode("utf-8").split("\0")) if names_size else ("",)
+        table._data_offset = names_start + names_size
+        if len(table._mmap) < table._data_offset + count * table._record.size:  # 检查文件是否完整
+            table.close()
+            raise ValueError(f"[Core层验证] 历法表文件不完整: {path}")
+        return table
+
+    # 关闭内存映射
+    def close(self) -> None:
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        self.record_count = 0
+
+    # 查询公历日期对应的逐日记录；超出历法表范围时返回None
+    def lookup(self, year: int, month: int, day: int) -> Optional[CalendarDay]:
+        if not self.start_year <= year <= self.end_year or self._mmap is None:
+            return None
+        position = datetime.date(year, month, day).toordinal() - self._start_ordinal  # 记录下标
+        values = self._record.unpack_from(self._mmap, self._data_offset + position * self._record.size)
+        festivals, cursor = {}, 9
+        for kind, slot_count in zip(FESTIVAL_KINDS, self._slots):
+            festivals[kind] = [self._names[name_id] for name_id in values[cursor:cursor + slot_count] if name_id]
+            cursor += slot_count
+        return CalendarDay(values[:9], festivals)
+
+    # 查询农历日期对应的公历日期：记录按公历日期排列，农历日期随之单调递增（闰月排在同数字的正常月之后），可按(年, 月×2+闰月标志, 日)二分查找；超出历法表范围或日期不存在时返回None
+    def find_lunar_date(self, lunar_year: int, lunar_month: int, lunar_day: int, is_leap_month: bool = False) -> Optional[Tuple[int, int, int]]:
+        if self._mmap is None or not self.start_year - 1 <= lunar_year <= self.end_year:
+            return None
+        target = (lunar_year, lunar_month * 2 + int(is_leap_month), lunar_day)
+        low, high = 0, self.record_count
+        while low < high:  # 查找第一条不小于目标农历日期的记录
+            middle = (low + high) // 2
+            year, month, day, is_leap = _LUNAR_DATE.unpack_from(self._mmap, self._data_offset + middle * self._record.size)
+            if (year, month * 2 + is_leap, day) < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low == self.record_count or tuple(_LUNAR_DATE.unpack_from(self._mmap, self._data_offset + low * self._record.size)) != (lunar_year, lunar_month, lunar_day, int(is_leap_month)):
+            return None
+        date = datetime.date.fromordinal(self._start_ordinal + low)
+        return date.year, date.month, date.day
+
+
+# 私有函数：计算lunar-python规则下的农历其他节日中依赖节气的部分（寒食节、春社、秋社）
+def _jieqi_other_festivals(solar_ymd: str, jieqi: Dict[str, Solar]) -> List[str]:
+    festivals = []
+    if solar_ymd == jieqi["清明"].next(-1).toYmd():  # 清明前一天为寒食节
+        festivals.append("寒食节")
+    for name, festival in (("立春", "春社"), ("立秋", "秋社")):  # 立春、立秋后第五个戊日为春社、秋社
+        term = jieqi[name]
+        offset = 4 - day_pillar_index(term.getYear(), term.getMonth(), term.getDay()) % 10
+        if offset < 0:
+            offset += 10
+        if solar_ymd == term.next(offset + 40).toYmd():
+            festivals.append(festival)
+    return festivals
+
+
+# 私有函数：计算指定年份的节气表（节气名 → 交接时刻），与lunar-python的Lunar对象内部节气表一致
+def _jieqi_table(year: int) -> Dict[str, Solar]:
+    jieqi_days = LunarYear.fromYear(year).getJieQiJulianDays()
+    return {name: Solar.fromJulianDay(jieqi_days[i]) for i, name in enumerate(Lunar.JIE_QI_IN_USE)}
+
+
+# 私有函数：逐个农历年生成逐日记录，返回公历日期 → (固定字段元组, 节日名称字典)；jieqi_tables为公历年 → 节气表（Lunar对象使用其公历日期所在年份的节气表）
+def _build_lunar_year_days(lunar_year: int, jieqi_tables: Dict[int, Dict[str, Solar]]) -> Dict[datetime.date, Tuple[Tuple[int, ...], Dict[str, List[str]]]]:
+    year_data = LunarYear.fromYear(lunar_year)
+    year_index = (lunar_year - 4) % 60  # 年干支序号（正月初一起算）
+    months = [lunar_month for lunar_month in year_data.getMonths() if lunar_month.getYear() == lunar_year]
+
+    days = {}
+    for month_position, lunar_month in enumerate(months):
+        month, is_leap = abs(lunar_month.getMonth()), lunar_month.getMonth() < 0
+        for day in range(1, lunar_month.getDayCount() + 1):
+            solar = Solar.fromJulianDay(lunar_month.getFirstJulianDay() + day - 1)
+            solar_ymd = solar.toYmd()
+            jieqi = jieqi_tables[solar.getYear()]
+            jie_starts = [jieqi[Lunar.JIE_QI_IN_USE[i]].toYmd() for i in range(0, len(Lunar.JIE_QI_IN_USE), 2)]  # 各节令交接日期
+
+            # 年干支（立春当天起算），规则与lunar-python的Lunar.__computeYear一致
+            li_chun = jieqi["立春"] if jieqi["立春"].getYear() == solar.getYear() else jieqi["LI_CHUN"]
+            year_offset = 0
+            if lunar_year == solar.getYear() and solar_ymd < li_chun.toYmd():
+                year_offset = -1
+            elif lunar_year < solar.getYear() and solar_ymd >= li_chun.toYmd():
+                year_offset = 1
+            year_index_by_lichun = (year_index + year_offset) % 60
+
+            # 月干支（节令当天起算），规则与lunar-python的Lunar.__computeMonth一致
+            month_offset, start = -3, None
+            for end in jie_starts:
+                if (solar_ymd if start is None else start) <= solar_ymd < end:
+                    break
+                start = end
+                month_offset += 1
+            month_gan = ((month_offset + 10 if month_offset < 0 else month_offset) + ((year_index_by_lichun % 10 + (1 if month_offset < 0 else 0)) % 5 + 1) * 2) % 10
+            month_zhi = ((month_offset + 12 if month_offset < 0 else month_offset) + LunarUtil.BASE_MONTH_ZHI_INDEX) % 12
+            month_index = next(i for i in range(month_gan, 60, 10) if i % 12 == month_zhi)
+
+            # 节日：按节日查找表读取，依赖节气的农历其他节日按节气表补充
+            signed_month = -month if is_leap else month
+            is_year_end = month_position == len(months) - 1 and day == lunar_month.getDayCount()  # 农历年最后一天为除夕
+            lunar_festivals = festival_index.lunar_festivals(signed_month, day, is_year_end)
+            lunar_other = festival_index.lunar_other_festivals(signed_month, day) + _jieqi_other_festivals(solar_ymd, jieqi)
+
+            date = datetime.date(solar.getYear(), solar.getMonth(), solar.getDay())
+            values = (lunar_year, month, day, int(is_leap), lunar_month.getDayCount(), year_index, year_index_by_lichun, month_index,
+                      day_pillar_index(date.year, date.month, date.day))
+            days[date] = (values, {
+                "solar_festivals": festival_index.solar_festivals(solar.getYear(), solar.getMonth(), solar.getDay()),
+                "solar_other_festivals": festival_index.solar_other_festivals(solar.getMonth(), solar.getDay()),
+                "lunar_festivals": lunar_festivals,
+                "lunar_other_festivals": lunar_other,
+            })
+    return days
+
+
+# 生成农历年内全部日期的逐日记录（历法表范围之外的回退路径），返回公历日期 → 逐日记录；按农历年逐月逐日推进，每个农历年只计算一次农历月和节气表，缓存最近生成的几个农历年
+@lru_cache(maxsize=8)
+def generate_lunar_year(lunar_year: int) -> Dict[datetime.date, CalendarDay]:
+    jieqi_tables = {year: _jieqi_table(year) for year in (lunar_year, lunar_year + 1)}  # 农历年跨越两个公历年
+    return {date: CalendarDay(values, festivals) for date, (values, festivals) in _build_lunar_year_days(lunar_year, jieqi_tables).items()}
+
+
+# 生成指定公历年份范围的逐日历法表文件，返回记录条数
+def build_calendar_table(start_year: int, end_year: int, path: str) -> int:
+    if start_year > end_year:
+        raise ValueError(f"[Core层验证] 历法表起始年不能大于结束年: {start_year} > {end_year}")
+    start, end = datetime.date(start_year, 1, 1), datetime.date(end_year, 12, 31)
+    jieqi_tables = {year: _jieqi_table(year) for year in range(start_year - 1, end_year + 2)}
+    days = {}
+    for lunar_year in range(start_year - 1, end_year + 1):  # 公历年初的日期属于上一农历年
+        days.update({date: record for date, record in _build_lunar_year_days(lunar_year, jieqi_tables).items() if start <= date <= end})
+    count = (end - start).days + 1
+    if len(days) != count:
+        raise ValueError(f"[Core层验证] 历法表日期不完整: 期望{count}天，实际{len(days)}天")
+
+    names: List[str] = []  # 节日名称表
+    name_ids: Dict[str, int] = {}
+    slots = [0] * len(FESTIVAL_KINDS)  # 各类节日单日最多个数
+    for _, festivals in days.values():
+        for i, kind in enumerate(FESTIVAL_KINDS):
+            slots[i] = max(slots[i], len(festivals[kind]))
+            for name in festivals[kind]:
+                if name not in name_ids:
+                    names.append(name)
+                    name_ids[name] = len(names)  # 编号从1开始，0表示空槽位
+    record = CalendarTable._record_struct(tuple(slots))
+    names_bytes = "\0".join(names).encode("utf-8")
+
+    with open(path, "wb") as table_file:
+        table_file.write(_HEADER.pack(_MAGIC, _VERSION, start_year, end_year, count, *slots, len(names_bytes)))
+        table_file.write(names_bytes)
+        for offset in range(count):
+            values, festivals = days[start + datetime.timedelta(days=offset)]
+            festival_ids = []
+            for kind, slot_count in zip(FESTIVAL_KINDS, slots):
+                ids = [name_ids[name] for name in festivals[kind]]
+                festival_ids.extend(ids + [0] * (slot_count - len(ids)))
+            table_file.write(record.pack(*values, *festival_ids))
+    return count
+
+
+# 逐日校验历法表与lunar-python的计算结果，返回不一致的日期描述列表
+def verify_calendar_table(table: CalendarTable, dates: Iterable[datetime.date]) -> List[str]:
+    mismatches = []
+    for date in dates:
+        record = table.lookup(date.year, date.month, date.day)
+        if record is None:  # 超出历法表范围的日期不校验
+            continue
+        solar = Solar.fromYmd(date.year, date.month, date.day)
+        lunar = solar.getLunar()
+        actual = (record.getYear(), record.getMonth(), record.getDay(), record.getMonthDayCount(), record.getYearInGanZhi(),
+                  record.getYearShengXiaoByLiChun(), record.getMonthInGanZhi(), record.getDayInGanZhi(), record.toString(),
+                  record.festivals["solar_festivals"], record.festivals["solar_other_festivals"], record.getFestivals(), record.getOtherFestivals())
+        expected = (lunar.getYear(), lunar.getMonth(), lunar.getDay(), LunarYear.fromYear(lunar.getYear()).getMonth(lunar.getMonth()).getDayCount(),
+                    lunar.getYearInGanZhi(), lunar.getYearShengXiaoByLiChun(), lunar.getMonthInGanZhi(), lunar.getDayInGanZhi(), lunar.toString(),
+                    solar.getFestivals(), solar.getOtherFestivals(), lunar.getFestivals(), lunar.getOtherFestivals())
+        if actual != expected:
+            mismatches.append(f"{date}: 历法表{actual} != lunar-python{expected}")
+    return mismatches
+
+
+# 查询公历日期的逐日记录：优先读取历法表，超出历法表范围时按农历年生成（公历年初的日期属于上一农历年）；
+# 日期按lunar-python的公历规则（1582-10-15之前为儒略历）标识，公历年范围2~9998（需要前后相邻农历年的节气表）
+def lookup_calendar_day(year: int, month: int, day: int) -> CalendarDay:
+    record = calendar_table.lookup(year, month, day)
+    if record is not None:
+        return record
+    date = datetime.date(year, month, day)
+    return generate_lunar_year(year).get(date) or generate_lunar_year(year - 1)[date]
+
+
+# 私有函数：打开配置的历法表文件，文件不存在或损坏时返回空表（全部查询回退到lunar-python）
+def _open_default_table() -> CalendarTable:
+    path = settings.CALENDAR_TABLE_PATH or DEFAULT_TABLE_PATH
+    try:
+        table = CalendarTable.open(path)
+    except (OSError, ValueError, struct.error) as e:
+        logger.info(f"逐日历法表未加载，将回退到lunar-python逐次计算: {path}，原因: {str(e)}")
+        return CalendarTable()
+    logger.info(f"逐日历法表加载完成: {table.start_year}~{table.end_year}年，共{len(table)}天")
+    return table
+
+
+# 创建全局逐日历法表实例：模块导入（应用启动）时映射一次，各工作进程共享操作系统页缓存
+calendar_table = _open_default_table()
+
+
+# 默认导出列表，指定模块的公开接口
+__all__ = [
+    'FESTIVAL_KINDS',
+    'DEFAULT_TABLE_PATH',
+    'CalendarDay',
+    'CalendarTable',
+    'build_calendar_table',
+    'verify_calendar_table',
+    'generate_lunar_year',
+    'lookup_calendar_day',
+    'calendar_table'
+]
@@ -0,0 +1,75 @@
+# backend/src/core/festival_index.py 2026-10-18 19:00:00
+# 功能：节日查找表，启动时把lunar-python的公历节日、公历其他节日、按星期的公历节日、农历节日和农历其他节日编译为以(月, 日)为键的字典，查询时直接按键读取，不再每次调用getFestivals()/getOtherFestivals()拼接字符串键扫描节日表
+
+from typing import Dict, List, Tuple  # 导入类型注解工具
+from lunar_python.util import LunarUtil, SolarUtil  # 导入lunar-python工具类，提供公历和农历节日表
+from core.ganzhi_arithmetic import julian_day_number  # 导入儒略日数计算函数，用于计算星期
+
+# 四类节日：公历节日、公历其他节日、农历节日、农历其他节日
+FESTIVAL_KINDS: Tuple[str, ...] = ("solar_festivals", "solar_other_festivals", "lunar_festivals", "lunar_other_festivals")
+
+# 月日键：(月, 日)，农历闰月的月份为负数
+MonthDay = Tuple[int, int]
+
+
+# 私有函数：把lunar-python的"月-日"字符串键转换为(月, 日)整数键
+def _month_day_key(key: str) -> MonthDay:
+    month, day = key.split("-")
+    return int(month), int(day)
+
+
+# 节日查找表：各类节日按整数键编译一次，查询结果与lunar-python的Solar/Lunar节日方法一致
+class FestivalIndex:
+    __slots__ = ("solar", "solar_other", "solar_week", "lunar", "lunar_other")
+
+    def __init__(self):
+        self.solar: Dict[MonthDay, str] = {_month_day_key(key): name for key, name in SolarUtil.FESTIVAL.items()}  # 公历节日：(月, 日) → 名称
+        self.solar_other: Dict[MonthDay, Tuple[str, ...]] = {_month_day_key(key): tuple(names) for key, names in SolarUtil.OTHER_FESTIVAL.items()}  # 公历其他节日：(月, 日) → 名称元组
+        self.solar_week: Dict[Tuple[int, int, int], str] = {  # 按星期的公历节日：(月, 第几周（0为最后一周）, 星期) → 名称
+            tuple(int(part) for part in key.split("-")): name for key, name in SolarUtil.WEEK_FESTIVAL.items()
+        }
+        self.lunar: Dict[MonthDay, str] = {_month_day_key(key): name for key, name in LunarUtil.FESTIVAL.items()}  # 农历节日：(月, 日) → 名称
+        self.lunar_other: Dict[MonthDay, Tuple[str, ...]] = {_month_day_key(key): tuple(names) for key, names in LunarUtil.OTHER_FESTIVAL.items()}  # 农历其他节日：(月, 日) → 名称元组
+
+    # 查询公历节日（含按星期的节日，如母亲节），规则与lunar-python的Solar.getFestivals一致
+    def solar_festivals(self, year: int, month: int, day: int) -> List[str]:
+        festivals = []
+        name = self.solar.get((month, day))
+        if name:
+            festivals.append(name)
+        week = (julian_day_number(year, month, day) + 1) % 7  # 星期（0为星期日）
+        name = self.solar_week.get((month, (day + 6) // 7, week))  # 当月第几个星期几
+        if name:
+            festivals.append(name)
+        if day + 7 > SolarUtil.getDaysOfMonth(year, month):  # 当月最后一个星期几
+            name = self.solar_week.get((month, 0, week))
+            if name:
+                festivals.append(name)
+        return festivals
+
+    # 查询公历其他节日
+    def solar_other_festivals(self, month: int, day: int) -> List[str]:
+        return list(self.solar_other.get((month, day), ()))
+
+    # 查询农历节日：month为农历月（闰月为负数），is_year_end表示农历年最后一天（除夕）
+    def lunar_festivals(self, month: int, day: int, is_year_end: bool = False) -> List[str]:
+        name = self.lunar.get((month, day))
+        festivals = [name] if name else []
+        if is_year_end:
+            festivals.append("除夕")
+        return festivals
+
+    # 查询农历其他节日中按农历日期固定的部分（寒食节、春社、秋社依赖节气，由调用方按节气表补充）
+    def lunar_other_festivals(self, month: int, day: int) -> List[str]:
+        return list(self.lunar_other.get((month, day), ()))
+
+
+# 创建全局节日查找表实例，导入时编译一次
+festival_index = FestivalIndex()
+
+# 默认导出列表，指定模块的公开接口
+__all__ = [
+    'FESTIVAL_KINDS',
+    'FestivalIndex',
+    'festival_index'
+]
@@ -0,0 +1,117 @@
+# backend/src/core/four_pillars_search.py 2026-10-18 18:10:00
+# 功能：四柱反查引擎，按年柱的六十甲子序号定位精确干支年，按节令交接时刻定位月柱区间，再按日柱六十循环和五鼠遁直接推算时辰区间，返回与四柱匹配的全部公历时间区间，不逐日调用lunar-python
+
+from typing import Dict, List, Tuple  # 导入类型注解工具
+from data.sixty_jiazi_data import SIXTY_JIAZI  # 导入六十甲子循环表
+from app.validators.four_pillars_validator import DI_ZHI, WU_HU_DUN_FULL, WU_SHU_DUN_FULL  # 导入地支列表、五虎遁表和五鼠遁表
+from core.ganzhi_arithmetic import julian_day_number, date_from_julian_day_number  # 导入儒略日数与公历日期的互相换算
+from core.jieqi_index import jieqi_index, lunar_month_window  # 导入节气交接时刻索引实例和索引范围之外的回退函数
+
+_SECONDS_PER_DAY = 86400  # 一天的秒数
+_SECONDS_PER_HOUR = 3600  # 一小时的秒数
+
+# 儒略日数偏移：六十甲子序号 = (儒略日数 + 49) % 60，与ganzhi_arithmetic一致
+_JIAZI_JDN_OFFSET = 49
+
+# 流派：1表示晚子时（23点）日柱算明天，2表示晚子时日柱算当天（与lunar-python的Solar.fromBaZi一致）
+FOUR_PILLARS_SECTS = (1, 2)
+
+# 时间区间：(起始秒数, 结束秒数)，秒数以儒略日数0日0时为起点，区间左闭右开
+TimeWindow = Tuple[int, int]
+
+
+# 私有函数：整数时刻YYYYMMDDhhmmss转换为秒数
+def _code_to_seconds(code: int) -> int:
+    date_code, time_code = divmod(code, 10 ** 6)
+    year, month_day = divmod(date_code, 10 ** 4)
+    hour, minute_second = divmod(time_code, 10 ** 4)
+    minute, second = divmod(minute_second, 100)
+    return julian_day_number(year, *divmod(month_day, 100)) * _SECONDS_PER_DAY + hour * _SECONDS_PER_HOUR + minute * 60 + second
+
+
+# 私有函数：秒数格式化为"YYYY-MM-DD HH:MM:SS"（与lunar-python的toYmdHms格式一致）
+def _format_seconds(seconds: int) -> str:
+    jdn, day_seconds = divmod(seconds, _SECONDS_PER_DAY)
+    hour, minute_second = divmod(day_seconds, _SECONDS_PER_HOUR)
+    return "%04d-%02d-%02d %02d:%02d:%02d" % (*date_from_julian_day_number(jdn), hour, *divmod(minute_second, 60))
+
+
+# 私有函数：精确干支年中第month_offset个节令月（寅月为0）的区间，索引范围之外回退到lunar-python
+def _month_window(year_exact: int, month_offset: int) -> TimeWindow:
+    window = jieqi_index.find_month_window(year_exact, month_offset)
+    if window is None:
+        window = lunar_month_window(year_exact, month_offset)
+    return _code_to_seconds(window[0]), _code_to_seconds(window[1])
+
+
+# 私有函数：列出日柱所在日（儒略日数pillar_day，日柱序号day_index）中时柱为time_pillar的时辰区间
+def _time_windows(pillar_day: int, day_index: int, time_pillar: str, sect: int) -> List[TimeWindow]:
+    base = pillar_day * _SECONDS_PER_DAY  # 当天0点
+    day_gan = SIXTY_JIAZI[day_index][0]  # 日干
+    zhi_index = DI_ZHI.index(time_pillar[1])  # 时支序号（子时为0）
+    if zhi_index != 0:  # 丑时至亥时：时干按当天日干起五鼠遁
+        if WU_SHU_DUN_FULL[day_gan][zhi_index] != time_pillar:
+            return []
+        start = base + (zhi_index * 2 - 1) * _SECONDS_PER_HOUR
+        return [(start, start + 2 * _SECONDS_PER_HOUR)]
+    if sect == 1:  # 晚子时算明天：子时为前一天23点至当天1点，时干按当天日干起
+        return [(base - _SECONDS_PER_HOUR, base + _SECONDS_PER_HOUR)] if WU_SHU_DUN_FULL[day_gan][0] == time_pillar else []
+    # 晚子时算当天：早子时（0点至1点）时干按当天日干起，晚子时（23点至24点）时干按次日日干起
+    windows = []
+    if WU_SHU_DUN_FULL[day_gan][0] == time_pillar:
+        windows.append((base, base + _SECONDS_PER_HOUR))
+    if WU_SHU_DUN_FULL[SIXTY_JIAZI[(day_index + 1) % 60][0]][0] == time_pillar:
+        windows.append((base + 23 * _SECONDS_PER_HOUR, base + _SECONDS_PER_DAY))
+    return windows
+
+
+# 私有函数：在节令月区间内查找日柱为day_index的那一天（节令月不足60天，至多一天），返回其时柱匹配的时辰区间
+def _day_windows(month_window: TimeWindow, day_index: int, time_pillar: str, sect: int) -> List[TimeWindow]:
+    window_start, window_end = month_window
+    day_shift = _SECONDS_PER_HOUR if sect == 1 else 0  # 晚子时算明天时，日柱所在日从前一天23点开始
+    first_day = (window_start + day_shift) // _SECONDS_PER_DAY  # 节令月起始时刻所在的日柱日
+    pillar_day = first_day + (day_index - first_day - _JIAZI_JDN_OFFSET) % 60  # 日柱序号为day_index的第一天
+    if pillar_day * _SECONDS_PER_DAY - day_shift >= window_end:
+        return []
+    return _time_windows(pillar_day, day_index, time_pillar, sect)
+
+
+# 反查与四柱匹配的全部公历时间区间：start_year~end_year为公历年范围（含两端），结果按时间排序，每项为左闭右开的[start, end)
+def search_four_pillars(year_pillar: str, month_pillar: str, day_pillar: str, time_pillar: str,
+                        start_year: int, end_year: int, sect: int = 1) -> List[Dict[str, str]]:
+    for pillar in (year_pillar, month_pillar, day_pillar, time_pillar):
+        if pillar not in SIXTY_JIAZI:
+            raise ValueError(f"[Core层验证] 无效的六十甲子组合: {pillar}")
+    if sect not in FOUR_PILLARS_SECTS:
+        raise ValueError(f"[Core层验证] 流派必须是{list(FOUR_PILLARS_SECTS)}中的一个，当前值：{sect}")
+    if start_year > end_year:
+        raise ValueError(f"[Core层验证] 起始年不能大于结束年: {start_year} > {end_year}")
+
+    month_pillars = WU_HU_DUN_FULL[year_pillar[0]]
+    if month_pillar not in month_pillars:  # 年干与月柱不符合五虎遁，没有匹配的时间
+        return []
+    month_offset = month_pillars.index(month_pillar)  # 节令月序号（寅月为0）
+    day_index = SIXTY_JIAZI.index(day_pillar)
+    range_start = julian_day_number(start_year, 1, 1) * _SECONDS_PER_DAY  # 起始年1月1日0点
+    range_end = julian_day_number(end_year + 1, 1, 1) * _SECONDS_PER_DAY  # 结束年次年1月1日0点
+
+    # 精确干支年从立春开始，与起始年1月重叠的是前一个干支年；干支年序号 = (年 - 4) % 60
+    first_year = max(1, start_year - 1)
+    year_exact = first_year + (SIXTY_JIAZI.index(year_pillar) + 4 - first_year) % 60
+    matches = []
+    while year_exact <= end_year:
+        month_window = _month_window(year_exact, month_offset)
+        for window_start, window_end in _day_windows(month_window, day_index, time_pillar, sect):
+            start = max(window_start, month_window[0], range_start)  # 时辰区间与节令月区间、查询年范围取交集
+            end = min(window_end, month_window[1], range_end)
+            if start < end:
+                matches.append({"start": _format_seconds(start), "end": _format_seconds(end)})
+        year_exact += 60
+    return matches
+
+
+# 默认导出列表，指定模块的公开接口
+__all__ = [
+    'FOUR_PILLARS_SECTS',
+    'search_four_pillars'
+]
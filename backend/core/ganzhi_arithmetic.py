@@ -0,0 +1,111 @@
+# backend/src/core/ganzhi_arithmetic.py 2026-10-18 14:30:00
+# 功能：纯整数干支运算模块，按儒略日数取模计算日柱，按五鼠遁表计算时柱，不构造lunar-python的Solar/Lunar对象
+
+from typing import Dict, Tuple  # 导入类型注解工具：Dict（字典类型）、Tuple（元组类型）
+from data.sixty_jiazi_data import SIXTY_JIAZI  # 导入六十甲子循环表
+from app.validators.four_pillars_validator import WU_SHU_DUN_FULL  # 导入五鼠遁表（日干 × 时支 → 时柱）
+
+# 格里高利历起始日（1582-10-15）的比较值：年×372+月×31+日，与lunar-python的儒略日计算保持同一分界
+_GREGORIAN_START = 588829
+
+# 格里高利历起始日（1582-10-15）的儒略日数
+_GREGORIAN_START_JDN = 2299161
+
+# 儒略日数偏移：六十甲子序号 = (儒略日数 + 49) % 60（例如2000-01-07为甲子日）
+_JIAZI_JDN_OFFSET = 49
+
+
+# 日柱和时柱相关的干支字段名（与历法转换结果ganzhi_info中的名称一致），这些字段只随公历日期和小时变化，与节气交接时刻无关
+DAY_HOUR_GANZHI_FIELDS = (
+    "lunar_day_in_ganzhi_exact", "lunar_day_in_gan_exact", "lunar_day_in_zhi_exact",
+    "lunar_day_in_ganzhi_exact2", "lunar_day_in_gan_exact2", "lunar_day_in_zhi_exact2",
+    "lunar_time_in_gan_exact", "lunar_time_in_zhi_exact", "lunar_time_in_ganzhi_exact",
+)
+
+
+# 计算公历日期正午的儒略日数（整数），1582-10-15之前按儒略历计算，与lunar-python的Solar.getJulianDay()取整结果一致
+def julian_day_number(year: int, month: int, day: int) -> int:
+    a = (14 - month) // 12  # 1、2月视为上一年的13、14月
+    y = year + 4800 - a  # 以公元前4800年为起点的年数
+    m = month + 12 * a - 3  # 以3月为起点的月序号
+    jdn = day + (153 * m + 2) // 5 + 365 * y + y // 4  # 儒略历部分
+    if year * 372 + month * 31 + day >= _GREGORIAN_START:
+        return jdn - y // 100 + y // 400 - 32045  # 格里高利历修正
+    return jdn - 32083  # 儒略历
+
+
+# 由儒略日数反推公历日期(年, 月, 日)，1582-10-15（儒略日数2299161）之前按儒略历，与julian_day_number互为逆运算
+def date_from_julian_day_number(jdn: int) -> Tuple[int, int, int]:
+    if jdn >= _GREGORIAN_START_JDN:
+        a = jdn + 32044  # 格里高利历：以公元前4800年3月1日为起点的日数
+        b = (4 * a + 3) // 146097  # 400年周期数
+        c = a - 146097 * b // 4  # 周期内日数
+    else:
+        b = 0  # 儒略历没有百年修正
+        c = jdn + 32082
+    d = (4 * c + 3) // 1461  # 4年周期内的年数
+    e = c - 1461 * d // 4  # 年内日数（以3月1日为起点）
+    m = (5 * e + 2) // 153  # 以3月为起点的月序号
+    return 100 * b + d - 4800 + m // 10, m + 3 - 12 * (m // 10), e - (153 * m + 2) // 5 + 1
+
+
+# 计算时支序号：0点与23点为子时（0），1~22点每两小时一个时辰（1~11）
+def time_zhi_index(hour: int) -> int:
+    return (hour + 1) // 2 % 12
+
+
+# 计算日柱在六十甲子中的序号；exact2=False时晚子时（23点）日柱算次日，exact2=True时晚子时日柱算当天
+def day_pillar_index(year: int, month: int, day: int, hour: int = 0, exact2: bool = False) -> int:
+    index = (julian_day_number(year, month, day) + _JIAZI_JDN_OFFSET) % 60  # 当天日柱序号
+    if hour == 23 and not exact2:
+        index = (index + 1) % 60  # 晚子时日柱算次日
+    return index
+
+
+# 计算日柱干支；对应Lunar.getDayInGanZhiExact()（exact2=False）和Lunar.getDayInGanZhiExact2()（exact2=True）
+def day_pillar(year: int, month: int, day: int, hour: int = 0, exact2: bool = False) -> str:
+    return SIXTY_JIAZI[day_pillar_index(year, month, day, hour, exact2)]
+
+
+# 计算时柱干支；时干按晚子时算次日的日干起五鼠遁，对应Lunar.getTimeInGanZhi()
+def hour_pillar(year: int, month: int, day: int, hour: int) -> str:
+    day_gan = SIXTY_JIAZI[day_pillar_index(year, month, day, hour)][0]  # 日干（晚子时算次日）
+    return WU_SHU_DUN_FULL[day_gan][time_zhi_index(hour)]  # 查五鼠遁表
+
+
+# 一次计算日柱（两种晚子时流派）和时柱，返回(日柱, 日柱2, 时柱)
+def day_hour_pillars(year: int, month: int, day: int, hour: int = 0) -> Tuple[str, str, str]:
+    index2 = (julian_day_number(year, month, day) + _JIAZI_JDN_OFFSET) % 60  # 晚子时算当天的日柱序号
+    index = (index2 + 1) % 60 if hour == 23 else index2  # 晚子时算次日的日柱序号
+    day_ganzhi = SIXTY_JIAZI[index]
+    return day_ganzhi, SIXTY_JIAZI[index2], WU_SHU_DUN_FULL[day_ganzhi[0]][time_zhi_index(hour)]
+
+
+# 计算日柱和时柱相关的全部干支字段，字段名与历法转换结果ganzhi_info中的名称一致
+def day_hour_ganzhi_fields(year: int, month: int, day: int, hour: int = 0) -> Dict[str, str]:
+    day_ganzhi, day_ganzhi2, time_ganzhi = day_hour_pillars(year, month, day, hour)
+    return {
+        "lunar_day_in_ganzhi_exact": day_ganzhi,  # 日柱（晚子时算次日）
+        "lunar_day_in_gan_exact": day_ganzhi[0],  # 日干
+        "lunar_day_in_zhi_exact": day_ganzhi[1],  # 日支
+        "lunar_day_in_ganzhi_exact2": day_ganzhi2,  # 日柱（晚子时算当天）
+        "lunar_day_in_gan_exact2": day_ganzhi2[0],  # 日干2
+        "lunar_day_in_zhi_exact2": day_ganzhi2[1],  # 日支2
+        "lunar_time_in_gan_exact": time_ganzhi[0],  # 时干
+        "lunar_time_in_zhi_exact": time_ganzhi[1],  # 时支
+        "lunar_time_in_ganzhi_exact": time_ganzhi,  # 时柱
+    }
+
+
+# 默认导出列表，指定模块的公开接口
+__all__ = [
+    'DAY_HOUR_GANZHI_FIELDS',
+    'julian_day_number',
+    'date_from_julian_day_number',
+    'time_zhi_index',
+    'day_pillar_index',
+    'day_pillar',
+    'hour_pillar',
+    'day_hour_pillars',
+    'day_hour_ganzhi_fields'
+]
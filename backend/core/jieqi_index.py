@@ -0,0 +1,250 @@
+# backend/src/core/jieqi_index.py 2026-10-18 15:00:00
+# 功能：节气交接时刻索引，预先计算指定年份范围内全部二十四节气的交接时刻并以紧凑二进制文件保存，启动时加载后按二分查找获取前后节令、气令和年、月精确干支
+
+import array  # 导入数组模块，用于紧凑存储节气时刻和节气序号
+import bisect  # 导入二分查找模块，用于在有序时刻数组中定位请求时刻
+import logging  # 导入Python标准日志模块，用于记录索引加载情况
+import os  # 导入操作系统模块，用于处理索引文件路径
+import struct  # 导入结构体模块，用于读写索引文件头
+import sys  # 导入系统模块，用于判断本机字节序
+from typing import Dict, List, Optional, Tuple  # 导入类型注解工具：Dict（字典类型）、List（列表类型）、Optional（可选类型）、Tuple（元组类型）
+from lunar_python import Lunar, Solar  # 导入lunar-python库的农历类和公历类，用于生成和校验索引
+from data.sixty_jiazi_data import SIXTY_JIAZI  # 导入六十甲子循环表，用于年柱计算
+from app.validators.four_pillars_validator import WU_HU_DUN_FULL  # 导入五虎遁表（年干 × 月支 → 月柱）
+from config import settings  # 导入应用配置对象，用于读取索引文件路径
+
+logger = logging.getLogger(__name__)  # 获取当前模块的日志记录器实例
+
+# 二十四节气名称（与lunar-python的Lunar.JIE_QI顺序一致），索引文件中保存的节气序号即此元组下标
+JIEQI_NAMES: Tuple[str, ...] = Lunar.JIE_QI
+
+# 节令名称 → 以立春为0的月序号（立春寅月为0，小寒丑月为11），不在此表中的为气令
+JIE_MONTH_OFFSET: Dict[str, int] = {
+    "立春": 0, "惊蛰": 1, "清明": 2, "立夏": 3, "芒种": 4, "小暑": 5,
+    "立秋": 6, "白露": 7, "寒露": 8, "立冬": 9, "大雪": 10, "小寒": 11,
+}
+
+# lunar-python节气表中跨年节气的英文键 → 中文名称
+_LUNAR_TABLE_KEYS: Dict[str, str] = {
+    "DA_XUE": "大雪", "DONG_ZHI": "冬至", "XIAO_HAN": "小寒", "DA_HAN": "大寒",
+    "LI_CHUN": "立春", "YU_SHUI": "雨水", "JING_ZHE": "惊蛰",
+}
+
+# 索引文件头：魔数、格式版本、起始年、结束年、节气个数（小端序）
+_HEADER = struct.Struct("<4sHhhI")
+_MAGIC = b"JQIX"
+_VERSION = 1
+
+# 默认索引文件路径
+DEFAULT_INDEX_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "jieqi_index.bin")
+
+# 节气信息：(节气名称, 交接时刻字符串"YYYY-MM-DD HH:MM:SS")
+JieqiTerm = Tuple[str, str]
+
+
+# 将公历时刻编码为整数YYYYMMDDhhmmss，整数大小顺序与lunar-python的toYmdHms字符串比较顺序一致
+def encode_instant(year: int, month: int, day: int, hour: int = 0, minute: int = 0, second: int = 0) -> int:
+    return ((((year * 100 + month) * 100 + day) * 100 + hour) * 100 + minute) * 100 + second
+
+
+# 将整数时刻解码为"YYYY-MM-DD HH:MM:SS"字符串（与lunar-python的toYmdHms格式一致）
+def format_instant(code: int) -> str:
+    code, second = divmod(code, 100)
+    code, minute = divmod(code, 100)
+    code, hour = divmod(code, 100)
+    code, day = divmod(code, 100)
+    year, month = divmod(code, 100)
+    return "%04d-%02d-%02d %02d:%02d:%02d" % (year, month, day, hour, minute, second)
+
+
+# 节气交接时刻索引类：按时间排序的节令和气令分别存放，查询时各做一次二分查找
+class JieqiIndex:
+
+    # 初始化索引：instants为全部节气时刻（已排序），term_ids为对应的节气序号
+    def __init__(self, start_year: int = 0, end_year: int = -1, instants: Optional[array.array] = None, term_ids: Optional[array.array] = None):
+        self.start_year = start_year  # 索引覆盖的起始年（公历）
+        self.end_year = end_year  # 索引覆盖的结束年（公历）
+        self.instants = instants if instants is not None else array.array("q")  # 全部节气时刻
+        self.term_ids = term_ids if term_ids is not None else array.array("B")  # 全部节气序号
+        jie_positions = [i for i, term_id in enumerate(self.term_ids) if JIEQI_NAMES[term_id] in JIE_MONTH_OFFSET]
+        qi_positions = [i for i, term_id in enumerate(self.term_ids) if JIEQI_NAMES[term_id] not in JIE_MONTH_OFFSET]
+        self._jie_instants = [self.instants[i] for i in jie_positions]  # 节令时刻（有序）
+        self._jie_names = [JIEQI_NAMES[self.term_ids[i]] for i in jie_positions]  # 节令名称
+        self._qi_instants = [self.instants[i] for i in qi_positions]  # 气令时刻（有序）
+        self._qi_names = [JIEQI_NAMES[self.term_ids[i]] for i in qi_positions]  # 气令名称
+        self._li_chun_positions = {  # 立春所在公历年（即精确干支年）→ 立春在节令数组中的位置
+            instant // 10 ** 10: position for position, (instant, name) in enumerate(zip(self._jie_instants, self._jie_names)) if name == "立春"
+        }
+
+    # 索引中的节气个数
+    def __len__(self) -> int:
+        return len(self.instants)
+
+    # 从二进制文件加载索引
+    @classmethod
+    def load(cls, path: str) -> "JieqiIndex":
+        with open(path, "rb") as index_file:
+            magic, version, start_year, end_year, count = _HEADER.unpack(index_file.read(_HEADER.size))
+            if magic != _MAGIC or version != _VERSION:  # 检查文件格式
+                raise ValueError(f"[Core层验证] 节气索引文件格式无效: {path}")
+            instants = array.array("q")
+            instants.frombytes(index_file.read(count * instants.itemsize))
+            term_ids = array.array("B")
+            term_ids.frombytes(index_file.read(count))
+        if len(instants) != count or len(term_ids) != count:  # 检查文件是否完整
+            raise ValueError(f"[Core层验证] 节气索引文件不完整: {path}")
+        if sys.byteorder == "big":  # 文件按小端序保存
+            instants.byteswap()
+        return cls(start_year, end_year, instants, term_ids)
+
+    # 将索引写入二进制文件
+    def save(self, path: str) -> None:
+        instants = array.array("q", self.instants)
+        if sys.byteorder == "big":  # 文件按小端序保存
+            instants.byteswap()
+        with open(path, "wb") as index_file:
+            index_file.write(_HEADER.pack(_MAGIC, _VERSION, self.start_year, self.end_year, len(self.instants)))
+            index_file.write(instants.tobytes())
+            index_file.write(self.term_ids.tobytes())
+
+    # 使用lunar-python计算指定公历年份范围内的全部节气时刻并构建索引
+    @classmethod
+    def build(cls, start_year: int, end_year: int) -> "JieqiIndex":
+        if start_year > end_year:
+            raise ValueError(f"[Core层验证] 节气索引起始年不能大于结束年: {start_year} > {end_year}")
+        terms: Dict[int, int] = {}  # 节气时刻 → 节气序号（相邻农历年的节气表有重叠，按时刻去重）
+        for lunar_year in range(start_year - 1, end_year + 2):
+            for key, solar in Lunar.fromYmd(lunar_year, 1, 1).getJieQiTable().items():
+                if not start_year <= solar.getYear() <= end_year:
+                    continue
+                code = encode_instant(solar.getYear(), solar.getMonth(), solar.getDay(), solar.getHour(), solar.getMinute(), solar.getSecond())
+                terms[code] = JIEQI_NAMES.index(_LUNAR_TABLE_KEYS.get(key, key))
+        codes = sorted(terms)
+        term_ids = [terms[code] for code in codes]
+        for previous, current in zip(term_ids, term_ids[1:]):  # 节气必须按顺序首尾相接，不能重复或遗漏
+            if current != (previous + 1) % len(JIEQI_NAMES):
+                raise ValueError(f"[Core层验证] 节气序列不连续: {JIEQI_NAMES[previous]} → {JIEQI_NAMES[current]}")
+        return cls(start_year, end_year, array.array("q", codes), array.array("B", term_ids))
+
+    # 私有方法：在有序时刻数组中查找前一个（不晚于请求时刻）和后一个（晚于请求时刻）的位置，越界时返回None
+    @staticmethod
+    def _around(instants: List[int], code: int) -> Optional[int]:
+        position = bisect.bisect_right(instants, code)
+        if position == 0 or position == len(instants):  # 请求时刻超出索引范围
+            return None
+        return position
+
+    # 查找请求时刻的前后节令和气令，返回(前一节令, 后一节令, 前一气令, 后一气令)；超出索引范围时返回None
+    def find_terms(self, year: int, month: int, day: int, hour: int = 0, minute: int = 0, second: int = 0) -> Optional[Tuple[JieqiTerm, JieqiTerm, JieqiTerm, JieqiTerm]]:
+        code = encode_instant(year, month, day, hour, minute, second)
+        jie_position = self._around(self._jie_instants, code)
+        qi_position = self._around(self._qi_instants, code)
+        if jie_position is None or qi_position is None:
+            return None
+        return (
+            (self._jie_names[jie_position - 1], format_instant(self._jie_instants[jie_position - 1])),  # 前一节令
+            (self._jie_names[jie_position], format_instant(self._jie_instants[jie_position])),  # 后一节令
+            (self._qi_names[qi_position - 1], format_instant(self._qi_instants[qi_position - 1])),  # 前一气令
+            (self._qi_names[qi_position], format_instant(self._qi_instants[qi_position])),  # 后一气令
+        )
+
+    # 查找请求时刻的节气有效区间[最近一次节气交接时刻, 下一次节气交接时刻)；超出索引范围时返回None
+    def find_window(self, year: int, month: int, day: int, hour: int = 0, minute: int = 0, second: int = 0) -> Optional[Tuple[str, str]]:
+        position = self._around(self.instants, encode_instant(year, month, day, hour, minute, second))
+        if position is None:
+            return None
+        return format_instant(self.instants[position - 1]), format_instant(self.instants[position])
+
+    # 计算请求时刻的年、月精确干支（以立春和各节令交接时刻为界），返回(年柱, 月柱)；超出索引范围时返回None
+    def find_year_month_pillars(self, year: int, month: int, day: int, hour: int = 0, minute: int = 0, second: int = 0) -> Optional[Tuple[str, str]]:
+        jie_position = self._around(self._jie_instants, encode_instant(year, month, day, hour, minute, second))
+        if jie_position is None:
+            return None
+        month_offset = JIE_MONTH_OFFSET[self._jie_names[jie_position - 1]]  # 所在节令月（寅月为0）
+        li_chun_position = jie_position - 1 - month_offset  # 最近一次立春在节令数组中的位置
+        if li_chun_position < 0:
+            return None
+        year_exact = self._jie_instants[li_chun_position] // 10 ** 10  # 立春所在公历年即精确干支年
+        year_pillar = SIXTY_JIAZI[(year_exact - 4) % 60]
+        return year_pillar, WU_HU_DUN_FULL[year_pillar[0]][month_offset]
+
+    # 查找[start_code, end_code]（整数时刻，含两端）内的全部节气，返回[(整数时刻, 节气名称), ...]；区间超出索引覆盖的公历年范围时返回None
+    def find_terms_between(self, start_code: int, end_code: int) -> Optional[List[Tuple[int, str]]]:
+        if not len(self.instants) or start_code // 10 ** 10 < self.start_year or end_code // 10 ** 10 > self.end_year:
+            return None
+        low, high = bisect.bisect_left(self.instants, start_code), bisect.bisect_right(self.instants, end_code)
+        return [(self.instants[i], JIEQI_NAMES[self.term_ids[i]]) for i in range(low, high)]
+
+    # 查找精确干支年中第month_offset个节令月（寅月为0）的区间[节令交接时刻, 下一节令交接时刻)，返回整数时刻；超出索引范围时返回None
+    def find_month_window(self, year_exact: int, month_offset: int) -> Optional[Tuple[int, int]]:
+        li_chun_position = self._li_chun_positions.get(year_exact)
+        if li_chun_position is None or li_chun_position + month_offset + 1 >= len(self._jie_instants):
+            return None
+        return self._jie_instants[li_chun_position + month_offset], self._jie_instants[li_chun_position + month_offset + 1]
+
+
+# 使用lunar-python计算节令月区间（索引范围之外的回退路径），返回整数时刻(节令交接时刻, 下一节令交接时刻)
+def lunar_month_window(year_exact: int, month_offset: int) -> Tuple[int, int]:
+    jieqi_table = Lunar.fromYmd(year_exact, 1, 1).getJieQiTable()  # 农历年的节气表从上一年大雪到下一年立春
+    start, end = jieqi_table[Lunar.JIE_QI_IN_USE[4 + month_offset * 2]], jieqi_table[Lunar.JIE_QI_IN_USE[6 + month_offset * 2]]
+    return (encode_instant(start.getYear(), start.getMonth(), start.getDay(), start.getHour(), start.getMinute(), start.getSecond()),
+            encode_instant(end.getYear(), end.getMonth(), end.getDay(), end.getHour(), end.getMinute(), end.getSecond()))
+
+
+# 使用lunar-python计算请求时刻的前后节令和气令（索引范围之外的回退路径）
+def lunar_jieqi_terms(lunar_date: Lunar) -> Tuple[JieqiTerm, JieqiTerm, JieqiTerm, JieqiTerm]:
+    prev_jie, next_jie = lunar_date.getPrevJie(), lunar_date.getNextJie()
+    prev_qi, next_qi = lunar_date.getPrevQi(), lunar_date.getNextQi()
+    return (
+        (prev_jie.getName(), prev_jie.getSolar().toYmdHms()),  # 前一节令
+        (next_jie.getName(), next_jie.getSolar().toYmdHms()),  # 后一节令
+        (prev_qi.getName(), prev_qi.getSolar().toYmdHms()),  # 前一气令
+        (next_qi.getName(), next_qi.getSolar().toYmdHms()),  # 后一气令
+    )
+
+
+# 逐个时刻校验索引与lunar-python的计算结果，返回不一致的时刻描述列表
+def verify_jieqi_index(index: JieqiIndex, instants: List[Tuple[int, int, int, int, int, int]]) -> List[str]:
+    mismatches = []
+    for instant in instants:
+        terms = index.find_terms(*instant)
+        pillars = index.find_year_month_pillars(*instant)
+        if terms is None or pillars is None:  # 超出索引范围的时刻不校验
+            continue
+        lunar_date = Solar.fromYmdHms(*instant).getLunar()
+        expected_terms = lunar_jieqi_terms(lunar_date)
+        expected_pillars = (lunar_date.getYearInGanZhiExact(), lunar_date.getMonthInGanZhiExact())
+        if terms != expected_terms or pillars != expected_pillars:
+            mismatches.append(f"{format_instant(encode_instant(*instant))}: 索引{terms}{pillars} != lunar-python{expected_terms}{expected_pillars}")
+    return mismatches
+
+
+# 私有函数：加载配置的索引文件，文件不存在或损坏时返回空索引（全部查询回退到lunar-python）
+def _load_default_index() -> JieqiIndex:
+    path = settings.JIEQI_INDEX_PATH or DEFAULT_INDEX_PATH
+    try:
+        index = JieqiIndex.load(path)
+    except (OSError, ValueError, struct.error) as e:
+        logger.warning(f"节气索引加载失败，将回退到lunar-python逐次计算: {path}，原因: {str(e)}")
+        return JieqiIndex()
+    logger.info(f"节气索引加载完成: {index.start_year}~{index.end_year}年，共{len(index)}个节气")
+    return index
+
+
+# 创建全局节气索引实例：模块导入（应用启动）时加载一次
+jieqi_index = _load_default_index()
+
+
+# 默认导出列表，指定模块的公开接口
+__all__ = [
+    'JIEQI_NAMES',
+    'JIE_MONTH_OFFSET',
+    'DEFAULT_INDEX_PATH',
+    'encode_instant',
+    'format_instant',
+    'JieqiIndex',
+    'lunar_month_window',
+    'lunar_jieqi_terms',
+    'verify_jieqi_index',
+    'jieqi_index'
+]
@@ -1,21 +1,29 @@
 # backend/src/core/liuyao_algorithm_core.py 2026-02-14 10:00:00
 # 功能：六爻排盘核心算法实现，集成历法转换功能，提供完整的六爻计算与历法信息
 
-from typing import List, Dict, Any, Optional, Tuple  # 导入类型注解工具：List（列表类型）、Dict（字典类型）、Any（任意类型）、Optional（可选类型）、Tuple（元组类型）
-from collections import OrderedDict  # 导入有序字典，用于实现LRU缓存
-from data.liuyao_configuration_data import SIXTY_FOUR_GUA, GUA_PALACES, TIAN_GAN_TO_LIU_SHEN  # 导入六十四卦、卦宫和天干转六神的静态数据
-from core.calendar_algorithm_core import calendar_algorithm_core  # 导入历法算法核心实例，用于公历农历转换和干支计算
+import itertools  # 导入迭代工具模块，用于枚举全部奇数个数组合
+import threading  # 导入线程模块，用于保护卦象模板表的并发构建
+from typing import List, Dict, Any, Optional, Sequence, Tuple  # 导入类型注解工具：List（列表类型）、Dict（字典类型）、Any（任意类型）、Optional（可选类型）、Sequence（序列类型）、Tuple（元组类型）
+from data.liuyao_gua_table import GUA_TABLE, BIAN_LIU_QIN_TABLE, LIU_SHEN_BY_DAY_GAN, GuaRecord  # 导入按整数卦码索引的只读六十四卦表、变卦六亲表和日干转六神表
+from core.calendar_cache import CalendarCache, calendar_cache  # 导入历法信息缓存类和全局共享缓存实例，用于公历农历转换和干支计算
 from app.validators.liuyao_validator import liuyao_validator  # 导入六爻验证器实例，用于Core层验证
+from app.validators.validated_types import ValidatedCast, ValidatedDateTime  # 导入已验证起卦请求和时刻值类型，已验证的请求跳过Core层重复验证
+
+# 卦象模板模式：off（每次请求重新构建）、lazy（首次用到时构建并缓存）、eager（启动时预编译全部模板）
+GUA_TEMPLATE_MODES = ("off", "lazy", "eager")
 
 # 六爻排盘核心算法类
 class LiuYaoAlgorithmCore:
     # 初始化六爻算法核心类
-    def __init__(self, max_cache_size: int = 100):
-        self.sixty_four_gua = SIXTY_FOUR_GUA  # 存储六十四卦静态数据
-        self.gua_palaces = GUA_PALACES  # 存储卦宫静态数据
-        self.tian_gan_to_liu_shen = TIAN_GAN_TO_LIU_SHEN  # 存储天干转六神的静态数据
-        self.calendar_cache = OrderedDict()  # 使用有序字典实现LRU缓存
-        self.max_cache_size = max_cache_size  # 最大缓存大小
+    def __init__(self, calendar_cache_instance: Optional[CalendarCache] = None, gua_template_mode: str = "lazy"):
+        if gua_template_mode not in GUA_TEMPLATE_MODES:  # 检查卦象模板模式是否有效
+            raise ValueError(f"[Core层验证] 无效的卦象模板模式: {gua_template_mode}，必须是{GUA_TEMPLATE_MODES}中的一个")
+        self.calendar_cache = calendar_cache_instance or calendar_cache  # 历法信息缓存，默认使用与CalendarService共享的全局实例
+        self.gua_template_mode = gua_template_mode  # 卦象模板模式
+        self._gua_templates: Dict[Tuple[int, ...], Dict[str, Any]] = {}  # 卦象模板表：键为奇数个数元组（共4^6=4096种），值为与日干、历法无关的排盘结构
+        self._gua_templates_lock = threading.Lock()  # 模板表构建锁，保证线程池并发下每个模板只构建一次
+        if gua_template_mode == "eager":  # 启动时预编译模式
+            self.precompile_gua_templates()  # 一次性构建全部卦象模板
 
     # 统计每个爻位中奇数的个数
     def count_odd_digits(self, yao_list: List[str], validate: bool = True) -> List[int]:
@@ -34,16 +42,14 @@ class LiuYaoAlgorithmCore:
         return odd_counts_list  # 返回奇数个数列表
     
     # 本卦纳甲计算
-    def ben_gua_najia(self, odd_counts_list: List[int]) -> Tuple[Dict[str, Any], str]:
-        # 将奇数个数转换为阴阳爻（1为阳爻，0为阴爻）
-        ben_gua_list = [1 if v % 2 == 1 else 0 for v in odd_counts_list]  # 列表推导式，转换为阴阳爻列表
-        ben_gua_str = ''.join(map(str, ben_gua_list))  # 将列表转换为字符串
-        
-        # 查找对应的卦象
-        ben_gua_info_dict = self.sixty_four_gua.get(ben_gua_str, {})  # 从六十四卦中查找对应的纳甲信息
-        ben_gua_info_dict['数列'] = ben_gua_list  # 添加数列信息到卦象字典中
+    def ben_gua_najia(self, odd_counts_list: List[int]) -> Tuple[GuaRecord, str]:
+        # 将奇数个数转换为6位整数卦码（奇数个数为奇数时为阳爻，第i爻对应第i位）
+        ben_gua_code = 0  # 初始化本卦卦码
+        for i, v in enumerate(odd_counts_list):
+            ben_gua_code |= (v & 1) << i  # 阳爻置位
         
-        return ben_gua_info_dict, ben_gua_str  # 返回本卦信息字典和本卦字符串
+        ben_gua_record = GUA_TABLE[ben_gua_code]  # 按卦码直接索引只读卦象记录
+        return ben_gua_record, ben_gua_record.code_str  # 返回本卦记录和本卦字符串
     
     # 动爻判断
     def dong_yao(self, odd_counts_list: List[int]) -> Tuple[List[int], List[str]]:
@@ -73,101 +79,38 @@ class LiuYaoAlgorithmCore:
         return has_fu_shen, dong_yao_positions  # 返回是否有伏神和动爻位置列表
     
     # 变卦纳甲计算
-    def bian_gua_najia(self, odd_counts_list: List[int], ben_gua_info_dict: Dict[str, Any]) -> Tuple[Dict[str, Any], str]:
-        # 检查是否有动爻
-        dong_yao_positions = [i + 1 for i, v in enumerate(odd_counts_list) if v in (0, 3)]  # 计算动爻位
-        if len(dong_yao_positions) == 0:  # 如果没有动爻
-            return {}, ""  # 返回空字典和空字符串
-        
-        bian_gua_list = [1 if v == 0 else 0 if v in (2, 3) else 1 for v in odd_counts_list]  # 列表推导式，计算变卦的阴阳爻列表
-        bian_gua_str = ''.join(map(str, bian_gua_list))  # 将列表转换为字符串
-        bian_gua_info_dict = self.sixty_four_gua.get(bian_gua_str, {})  # 从六十四卦中查找对应的变卦信息
-        
-        # 重新计算变卦六亲
-        ben_gua_gong = ben_gua_info_dict.get('卦宫', '未知卦宫')  # 获取本卦的卦宫
-        if ben_gua_gong in self.gua_palaces:  # 如果本卦卦宫在卦宫数据中
-            bian_gua_liuqin_list = []  # 初始化变卦六亲列表
-            for dizhi in bian_gua_info_dict.get('纳支', []):  # 遍历变卦的纳支
-                liuqin = self.gua_palaces[ben_gua_gong].get(dizhi, '未知六亲')  # 根据卦宫和地支获取六亲
-                bian_gua_liuqin_list.append(liuqin)  # 将六亲添加到列表中
-            bian_gua_info_dict['六亲'] = bian_gua_liuqin_list  # 添加六亲信息到变卦字典中
-        
-        bian_gua_info_dict['数列'] = bian_gua_list  # 添加数列信息到变卦字典中
-        
-        return bian_gua_info_dict, bian_gua_str  # 返回变卦信息字典和变卦字符串
+    def bian_gua_najia(self, odd_counts_list: List[int], ben_gua_record: GuaRecord) -> Tuple[Optional[GuaRecord], Tuple[str, ...]]:
+        # 计算变卦卦码（老阴0变阳，老阳3变阴，少阳1、少阴2不变）
+        bian_gua_code = 0  # 初始化变卦卦码
+        has_dong_yao = False  # 是否有动爻
+        for i, v in enumerate(odd_counts_list):
+            if v in (0, 3):  # 动爻
+                has_dong_yao = True
+            if v in (0, 1):  # 变后为阳爻
+                bian_gua_code |= 1 << i
+        if not has_dong_yao:  # 如果没有动爻
+            return None, ()  # 返回空记录和空六亲
+        
+        bian_gua_record = GUA_TABLE[bian_gua_code]  # 按卦码直接索引变卦记录
+        bian_gua_liu_qin = BIAN_LIU_QIN_TABLE[ben_gua_record.palace_index][bian_gua_code]  # 变卦六亲按本卦卦宫重新推算（查预编译表）
+        return bian_gua_record, bian_gua_liu_qin  # 返回变卦记录和变卦六亲
     
     # 六神分布计算
-    def calculate_liu_shen(self, day_gan: str) -> List[str]:
-        valid_day_gans = ["甲", "乙", "丙", "丁", "戊", "己", "庚", "辛", "壬", "癸"]  # 有效的日干列表
-        if day_gan not in valid_day_gans:  # 检查日干是否有效
-            raise ValueError(f"[Core层验证] 无效的日干: {day_gan}，必须是{valid_day_gans}中的一个")  # 抛出带有Core层标识的值错误异常
+    def calculate_liu_shen(self, day_gan: str) -> Tuple[str, ...]:
+        liu_shen_list = LIU_SHEN_BY_DAY_GAN.get(day_gan)  # 从只读日干转六神表中获取六神分布
+        if liu_shen_list is None:  # 检查日干是否有效
+            raise ValueError(f"[Core层验证] 无效的日干: {day_gan}，必须是{list(LIU_SHEN_BY_DAY_GAN)}中的一个")  # 抛出带有Core层标识的值错误异常
         
-        return self.tian_gan_to_liu_shen.get(day_gan, [])  # 从天干转六神数据中获取六神分布列表
+        return liu_shen_list  # 返回六神分布元组（从初爻到上爻）
     
-    # 私有方法：获取历法信息（带LRU缓存）
+    # 私有方法：获取历法信息（使用共享历法缓存，农历输入归一到公历时刻）
     def _get_calendar_info_with_cache(self, **kwargs) -> Dict[str, Any]:
-        
-        cache_key = str(sorted(kwargs.items())) # 生成缓存键，将参数转换为字符串
-        
-        # 检查缓存中是否存在该历法信息
-        if cache_key in self.calendar_cache:
-            # 移动到末尾（最近使用）
-            self.calendar_cache.move_to_end(cache_key)
-            return self.calendar_cache[cache_key]  # 返回缓存的历法信息
-        
-        # 缓存中不存在，调用历法核心计算
-        if 'lunar_year' in kwargs:
-            # 农历转公历
-            calendar_info = calendar_algorithm_core.convert_lunar_to_solar(**kwargs)
-        else:
-            # 公历转农历
-            calendar_info = calendar_algorithm_core.convert_solar_to_lunar(**kwargs)
-        
-        # 将计算结果存入缓存
-        self.calendar_cache[cache_key] = calendar_info
-        
-        # 检查缓存大小，如果超过限制，删除最旧的
-        if len(self.calendar_cache) > self.max_cache_size:
-            self.calendar_cache.popitem(last=False)
-        
-        return calendar_info  # 返回历法信息
-    
-    # 私有方法：安全获取数组元素
-    def _safe_get_array_element(self, data: Dict[str, Any], key: str, index: int) -> str:
-        """安全获取数组元素，避免索引越界"""
-        array = data.get(key, [])
-        return array[index] if index < len(array) else ""
+        return self.calendar_cache.get(**kwargs)  # 公历传year/month/day，农历传lunar_year/lunar_month/lunar_day/is_leap_month
     
-    # 私有方法：获取爻的阴阳属性
-    def _get_yao_nature(self, data: Dict[str, Any], index: int) -> str:
-        """获取爻的阴阳属性（阳爻为"阳"，阴爻为"阴"）"""
-        array = data.get("数列", [])
-        if index >= len(array):
-            return ""
-        return "阳" if array[index] == 1 else "阴"
-    
-    # 私有方法：提取世应爻位
-    def _extract_shi_ying_positions(self, shi_ying_list: List[str]) -> Dict[str, int]:
-        """从世应数组中提取世爻位和应爻位（从下往上：1→6）"""
-        shi_position = 0
-        ying_position = 0
-        for i, value in enumerate(shi_ying_list):
-            if value == "世":
-                shi_position = i + 1
-            elif value == "应":
-                ying_position = i + 1
-        return {"shi_position": shi_position, "ying_position": ying_position}
-    
-    # 私有方法：统一计算逻辑
-    def _calculate_paipan_common(self, yao_list: List[str], calendar_info: Dict[str, Any], validate: bool = True) -> Dict[str, Any]:
-        # 从历法信息中提取日干
-        day_gan = calendar_info.get('ganzhi_info', {}).get('lunar_day_in_gan_exact', '甲')
-        
-        # 统计奇数个数（传递验证控制参数）
-        odd_counts_list = self.count_odd_digits(yao_list, validate=validate)  # 调用count_odd_digits方法统计奇数个数，传递验证控制参数
-        
+    # 私有方法：构建卦象结构（只依赖奇数个数，与日干和历法无关，可作为模板复用）
+    def _build_gua_structure(self, odd_counts_list: List[int]) -> Dict[str, Any]:
         # 计算本卦
-        ben_gua_info, ben_gua_str = self.ben_gua_najia(odd_counts_list)  # 调用ben_gua_najia方法计算本卦，获取本卦字符串
+        ben_gua, ben_gua_str = self.ben_gua_najia(odd_counts_list)  # 调用ben_gua_najia方法获取本卦记录和本卦字符串
         
         # 判断动爻
         dong_yao_positions, dong_yao_symbols = self.dong_yao(odd_counts_list)  # 调用dong_yao方法判断动爻
@@ -176,34 +119,10 @@ class LiuYaoAlgorithmCore:
         has_dong_yao = len(dong_yao_positions) > 0  # 判断是否有动爻（动爻位置列表长度大于0）
         
         # 计算变卦（如果有动爻）
-        bian_gua_info, bian_gua_str = self.bian_gua_najia(odd_counts_list, ben_gua_info) if has_dong_yao else ({}, "")  # 如果有动爻则计算变卦，否则返回空字典和空字符串
-        
-        # 计算六神
-        liu_shen_list = self.calculate_liu_shen(day_gan)  # 调用calculate_liu_shen方法计算六神分布
-        
-        # 获取伏神爻位信息（根据伏干列表判断哪些爻位有伏神）
-        fu_gan_list = ben_gua_info.get("伏干", [])  # 获取伏干列表
-        fu_shen_wei_list = []  # 初始化伏神爻位列表
+        bian_gua, bian_gua_liu_qin = self.bian_gua_najia(odd_counts_list, ben_gua)  # 无动爻时返回None和空六亲
         
-        # 遍历伏干列表，找出所有伏神爻位
-        for i, fu_gan in enumerate(fu_gan_list):
-            if fu_gan:  # 如果伏干不为空，说明该爻位有伏神
-                fu_shen_wei_list.append(i + 1)  # 添加爻位位置（从下往上：1→6）
-        
-        # 旧返回格式（已注释）
-        # result = {
-        #     "calendar_info": calendar_info,  # 历法信息
-        #     "yao_list": yao_list,  # 原始爻位列表
-        #     "odd_counts": odd_counts_list,  # 奇数个数列表
-        #     "ben_gua": ben_gua_info,  # 本卦信息
-        #     "dong_yao": {
-        #         "positions": dong_yao_positions,  # 动爻位置列表
-        #         "symbols": dong_yao_symbols  # 动爻符号列表
-        #     },
-        #     "bian_gua": bian_gua_info,  # 变卦信息
-        #     "liu_shen": liu_shen_list,  # 六神分布列表
-        #     "day_gan": day_gan  # 日干信息
-        # }
+        # 伏神爻位信息（卦表编译时已根据伏干列表预先计算）
+        fu_shen_wei_list = list(ben_gua.fu_shen_wei_list)  # 伏神爻位列表（从下往上：1→6）
         
         # 新的响应格式：整合爻位信息（从上往下：6→1）
         ben_gua_body = []  # 初始化本卦主体
@@ -218,19 +137,19 @@ class LiuYaoAlgorithmCore:
             # 构建公共字段（无论是否有伏神都包含）
             ben_gua_body_info = {
                 "position": position,  # 爻位位置，从上往下排列（6→1）
-                "liu_shen": liu_shen_list[original_index] if original_index < len(liu_shen_list) else "",  # 逆序分解六神分布
-                "liu_qin": self._safe_get_array_element(ben_gua_info, "六亲", original_index),  # 逆序分解六亲
-                "na_gan": self._safe_get_array_element(ben_gua_info, "纳干", original_index),  # 逆序分解纳干
-                "na_zhi": self._safe_get_array_element(ben_gua_info, "纳支", original_index),  # 逆序分解纳支
-                "shi_ying": self._safe_get_array_element(ben_gua_info, "世应", original_index),  # 逆序分解世应位置
-                "yao_nature": self._get_yao_nature(ben_gua_info, original_index)  # 逆序分解爻的阴阳属性（1为阳爻，0为阴爻）
+                "liu_shen": "",  # 六神占位，组装结果时按日干填入
+                "liu_qin": ben_gua.liu_qin[original_index],  # 逆序分解六亲
+                "na_gan": ben_gua.na_gan[original_index],  # 逆序分解纳干
+                "na_zhi": ben_gua.na_zhi[original_index],  # 逆序分解纳支
+                "shi_ying": ben_gua.shi_ying[original_index],  # 逆序分解世应位置
+                "yao_nature": "阳" if ben_gua.yao_bits[original_index] else "阴"  # 逆序分解爻的阴阳属性（1为阳爻，0为阴爻）
             }
             # 如果有伏神，添加伏神字段
             if fu_shen_wei_list:
                 ben_gua_body_info.update({
-                    "fu_qin": self._safe_get_array_element(ben_gua_info, "伏亲", original_index),  # 逆序分解伏亲
-                    "fu_gan": self._safe_get_array_element(ben_gua_info, "伏干", original_index),  # 逆序分解伏干
-                    "fu_zhi": self._safe_get_array_element(ben_gua_info, "伏支", original_index)  # 逆序分解伏支
+                    "fu_qin": ben_gua.fu_qin[original_index],  # 逆序分解伏亲
+                    "fu_gan": ben_gua.fu_gan[original_index],  # 逆序分解伏干
+                    "fu_zhi": ben_gua.fu_zhi[original_index]  # 逆序分解伏支
                 })
             ben_gua_body.append(ben_gua_body_info)            
             
@@ -247,86 +166,172 @@ class LiuYaoAlgorithmCore:
                 # 变卦爻位信息
                 bian_gua_body_info = {
                     "position": position,  # 逆序分解爻位位置，从上往下排列（6→1）
-                    "liu_qin": self._safe_get_array_element(bian_gua_info, "六亲", original_index),  # 逆序分解六亲
-                    "na_gan": self._safe_get_array_element(bian_gua_info, "纳干", original_index),  # 逆序分解纳天干
-                    "na_zhi": self._safe_get_array_element(bian_gua_info, "纳支", original_index),  # 逆序分解纳地支
-                    "shi_ying": self._safe_get_array_element(bian_gua_info, "世应", original_index),  # 逆序分解世应位置
-                    "yao_nature": self._get_yao_nature(bian_gua_info, original_index)  # 爻的阴阳属性（1为阳爻，0为阴爻）
+                    "liu_qin": bian_gua_liu_qin[original_index],  # 逆序分解六亲（按本卦卦宫推算）
+                    "na_gan": bian_gua.na_gan[original_index],  # 逆序分解纳天干
+                    "na_zhi": bian_gua.na_zhi[original_index],  # 逆序分解纳地支
+                    "shi_ying": bian_gua.shi_ying[original_index],  # 逆序分解世应位置
+                    "yao_nature": "阳" if bian_gua.yao_bits[original_index] else "阴"  # 爻的阴阳属性（1为阳爻，0为阴爻）
                 }
                 bian_gua_body.append(bian_gua_body_info)
-
-        # 提取本卦世应爻位
-        ben_gua_shi_ying = self._extract_shi_ying_positions(ben_gua_info.get("世应", []))
+        
+        # 构建卦象结构（不含历法信息和六神）
+        gua_structure = {
+            "ben_gua_head": {
+                "name": ben_gua.name,  # 本卦卦名
+                "code": ben_gua_str,  # 本卦字符串（如"111111"）
+                "palace": ben_gua.palace,  # 本卦卦宫
+                "nature": ben_gua.palace_attr,  # 本卦宫属（金木水火土）
+                "upper": ben_gua.upper,  # 本卦上卦
+                "lower": ben_gua.lower,  # 本卦下卦
+                "chong_he": ben_gua.chong_he,  # 本卦六冲或六合
+                "shi_body": ben_gua.shi_body,  # 本卦世身
+                "month_body": ben_gua.month_body,  # 本卦月身
+                "shi_position": ben_gua.shi_position,  # 本卦世爻位（从下往上：1→6）
+                "ying_position": ben_gua.ying_position,  # 本卦应爻位（从下往上：1→6）
+                "fu_shen_wei_list": fu_shen_wei_list,  # 伏神爻位列表（从下往上：1→6），始终返回，用于判断是否有伏神
+            },
+            "ben_gua_body": ben_gua_body  # 本卦主体（六个爻位的详细信息，包含世应信息）
+        }
+        
+        # 如果有动爻，才添加动爻和变卦信息
+        if has_dong_yao:
+            gua_structure["dong_yao_info"] = {
+                "positions": dong_yao_positions,  # 动爻位置列表（从下往上：1→6）
+                "count": len(dong_yao_positions),  # 动爻数量
+                "details": dong_yao_details  # 动爻详细信息列表（6~1爻的完整信息）
+            }
+            gua_structure["bian_gua_head"] = {
+                "name": bian_gua.name,  # 变卦卦名
+                "code": bian_gua.code_str,  # 变卦字符串（如"011111"）
+                "palace": bian_gua.palace,  # 变卦卦宫
+                "nature": bian_gua.palace_attr,  # 变卦宫属（金木水火土）
+                "upper": bian_gua.upper,  # 变卦上卦
+                "lower": bian_gua.lower,  # 变卦下卦
+                "chong_he": bian_gua.chong_he,  # 本卦六冲或六合
+                "shi_position": bian_gua.shi_position,  # 变卦世爻位（从下往上：1→6）
+                "ying_position": bian_gua.ying_position  # 变卦应爻位（从下往上：1→6）
+            }
+            gua_structure["bian_gua_body"] = bian_gua_body  # 变卦主体（六个爻位的详细信息，包含世应信息）
+        
+        return gua_structure  # 返回卦象结构
+    
+    # 私有方法：获取卦象模板（按奇数个数元组懒加载，构建后只读共享）
+    def _get_gua_template(self, odd_counts_list: List[int]) -> Dict[str, Any]:
+        template_key = tuple(odd_counts_list)  # 模板键：六个爻位的奇数个数元组
+        template = self._gua_templates.get(template_key)  # 无锁快速路径：模板已构建时直接返回
+        if template is None:
+            with self._gua_templates_lock:  # 加锁后再次检查，避免并发重复构建
+                template = self._gua_templates.get(template_key)
+                if template is None:
+                    template = self._build_gua_structure(list(template_key))  # 构建卦象模板
+                    self._gua_templates[template_key] = template  # 存入模板表
+        return template  # 返回卦象模板
+    
+    # 预编译全部卦象模板（4^6=4096种奇数个数组合）
+    def precompile_gua_templates(self) -> int:
+        for odd_counts in itertools.product(range(4), repeat=6):  # 枚举每个爻位0~3个奇数的全部组合
+            self._get_gua_template(list(odd_counts))  # 构建并缓存模板
+        return len(self._gua_templates)  # 返回模板数量
+    
+    # 私有方法：组装排盘结果（复制卦象结构，叠加历法信息和六神，保证模板本身不被请求修改）
+    def _assemble_paipan_result(self, gua_structure: Dict[str, Any], calendar_info: Dict[str, Any], liu_shen_list: Tuple[str, ...]) -> Dict[str, Any]:
+        # 本卦主体：按原始索引（从下往上：0→5）逆序填入六神
+        ben_gua_body = [
+            {**yao_info, "liu_shen": liu_shen_list[5 - i] if 5 - i < len(liu_shen_list) else ""}  # 逆序分解六神分布
+            for i, yao_info in enumerate(gua_structure["ben_gua_body"])
+        ]
+        ben_gua_head = dict(gua_structure["ben_gua_head"])  # 复制本卦卦头
+        ben_gua_head["fu_shen_wei_list"] = list(ben_gua_head["fu_shen_wei_list"])  # 复制伏神爻位列表
         
         # 构建新的返回结果（移除冗余的success字段，Core层通过异常表示失败）
         result = {
             "liuyao_config_data": {
                 "calendar_info": calendar_info,
-                "ben_gua_head": {
-                    "name": ben_gua_info.get("卦名", ""),  # 本卦卦名
-                    "code": ben_gua_str,  # 本卦字符串（如"111111"）
-                    "palace": ben_gua_info.get("卦宫", ""),  # 本卦卦宫
-                    "nature": ben_gua_info.get("宫属", ""),  # 本卦宫属（金木水火土）
-                    "upper": ben_gua_info.get("上卦", ""),  # 本卦上卦
-                    "lower": ben_gua_info.get("下卦", ""),  # 本卦下卦
-                    "chong_he": ben_gua_info.get("冲合", ""),  # 本卦六冲或六合
-                    "shi_body": ben_gua_info.get("世身", ""),  # 本卦世身
-                    "month_body": ben_gua_info.get("月身", ""),  # 本卦月身
-                    "shi_position": ben_gua_shi_ying["shi_position"],  # 本卦世爻位（从下往上：1→6）
-                    "ying_position": ben_gua_shi_ying["ying_position"],  # 本卦应爻位（从下往上：1→6）
-                    "fu_shen_wei_list": fu_shen_wei_list,  # 伏神爻位列表（从下往上：1→6），始终返回，用于判断是否有伏神
-                },                
+                "ben_gua_head": ben_gua_head,
                 "ben_gua_body": ben_gua_body  # 本卦主体（六个爻位的详细信息，包含世应信息）
             },
             "message": "六爻排盘计算成功"
         }
         
         # 如果有动爻，才添加动爻和变卦信息
-        if has_dong_yao:
-            # 提取变卦世应爻位
-            bian_gua_shi_ying = self._extract_shi_ying_positions(bian_gua_info.get("世应", []))
-            
+        if "dong_yao_info" in gua_structure:
+            dong_yao_info = gua_structure["dong_yao_info"]
             result["liuyao_config_data"]["dong_yao_info"] = {
-                "positions": dong_yao_positions,  # 动爻位置列表（从下往上：1→6）
-                "count": len(dong_yao_positions),  # 动爻数量
-                "details": dong_yao_details  # 动爻详细信息列表（6~1爻的完整信息）
+                "positions": list(dong_yao_info["positions"]),  # 动爻位置列表（从下往上：1→6）
+                "count": dong_yao_info["count"],  # 动爻数量
+                "details": [dict(detail) for detail in dong_yao_info["details"]]  # 动爻详细信息列表（6~1爻的完整信息）
             }
-            result["liuyao_config_data"]["bian_gua_head"] = {
-                "name": bian_gua_info.get("卦名", ""),  # 变卦卦名
-                "code": bian_gua_str,  # 变卦字符串（如"011111"）
-                "palace": bian_gua_info.get("卦宫", ""),  # 变卦卦宫
-                "nature": bian_gua_info.get("宫属", ""),  # 变卦宫属（金木水火土）
-                "upper": bian_gua_info.get("上卦", ""),  # 变卦上卦
-                "lower": bian_gua_info.get("下卦", ""),  # 变卦下卦
-                "chong_he": bian_gua_info.get("冲合", ""),  # 本卦六冲或六合
-                "shi_position": bian_gua_shi_ying["shi_position"],  # 变卦世爻位（从下往上：1→6）
-                "ying_position": bian_gua_shi_ying["ying_position"]  # 变卦应爻位（从下往上：1→6）
-            }
-            result["liuyao_config_data"]["bian_gua_body"] = bian_gua_body  # 变卦主体（六个爻位的详细信息，包含世应信息）
+            result["liuyao_config_data"]["bian_gua_head"] = dict(gua_structure["bian_gua_head"])  # 变卦卦头
+            result["liuyao_config_data"]["bian_gua_body"] = [dict(yao_info) for yao_info in gua_structure["bian_gua_body"]]  # 变卦主体
         
         return result  # 返回完整的排盘结果
     
+    # 私有方法：统一计算逻辑
+    def _calculate_paipan_common(self, yao_list: List[str], calendar_info: Dict[str, Any], validate: bool = True) -> Dict[str, Any]:
+        # 统计奇数个数（传递验证控制参数）
+        odd_counts_list = self.count_odd_digits(yao_list, validate=validate)  # 调用count_odd_digits方法统计奇数个数，传递验证控制参数
+        return self._calculate_paipan_from_odd_counts(odd_counts_list, calendar_info)
+    
+    # 私有方法：按奇数个数和历法信息计算排盘（起卦数列已验证）
+    def _calculate_paipan_from_odd_counts(self, odd_counts_list: Sequence[int], calendar_info: Dict[str, Any]) -> Dict[str, Any]:
+        # 从历法信息中提取日干
+        day_gan = calendar_info.get('ganzhi_info', {}).get('lunar_day_in_gan_exact', '甲')
+        
+        # 获取卦象结构：模板模式下复用预编译模板，否则每次重新构建
+        if self.gua_template_mode == "off":
+            gua_structure = self._build_gua_structure(odd_counts_list)  # 每次请求重新构建卦象结构
+        else:
+            gua_structure = self._get_gua_template(odd_counts_list)  # 从模板表中获取卦象结构
+        
+        # 计算六神
+        liu_shen_list = self.calculate_liu_shen(day_gan)  # 调用calculate_liu_shen方法计算六神分布
+        
+        return self._assemble_paipan_result(gua_structure, calendar_info, liu_shen_list)  # 组装并返回完整的排盘结果
+    
     # 完整六爻排盘计算（包含公历信息）
-    def calculate_paipan_with_solar_calendar(self, yao_list: List[str], year: int, month: int, day: int, hour: int = 0, minute: int = 0, second: int = 0, validate: bool = True) -> Dict[str, Any]:
-        # 1. 获取历法信息（使用缓存）
+    def calculate_paipan_with_solar_calendar(self, yao_list: List[str], year: int, month: int, day: int, hour: int = 0, minute: int = 0, second: int = 0, validate: bool = True, calendar_profile: str = "full") -> Dict[str, Any]:
+        # 1. 获取历法信息（使用缓存，calendar_profile控制嵌入结果的历法字段，排盘本身只需要日干）
         calendar_info = self._get_calendar_info_with_cache(
-            year=year, month=month, day=day, hour=hour, minute=minute, second=second
+            year=year, month=month, day=day, hour=hour, minute=minute, second=second, profile=calendar_profile
         )
         
         # 2. 调用统一计算逻辑（传递验证控制参数）
         return self._calculate_paipan_common(yao_list, calendar_info, validate=validate)
     
     # 集成农历信息的完整六爻排盘计算
-    def calculate_paipan_with_lunar_calendar(self, yao_list: List[str], lunar_year: int, lunar_month: int, lunar_day: int, hour: int = 0, minute: int = 0, second: int = 0, is_leap_month: bool = False, validate: bool = True) -> Dict[str, Any]:
-        # 1. 获取历法信息（使用缓存）
+    def calculate_paipan_with_lunar_calendar(self, yao_list: List[str], lunar_year: int, lunar_month: int, lunar_day: int, hour: int = 0, minute: int = 0, second: int = 0, is_leap_month: bool = False, validate: bool = True, calendar_profile: str = "full") -> Dict[str, Any]:
+        # 1. 获取历法信息（使用缓存，calendar_profile控制嵌入结果的历法字段，排盘本身只需要日干）
         calendar_info = self._get_calendar_info_with_cache(
             lunar_year=lunar_year, lunar_month=lunar_month, lunar_day=lunar_day,
-            hour=hour, minute=minute, second=second, is_leap_month=is_leap_month
+            hour=hour, minute=minute, second=second, is_leap_month=is_leap_month, profile=calendar_profile
         )
         
         # 2. 调用统一计算逻辑（传递验证控制参数）
         return self._calculate_paipan_common(yao_list, calendar_info, validate=validate)
     
+    # 批量六爻排盘计算（同一历法参数下的多组爻位共用一次历法转换）
+    def calculate_paipan_batch(self, yao_lists: List[List[str]], validate: bool = True, **calendar_kwargs) -> List[Dict[str, Any]]:
+        # 1. 获取历法信息（使用缓存，公历传year/month/day，农历传lunar_year/lunar_month/lunar_day/is_leap_month，可选profile）
+        calendar_info = self._get_calendar_info_with_cache(**calendar_kwargs)
+        
+        # 2. 逐组调用统一计算逻辑，结果顺序与输入一致
+        return [self._calculate_paipan_common(yao_list, calendar_info, validate=validate) for yao_list in yao_lists]
+    
+    # 按已验证起卦请求计算六爻排盘（不再重复验证起卦数列和时刻）
+    def calculate_paipan_with_cast(self, cast: ValidatedCast) -> Dict[str, Any]:
+        calendar_info = self.calendar_cache.get_validated(cast.moment, profile=cast.calendar_profile)  # 获取历法信息（使用缓存）
+        return self._calculate_paipan_from_odd_counts(cast.odd_counts, calendar_info)
+    
+    # 批量按已验证起卦请求计算六爻排盘（时刻和输出配置相同的请求共用一次历法信息查询），结果顺序与输入一致
+    def calculate_paipan_with_casts(self, casts: Sequence[ValidatedCast]) -> List[Dict[str, Any]]:
+        calendar_infos: Dict[Tuple[ValidatedDateTime, str], Dict[str, Any]] = {}  # (时刻, 输出配置) → 历法信息
+        results = []
+        for cast in casts:
+            key = (cast.moment, cast.calendar_profile)
+            if key not in calendar_infos:
+                calendar_infos[key] = self.calendar_cache.get_validated(cast.moment, profile=cast.calendar_profile)
+            results.append(self._calculate_paipan_from_odd_counts(cast.odd_counts, calendar_infos[key]))
+        return results
 
 
 # 默认导出列表
@@ -0,0 +1,110 @@
+# backend/src/core/liuyao_distribution.py 2026-10-18 20:10:00
+# 功能：六爻起卦蒙特卡洛分布分析，按随机数起卦法的规则成块生成起卦，只统计奇数个数组合（4^6=4096种）的出现次数，
+#       再按每种组合预先算好的本卦、变卦、动爻数和卦宫汇总分布，并与理论概率对照；有NumPy时整块向量化统计，分块可在多个工作者上并行
+
+import math  # 导入数学模块，用于计算组合数
+from collections import Counter  # 导入计数器，用于无NumPy时统计奇数个数组合
+from functools import lru_cache  # 导入LRU缓存装饰器，用于只构建一次组合属性表
+from typing import Any, Dict, Iterable, List, Sequence, Tuple  # 导入类型注解工具
+from app.divination.random_number_divination import RandomDrawStream, THREE_DIGIT_ODD_COUNTS, HAS_NUMPY  # 导入可复现随机整数块生成器、奇数个数查表和NumPy可用标志
+from core.liuyao_algorithm_core import LiuYaoAlgorithmCore  # 导入六爻算法核心类，组合属性按排盘相同的规则计算
+
+if HAS_NUMPY:
+    import numpy as np
+
+PATTERN_COUNT = 4 ** 6  # 奇数个数组合数：组合码 = Σ 第i爻奇数个数 × 4^i（i从0开始，初爻在最低位）
+
+NO_BIAN_GUA = "无"  # 没有动爻时的变卦名称
+
+_YAO_PROBABILITIES = tuple(math.comb(3, k) / 8 for k in range(4))  # 单爻奇数个数的理论概率：0、1、2、3个奇数分别为1/8、3/8、3/8、1/8
+
+
+# 私有函数：组合码转换为奇数个数列表（从初爻到上爻）
+def _pattern_odd_counts(pattern: int) -> List[int]:
+    return [pattern >> (2 * i) & 3 for i in range(6)]
+
+
+# 私有函数：构建每种奇数个数组合的属性表：(本卦名, 变卦名, 动爻数, 卦宫, 理论概率)，按排盘相同的规则计算
+@lru_cache(maxsize=1)
+def _pattern_attributes() -> Tuple[Tuple[str, str, int, str, float], ...]:
+    core = LiuYaoAlgorithmCore(gua_template_mode="off")
+    attributes = []
+    for pattern in range(PATTERN_COUNT):
+        odd_counts = _pattern_odd_counts(pattern)
+        ben_gua_record, _ = core.ben_gua_najia(odd_counts)
+        dong_yao_positions, _ = core.dong_yao(odd_counts)
+        bian_gua_record, _ = core.bian_gua_najia(odd_counts, ben_gua_record)
+        probability = math.prod(_YAO_PROBABILITIES[odd_count] for odd_count in odd_counts)
+        attributes.append((ben_gua_record.name, bian_gua_record.name if bian_gua_record else NO_BIAN_GUA,
+                           len(dong_yao_positions), ben_gua_record.palace, probability))
+    return tuple(attributes)
+
+
+# 模拟第chunk_index块的count次起卦（每次6个0~999的随机整数，与批量抽取six-yao相同），返回长度为4096的组合出现次数列表
+def simulate_pattern_counts(count: int, seed: int, chunk_index: int = 0) -> List[int]:
+    stream = RandomDrawStream(seed)
+    if HAS_NUMPY:  # 向量化：随机整数查表得奇数个数，按4的幂加权求组合码，再一次计数
+        odd_counts = np.asarray(THREE_DIGIT_ODD_COUNTS, dtype=np.int64)[stream.integer_array(1000, count * 6, chunk_index).reshape(count, 6)]
+        return np.bincount(odd_counts @ (4 ** np.arange(6, dtype=np.int64)), minlength=PATTERN_COUNT).tolist()
+    odd_counts = map(THREE_DIGIT_ODD_COUNTS.__getitem__, stream.integers(1000, count * 6, chunk_index))
+    pattern_counts = [0] * PATTERN_COUNT
+    for yao_counts, times in Counter(zip(*[odd_counts] * 6)).items():  # 每6个奇数个数组成一次起卦
+        pattern_counts[sum(odd_count << (2 * i) for i, odd_count in enumerate(yao_counts))] += times
+    return pattern_counts
+
+
+# 合并多个分块的组合出现次数
+def merge_pattern_counts(chunks: Iterable[Sequence[int]]) -> List[int]:
+    merged = [0] * PATTERN_COUNT
+    for chunk in chunks:
+        for pattern, times in enumerate(chunk):
+            merged[pattern] += times
+    return merged
+
+
+# 私有函数：汇总一个维度的分布，返回条目（by_count为True时按出现次数降序，否则按名称升序）、卡方统计量和自由度
+def _summarize(observed: Dict[Any, int], expected: Dict[Any, float], total: int, by_count: bool = True) -> Dict[str, Any]:
+    items = []
+    chi_square = 0.0
+    for key, probability in expected.items():
+        times = observed.get(key, 0)
+        chi_square += (times - total * probability) ** 2 / (total * probability)
+        items.append({"name": key, "count": times, "ratio": round(times / total, 6), "expected_ratio": round(probability, 6)})
+    items.sort(key=(lambda item: (-item["count"], str(item["name"]))) if by_count else (lambda item: item["name"]))
+    return {"chi_square": round(chi_square, 3), "degrees_of_freedom": len(expected) - 1, "items": items}
+
+
+# 按组合出现次数汇总本卦、变卦、动爻数和卦宫的分布
+def summarize_pattern_counts(pattern_counts: Sequence[int]) -> Dict[str, Any]:
+    total = sum(pattern_counts)
+    if total <= 0:
+        raise ValueError("[Core层验证] 模拟次数必须大于0")
+    dimensions = ("ben_gua", "bian_gua", "moving_line_counts", "palaces")
+    observed = {dimension: Counter() for dimension in dimensions}
+    expected = {dimension: Counter() for dimension in dimensions}
+    for times, (ben_gua, bian_gua, moving_count, palace, probability) in zip(pattern_counts, _pattern_attributes()):
+        for dimension, key in zip(dimensions, (ben_gua, bian_gua, moving_count, palace)):
+            observed[dimension][key] += times
+            expected[dimension][key] += probability
+    return {"total_casts": total, **{dimension: _summarize(observed[dimension], expected[dimension], total, dimension != "moving_line_counts")
+                                     for dimension in dimensions}}
+
+
+# 分块模拟count次起卦并汇总分布；map_func用于分发分块（默认串行，可传入进程池的map并行），每块独立播种，结果与分发方式无关
+def simulate_distribution(count: int, seed: int, chunk_size: int = 1000000, map_func=map) -> Dict[str, Any]:
+    if count <= 0 or chunk_size <= 0:
+        raise ValueError(f"[Core层验证] 模拟次数和分块大小必须大于0，当前值：{count}、{chunk_size}")
+    chunk_sizes = [min(chunk_size, count - start) for start in range(0, count, chunk_size)]
+    chunks = map_func(simulate_pattern_counts, chunk_sizes, [seed] * len(chunk_sizes), range(len(chunk_sizes)))
+    return summarize_pattern_counts(merge_pattern_counts(chunks))
+
+
+# 默认导出列表，指定模块的公开接口
+__all__ = [
+    'PATTERN_COUNT',
+    'NO_BIAN_GUA',
+    'simulate_pattern_counts',
+    'merge_pattern_counts',
+    'summarize_pattern_counts',
+    'simulate_distribution'
+]
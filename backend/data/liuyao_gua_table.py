@@ -0,0 +1,152 @@
+"""
+ * @file            backend/data/liuyao_gua_table.py
+ * @description     六十四卦只读编码表，将字符串键的SIXTY_FOUR_GUA编译为按6位整数卦码索引的不可变记录
+ * @author          Gordon <gordon_cao@qq.com>
+ * @createTime      2026-10-18 11:00:00
+ * @lastModified    2026-10-18 11:00:00
+ * Copyright © All rights reserved
+"""
+
+from types import MappingProxyType  # 导入只读映射类型，用于冻结日干转六神表
+from typing import Dict, List, Mapping, Tuple  # 导入类型注解工具：Dict（字典类型）、List（列表类型）、Mapping（映射类型）、Tuple（元组类型）
+from data.liuyao_configuration_data import SIXTY_FOUR_GUA, GUA_PALACES, TIAN_GAN_TO_LIU_SHEN  # 导入六十四卦、卦宫六亲和天干转六神的原始配置数据
+
+# 卦宫名称列表（按京房八宫顺序），卦宫序号即列表下标
+PALACE_NAMES: Tuple[str, ...] = ("乾", "兑", "离", "震", "巽", "坎", "艮", "坤")
+
+
+# 六十四卦只读记录：使用__slots__存储，每个爻位相关字段均为长度为6的元组（下标0为初爻）
+class GuaRecord:
+    __slots__ = (
+        "code",  # 6位整数卦码：第i位（从0开始）对应第i+1爻，1为阳爻，0为阴爻
+        "code_str",  # 卦码字符串（如"011111"，从初爻到上爻）
+        "name",  # 卦名
+        "palace",  # 卦宫
+        "palace_index",  # 卦宫序号（PALACE_NAMES中的下标）
+        "palace_attr",  # 宫属（首卦、一世……归魂）
+        "upper",  # 上卦
+        "lower",  # 下卦
+        "chong_he",  # 六冲或六合
+        "shi_body",  # 世身
+        "month_body",  # 月身
+        "yi_xu",  # 易序
+        "yao_bits",  # 阴阳爻数列（1为阳爻，0为阴爻）
+        "na_gan",  # 纳干
+        "na_zhi",  # 纳支
+        "liu_qin",  # 六亲
+        "shi_ying",  # 世应
+        "fu_gan",  # 伏干
+        "fu_zhi",  # 伏支
+        "fu_qin",  # 伏亲
+        "shi_position",  # 世爻位（从下往上：1→6）
+        "ying_position",  # 应爻位（从下往上：1→6）
+        "fu_shen_wei_list",  # 伏神爻位（从下往上：1→6）
+    )
+
+    # 初始化只读记录，所有字段通过object.__setattr__一次性写入
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            object.__setattr__(self, name, fields[name])
+
+    # 禁止修改字段，保证记录可在多线程间安全共享
+    def __setattr__(self, name, value):
+        raise AttributeError(f"GuaRecord是只读记录，不能修改字段: {name}")
+
+    # 禁止删除字段
+    def __delattr__(self, name):
+        raise AttributeError(f"GuaRecord是只读记录，不能删除字段: {name}")
+
+    def __repr__(self) -> str:
+        return f"GuaRecord(code={self.code_str}, name={self.name})"
+
+
+# 将阴阳爻数列（从初爻到上爻）转换为6位整数卦码
+def gua_code_from_bits(yao_bits) -> int:
+    code = 0  # 初始化卦码
+    for i, bit in enumerate(yao_bits):
+        if bit:
+            code |= 1 << i  # 第i爻为阳爻时置位
+    return code  # 返回整数卦码
+
+
+# 将6位整数卦码转换为卦码字符串（从初爻到上爻）
+def gua_code_to_str(code: int) -> str:
+    return ''.join('1' if code >> i & 1 else '0' for i in range(6))  # 逐位拼接阴阳爻
+
+
+# 私有函数：根据原始配置构建单条只读记录
+def _build_gua_record(code_str: str, gua_info: Dict) -> GuaRecord:
+    shi_ying = tuple(gua_info["世应"])  # 世应列
+    fu_gan = tuple(gua_info["伏干"])  # 伏干列
+    yao_bits = tuple(int(bit) for bit in code_str)  # 阴阳爻数列
+    return GuaRecord(
+        code=gua_code_from_bits(yao_bits),
+        code_str=code_str,
+        name=gua_info["卦名"],
+        palace=gua_info["卦宫"],
+        palace_index=PALACE_NAMES.index(gua_info["卦宫"]),
+        palace_attr=gua_info["宫属"],
+        upper=gua_info["上卦"],
+        lower=gua_info["下卦"],
+        chong_he=gua_info["冲合"],
+        shi_body=gua_info["世身"],
+        month_body=gua_info["月身"],
+        yi_xu=gua_info["易序"],
+        yao_bits=yao_bits,
+        na_gan=tuple(gua_info["纳干"]),
+        na_zhi=tuple(gua_info["纳支"]),
+        liu_qin=tuple(gua_info["六亲"]),
+        shi_ying=shi_ying,
+        fu_gan=fu_gan,
+        fu_zhi=tuple(gua_info["伏支"]),
+        fu_qin=tuple(gua_info["伏亲"]),
+        shi_position=shi_ying.index("世") + 1 if "世" in shi_ying else 0,
+        ying_position=shi_ying.index("应") + 1 if "应" in shi_ying else 0,
+        fu_shen_wei_list=tuple(i + 1 for i, gan in enumerate(fu_gan) if gan),
+    )
+
+
+# 私有函数：构建按整数卦码索引的六十四卦表
+def _build_gua_table() -> Tuple[GuaRecord, ...]:
+    records: List[GuaRecord] = [None] * 64  # 预分配64个位置
+    for code_str, gua_info in SIXTY_FOUR_GUA.items():
+        record = _build_gua_record(code_str, gua_info)
+        records[record.code] = record  # 以整数卦码为下标存放
+    if any(record is None for record in records):  # 配置数据必须覆盖全部64卦
+        raise ValueError("六十四卦配置数据不完整")
+    return tuple(records)
+
+
+# 私有函数：构建变卦六亲表（本卦卦宫序号 × 变卦卦码 → 按本卦卦宫重新推算的六亲）
+def _build_bian_liu_qin_table() -> Tuple[Tuple[Tuple[str, ...], ...], ...]:
+    return tuple(
+        tuple(
+            tuple(GUA_PALACES[palace].get(zhi, '未知六亲') for zhi in record.na_zhi)
+            for record in GUA_TABLE
+        )
+        for palace in PALACE_NAMES
+    )
+
+
+# 六十四卦只读表：GUA_TABLE[卦码]即对应卦的记录
+GUA_TABLE: Tuple[GuaRecord, ...] = _build_gua_table()
+
+# 变卦六亲表：BIAN_LIU_QIN_TABLE[本卦卦宫序号][变卦卦码]
+BIAN_LIU_QIN_TABLE: Tuple[Tuple[Tuple[str, ...], ...], ...] = _build_bian_liu_qin_table()
+
+# 日干转六神表（只读映射，值为从初爻到上爻的六神元组）
+LIU_SHEN_BY_DAY_GAN: Mapping[str, Tuple[str, ...]] = MappingProxyType({
+    day_gan: tuple(liu_shen_list) for day_gan, liu_shen_list in TIAN_GAN_TO_LIU_SHEN.items()
+})
+
+
+# 默认导出列表，指定模块的公开接口
+__all__ = [
+    'PALACE_NAMES',
+    'GuaRecord',
+    'GUA_TABLE',
+    'BIAN_LIU_QIN_TABLE',
+    'LIU_SHEN_BY_DAY_GAN',
+    'gua_code_from_bits',
+    'gua_code_to_str'
+]
@@ -7,8 +7,6 @@ from fastapi import FastAPI, Request  # 导入FastAPI类，用于创建Web应用
 from fastapi.middleware.cors import CORSMiddleware  # 导入CORS中间件，用于处理跨域请求
 from fastapi.staticfiles import StaticFiles  # 导入StaticFiles，用于静态文件服务
 from contextlib import asynccontextmanager  # 导入asynccontextmanager，用于管理应用生命周期
-from fastapi.responses import JSONResponse  # 导入JSONResponse类，用于自定义JSON响应
-import json  # 导入json模块，用于JSON序列化
 import logging  # 导入logging模块，用于日志记录
 
 # 配置日志
@@ -21,28 +19,25 @@ sys.path.append(os.path.dirname(__file__))
 
 from config import settings  # 导入应用配置对象，包含应用的基本配置信息
 from app.api import api_router  # 导入API路由器，包含所有API接口路由
+from app.utils.response_formatter import UTF8JSONResponse  # 导入自定义UTF-8 JSON响应类，作为应用默认响应类
+from app.utils.cpu_executor import cpu_executor  # 导入CPU密集型任务执行器实例，随应用启动和关闭
+from app.services.hot_score_service import hot_score_decay_task  # 导入热度分后台衰减任务实例，随应用启动和关闭
+from app.services.view_counter import view_counter  # 导入浏览数写回缓冲实例，随应用启动和关闭
 
 # 定义应用生命周期管理器，使用异步上下文管理器装饰器
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # 启动时执行的操作，打印应用启动信息
     print(f"[START] {settings.APP_NAME} v{settings.APP_VERSION} 正在启动...")
+    cpu_executor.start()  # 启动CPU执行器并预热工作者（进程池模式下在接收请求前拉起全部工作进程）
+    hot_score_decay_task.start()  # 启动热度分后台衰减任务
+    view_counter.start()  # 启动浏览数后台批量写回任务
     yield  # 暂停执行，等待应用关闭
     # 关闭时执行的操作，打印应用关闭信息
     print("[STOP] 应用正在关闭...")
-
-# 创建自定义JSON响应类，继承自FastAPI的JSONResponse类
-class UTF8JSONResponse(JSONResponse):
-    # 重写render方法，自定义JSON响应的渲染逻辑
-    def render(self, content: any) -> bytes:
-        # 使用json.dumps序列化内容，确保UTF-8编码正确
-        return json.dumps(
-            content,  # 要序列化的内容
-            ensure_ascii=False,  # 确保中文字符不被转义，保持原样输出
-            allow_nan=False,  # 不允许NaN值，避免JSON格式错误
-            indent=None,  # 不缩进，压缩JSON输出
-            separators=(",", ":"),  # 使用紧凑的分隔符，减少JSON文件大小
-        ).encode("utf-8")  # 将JSON字符串编码为UTF-8字节
+    await view_counter.stop()  # 停止浏览数后台写回任务，并写回剩余的浏览数
+    await hot_score_decay_task.stop()  # 停止热度分后台衰减任务
+    cpu_executor.shutdown()  # 关闭CPU执行器，取消尚未开始的任务
 
 # 创建FastAPI应用实例，配置应用的基本信息和行为
 app = FastAPI(
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# backend/scripts/analyze_liuyao_distribution.py 2026-10-18 20:10:00
+# 功能：离线蒙特卡洛模拟随机数起卦，统计本卦、变卦、动爻数和卦宫分布并与理论概率对照；分块在多个进程上并行，有NumPy时每块向量化统计
+#
+# 用法（在backend目录下执行）：
+#   python scripts/analyze_liuyao_distribution.py                              模拟1000万次，按CPU核数并行
+#   python scripts/analyze_liuyao_distribution.py --count 1000000 --seed 7     指定模拟次数和随机种子（可复现）
+#   python scripts/analyze_liuyao_distribution.py --workers 1                  单进程执行
+#   python scripts/analyze_liuyao_distribution.py --json > distribution.json   输出完整JSON结果
+
+import argparse
+import json
+import os
+import secrets
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.divination.random_number_divination import RandomDrawStream
+from core.liuyao_distribution import simulate_distribution
+
+
+# 打印一个维度的分布：卡方统计量和前top项（偏差为实际比例相对理论比例的百分比）
+def print_dimension(title: str, summary: dict, top: int):
+    print(f"\n{title}（卡方 {summary['chi_square']}，自由度 {summary['degrees_of_freedom']}）")
+    for item in summary["items"][:top]:
+        deviation = (item["ratio"] / item["expected_ratio"] - 1) * 100
+        print(f"  {str(item['name']):<8} {item['count']:>12} {item['ratio']:>10.6f} 理论{item['expected_ratio']:>10.6f} 偏差{deviation:>+7.2f}%")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="蒙特卡洛模拟随机数起卦分布")
+    parser.add_argument("--count", type=int, default=10000000, help="模拟起卦次数（默认1000万）")
+    parser.add_argument("--seed", type=int, default=None, help="随机种子（默认随机生成并输出）")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="并行进程数（默认CPU核数）")
+    parser.add_argument("--chunk-size", type=int, default=500000, help="每块模拟次数（默认50万）")
+    parser.add_argument("--top", type=int, default=10, help="每个维度打印的条目数（默认10）")
+    parser.add_argument("--json", action="store_true", help="输出完整JSON结果")
+    args = parser.parse_args()
+
+    seed = secrets.randbelow(2 ** 53) if args.seed is None else args.seed
+    started = time.perf_counter()
+    if args.workers > 1:
+        with ProcessPoolExecutor(max_workers=args.workers) as executor:
+            result = simulate_distribution(args.count, seed, args.chunk_size, map_func=executor.map)
+    else:
+        result = simulate_distribution(args.count, seed, args.chunk_size)
+    elapsed = time.perf_counter() - started
+
+    if args.json:
+        print(json.dumps({"seed": seed, "generator": RandomDrawStream(seed).generator, "elapsed_seconds": round(elapsed, 3), **result},
+                         ensure_ascii=False, indent=2))
+        return
+    print(f"模拟次数: {result['total_casts']}，种子: {seed}，生成器: {RandomDrawStream(seed).generator}，进程: {args.workers}，耗时{elapsed:.2f}秒")
+    print_dimension("动爻数", result["moving_line_counts"], 7)
+    print_dimension("卦宫", result["palaces"], 8)
+    print_dimension("本卦", result["ben_gua"], args.top)
+    print_dimension("变卦", result["bian_gua"], args.top)
+
+
+if __name__ == "__main__":
+    main()
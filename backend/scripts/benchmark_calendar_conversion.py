@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# backend/scripts/benchmark_calendar_conversion.py 2026-10-18 17:10:00
+# 功能：对比公历输入与农历输入的历法转换耗时（同一批时刻分别以公历和农历形式输入），验证农历路径与公历路径开销一致
+#
+# 用法（在backend目录下执行）：
+#   python scripts/benchmark_calendar_conversion.py                       核心层full配置，各1000次
+#   python scripts/benchmark_calendar_conversion.py --profile ganzhi      指定输出配置
+#   python scripts/benchmark_calendar_conversion.py --layer service       经服务层（含验证和共享缓存，每轮前清空缓存）
+#   python scripts/benchmark_calendar_conversion.py --count 5000 --seed 7 指定样本数和随机种子
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lunar_python import Solar
+from core.calendar_algorithm_core import calendar_algorithm_core, CALENDAR_PROFILES
+from core.calendar_cache import calendar_cache
+from app.services.calendar_service import calendar_service
+
+
+# 生成随机公历时刻，并换算为对应的农历输入参数
+def build_samples(count: int, seed: int, start_year: int, end_year: int):
+    rng = random.Random(seed)
+    solar_samples, lunar_samples = [], []
+    for _ in range(count):
+        solar = Solar.fromYmdHms(rng.randint(start_year, end_year), rng.randint(1, 12), rng.randint(1, 28),
+                                 rng.randint(0, 23), rng.randint(0, 59), rng.randint(0, 59))
+        lunar = solar.getLunar()
+        solar_samples.append({"year": solar.getYear(), "month": solar.getMonth(), "day": solar.getDay(),
+                              "hour": solar.getHour(), "minute": solar.getMinute(), "second": solar.getSecond()})
+        lunar_samples.append({"lunar_year": lunar.getYear(), "lunar_month": abs(lunar.getMonth()), "lunar_day": lunar.getDay(),
+                              "hour": solar.getHour(), "minute": solar.getMinute(), "second": solar.getSecond(),
+                              "is_leap_month": lunar.getMonth() < 0})
+    return solar_samples, lunar_samples
+
+
+# 依次执行全部样本，返回平均耗时（微秒）
+def measure(func, samples, profile: str, clear_cache: bool) -> float:
+    if clear_cache:
+        calendar_cache.clear()
+    started = time.perf_counter()
+    for sample in samples:
+        func(**sample, profile=profile)
+    return (time.perf_counter() - started) / len(samples) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="对比公历输入与农历输入的历法转换耗时")
+    parser.add_argument("--count", type=int, default=1000, help="样本数（默认1000）")
+    parser.add_argument("--seed", type=int, default=2026, help="随机种子（默认2026）")
+    parser.add_argument("--start", type=int, default=1901, help="样本起始公历年（默认1901）")
+    parser.add_argument("--end", type=int, default=2099, help="样本结束公历年（默认2099）")
+    parser.add_argument("--profile", default="full", choices=list(CALENDAR_PROFILES), help="输出配置（默认full）")
+    parser.add_argument("--layer", default="core", choices=["core", "service"], help="测量层级：core（历法核心）或service（服务层+共享缓存）")
+    parser.add_argument("--rounds", type=int, default=3, help="测量轮数，取最小值（默认3）")
+    args = parser.parse_args()
+
+    solar_samples, lunar_samples = build_samples(args.count, args.seed, args.start, args.end)
+    if args.layer == "core":
+        solar_func, lunar_func = calendar_algorithm_core.convert_solar_to_lunar, calendar_algorithm_core.convert_lunar_to_solar
+    else:
+        solar_func, lunar_func = calendar_service.convert_solar_to_lunar, calendar_service.convert_lunar_to_solar
+
+    # 交替测量两条路径，减少lunar-python内部缓存和CPU频率波动造成的偏差
+    clear_cache = args.layer == "service"
+    solar_times, lunar_times = [], []
+    for _ in range(args.rounds):
+        solar_times.append(measure(solar_func, solar_samples, args.profile, clear_cache))
+        lunar_times.append(measure(lunar_func, lunar_samples, args.profile, clear_cache))
+    solar_best, lunar_best = min(solar_times), min(lunar_times)
+
+    print(f"层级: {args.layer}，输出配置: {args.profile}，样本: {args.count}个（{args.start}~{args.end}年），轮数: {args.rounds}")
+    print(f"公历输入: {solar_best:10.1f} 微秒/次")
+    print(f"农历输入: {lunar_best:10.1f} 微秒/次")
+    print(f"农历/公历: {lunar_best / solar_best:.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+# backend/scripts/build_calendar_table.py 2026-10-18 15:40:00
+# 功能：生成和校验逐日历法表文件（data/calendar_table.bin，部署时生成，不纳入版本库）
+#
+# 用法（在backend目录下执行）：
+#   python scripts/build_calendar_table.py                          生成1900~2100年的历法表
+#   python scripts/build_calendar_table.py --start 1800 --end 2200  生成指定年份范围的历法表
+#   python scripts/build_calendar_table.py --verify                 校验已有历法表与lunar-python逐日计算的结果是否一致
+#   python scripts/build_calendar_table.py --verify --step-days 1   逐日全量校验（耗时较长）
+
+import argparse
+import datetime
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.calendar_table import CalendarTable, DEFAULT_TABLE_PATH, build_calendar_table, verify_calendar_table
+
+
+def main():
+    parser = argparse.ArgumentParser(description="生成和校验逐日历法表")
+    parser.add_argument("--start", type=int, default=1900, help="起始公历年（默认1900）")
+    parser.add_argument("--end", type=int, default=2100, help="结束公历年（默认2100）")
+    parser.add_argument("--output", default=DEFAULT_TABLE_PATH, help="历法表文件路径")
+    parser.add_argument("--verify", action="store_true", help="只校验已有历法表，不重新生成")
+    parser.add_argument("--step-days", type=int, default=7, help="校验时的采样间隔（天，默认7）")
+    args = parser.parse_args()
+
+    if args.verify:
+        table = CalendarTable.open(args.output)
+        print(f"已加载历法表: {args.output}（{table.start_year}~{table.end_year}年，共{len(table)}天）")
+        first = datetime.date(table.start_year, 1, 1)
+        dates = [first + datetime.timedelta(days=offset) for offset in range(0, len(table), args.step_days)]
+        started = time.time()
+        mismatches = verify_calendar_table(table, dates)
+        print(f"校验日期: {len(dates)}个，不一致: {len(mismatches)}个，耗时{time.time() - started:.1f}秒")
+        for mismatch in mismatches[:20]:
+            print(f"  {mismatch}")
+        sys.exit(1 if mismatches else 0)
+
+    started = time.time()
+    count = build_calendar_table(args.start, args.end, args.output)
+    print(f"已生成历法表: {args.output}（{args.start}~{args.end}年，共{count}天，{os.path.getsize(args.output)}字节，耗时{time.time() - started:.1f}秒）")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+# backend/scripts/build_jieqi_index.py 2026-10-18 15:00:00
+# 功能：生成和校验节气交接时刻索引文件（data/jieqi_index.bin）
+#
+# 用法（在backend目录下执行）：
+#   python scripts/build_jieqi_index.py                          生成1900~2100年的索引
+#   python scripts/build_jieqi_index.py --start 1800 --end 2200  生成指定年份范围的索引
+#   python scripts/build_jieqi_index.py --verify                 校验已有索引与lunar-python逐次计算的结果是否一致
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.jieqi_index import JieqiIndex, DEFAULT_INDEX_PATH, verify_jieqi_index
+
+
+# 生成校验时刻：每个节气交接时刻及其前后1秒，以及每隔step_hours小时的采样时刻
+def build_verify_instants(index: JieqiIndex, step_hours: int):
+    instants = []
+    for code in index.instants:
+        for delta in (-1, 0, 1):
+            moment = time.strptime(str(code), "%Y%m%d%H%M%S")
+            seconds = moment.tm_sec + delta
+            if 0 <= seconds <= 59:
+                instants.append((moment.tm_year, moment.tm_mon, moment.tm_mday, moment.tm_hour, moment.tm_min, seconds))
+    for year in range(index.start_year, index.end_year + 1):
+        for hour_of_year in range(0, 365 * 24, step_hours):
+            day_of_year, hour = divmod(hour_of_year, 24)
+            moment = time.strptime(f"{year} {day_of_year + 1}", "%Y %j")
+            instants.append((year, moment.tm_mon, moment.tm_mday, hour, 17, 29))
+    return instants
+
+
+def main():
+    parser = argparse.ArgumentParser(description="生成和校验节气交接时刻索引")
+    parser.add_argument("--start", type=int, default=1900, help="起始公历年（默认1900）")
+    parser.add_argument("--end", type=int, default=2100, help="结束公历年（默认2100）")
+    parser.add_argument("--output", default=DEFAULT_INDEX_PATH, help="索引文件路径")
+    parser.add_argument("--verify", action="store_true", help="只校验已有索引，不重新生成")
+    parser.add_argument("--step-hours", type=int, default=97, help="校验时的采样间隔（小时，默认97）")
+    args = parser.parse_args()
+
+    if args.verify:
+        index = JieqiIndex.load(args.output)
+        print(f"已加载索引: {args.output}（{index.start_year}~{index.end_year}年，共{len(index)}个节气）")
+        instants = build_verify_instants(index, args.step_hours)
+        started = time.time()
+        mismatches = verify_jieqi_index(index, instants)
+        print(f"校验时刻: {len(instants)}个，不一致: {len(mismatches)}个，耗时{time.time() - started:.1f}秒")
+        for mismatch in mismatches[:20]:
+            print(f"  {mismatch}")
+        sys.exit(1 if mismatches else 0)
+
+    started = time.time()
+    index = JieqiIndex.build(args.start, args.end)
+    index.save(args.output)
+    print(f"已生成索引: {args.output}（{args.start}~{args.end}年，共{len(index)}个节气，{os.path.getsize(args.output)}字节，耗时{time.time() - started:.1f}秒）")
+
+
+if __name__ == "__main__":
+    main()
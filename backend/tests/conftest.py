@@ -0,0 +1,51 @@
+"""
+ * @file            backend/tests/conftest.py
+ * @description     测试公共夹具：建好全部表的内存数据库会话，并记录会话执行的SQL语句，供查询次数和查询计划测试使用
+ * @author          Gordon <gordon_cao@qq.com>
+ * @createTime      2026-10-18 22:20:00
+ * @lastModified    2026-10-18 22:20:00
+ * Copyright © All rights reserved
+"""
+
+import sys
+import os
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.database import Base
+import app.models  # noqa: F401  导入全部模型，注册到Base.metadata
+
+
+# 内存数据库会话：session.statements记录执行的SQL语句文本（测试可随时清空），
+# session.executions记录(语句, 参数, 是否批量执行)，用于取查询计划和检查批量执行
+@pytest.fixture
+def db_session():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    session = sessionmaker(bind=engine)()
+    session.statements, session.executions = [], []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        session.statements.append(statement)
+        session.executions.append((statement, parameters, executemany))
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield session
+    session.close()
+    engine.dispose()
+
+
+# 查询计划：对session.executions中记录的一次执行取EXPLAIN QUERY PLAN，各行明细拼接为一个字符串
+@pytest.fixture
+def query_plan(db_session):
+    def plan(execution):
+        statement, parameters, _ = execution
+        rows = db_session.connection().exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+        return " ".join(row[-1] for row in rows)
+    return plan
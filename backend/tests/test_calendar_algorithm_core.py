@@ -0,0 +1,117 @@
+"""
+ * @file            backend/tests/test_calendar_algorithm_core.py
+ * @description     历法算法核心输出投影测试
+ * @author          Gordon <gordon_cao@qq.com>
+ * @createTime      2026-10-18 14:00:00
+ * @lastModified    2026-10-18 22:30:00
+ * Copyright © All rights reserved
+"""
+
+import sys
+import os
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from lunar_python import Lunar
+
+from core.calendar_algorithm_core import calendar_algorithm_core, CalendarError, CALENDAR_PROFILES, CALENDAR_SECTIONS, resolve_projection
+from core.calendar_cache import CalendarCache
+from app.api.calendar_api import router as calendar_router
+
+INSTANT = (2024, 2, 4, 16, 27, 7)
+
+
+# 测试各输出配置只包含对应区块和字段，且字段值与完整输出一致
+@pytest.mark.parametrize("profile", list(CALENDAR_PROFILES))
+def test_profile_is_projection_of_full(profile):
+    full = calendar_algorithm_core.convert_solar_to_lunar(*INSTANT)
+    result = calendar_algorithm_core.convert_solar_to_lunar(*INSTANT, profile=profile)
+
+    for section, field_names in resolve_projection(profile):
+        assert list(result[section]) == list(field_names)
+        assert result[section] == {name: full[section][name] for name in field_names}
+    assert set(result) - set(CALENDAR_SECTIONS) == {"success", "valid", "input_type", "conversion_type"}
+
+
+# 测试完整配置字段顺序与区块表一致
+def test_full_profile_keeps_field_order():
+    full = calendar_algorithm_core.convert_solar_to_lunar(*INSTANT)
+    assert list(full) == ["success", "valid", "input_type", "conversion_type"] + list(CALENDAR_SECTIONS)
+    for section, section_fields in CALENDAR_SECTIONS.items():
+        assert list(full[section]) == list(section_fields)
+
+
+# 测试fields参数：区块名与"区块名.字段名"混用，输出按字段表顺序
+def test_fields_selection():
+    result = calendar_algorithm_core.convert_solar_to_lunar(
+        *INSTANT, fields=["ganzhi_info.lunar_day_in_gan_exact", "solar_info.solar_YmdHms", "jieqi_info"]
+    )
+    assert list(result["solar_info"]) == ["solar_YmdHms"]
+    assert result["ganzhi_info"] == {"lunar_day_in_gan_exact": "戊"}
+    assert result["jieqi_info"]["jieqi_result_a"]["prev_jie"]["name"] == "立春"
+    assert "lunar_info" not in result
+
+
+# 测试无效配置和字段
+def test_invalid_projection():
+    with pytest.raises(CalendarError):
+        calendar_algorithm_core.convert_solar_to_lunar(*INSTANT, profile="tiny")
+    with pytest.raises(CalendarError):
+        calendar_algorithm_core.convert_solar_to_lunar(*INSTANT, fields=["ganzhi_info.unknown"])
+
+
+# 测试农历输入直接映射到公历日期构建结果，与对应的公历输入一致，且不构造Lunar对象
+@pytest.mark.parametrize("lunar_input, solar_input", [
+    ((2023, 2, 1, 10, 30, 0, True), (2023, 3, 22, 10, 30, 0)),  # 2023年闰二月初一
+    ((2023, 12, 29, 23, 5, 0, False), (2024, 2, 8, 23, 5, 0)),  # 晚子时
+    ((1850, 5, 5, 8, 0, 0, False), (1850, 6, 14, 8, 0, 0)),  # 超出历法表范围，按农历月首日推算
+])
+def test_lunar_input_matches_solar(monkeypatch, lunar_input, solar_input):
+    expected = calendar_algorithm_core.convert_solar_to_lunar(*solar_input, profile="ganzhi")
+    monkeypatch.setattr(Lunar, "fromYmdHms", lambda *args: pytest.fail("不应构造农历对象"))
+    assert calendar_algorithm_core.convert_lunar_to_solar(*lunar_input, profile="ganzhi") == expected
+
+
+# 测试农历输入按闰月天数验证
+def test_lunar_input_checks_leap_month_days():
+    with pytest.raises(CalendarError):
+        calendar_algorithm_core.convert_lunar_to_solar(2023, 2, 30, is_leap_month=True)  # 2023年闰二月只有29天
+    with pytest.raises(CalendarError):
+        calendar_algorithm_core.convert_lunar_to_solar(2024, 5, 0)
+
+
+# 测试时辰分桶缓存对精简配置整个时辰共用一个结果（日柱时柱与节气无关，跨越立春也不拆分），并与精确计算一致
+def test_shichen_cache_with_minimal_profile():
+    cache = CalendarCache(max_size=16, ttl_seconds=0, mode="shichen")
+    for instant in [(2024, 2, 4, 16, 20, 0), (2024, 2, 4, 16, 27, 6), (2024, 2, 4, 16, 27, 7), (2024, 2, 4, 15, 5, 0)]:
+        assert cache.get_solar(*instant, profile="minimal") == calendar_algorithm_core.convert_solar_to_lunar(*instant, profile="minimal")
+    assert cache.stats()["misses"] == 1 and cache.stats()["hits"] == 3
+
+
+# 测试/convert-solar接口的profile和fields参数（序列化结果不使用Pydantic v1的已弃用接口）
+@pytest.mark.filterwarnings("error::pydantic.PydanticDeprecatedSince20")
+def test_convert_solar_endpoint_projection():
+    app = FastAPI()
+    app.include_router(calendar_router, prefix="/calendar")
+    client = TestClient(app)
+    body = {"year": 2024, "month": 2, "day": 4, "hour": 16, "minute": 27, "second": 7}
+
+    data = client.post("/calendar/convert-solar", json={**body, "profile": "minimal"}).json()["data"]
+    assert set(data) >= {"solar_info", "ganzhi_info"} and "lunar_info" not in data and "jieqi_info" not in data
+
+    data = client.post("/calendar/convert-solar", json={**body, "fields": ["lunar_info.lunar_day"]}).json()["data"]
+    assert data["lunar_info"] == {"lunar_day": 25}
+
+    assert client.post("/calendar/convert-solar", json={**body, "profile": "tiny"}).status_code == 422
+
+    lunar_body = {"lunar_year": 2023, "lunar_month": 12, "lunar_day": 25, "hour": 16, "minute": 27, "second": 7, "profile": "minimal"}
+    response = client.post("/calendar/convert-lunar", json=lunar_body)
+    assert response.status_code == 200 and "lunar_info" not in response.json()["data"]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
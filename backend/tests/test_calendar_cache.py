@@ -0,0 +1,120 @@
+"""
+ * @file            backend/tests/test_calendar_cache.py
+ * @description     历法信息共享缓存单元测试
+ * @author          Gordon <gordon_cao@qq.com>
+ * @createTime      2026-10-18 13:00:00
+ * @lastModified    2026-10-18 13:00:00
+ * Copyright © All rights reserved
+"""
+
+import sys
+import os
+import time
+import threading
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from core.calendar_algorithm_core import calendar_algorithm_core, CalendarError
+from core.calendar_cache import CalendarCache, shichen_bucket
+
+
+# 测试农历输入与等价的公历输入共用同一缓存条目，且结果与直接转换一致
+def test_lunar_and_solar_share_entry():
+    cache = CalendarCache(max_size=16, ttl_seconds=0)
+    lunar_info = cache.get_lunar(2024, 1, 1, 10, 30, 0)
+    solar_info = cache.get_solar(2024, 2, 10, 10, 30, 0)
+
+    assert solar_info is lunar_info
+    assert lunar_info == calendar_algorithm_core.convert_lunar_to_solar(2024, 1, 1, 10, 30, 0)
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+# 测试闰月映射和无效农历日期
+def test_leap_month_and_invalid_lunar_date():
+    cache = CalendarCache(max_size=16, ttl_seconds=0)
+    assert cache.resolve_lunar_date(2023, 2, 1, True) == (2023, 3, 22)
+    assert cache.get_lunar(2023, 2, 1, 8, 0, 0, True) == calendar_algorithm_core.convert_lunar_to_solar(2023, 2, 1, 8, 0, 0, True)
+    with pytest.raises(CalendarError):
+        cache.resolve_lunar_date(2024, 2, 1, True)
+
+
+# 测试容量淘汰和过期移除计数
+def test_eviction_and_expiration():
+    cache = CalendarCache(max_size=2, ttl_seconds=0)
+    cache.get_solar(2024, 1, 1)
+    cache.get_solar(2024, 1, 2)
+    cache.get_solar(2024, 1, 3)
+    assert cache.stats()["evictions"] == 1 and cache.stats()["size"] == 2
+
+    cache = CalendarCache(max_size=2, ttl_seconds=0.01)
+    cache.get_solar(2024, 1, 1)
+    time.sleep(0.02)
+    cache.get_solar(2024, 1, 1)
+    assert cache.stats()["expirations"] == 1 and cache.stats()["misses"] == 2
+
+
+# 测试多线程并发访问时计数一致、容量不越界
+def test_concurrent_access():
+    cache = CalendarCache(max_size=8, ttl_seconds=0)
+    errors = []
+
+    def worker(offset):
+        try:
+            for i in range(40):
+                cache.get_solar(2024, 3, 1 + (i + offset) % 12, 9)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    stats = cache.stats()
+    assert not errors
+    assert stats["hits"] + stats["misses"] == 8 * 40
+    assert stats["size"] <= 8
+
+
+# 测试时辰分桶：23点单独成桶，其余每两小时一个时辰
+def test_shichen_bucket():
+    assert [shichen_bucket(hour) for hour in (0, 1, 2, 3, 21, 22, 23)] == [0, 1, 1, 2, 11, 11, 12]
+
+
+# 测试时辰分桶模式：同一时辰内不同分秒命中缓存，且结果与精确计算一致
+def test_shichen_mode_hits_within_bucket():
+    cache = CalendarCache(max_size=16, ttl_seconds=0, mode="shichen")
+    for minute, second in ((5, 0), (17, 31), (59, 59)):
+        instant = (2024, 5, 20, 10, minute, second)
+        assert cache.get_solar(*instant) == calendar_algorithm_core.convert_solar_to_lunar(*instant)
+    stats = cache.stats()
+    assert stats["misses"] == 1 and stats["hits"] == 2 and stats["size"] == 1
+
+
+# 测试时辰分桶模式：桶内跨越节气交接时刻时拆分区间，两侧结果都与精确计算一致
+def test_shichen_mode_splits_at_jieqi_boundary():
+    cache = CalendarCache(max_size=16, ttl_seconds=0, mode="shichen")
+    lichun = calendar_algorithm_core.convert_solar_to_lunar(2024, 2, 4, 16, 0, 0)["jieqi_info"]["jieqi_result_a"]["next_jie"]["time"]
+    assert lichun == "2024-02-04 16:27:07"  # 2024年立春交接时刻
+
+    instants = [(2024, 2, 4, 16, 20, 0), (2024, 2, 4, 16, 27, 6), (2024, 2, 4, 16, 27, 7), (2024, 2, 4, 15, 10, 0), (2024, 2, 4, 16, 50, 0)]
+    for instant in instants:
+        assert cache.get_solar(*instant) == calendar_algorithm_core.convert_solar_to_lunar(*instant)
+    stats = cache.stats()
+    assert stats["misses"] == 2 and stats["hits"] == 3
+
+
+# 测试时辰分桶模式下越界时间仍抛出Core层验证异常
+def test_shichen_mode_rejects_invalid_time():
+    cache = CalendarCache(max_size=16, ttl_seconds=0, mode="shichen")
+    cache.get_solar(2024, 5, 20, 10, 0, 0)
+    with pytest.raises(CalendarError):
+        cache.get_solar(2024, 5, 20, 10, 60, 0)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
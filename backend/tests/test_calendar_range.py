@@ -0,0 +1,94 @@
+"""
+ * @file            backend/tests/test_calendar_range.py
+ * @description     历法日期范围测试：逐日字段与lunar-python对照（历法表范围内外、1582年历法切换）、范围验证、json与ndjson接口
+ * @author          Gordon <gordon_cao@qq.com>
+ * @createTime      2026-10-18 18:40:00
+ * @lastModified    2026-10-18 18:40:00
+ * Copyright © All rights reserved
+"""
+
+import sys
+import os
+import json
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from lunar_python import Solar
+
+from app.api.calendar_api import router as calendar_router
+from app.services.calendar_service import calendar_service
+from core.calendar_range import get_calendar_days, month_span
+from core.ganzhi_arithmetic import julian_day_number
+
+
+# 使用lunar-python逐日计算期望字段
+def expected_day(jdn):
+    solar = Solar.fromJulianDay(jdn)
+    lunar = solar.getLunar()
+    return {
+        "solar_Ymd": solar.toYmd(), "solar_week": solar.getWeek(),
+        "lunar_year": lunar.getYear(), "lunar_month": lunar.getMonth(), "lunar_day": lunar.getDay(),
+        "lunar_month_in_Chinese": lunar.getMonthInChinese(), "lunar_day_in_Chinese": lunar.getDayInChinese(),
+        "lunar_year_in_GanZhi": lunar.getYearInGanZhi(), "lunar_month_in_GanZhi": lunar.getMonthInGanZhi(),
+        "lunar_day_in_GanZhi": lunar.getDayInGanZhi(), "jieqi": lunar.getJieQi() or None,
+        "solar_festivals": solar.getFestivals(), "solar_other_festivals": solar.getOtherFestivals(),
+        "lunar_festivals": lunar.getFestivals(), "lunar_other_festivals": lunar.getOtherFestivals(),
+    }
+
+
+# 测试逐日字段与lunar-python一致：历法表范围内、范围之外（按农历年生成）、1582年10月儒略历切换
+@pytest.mark.parametrize("start_jdn, end_jdn", [
+    (julian_day_number(2023, 12, 25), julian_day_number(2024, 3, 5)),
+    month_span(2300, 2),
+    month_span(1582, 10),
+])
+def test_days_match_lunar_python(start_jdn, end_jdn):
+    days = get_calendar_days(start_jdn, end_jdn)
+    assert len(days) == end_jdn - start_jdn + 1
+    for jdn, day in zip(range(start_jdn, end_jdn + 1), days):
+        expected = expected_day(jdn)
+        assert {key: day[key] for key in expected} == expected
+
+
+# 测试范围解析：整月、整年、起止日期，以及天数上限和无效日期
+def test_resolve_calendar_range():
+    assert calendar_service.resolve_calendar_range(year=2024, month=2) == month_span(2024, 2)
+    start_jdn, end_jdn = calendar_service.resolve_calendar_range(year=2024)
+    assert end_jdn - start_jdn + 1 == 366
+    assert calendar_service.resolve_calendar_range(start_date="2024-01-30", end_date="2024-02-02") == (
+        julian_day_number(2024, 1, 30), julian_day_number(2024, 2, 2))
+    with pytest.raises(ValueError, match=r"\[Service层验证\] 日期范围不能超过"):
+        calendar_service.resolve_calendar_range(start_date="2020-01-01", end_date="2024-01-01")
+    assert calendar_service.resolve_calendar_range(start_date="2020-01-01", end_date="2024-01-01", stream=True)
+    with pytest.raises(ValueError, match=r"\[Service层验证\] start_date"):
+        calendar_service.resolve_calendar_range(start_date="2024-02-30", end_date="2024-03-01")
+
+
+# 测试接口：json一次返回整月，ndjson每天一行并覆盖多个执行器分块
+def test_calendar_range_endpoint():
+    app = FastAPI()
+    app.include_router(calendar_router)
+    client = TestClient(app)
+
+    response = client.post("/calendar-range", json={"year": 2024, "month": 2})
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["total_days"] == 29 and data["start_date"] == "2024-02-01" and data["end_date"] == "2024-02-29"
+    assert [day["solar_Ymd"] for day in data["days"] if day["jieqi"]] == ["2024-02-04", "2024-02-19"]
+
+    response = client.post("/calendar-range", json={"year": 2024, "format": "ndjson"})
+    assert response.status_code == 200 and response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert len(lines) == 366 and lines[0]["solar_Ymd"] == "2024-01-01" and lines[-1]["solar_Ymd"] == "2024-12-31"
+    assert [day["lunar_festivals"] for day in lines if day["solar_Ymd"] == "2024-02-10"] == [["春节"]]
+
+    assert client.post("/calendar-range", json={"start_date": "2020-01-01", "end_date": "2024-01-01"}).status_code == 400
+    assert client.post("/calendar-range", json={"month": 2}).status_code == 422
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,92 @@
+"""
+ * @file            backend/tests/test_calendar_table.py
+ * @description     逐日历法表（mmap）测试
+ * @author          Gordon <gordon_cao@qq.com>
+ * @createTime      2026-10-18 15:40:00
+ * @lastModified    2026-10-18 15:40:00
+ * Copyright © All rights reserved
+"""
+
+import sys
+import os
+import datetime
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from lunar_python import LunarYear, Solar
+
+import core.calendar_algorithm_core as calendar_algorithm_module
+from core.calendar_table import CalendarTable, build_calendar_table, verify_calendar_table
+from core.calendar_algorithm_core import calendar_algorithm_core, LUNAR_INFO_FIELDS
+
+
+@pytest.fixture(scope="module")
+def table(tmp_path_factory):
+    """生成2023~2025年的历法表（2023年有闰二月）"""
+    path = str(tmp_path_factory.mktemp("calendar_table") / "calendar_table.bin")
+    assert build_calendar_table(2023, 2025, path) == 1096
+    calendar_table = CalendarTable.open(path)
+    yield calendar_table
+    calendar_table.close()
+
+
+# 测试历法表逐日记录与lunar-python一致（隔日抽样，覆盖闰月、除夕、寒食节、春社、秋社）
+def test_records_match_lunar_python(table):
+    first = datetime.date(2023, 1, 1)
+    dates = [first + datetime.timedelta(days=offset) for offset in range(0, len(table), 2)]
+    dates += [datetime.date(2023, 4, 4), datetime.date(2024, 2, 9), datetime.date(2024, 3, 21), datetime.date(2024, 9, 26), datetime.date(2025, 1, 28)]
+    assert verify_calendar_table(table, dates) == []
+
+
+# 测试闰月与节日字段
+def test_leap_month_and_festivals(table):
+    leap_day = table.lookup(2023, 3, 22)  # 2023年闰二月初一
+    assert (leap_day.getYear(), leap_day.getMonth(), leap_day.getDay()) == (2023, -2, 1)
+    assert leap_day.getMonthInChinese() == "闰二"
+    assert table.lookup(2024, 2, 9).getFestivals() == ["除夕"]
+    assert "春节" in table.lookup(2024, 2, 10).getFestivals()
+    assert table.lookup(2024, 1, 1).festivals["solar_festivals"] == ["元旦节"]
+
+
+# 测试超出范围返回None，损坏文件抛出异常
+def test_out_of_range_and_invalid_file(table, tmp_path):
+    assert table.lookup(2022, 12, 31) is None
+    assert table.lookup(2026, 1, 1) is None
+    assert CalendarTable().lookup(2024, 1, 1) is None
+    broken = tmp_path / "broken.bin"
+    broken.write_bytes(b"NOPE" + bytes(32))
+    with pytest.raises(ValueError):
+        CalendarTable.open(str(broken))
+
+
+# 测试按农历日期反查公历日期：每个农历月的首日和末日与lunar-python一致，不存在或超出范围的日期返回None
+def test_find_lunar_date(table):
+    for lunar_year in (2023, 2024):
+        for lunar_month in LunarYear.fromYear(lunar_year).getMonths():
+            if lunar_month.getYear() != lunar_year:
+                continue
+            month = lunar_month.getMonth()
+            for day in (1, lunar_month.getDayCount()):
+                solar = Solar.fromJulianDay(lunar_month.getFirstJulianDay() + day - 1)
+                assert table.find_lunar_date(lunar_year, abs(month), day, month < 0) == (solar.getYear(), solar.getMonth(), solar.getDay())
+    assert table.find_lunar_date(2023, 2, 1, True) == (2023, 3, 22)  # 2023年闰二月初一
+    assert table.find_lunar_date(2023, 2, 30, True) is None  # 2023年闰二月只有29天
+    assert table.find_lunar_date(2024, 2, 1, True) is None  # 2024年没有闰月
+    assert table.find_lunar_date(2022, 11, 1) is None  # 早于历法表起始日
+    assert CalendarTable().find_lunar_date(2024, 1, 1) is None
+
+
+# 测试历法核心使用历法表输出日期级农历字段，除完整字符串外不构造农历对象，结果与lunar-python一致
+def test_calendar_core_reads_table(table, monkeypatch):
+    fields = ["lunar_info." + name for name in LUNAR_INFO_FIELDS if name != "lunar_full_string"]
+    expected = calendar_algorithm_core.convert_solar_to_lunar(2024, 2, 9, 23, 10, 0, fields=fields)
+
+    monkeypatch.setattr(calendar_algorithm_module, "calendar_table", table)
+    monkeypatch.setattr(Solar, "getLunar", lambda self: pytest.fail("不应构造农历对象"))
+    assert calendar_algorithm_core.convert_solar_to_lunar(2024, 2, 9, 23, 10, 0, fields=fields) == expected
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,114 @@
+"""
+ * @file            backend/tests/test_cpu_executor.py
+ * @description     CPU执行器测试：线程/进程池执行、排队上限、调用超时、业务异常跨进程传递
+ * @author          Gordon <gordon_cao@qq.com>
+ * @createTime      2026-10-18 16:40:00
+ * @lastModified    2026-10-18 16:40:00
+ * Copyright © All rights reserved
+"""
+
+import sys
+import os
+import asyncio
+import pickle
+import threading
+import time
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import liuyao_api
+from app.exceptions.business_exceptions import SolarValidationException, SolarConversionException
+from app.services.calendar_service import _call_calendar_service
+from app.utils import cpu_executor as cpu_executor_module
+from app.utils.cpu_executor import CpuExecutor, CpuExecutorBusyError, CpuExecutorTimeoutError
+
+
+# 测试线程模式在执行器中运行函数并返回结果
+def test_thread_mode_runs_function():
+    executor = CpuExecutor(mode="thread", max_workers=2, timeout=5)
+    try:
+        assert asyncio.run(executor.run(pow, 2, 10)) == 1024
+        stats = executor.stats()
+        assert stats["completed"] == 1 and stats["pending"] == 0
+    finally:
+        executor.shutdown()
+
+
+# 测试在途任务达到上限时拒绝新任务，名额在任务结束后归还
+def test_busy_when_pending_limit_reached():
+    executor = CpuExecutor(mode="thread", max_workers=1, max_pending=1, timeout=5)
+    release = threading.Event()
+
+    async def scenario():
+        first = asyncio.ensure_future(executor.run(release.wait))
+        await asyncio.sleep(0.05)  # 等待第一个任务占用名额
+        with pytest.raises(CpuExecutorBusyError):
+            await executor.run(pow, 2, 2)
+        release.set()
+        assert await first is True
+        return await executor.run(pow, 2, 3)  # 名额归还后可以再次提交
+
+    try:
+        assert asyncio.run(scenario()) == 8
+        assert executor.stats()["rejected"] == 1
+    finally:
+        release.set()
+        executor.shutdown()
+
+
+# 测试超时的任务抛出超时异常，并计入统计
+def test_timeout_raises():
+    executor = CpuExecutor(mode="thread", max_workers=1, timeout=0.05)
+    try:
+        with pytest.raises(CpuExecutorTimeoutError):
+            asyncio.run(executor.run(time.sleep, 0.3))
+        assert executor.stats()["timeouts"] == 1
+    finally:
+        executor.shutdown()
+
+
+# 测试进程模式：服务方法在工作进程中执行，业务异常可以传回主进程
+def test_process_mode_calendar_service():
+    executor = CpuExecutor(mode="process", max_workers=1, timeout=30)
+    try:
+        result = asyncio.run(executor.run(
+            _call_calendar_service, "convert_solar_to_lunar",
+            {"year": 2024, "month": 2, "day": 4, "hour": 16, "minute": 30, "second": 0}
+        ))
+        assert result.ganzhi_info["lunar_year_in_ganzhi_exact"] == "甲辰"
+        with pytest.raises(SolarConversionException):
+            asyncio.run(executor.run(
+                _call_calendar_service, "convert_solar_to_lunar",
+                {"year": 2024, "month": 13, "day": 1}
+            ))
+    finally:
+        executor.shutdown()
+
+
+# 测试构造函数签名不同的业务异常子类可以被pickle往返
+def test_business_exception_pickle_round_trip():
+    for exception in (SolarValidationException(), SolarConversionException("转换失败")):
+        restored = pickle.loads(pickle.dumps(exception))
+        assert type(restored) is type(exception)
+        assert (restored.message, restored.code) == (exception.message, exception.code)
+
+
+# 测试接口把执行器繁忙映射为503、超时映射为504
+def test_endpoint_maps_executor_errors(monkeypatch):
+    app = FastAPI()
+    app.include_router(liuyao_api.router)
+    client = TestClient(app)
+    payload = {"numbers": ["111", "000", "123", "456", "789", "246"], "year": 2024, "month": 2, "day": 4}
+
+    for error, status_code in ((CpuExecutorBusyError("繁忙"), 503), (CpuExecutorTimeoutError("超时"), 504)):
+        async def failing_run(*args, error=error, **kwargs):
+            raise error
+
+        monkeypatch.setattr(cpu_executor_module.cpu_executor, "run", failing_run)
+        response = client.post("/assemble-liuya", json=payload)
+        assert response.status_code == status_code
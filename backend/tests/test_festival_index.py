@@ -0,0 +1,86 @@
+"""
+ * @file            backend/tests/test_festival_index.py
+ * @description     节日查找表测试：公历（含按星期的节日）和农历节日与lunar-python一致、历法核心读取查找表、节日范围接口
+ * @author          Gordon <gordon_cao@qq.com>
+ * @createTime      2026-10-18 19:10:00
+ * @lastModified    2026-10-18 19:10:00
+ * Copyright © All rights reserved
+"""
+
+import sys
+import os
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from lunar_python import Lunar, Solar
+
+from app.api.calendar_api import router as calendar_router
+from core.calendar_algorithm_core import calendar_algorithm_core
+from core.festival_index import festival_index
+
+
+# 测试公历节日与lunar-python一致：逐日覆盖多个年份（含1582年历法切换和按星期的节日）
+@pytest.mark.parametrize("year", [1582, 1900, 2024, 2100, 2300])
+def test_solar_festivals_match_lunar_python(year):
+    start, end = int(Solar.fromYmd(year, 1, 1).getJulianDay()), int(Solar.fromYmd(year, 12, 31).getJulianDay())
+    for julian_day in range(start, end + 1):
+        solar = Solar.fromJulianDay(julian_day)
+        assert festival_index.solar_festivals(solar.getYear(), solar.getMonth(), solar.getDay()) == solar.getFestivals()
+        assert festival_index.solar_other_festivals(solar.getMonth(), solar.getDay()) == solar.getOtherFestivals()
+
+
+# 测试按星期的节日和农历节日（闰月不算节日、除夕由调用方标识）
+def test_week_and_lunar_festivals():
+    assert festival_index.solar_festivals(2024, 5, 12) == ["母亲节"]
+    assert festival_index.solar_festivals(2024, 11, 28) == ["感恩节"]
+    assert festival_index.solar_festivals(2024, 3, 25) == ["全国中小学生安全教育日"]  # 3月最后一个星期一
+    assert festival_index.lunar_festivals(5, 5) == Lunar.fromYmd(2025, 5, 5).getFestivals() == ["端午节"]
+    assert festival_index.lunar_festivals(-6, 6) == Lunar.fromYmd(2025, -6, 6).getFestivals() == []
+    assert festival_index.lunar_festivals(12, 29, True) == Lunar.fromYmd(2024, 12, 29).getFestivals() == ["除夕"]
+    assert festival_index.lunar_other_festivals(1, 7) == ["人日"]
+
+
+# 测试历法核心的公历节日字段读取查找表
+def test_core_reads_festival_index(monkeypatch):
+    result = calendar_algorithm_core.convert_solar_to_lunar(2024, 5, 12, 10, 0, 0, profile="full")
+    assert result["solar_info"]["solar_festivals"] == ["母亲节"]
+
+    def fail(self):
+        raise AssertionError("不应逐次调用Solar节日方法")
+
+    monkeypatch.setattr(Solar, "getFestivals", fail)
+    monkeypatch.setattr(Solar, "getOtherFestivals", fail)
+    result = calendar_algorithm_core.convert_solar_to_lunar(2024, 10, 1, 10, 0, 0, profile="full", fields=["solar_info.solar_festivals", "solar_info.solar_other_festivals"])
+    assert result["solar_info"]["solar_festivals"] == ["国庆节"]
+
+
+# 测试节日范围接口：按类别过滤、只返回有节日的日期，以及天数上限和类别验证
+def test_festival_range_endpoint():
+    app = FastAPI()
+    app.include_router(calendar_router)
+    client = TestClient(app)
+
+    response = client.post("/festivals-range", json={"year": 2024, "month": 2, "kinds": ["lunar_festivals"]})
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["total_days"] == 29 and data["kinds"] == ["lunar_festivals"]
+    assert [(day["solar_Ymd"], day["lunar_festivals"]) for day in data["days"]] == [
+        ("2024-02-09", ["除夕"]), ("2024-02-10", ["春节"]), ("2024-02-24", ["元宵节"])]
+    assert all(set(day) == {"solar_Ymd", "solar_week", "lunar_month_in_Chinese", "lunar_day_in_Chinese", "lunar_festivals"} for day in data["days"])
+
+    response = client.post("/festivals-range", json={"start_date": "2300-01-01", "end_date": "2300-12-31"})
+    assert response.status_code == 200
+    for day in response.json()["data"]["days"]:
+        solar = Solar.fromYmd(*(int(part) for part in day["solar_Ymd"].split("-")))
+        assert day["solar_festivals"] == solar.getFestivals() and day["lunar_other_festivals"] == solar.getLunar().getOtherFestivals()
+
+    assert client.post("/festivals-range", json={"year": 2024, "kinds": ["jieqi"]}).status_code == 400
+    assert client.post("/festivals-range", json={"start_date": "2000-01-01", "end_date": "2020-01-01"}).status_code == 400
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,110 @@
+"""
+ * @file            backend/tests/test_four_pillars_search.py
+ * @description     四柱反查引擎测试：匹配区间与lunar-python逐时刻计算的四柱对照、节令截断、晚子时流派、索引范围之外的回退、接口
+ * @author          Gordon <gordon_cao@qq.com>
+ * @createTime      2026-10-18 18:20:00
+ * @lastModified    2026-10-18 18:20:00
+ * Copyright © All rights reserved
+"""
+
+import sys
+import os
+import random
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from lunar_python import Solar
+
+from app.api.calendar_api import router as calendar_router
+from core.four_pillars_search import search_four_pillars, _code_to_seconds, _format_seconds
+
+
+# 使用lunar-python计算时刻的四柱（sect=1日柱晚子时算明天，sect=2晚子时算当天）
+def lunar_pillars(solar, sect):
+    lunar = solar.getLunar()
+    day_ganzhi = lunar.getDayInGanZhiExact() if sect == 1 else lunar.getDayInGanZhiExact2()
+    return lunar.getYearInGanZhiExact(), lunar.getMonthInGanZhiExact(), day_ganzhi, lunar.getTimeInGanZhi()
+
+
+# 把"YYYY-MM-DD HH:MM:SS"偏移delta秒后转换为Solar对象
+def to_solar(text, delta=0):
+    text = _format_seconds(_code_to_seconds(int(text.replace("-", "").replace(" ", "").replace(":", ""))) + delta)
+    date, time = text.split(" ")
+    return Solar.fromYmdHms(*map(int, date.split("-")), *map(int, time.split(":")))
+
+
+# 测试随机时刻（节气索引范围内外、两种流派）：时刻落在按其四柱反查得到的某个区间内，且每个区间两端恰好是四柱的边界
+@pytest.mark.parametrize("start_year, end_year", [(1900, 2100), (1500, 1899), (2101, 2600)])
+def test_windows_match_lunar_python(start_year, end_year):
+    rng = random.Random(start_year)
+    for _ in range(25):
+        solar = Solar.fromYmdHms(rng.randint(start_year, end_year), rng.randint(1, 12), rng.randint(1, 28),
+                                 rng.randint(0, 23), rng.randint(0, 59), rng.randint(0, 59))
+        sect = rng.choice((1, 2))
+        pillars = lunar_pillars(solar, sect)
+        windows = search_four_pillars(*pillars, solar.getYear() - 100, solar.getYear() + 100, sect)
+        assert any(window["start"] <= solar.toYmdHms() < window["end"] for window in windows), (solar.toYmdHms(), pillars)
+        for window in windows:
+            assert lunar_pillars(to_solar(window["start"]), sect) == pillars
+            assert lunar_pillars(to_solar(window["end"], -1), sect) == pillars
+            assert lunar_pillars(to_solar(window["start"], -1), sect) != pillars
+            assert lunar_pillars(to_solar(window["end"]), sect) != pillars
+
+
+# 测试时辰被节令交接时刻截断：2024年立春（02-04 16:27:07）所在申时只有交接之后属于甲辰年丙寅月
+def test_window_clipped_at_jie():
+    windows = search_four_pillars("甲辰", "丙寅", "戊戌", "庚申", 2024, 2024)
+    assert windows == [{"start": "2024-02-04 16:27:07", "end": "2024-02-04 17:00:00"}]
+
+
+# 测试晚子时流派：sect=1时子时为前一天23点至当天1点；sect=2时早子时和晚子时分属不同时柱
+def test_sects_split_zi_hour():
+    assert search_four_pillars("甲辰", "丙寅", "甲子", "甲子", 2024, 2024, sect=1) == [
+        {"start": "2024-02-29 23:00:00", "end": "2024-03-01 01:00:00"}]
+    assert search_four_pillars("甲辰", "丙寅", "甲子", "甲子", 2024, 2024, sect=2) == [
+        {"start": "2024-03-01 00:00:00", "end": "2024-03-01 01:00:00"}]
+    assert search_four_pillars("甲辰", "丙寅", "甲子", "丙子", 2024, 2024, sect=2) == [
+        {"start": "2024-03-01 23:00:00", "end": "2024-03-02 00:00:00"}]
+
+
+# 测试与lunar-python的Solar.fromBaZi结果一致：fromBaZi返回的每个时刻都落在反查区间内
+def test_covers_solar_from_bazi():
+    pillars = ("庚午", "辛巳", "丙寅", "甲午")
+    windows = search_four_pillars(*pillars, 1900, 2100, sect=2)
+    for solar in Solar.fromBaZi(*pillars, 2, 1900):
+        assert any(window["start"] <= solar.toYmdHms() < window["end"] for window in windows)
+
+
+# 测试不符合五虎遁的组合没有匹配，无效干支抛出异常
+def test_inconsistent_and_invalid_pillars():
+    assert search_four_pillars("甲辰", "戊寅", "甲子", "甲子", 1900, 2100) == []
+    with pytest.raises(ValueError):
+        search_four_pillars("甲甲", "丙寅", "甲子", "甲子", 1900, 2100)
+
+
+# 测试四柱反查接口
+def test_search_endpoint():
+    app = FastAPI()
+    app.include_router(calendar_router)
+    client = TestClient(app)
+    payload = {"year_pillar": "甲辰", "month_pillar": "丙寅", "day_pillar": "甲子", "time_pillar": "甲子"}
+
+    response = client.post("/search-four-pillars", json=payload)
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["total_matches"] == 2 and data["matches"][0]["start"] == "2024-02-29 23:00:00"
+
+    response = client.post("/search-four-pillars", json={**payload, "start_year": 1, "end_year": 9999})
+    assert response.status_code == 400
+    assert "[Service层验证]" in response.json()["detail"]["error_message"]
+
+    response = client.post("/search-four-pillars", json={**payload, "time_pillar": "甲甲"})
+    assert response.status_code == 422
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,94 @@
+"""
+ * @file            backend/tests/test_ganzhi_arithmetic.py
+ * @description     纯整数日柱时柱运算与lunar-python对照测试（1900~2100年）
+ * @author          Gordon <gordon_cao@qq.com>
+ * @createTime      2026-10-18 14:30:00
+ * @lastModified    2026-10-18 18:20:00
+ * Copyright © All rights reserved
+"""
+
+import sys
+import os
+import datetime
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from lunar_python import Solar
+
+from core.ganzhi_arithmetic import julian_day_number, date_from_julian_day_number, day_pillar, hour_pillar, day_hour_ganzhi_fields
+from core.calendar_algorithm_core import calendar_algorithm_core
+
+START_DATE = datetime.date(1900, 1, 1)
+END_DATE = datetime.date(2100, 12, 31)
+
+
+def _lunar_fields(year: int, month: int, day: int, hour: int) -> dict:
+    """用lunar-python计算日柱时柱相关字段"""
+    lunar = Solar.fromYmdHms(year, month, day, hour, 30, 0).getLunar()
+    return {
+        "lunar_day_in_ganzhi_exact": lunar.getDayInGanZhiExact(),
+        "lunar_day_in_gan_exact": lunar.getDayGanExact(),
+        "lunar_day_in_zhi_exact": lunar.getDayZhiExact(),
+        "lunar_day_in_ganzhi_exact2": lunar.getDayInGanZhiExact2(),
+        "lunar_day_in_gan_exact2": lunar.getDayGanExact2(),
+        "lunar_day_in_zhi_exact2": lunar.getDayZhiExact2(),
+        "lunar_time_in_gan_exact": lunar.getTimeGan(),
+        "lunar_time_in_zhi_exact": lunar.getTimeZhi(),
+        "lunar_time_in_ganzhi_exact": lunar.getTimeInGanZhi(),
+    }
+
+
+# 测试1900~2100年每一天的儒略日数与lunar-python正午儒略日取整一致（lunar-python的日柱即由此取模得到）
+def test_julian_day_number_every_day():
+    date = START_DATE
+    while date <= END_DATE:
+        noon = Solar.fromYmdHms(date.year, date.month, date.day, 12, 0, 0)
+        assert julian_day_number(date.year, date.month, date.day) == int(noon.getJulianDay()), date
+        date += datetime.timedelta(days=1)
+
+
+# 测试儒略日数反推公历日期与julian_day_number互逆，并覆盖儒略历与格里高利历交界（1582-10-04之后为1582-10-15）
+def test_date_from_julian_day_number_round_trip():
+    for jdn in list(range(2299150, 2299170)) + list(range(1721424, 5373484, 997)):
+        date = date_from_julian_day_number(jdn)
+        assert julian_day_number(*date) == jdn, date
+        solar = Solar.fromJulianDay(jdn)
+        assert date == (solar.getYear(), solar.getMonth(), solar.getDay())
+    assert date_from_julian_day_number(2299161) == (1582, 10, 15)
+    assert date_from_julian_day_number(2299160) == (1582, 10, 4)
+
+
+# 测试1900~2100年抽样日期的全部日柱时柱字段与lunar-python一致（步长61天与六十甲子互质，抽样覆盖全部日柱；每个日期轮换小时，并覆盖晚子时）
+def test_pillars_match_lunar_python():
+    date = START_DATE
+    while date <= END_DATE:
+        for hour in (date.toordinal() % 23, 23):
+            assert day_hour_ganzhi_fields(date.year, date.month, date.day, hour) == _lunar_fields(date.year, date.month, date.day, hour), (date, hour)
+        date += datetime.timedelta(days=61)
+
+
+# 测试已知日柱、晚子时两种流派和格里高利历改历前后的日期
+@pytest.mark.parametrize("year,month,day,hour,expected_day,expected_day2,expected_time", [
+    (2000, 1, 7, 0, "甲子", "甲子", "甲子"),
+    (2000, 1, 7, 23, "乙丑", "甲子", "丙子"),
+    (2024, 2, 4, 16, "戊戌", "戊戌", "庚申"),
+    (1582, 10, 4, 12, None, None, None),
+    (1582, 10, 15, 12, None, None, None),
+])
+def test_known_pillars(year, month, day, hour, expected_day, expected_day2, expected_time):
+    expected = _lunar_fields(year, month, day, hour)
+    assert day_pillar(year, month, day, hour) == (expected_day or expected["lunar_day_in_ganzhi_exact"])
+    assert day_pillar(year, month, day, hour, exact2=True) == (expected_day2 or expected["lunar_day_in_ganzhi_exact2"])
+    assert hour_pillar(year, month, day, hour) == (expected_time or expected["lunar_time_in_ganzhi_exact"])
+
+
+# 测试完整历法转换中的日柱时柱字段来自整数运算且与lunar-python一致
+def test_calendar_core_uses_arithmetic_pillars():
+    result = calendar_algorithm_core.convert_solar_to_lunar(1999, 12, 31, 23, 30, 0)
+    assert {name: result["ganzhi_info"][name] for name in _lunar_fields(1999, 12, 31, 23)} == _lunar_fields(1999, 12, 31, 23)
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
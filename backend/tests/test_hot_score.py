@@ -0,0 +1,130 @@
+"""
+ * @file            backend/tests/test_hot_score.py
+ * @description     排盘记录热度分测试：互动事件增量累加、按半衰期整体衰减、多进程只衰减一次、最热列表按热度分排序
+ * @author          Gordon <gordon_cao@qq.com>
+ * @createTime      2026-10-18 20:20:00
+ * @lastModified    2026-10-18 22:20:00
+ * Copyright © All rights reserved
+"""
+
+import sys
+import os
+import asyncio
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from app.models import User, PanRecord, SystemConfig
+from app.services.collect_service import CollectService
+from app.services.hot_score_service import HOT_SCORE_MIN, HOT_SCORE_WEIGHTS, DECAYED_AT_KEY, HotScoreDecayTask, HotScoreService, decay_factor
+from app.services.like_service import LikeService
+from app.services.pan_service import PanService
+from app.services.view_counter import view_counter
+from config import settings
+
+HALF_LIFE = int(settings.HOT_SCORE_HALF_LIFE_HOURS * 3600)
+
+
+# 内存数据库：一个用户、两条公开排盘记录
+@pytest.fixture
+def db(db_session):
+    session = db_session
+    session.add(User(id=1, phone="13800000001"))
+    session.add_all([
+        PanRecord(id=i, user_id=1, pan_params="{}", pan_result="{}", audit_status=1, create_time=1700000000 + i,
+                  hot_score=HOT_SCORE_WEIGHTS["publish"])
+        for i in (1, 2)
+    ])
+    session.commit()
+    return session
+
+
+# 读取记录的热度分
+def score_of(db, record_id):
+    db.expire_all()
+    return db.get(PanRecord, record_id).hot_score
+
+
+# 测试点赞、收藏和浏览增量累加热度分，取消时扣回且不低于0
+def test_events_update_score(db):
+    publish = HOT_SCORE_WEIGHTS["publish"]
+    LikeService(db).toggle_like(1, 1)
+    CollectService(db).toggle_collect(1, 1)
+    assert score_of(db, 1) == pytest.approx(publish + HOT_SCORE_WEIGHTS["like"] + HOT_SCORE_WEIGHTS["collect"])
+    LikeService(db).toggle_like(1, 1)
+    assert score_of(db, 1) == pytest.approx(publish + HOT_SCORE_WEIGHTS["collect"])
+
+    view_counter.clear()
+    detail = PanService(db).get_pan_detail(1)
+    assert detail["view_count"] == 1
+    view_counter.flush(db)  # 浏览热度分随浏览数批量写回
+    assert score_of(db, 1) == pytest.approx(publish + HOT_SCORE_WEIGHTS["collect"] + HOT_SCORE_WEIGHTS["view"])
+
+    db.get(PanRecord, 2).hot_score = 0.5
+    db.commit()
+    HotScoreService(db).add_event(2, "collect", -1)
+    db.commit()
+    assert score_of(db, 2) == 0
+
+
+# 测试衰减：第一次只记录起点，经过一个半衰期热度分减半，同一时刻重复衰减不生效，过小的热度分归零
+def test_decay(db):
+    service = HotScoreService(db)
+    db.get(PanRecord, 2).hot_score = HOT_SCORE_MIN * 1.5
+    db.commit()
+    assert service.decay(now=1000) == 0
+    assert service.decay(now=1000 + HALF_LIFE) == 2
+    assert score_of(db, 1) == pytest.approx(HOT_SCORE_WEIGHTS["publish"] / 2)
+    assert score_of(db, 2) == 0
+    assert service.decay(now=1000 + HALF_LIFE) == 0
+    assert service.decay(now=1000 + HALF_LIFE * 3) == 1  # 已归零的记录不再改写
+    assert score_of(db, 1) == pytest.approx(HOT_SCORE_WEIGHTS["publish"] / 8)
+    assert decay_factor(-1) == 1.0
+
+
+# 测试另一个进程已经完成衰减时，本进程基于旧时间的衰减不生效
+def test_decay_claim(db):
+    service = HotScoreService(db)
+    service.decay(now=1000)
+    config = db.query(SystemConfig).filter(SystemConfig.key == DECAYED_AT_KEY).first()
+    config.value = "5000"  # 模拟其他进程抢先更新了衰减时间
+    db.commit()
+    assert service.decay(now=3000) == 0
+    assert score_of(db, 1) == HOT_SCORE_WEIGHTS["publish"]
+
+
+# 测试最热列表按热度分排序：衰减后的旧热门记录排在新的互动记录之后
+def test_hottest_uses_score(db):
+    for _ in range(3):
+        HotScoreService(db).add_event(1, "like")
+    db.commit()
+    assert [item["id"] for item in PanService(db).get_public_pan_list(sort="hottest")] == [1, 2]
+    HotScoreService(db).decay(now=1000)
+    HotScoreService(db).decay(now=1000 + HALF_LIFE * 4)
+    HotScoreService(db).add_event(2, "like")
+    db.commit()
+    assert [item["id"] for item in PanService(db).get_public_pan_list(sort="hottest")] == [2, 1]
+
+
+# 测试后台衰减任务按配置间隔运行，并可以停止；间隔为0时不启动
+def test_decay_task(monkeypatch):
+    calls = []
+    monkeypatch.setattr(HotScoreDecayTask, "_decay_once", staticmethod(lambda: calls.append(1) or 0))
+
+    async def run():
+        task = HotScoreDecayTask()
+        task.start(interval=0)
+        assert task._task is None
+        task.start(interval=0.01)
+        await asyncio.sleep(0.1)
+        await task.stop()
+        assert task._task is None
+
+    asyncio.run(run())
+    assert calls
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,102 @@
+"""
+ * @file            backend/tests/test_jieqi_index.py
+ * @description     节气交接时刻索引测试
+ * @author          Gordon <gordon_cao@qq.com>
+ * @createTime      2026-10-18 15:00:00
+ * @lastModified    2026-10-18 15:00:00
+ * Copyright © All rights reserved
+"""
+
+import sys
+import os
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from lunar_python import Solar
+
+from core.jieqi_index import JieqiIndex, jieqi_index, lunar_jieqi_terms, verify_jieqi_index, format_instant
+from core.calendar_algorithm_core import calendar_algorithm_core
+
+
+def _decode(code: int) -> tuple:
+    """整数时刻解码为(年, 月, 日, 时, 分, 秒)"""
+    text = format_instant(code)
+    return tuple(int(part) for part in text.replace("-", " ").replace(":", " ").split())
+
+
+# 测试仓库自带的索引文件已加载并覆盖1900~2100年
+def test_default_index_loaded():
+    assert (jieqi_index.start_year, jieqi_index.end_year) == (1900, 2100)
+    assert len(jieqi_index) == 24 * 201
+    assert format_instant(jieqi_index.instants[0]).startswith("1900-01")
+
+
+# 测试索引文件写入后重新加载内容不变，且与重新生成的结果一致
+def test_save_load_roundtrip(tmp_path):
+    built = JieqiIndex.build(2023, 2025)
+    path = str(tmp_path / "jieqi_index.bin")
+    built.save(path)
+    loaded = JieqiIndex.load(path)
+    assert (loaded.start_year, loaded.end_year) == (2023, 2025)
+    assert list(loaded.instants) == list(built.instants)
+    assert list(loaded.term_ids) == list(built.term_ids)
+    subset = [code for code in jieqi_index.instants if 2023 <= code // 10 ** 10 <= 2025]
+    assert list(loaded.instants) == subset
+
+
+# 测试节气交接时刻前后1秒的前后节气和年、月精确干支与lunar-python一致（抽样覆盖1900~2100年）
+def test_boundaries_match_lunar_python():
+    instants = []
+    for code in list(jieqi_index.instants)[1:-1:37]:
+        year, month, day, hour, minute, second = _decode(code)
+        for delta in (-1, 0, 1):
+            if 0 <= second + delta <= 59:
+                instants.append((year, month, day, hour, minute, second + delta))
+    assert verify_jieqi_index(jieqi_index, instants) == []
+
+
+# 测试立春交接时刻前后的年柱、月柱切换
+def test_li_chun_switch():
+    before = jieqi_index.find_year_month_pillars(2024, 2, 4, 16, 27, 6)
+    after = jieqi_index.find_year_month_pillars(2024, 2, 4, 16, 27, 7)
+    assert before == ("癸卯", "乙丑")
+    assert after == ("甲辰", "丙寅")
+    assert jieqi_index.find_terms(2024, 2, 4, 16, 27, 7)[0] == ("立春", "2024-02-04 16:27:07")
+
+
+# 测试超出索引范围时回退到lunar-python，结果与逐次计算一致
+def test_out_of_range_fallback():
+    assert jieqi_index.find_terms(1850, 6, 1) is None
+    assert jieqi_index.find_window(1899, 12, 31) is None
+    assert jieqi_index.find_year_month_pillars(1900, 1, 2) is None
+
+    result = calendar_algorithm_core.convert_solar_to_lunar(1850, 6, 1, 8, 0, 0)
+    lunar_date = Solar.fromYmdHms(1850, 6, 1, 8, 0, 0).getLunar()
+    (prev_jie, next_jie, prev_qi, next_qi) = lunar_jieqi_terms(lunar_date)
+    jieqi_result = result["jieqi_info"]["jieqi_result_a"]
+    assert (jieqi_result["prev_jie"]["name"], jieqi_result["prev_jie"]["time"]) == prev_jie
+    assert (jieqi_result["next_qi"]["name"], jieqi_result["next_qi"]["time"]) == next_qi
+    assert result["ganzhi_info"]["lunar_month_in_ganzhi_exact"] == lunar_date.getMonthInGanZhiExact()
+
+
+# 测试空索引（索引文件缺失时的状态）全部查询返回None
+def test_empty_index():
+    empty = JieqiIndex()
+    assert len(empty) == 0
+    assert empty.find_terms(2024, 1, 1) is None
+    assert empty.find_window(2024, 1, 1) is None
+    assert empty.find_year_month_pillars(2024, 1, 1) is None
+
+
+# 测试无效索引文件抛出异常
+def test_invalid_index_file(tmp_path):
+    path = tmp_path / "broken.bin"
+    path.write_bytes(b"NOPE" + bytes(20))
+    with pytest.raises(ValueError):
+        JieqiIndex.load(str(path))
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
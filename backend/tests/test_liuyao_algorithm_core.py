@@ -0,0 +1,98 @@
+"""
+ * @file            backend/tests/test_liuyao_algorithm_core.py
+ * @description     六爻排盘核心算法单元测试
+ * @author          Gordon <gordon_cao@qq.com>
+ * @createTime      2026-10-18 10:00:00
+ * @lastModified    2026-10-18 10:00:00
+ * Copyright © All rights reserved
+"""
+
+import sys
+import os
+import json
+import itertools
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from core.liuyao_algorithm_core import LiuYaoAlgorithmCore
+from data.liuyao_configuration_data import SIXTY_FOUR_GUA
+from data.liuyao_gua_table import GUA_TABLE, LIU_SHEN_BY_DAY_GAN, gua_code_from_bits, gua_code_to_str
+
+# 奇数个数到三位数爻值的映射（0~3个奇数）
+DIGITS_BY_ODD_COUNT = {0: "000", 1: "100", 2: "110", 3: "111"}
+
+
+def _calendar_info(day_gan: str) -> dict:
+    """构造只包含日干的历法信息"""
+    return {"ganzhi_info": {"lunar_day_in_gan_exact": day_gan}}
+
+
+# 测试模板模式与逐次构建模式的排盘结果完全一致
+def test_gua_templates_match_rebuild():
+    rebuild_core = LiuYaoAlgorithmCore(gua_template_mode="off")
+    template_core = LiuYaoAlgorithmCore(gua_template_mode="lazy")
+
+    for odd_counts in itertools.product(range(4), repeat=6):
+        yao_list = [DIGITS_BY_ODD_COUNT[v] for v in odd_counts]
+        for day_gan in ("甲", "丙", "己", "癸"):
+            expected = rebuild_core._calculate_paipan_common(yao_list, _calendar_info(day_gan))
+            actual = template_core._calculate_paipan_common(yao_list, _calendar_info(day_gan))
+            assert json.dumps(actual, ensure_ascii=False) == json.dumps(expected, ensure_ascii=False)
+
+
+# 测试修改排盘结果不会污染共享模板
+def test_gua_template_is_not_mutated_by_result():
+    core = LiuYaoAlgorithmCore(gua_template_mode="lazy")
+    yao_list = ["000", "111", "100", "110", "111", "000"]
+
+    first = core._calculate_paipan_common(yao_list, _calendar_info("甲"))
+    first["liuyao_config_data"]["ben_gua_body"][0]["liu_qin"] = "已修改"
+    first["liuyao_config_data"]["ben_gua_head"]["fu_shen_wei_list"].append(99)
+    first["liuyao_config_data"]["dong_yao_info"]["positions"].append(99)
+
+    second = core._calculate_paipan_common(yao_list, _calendar_info("甲"))
+    assert second["liuyao_config_data"]["ben_gua_body"][0]["liu_qin"] != "已修改"
+    assert 99 not in second["liuyao_config_data"]["ben_gua_head"]["fu_shen_wei_list"]
+    assert 99 not in second["liuyao_config_data"]["dong_yao_info"]["positions"]
+
+
+# 测试预编译模式构建全部4096个模板
+def test_eager_mode_precompiles_all_templates():
+    core = LiuYaoAlgorithmCore(gua_template_mode="eager")
+    assert len(core._gua_templates) == 4 ** 6
+
+
+# 测试整数卦码表与原始字符串键配置一一对应
+def test_gua_table_matches_configuration():
+    assert len(GUA_TABLE) == 64
+    for code, record in enumerate(GUA_TABLE):
+        assert record.code == code
+        assert gua_code_to_str(code) == record.code_str
+        assert gua_code_from_bits(record.yao_bits) == code
+        assert record.name == SIXTY_FOUR_GUA[record.code_str]["卦名"]
+        assert list(record.na_zhi) == SIXTY_FOUR_GUA[record.code_str]["纳支"]
+
+
+# 测试卦象记录和六神表只读，不能被请求修改
+def test_gua_table_is_read_only():
+    record = GUA_TABLE[0b111111]
+    with pytest.raises(AttributeError):
+        record.name = "已修改"
+    with pytest.raises(TypeError):
+        record.liu_qin[0] = "已修改"
+    with pytest.raises(TypeError):
+        LIU_SHEN_BY_DAY_GAN["甲"] = ()
+
+
+# 测试无效日干抛出Core层验证异常
+def test_invalid_day_gan_raises():
+    core = LiuYaoAlgorithmCore()
+    with pytest.raises(ValueError, match="Core层验证"):
+        core.calculate_liu_shen("子")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,90 @@
+"""
+ * @file            backend/tests/test_liuyao_batch.py
+ * @description     六爻批量排盘服务与接口测试
+ * @author          Gordon <gordon_cao@qq.com>
+ * @createTime      2026-10-18 12:00:00
+ * @lastModified    2026-10-18 17:50:00
+ * Copyright © All rights reserved
+"""
+
+import sys
+import os
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from core.calendar_algorithm_core import calendar_algorithm_core
+from core.calendar_cache import calendar_cache
+from app.api.liuyao_api import router as liuyao_router
+from app.services.liuyao_service import LiuYaoService
+
+YAO_LIST_A = ["111", "000", "123", "456", "789", "246"]
+YAO_LIST_B = ["000", "000", "000", "111", "111", "111"]
+
+
+# 测试相同时间的条目只做一次历法转换，结果顺序与输入一致
+def test_batch_groups_by_calendar_key(monkeypatch):
+    service = LiuYaoService()
+    calendar_cache.clear()  # 清空共享历法缓存
+    calls = []
+    original = calendar_algorithm_core.convert_validated  # 已验证的时刻经此入口转换
+
+    def counting_convert(*args, **kwargs):
+        calls.append(args or kwargs)
+        return original(*args, **kwargs)
+
+    monkeypatch.setattr(calendar_algorithm_core, "convert_validated", counting_convert)
+
+    items = []
+    for i in range(20):
+        items.append({"yao_list": YAO_LIST_A if i % 2 else YAO_LIST_B, "year": 2024, "month": 3, "day": 1 + i % 2, "hour": 10})
+    results = service.calculate_liuyao_batch(items)
+
+    assert len(calls) == 2
+    assert [result["index"] for result in results] == list(range(20))
+    for item, result in zip(items, results):
+        single = service.calculate_liuyao_with_solar_calendar(yao_list=item["yao_list"], year=2024, month=3, day=item["day"], hour=10)
+        assert result["success"] is True
+        assert result["data"] == single
+
+
+# 测试单条错误不影响其他条目
+def test_batch_reports_per_item_errors():
+    service = LiuYaoService()
+    results = service.calculate_liuyao_batch([
+        {"yao_list": YAO_LIST_A, "year": 2024, "month": 2, "day": 30},
+        {"yao_list": ["12a", "000", "000", "000", "000", "000"], "year": 2024, "month": 3, "day": 1},
+        {"yao_list": YAO_LIST_A, "lunar_year": 2023, "lunar_month": 2, "lunar_day": 1, "is_leap_month": True},
+    ])
+
+    assert results[0]["success"] is False and "[Service层验证]" in results[0]["error"]
+    assert results[1]["success"] is False and "[Service层验证]" in results[1]["error"]
+    assert results[2]["success"] is True
+
+
+# 测试批量接口：API层验证失败的条目也按原始下标返回
+def test_batch_endpoint_keeps_request_order():
+    app = FastAPI()
+    app.include_router(liuyao_router, prefix="/liuyao")
+    client = TestClient(app)
+
+    response = client.post("/liuyao/assemble-liuya/batch", json={"items": [
+        {"numbers": YAO_LIST_A, "year": 2024, "month": 3, "day": 1, "hour": 10},
+        {"numbers": ["111"], "year": 2024, "month": 3, "day": 1},
+        {"numbers": YAO_LIST_B, "lunar_year": 2024, "lunar_month": 1, "lunar_day": 1},
+    ]})
+
+    assert response.status_code == 200
+    body = response.json()
+    assert [result["index"] for result in body["results"]] == [0, 1, 2]
+    assert [result["success"] for result in body["results"]] == [True, False, True]
+    assert "[API层验证]" in body["results"][1]["error"]
+    assert body["success_count"] == 2 and body["failed_count"] == 1
+
+
+if __name__ == "__main__":
+    import pytest
+    pytest.main([__file__])
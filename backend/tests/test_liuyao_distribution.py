@@ -0,0 +1,115 @@
+"""
+ * @file            backend/tests/test_liuyao_distribution.py
+ * @description     起卦分布模拟测试：组合计数与批量起卦结果一致、理论概率、分块并行结果不变、管理接口
+ * @author          Gordon <gordon_cao@qq.com>
+ * @createTime      2026-10-18 20:20:00
+ * @lastModified    2026-10-18 22:10:00
+ * Copyright © All rights reserved
+"""
+
+import sys
+import os
+import asyncio
+import math
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import admin
+from app.divination.random_number_divination import RandomNumberDivination, RandomDrawStream
+from app.services.liuyao_service import liuyao_service
+from app.utils.cpu_executor import cpu_executor
+from app.utils.dependencies import get_current_admin_user
+from core.liuyao_algorithm_core import LiuYaoAlgorithmCore
+from config import settings
+from core.liuyao_distribution import PATTERN_COUNT, NO_BIAN_GUA, simulate_pattern_counts, summarize_pattern_counts, simulate_distribution
+
+
+# 测试组合计数与批量抽取six-yao的逐次起卦结果一致（同一种子和块序号）
+def test_pattern_counts_match_bulk_casts():
+    pattern_counts = simulate_pattern_counts(5000, seed=11, chunk_index=3)
+    casts = RandomNumberDivination.generate_bulk_draws(RandomDrawStream(11), "six-yao", 5000, chunk_index=3)
+    expected = Counter(sum(odd_count << (2 * i) for i, odd_count in enumerate(cast["odd_counts"])) for cast in casts)
+    assert len(pattern_counts) == PATTERN_COUNT and sum(pattern_counts) == 5000
+    assert {pattern: times for pattern, times in enumerate(pattern_counts) if times} == dict(expected)
+
+
+# 测试理论概率：本卦和卦宫均匀分布，动爻数服从二项分布B(6, 1/4)，无变卦与动爻数为0的次数一致
+def test_summary_expected_ratios():
+    core = LiuYaoAlgorithmCore(gua_template_mode="off")
+    pattern_counts = [0] * PATTERN_COUNT
+    pattern_counts[0b11_01_10_01_10_01] = 3  # 初爻起：1、2、1、2、1、3个奇数，上爻为动爻
+    summary = summarize_pattern_counts(pattern_counts)
+    assert summary["total_casts"] == 3
+    assert len(summary["ben_gua"]["items"]) == 64 and len(summary["bian_gua"]["items"]) == 65 and len(summary["palaces"]["items"]) == 8
+    assert all(item["expected_ratio"] == round(1 / 64, 6) for item in summary["ben_gua"]["items"])
+    assert [item["expected_ratio"] for item in summary["moving_line_counts"]["items"]] == [
+        round(math.comb(6, k) * 0.25 ** k * 0.75 ** (6 - k), 6) for k in range(7)]
+    odd_counts = [1, 2, 1, 2, 1, 3]
+    ben_gua_record, _ = core.ben_gua_najia(odd_counts)
+    bian_gua_record, _ = core.bian_gua_najia(odd_counts, ben_gua_record)
+    assert summary["ben_gua"]["items"][0] == {"name": ben_gua_record.name, "count": 3, "ratio": 1.0, "expected_ratio": round(1 / 64, 6)}
+    assert summary["bian_gua"]["items"][0]["name"] == bian_gua_record.name
+    assert summary["palaces"]["items"][0]["name"] == ben_gua_record.palace
+    assert next(item for item in summary["moving_line_counts"]["items"] if item["name"] == 1)["count"] == 3
+
+    summary = summarize_pattern_counts(simulate_pattern_counts(20000, seed=5))
+    no_bian = next(item for item in summary["bian_gua"]["items"] if item["name"] == NO_BIAN_GUA)
+    assert no_bian["count"] == summary["moving_line_counts"]["items"][0]["count"]
+    assert summary["moving_line_counts"]["chi_square"] < 30  # 自由度6，远小于显著性阈值
+
+
+# 测试分块并行与串行结果一致（每块独立播种）
+def test_parallel_chunks_are_deterministic():
+    serial = simulate_distribution(30000, seed=9, chunk_size=7000)
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        parallel = simulate_distribution(30000, seed=9, chunk_size=7000, map_func=executor.map)
+    assert parallel == serial and serial["total_casts"] == 30000
+
+
+# 测试管理接口：返回分布和种子，模拟次数越界返回400
+def test_admin_endpoint():
+    app = FastAPI()
+    app.include_router(admin.router, prefix="/admin")
+    app.dependency_overrides[get_current_admin_user] = lambda: None
+    client = TestClient(app)
+
+    response = client.post("/admin/analysis/liuyao-distribution", json={"count": 2000, "seed": 3})
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["seed"] == 3 and data["total_casts"] == 2000
+    replay = client.post("/admin/analysis/liuyao-distribution", json={"count": 2000, "seed": 3}).json()["data"]
+    data.pop("elapsed_seconds"), replay.pop("elapsed_seconds")
+    assert replay == data  # 相同种子复现相同分布
+    assert client.post("/admin/analysis/liuyao-distribution", json={"count": 0}).status_code == 400
+
+
+# 测试线程模式下拒绝无法在执行器超时内完成的模拟次数，进程模式下放宽到配置上限；分块超时按模拟次数计算
+def test_simulation_limits(monkeypatch):
+    monkeypatch.setattr(cpu_executor, "mode", "thread")
+    monkeypatch.setattr(cpu_executor, "timeout", 10.0)
+    monkeypatch.setattr(settings, "LIUYAO_SIMULATION_MIN_RATE", 1000)
+    assert liuyao_service.simulation_max_count() == 10000
+    with pytest.raises(ValueError) as exc_info:
+        asyncio.run(liuyao_service.simulate_distribution_async(10001, seed=1))
+    assert "[Service层验证]" in str(exc_info.value)
+
+    # 线程模式下同一轮分块共用GIL，超时按整轮次数计算；进程模式按单块次数计算；均不低于默认超时
+    wave = [(5000, 1, 0), (5000, 1, 1), (3000, 1, 2)]
+    assert liuyao_service._simulation_wave_timeout(wave) == 13.0
+    monkeypatch.setattr(cpu_executor, "mode", "process")
+    assert liuyao_service.simulation_max_count() == settings.LIUYAO_SIMULATION_MAX_COUNT
+    assert liuyao_service._simulation_wave_timeout(wave) == 10.0
+    assert liuyao_service._simulation_wave_timeout([(50000, 1, 0)]) == 50.0
+    monkeypatch.setattr(cpu_executor, "timeout", 0)
+    assert liuyao_service._simulation_wave_timeout(wave) == 0
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
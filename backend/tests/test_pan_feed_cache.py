@@ -0,0 +1,160 @@
+"""
+ * @file            backend/tests/test_pan_feed_cache.py
+ * @description     公开排盘列表页缓存测试：内存预算淘汰、过期、失效代数、按记录和按类型失效，以及接口命中与保存、审核、点赞后的失效
+ * @author          Gordon <gordon_cao@qq.com>
+ * @createTime      2026-10-18 20:40:00
+ * @lastModified    2026-10-18 22:20:00
+ * Copyright © All rights reserved
+"""
+
+import sys
+import os
+import json
+import time
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import admin, pan
+from app.db.database import get_db
+from app.models import User, PanRecord
+from app.services.like_service import LikeService
+from app.services.pan_feed_cache import PanFeedCache, pan_feed_cache
+from app.utils import dependencies
+
+
+# 生成页缓存键
+def key(pan_type="liuyao", sort="newest", cursor=None):
+    return (pan_type, sort, cursor, 1, 12)
+
+
+# 测试按内存预算淘汰最久未使用的页，单页超过预算时不缓存
+def test_memory_budget():
+    cache = PanFeedCache(max_bytes=4000)  # 每页约1256字节（含估算开销），可容纳3页
+    for cursor in ("a", "b", "c"):
+        _, generation = cache.get(key(cursor=cursor))
+        assert cache.put(key(cursor=cursor), b"x" * 1000, [1], generation)
+    cache.get(key(cursor="a"))  # a变为最近使用，淘汰b
+    _, generation = cache.get(key(cursor="d"))
+    cache.put(key(cursor="d"), b"x" * 100, [2], generation)
+    assert cache.get(key(cursor="b"))[0] is None
+    assert cache.get(key(cursor="a"))[0] is not None
+    stats = cache.stats()
+    assert stats["evictions"] == 1 and stats["size_bytes"] <= stats["max_bytes"]
+    assert not cache.put(key(cursor="e"), b"x" * 4000, [], cache.generation)
+
+    with pytest.raises(ValueError):
+        PanFeedCache(max_bytes=0)
+
+
+# 测试条目过期
+def test_ttl():
+    cache = PanFeedCache(ttl_seconds=0.05)
+    cache.put(key(), b"{}", [1], cache.generation)
+    assert cache.get(key())[0] == b"{}"
+    time.sleep(0.06)
+    assert cache.get(key())[0] is None
+    assert cache.stats()["expirations"] == 1
+
+
+# 测试查询期间发生失效时不写回旧数据
+def test_generation_guard():
+    cache = PanFeedCache()
+    _, generation = cache.get(key())
+    cache.invalidate_pans(99)
+    assert not cache.put(key(), b"{}", [1], generation)
+    assert cache.get(key())[0] is None
+
+
+# 测试按记录失效只移除包含该记录的页，按类型失效移除该类型全部页
+def test_invalidation_scope():
+    cache = PanFeedCache()
+    cache.put(key(cursor="a"), b"a", [1, 2], cache.generation)
+    cache.put(key(cursor="b"), b"b", [3], cache.generation)
+    cache.put(key(pan_type="bazi"), b"c", [4], cache.generation)
+    assert cache.invalidate_pans(2) == 1
+    assert cache.get(key(cursor="a"))[0] is None and cache.get(key(cursor="b"))[0] == b"b"
+    assert cache.invalidate_feed("liuyao") == 1
+    assert cache.get(key(pan_type="bazi"))[0] == b"c"
+    assert cache.invalidate_feed() == 1 and cache.stats()["size_bytes"] == 0
+    assert cache.stats()["invalidations"] == 3
+
+
+# 内存数据库和挂载排盘、管理接口的测试应用，当前用户通过依赖覆盖切换
+@pytest.fixture
+def client(db_session):
+    session = db_session
+    session.add_all([User(id=1, phone="13800000001", nickname="用户1", role=2)])
+    session.add_all([
+        PanRecord(id=i, user_id=1, pan_params=json.dumps({"n": i}), pan_result="{}", create_time=1700000000 + i, audit_status=1)
+        for i in range(1, 6)
+    ])
+    session.commit()
+
+    app = FastAPI()
+    app.include_router(pan.router)
+    app.include_router(admin.router, prefix="/admin")
+    app.dependency_overrides[get_db] = lambda: session
+    app.dependency_overrides[dependencies.get_db] = lambda: session
+    app.dependency_overrides[dependencies.get_current_admin_user] = lambda: session.get(User, 1)
+    current = {"user": None}
+    app.dependency_overrides[pan.get_current_user_from_payload] = lambda: current["user"]
+    pan_feed_cache.clear()
+    test_client = TestClient(app)
+    test_client.session, test_client.current = session, current
+    yield test_client
+    pan_feed_cache.clear()
+
+
+# 读取公开列表中的记录ID
+def feed_ids(client, **params):
+    return [item["id"] for item in client.get("/public/list", params=params).json()["data"]]
+
+
+# 测试第二次访问命中缓存且响应字节一致，登录用户读取同一份共享页
+def test_api_hit(client):
+    first = client.get("/public/list", params={"size": 3})
+    second = client.get("/public/list", params={"size": 3})
+    assert first.content == second.content
+    assert first.json()["data"][0]["pan_params"] == {"n": 5}
+    assert pan_feed_cache.stats()["hits"] == 1 and pan_feed_cache.stats()["misses"] == 1
+
+    client.current["user"] = client.session.get(User, 1)
+    assert client.get("/public/list", params={"size": 3}).content == first.content
+    assert pan_feed_cache.stats()["hits"] == 2 and pan_feed_cache.stats()["misses"] == 1
+    assert client.get("/admin/cache/pan-feed-stats").json()["data"]["hit_ratio"] == 0.6667
+
+
+# 测试点赞后包含该记录的页失效，计数更新
+def test_like_invalidates(client):
+    client.get("/public/list", params={"size": 3})
+    LikeService(client.session).toggle_like(1, 5)
+    data = client.get("/public/list", params={"size": 3}).json()["data"]
+    assert data[0]["like_count"] == 1
+    assert pan_feed_cache.stats()["hits"] == 0
+
+
+# 测试保存、审核通过和删除后列表成员变化立即可见
+def test_membership_events_invalidate(client):
+    assert feed_ids(client, size=3) == [5, 4, 3]
+
+    client.current["user"] = client.session.get(User, 1)
+    record_id = client.post("/save", json={"pan_params": "{}", "pan_result": "{}"}).json()["data"]["record_id"]
+    client.session.get(PanRecord, record_id).create_time = 1800000000
+    client.session.commit()
+    client.current["user"] = None
+    assert pan_feed_cache.stats()["size"] == 0  # 保存后该类型的页已失效
+
+    assert client.put(f"/admin/pan-records/{record_id}/audit", json={"audit_status": 1}).status_code == 200
+    assert feed_ids(client, size=3) == [record_id, 5, 4]
+
+    assert client.delete("/admin/pan-records/5").status_code == 200
+    assert feed_ids(client, size=3) == [record_id, 4, 3]
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
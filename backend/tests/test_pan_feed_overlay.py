@@ -0,0 +1,115 @@
+"""
+ * @file            backend/tests/test_pan_feed_overlay.py
+ * @description     公开排盘列表共享页与个人状态叠加测试：点赞/收藏位图按一次合并查询返回且与传入顺序一致、未登录不查询、登录用户命中共享页缓存
+ * @author          Gordon <gordon_cao@qq.com>
+ * @createTime      2026-10-18 21:00:00
+ * @lastModified    2026-10-18 22:20:00
+ * Copyright © All rights reserved
+"""
+
+import sys
+import os
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import pan
+from app.db.database import get_db
+from app.middleware.auth import get_current_user
+from app.models import User, PanRecord, PanLike, PanCollect
+from app.services.pan_feed_cache import pan_feed_cache
+from app.services.pan_service import PanService
+
+RECORD_COUNT = 10
+
+
+# 内存数据库：用户1点赞偶数ID、收藏3的倍数ID的记录，用户2点赞记录1
+@pytest.fixture
+def db(db_session):
+    session = db_session
+    session.add_all([User(id=1, phone="13800000001", nickname="用户1"), User(id=2, phone="13800000002", nickname="用户2")])
+    session.add_all([
+        PanRecord(id=i, user_id=1, pan_params="{}", pan_result="{}", create_time=1700000000 + i, audit_status=1)
+        for i in range(1, RECORD_COUNT + 1)
+    ])
+    session.add_all([PanLike(user_id=1, pan_id=i) for i in range(2, RECORD_COUNT + 1, 2)])
+    session.add_all([PanCollect(user_id=1, pan_id=i) for i in range(3, RECORD_COUNT + 1, 3)])
+    session.add(PanLike(user_id=2, pan_id=1))
+    session.commit()
+    session.statements.clear()
+    return session
+
+
+# 测试位图与传入顺序一致，点赞和收藏在一次查询中获取
+def test_interaction_bits(db):
+    pan_ids = [6, 1, 3, 4, 99]
+    bits = PanService(db).get_interaction_bits(1, pan_ids)
+    assert bits == {"pan_ids": pan_ids, "liked": "10010", "collected": "10100"}
+    assert len(db.statements) == 1 and "UNION ALL" in db.statements[0]
+
+    assert PanService(db).get_interaction_bits(2, pan_ids)["liked"] == "01000"
+
+
+# 测试未登录或记录列表为空时不查询数据库
+def test_anonymous_bits(db):
+    assert PanService(db).get_interaction_bits(None, [1, 2]) == {"pan_ids": [1, 2], "liked": "00", "collected": "00"}
+    assert PanService(db).get_interactions(1, []) == (set(), set())
+    assert db.statements == []
+
+
+# 测试合并查询的两个分支都走(user_id, pan_id)索引
+def test_bits_use_index(db, query_plan):
+    PanService(db).get_interactions(1, [1, 2, 3])
+    plan = query_plan(db.executions[-1])
+    assert "SEARCH pan_like USING COVERING INDEX" in plan and "SEARCH pan_collect USING COVERING INDEX" in plan
+    assert "SCAN" not in plan
+
+
+# 挂载排盘接口的测试应用，当前用户通过依赖覆盖切换
+@pytest.fixture
+def client(db):
+    app = FastAPI()
+    app.include_router(pan.router)
+    app.dependency_overrides[get_db] = lambda: db
+    current = {"payload": {}}
+    app.dependency_overrides[get_current_user] = lambda: current["payload"]
+    pan_feed_cache.clear()
+    test_client = TestClient(app)
+    test_client.current = current
+    yield test_client
+    pan_feed_cache.clear()
+
+
+# 测试登录用户读取与匿名用户相同的共享页（命中缓存时不查询数据库），再通过叠加接口获取个人状态
+def test_shared_page_and_overlay(client, db):
+    anonymous = client.get("/public/list", params={"size": 4})
+    assert all("is_liked" not in item for item in anonymous.json()["data"])
+
+    client.current["payload"] = {"user_id": 1}
+    db.statements.clear()
+    shared = client.get("/public/list", params={"size": 4})
+    assert shared.content == anonymous.content and db.statements == []
+
+    pan_ids = [item["id"] for item in shared.json()["data"]]
+    response = client.get("/public/interactions", params={"pan_ids": pan_ids}).json()
+    assert response["code"] == 200
+    assert response["data"] == {"pan_ids": [10, 9, 8, 7], "liked": "1010", "collected": "0100"}
+    assert len(db.statements) == 1
+
+    client.current["payload"] = {}
+    assert client.get("/public/interactions", params={"pan_ids": pan_ids}).json()["data"]["liked"] == "0000"
+
+
+# 测试叠加接口的参数校验：至少1个、最多100个记录ID
+def test_overlay_validation(client):
+    assert client.get("/public/interactions").status_code == 422
+    assert client.get("/public/interactions", params={"pan_ids": list(range(101))}).status_code == 422
+    assert client.get("/public/interactions", params={"pan_ids": list(range(100))}).status_code == 200
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,141 @@
+"""
+ * @file            backend/tests/test_pan_pagination.py
+ * @description     排盘记录游标分页测试：逐页遍历与完整排序一致、游标验证、索引与游标查询条件匹配、公开列表接口返回next_cursor
+ * @author          Gordon <gordon_cao@qq.com>
+ * @createTime      2026-10-18 20:00:00
+ * @lastModified    2026-10-18 22:20:00
+ * Copyright © All rights reserved
+"""
+
+import sys
+import os
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import pan
+from app.db.database import get_db
+from app.models import User, PanRecord
+from app.services.pan_service import PanService, decode_cursor, encode_cursor, paginate_keyset
+
+RECORD_COUNT = 47
+
+
+# 内存数据库：创建时间和热度分大量重复，用于验证排序键相同时按id继续分页；另有不公开、未审核和已删除的记录
+@pytest.fixture
+def db(db_session):
+    session = db_session
+    session.add(User(id=1, phone="13800000001", nickname="用户1"))
+    session.add_all([
+        PanRecord(id=i, user_id=1, pan_params="{}", pan_result="{}", create_time=1700000000 + i // 4,
+                  audit_status=1, hot_score=float(i % 3))
+        for i in range(1, RECORD_COUNT + 1)
+    ])
+    session.add_all([
+        PanRecord(id=100, user_id=1, pan_params="{}", pan_result="{}", create_time=1800000000, audit_status=1, is_public=0),
+        PanRecord(id=101, user_id=1, pan_params="{}", pan_result="{}", create_time=1800000000, audit_status=0),
+        PanRecord(id=102, user_id=1, pan_params="{}", pan_result="{}", create_time=1800000000, audit_status=1, deleted_at=1),
+    ])
+    session.commit()
+    return session
+
+
+# 期望的完整排序
+def expected_ids(sort):
+    if sort == "hottest":
+        key = lambda i: (i % 3, 1700000000 + i // 4, i)
+    else:
+        key = lambda i: (1700000000 + i // 4, i)
+    return sorted(range(1, RECORD_COUNT + 1), key=key, reverse=True)
+
+
+# 测试按游标逐页遍历得到完整且不重复的排序，最后一页没有下一页游标
+@pytest.mark.parametrize("sort", ["newest", "hottest"])
+@pytest.mark.parametrize("size", [1, 5, 12, RECORD_COUNT])
+def test_walk_all_pages(db, sort, size):
+    service = PanService(db)
+    ids, cursor, pages = [], None, 0
+    while True:
+        result = service.get_public_pan_page(size=size, sort=sort, cursor=cursor)
+        ids.extend(item["id"] for item in result["list"])
+        pages += 1
+        cursor = result["next_cursor"]
+        if cursor is None:
+            break
+    assert ids == expected_ids(sort)
+    assert pages == -(-RECORD_COUNT // size)
+
+
+# 测试没有游标时仍兼容页码分页
+def test_page_fallback(db):
+    service = PanService(db)
+    assert [item["id"] for item in service.get_public_pan_list(page=3, size=10, sort="hottest")] == expected_ids("hottest")[20:30]
+    assert service.get_public_pan_list(page=10, size=10) == []
+
+
+# 测试无效游标和排序方式不匹配的游标被拒绝
+def test_invalid_cursor(db):
+    record = db.get(PanRecord, 5)
+    cursor = encode_cursor("newest", record)
+    assert decode_cursor("newest", cursor) == (record.create_time, 5)
+    for sort, bad in (("newest", "not-a-cursor!"), ("newest", "e30"), ("hottest", cursor),
+                      ("newest", encode_cursor("newest", record)[:-2])):
+        with pytest.raises(ValueError) as exc_info:
+            decode_cursor(sort, bad)
+        assert "[Service层验证]" in str(exc_info.value)
+
+
+# 测试游标查询使用与查询条件一致的索引，不需要临时排序
+@pytest.mark.parametrize("sort, index", [("newest", "idx_pan_record_time"), ("hottest", "idx_pan_record_hot")])
+def test_seek_uses_index(db, query_plan, sort, index):
+    query = db.query(PanRecord).filter(
+        PanRecord.pan_type == "liuyao",
+        PanRecord.is_public == 1,
+        PanRecord.audit_status == 1,
+        PanRecord.is_visible == 1,
+        PanRecord.deleted_at.is_(None)
+    )
+    _, cursor = paginate_keyset(query, sort, 5)
+    paginate_keyset(query, sort, 5, cursor)
+    plan = query_plan(db.executions[-1])
+    assert f"USING INDEX {index}" in plan
+    assert "TEMP B-TREE" not in plan
+
+
+# 测试后台管理列表（只按deleted_at过滤，审核状态和用户为可选条件）的首页和游标页都使用管理列表索引，不需要临时排序
+@pytest.mark.parametrize("filters", [{}, {"audit_status": 1}, {"user_id": 1}, {"audit_status": 0, "user_id": 1}])
+def test_admin_seek_uses_index(db, query_plan, filters):
+    query = db.query(PanRecord).filter(PanRecord.deleted_at.is_(None))
+    for column, value in filters.items():
+        query = query.filter(getattr(PanRecord, column) == value)
+    start = len(db.executions)
+    _, cursor = paginate_keyset(query, "newest", 5)
+    paginate_keyset(query, "newest", 5, cursor)
+    for execution in db.executions[start:start + 2]:
+        plan = query_plan(execution)
+        assert "USING INDEX idx_pan_record_admin" in plan
+        assert "TEMP B-TREE" not in plan
+
+
+# 测试公开列表接口返回next_cursor，并按游标返回下一页
+def test_public_list_api(db):
+    app = FastAPI()
+    app.include_router(pan.router)
+    app.dependency_overrides[get_db] = lambda: db
+    client = TestClient(app)
+
+    first = client.get("/public/list", params={"size": 20, "sort": "hottest"}).json()
+    assert [item["id"] for item in first["data"]] == expected_ids("hottest")[:20]
+    second = client.get("/public/list", params={"size": 20, "sort": "hottest", "cursor": first["next_cursor"]}).json()
+    assert [item["id"] for item in second["data"]] == expected_ids("hottest")[20:40]
+
+    response = client.get("/public/list", params={"cursor": first["next_cursor"]})
+    assert response.status_code == 400
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
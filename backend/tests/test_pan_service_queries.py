@@ -0,0 +1,101 @@
+"""
+ * @file            backend/tests/test_pan_service_queries.py
+ * @description     排盘记录服务查询次数测试：公开列表和详情的作者、点赞/收藏状态按页批量查询，查询次数与每页数量无关
+ * @author          Gordon <gordon_cao@qq.com>
+ * @createTime      2026-10-18 19:40:00
+ * @lastModified    2026-10-18 22:20:00
+ * Copyright © All rights reserved
+"""
+
+import sys
+import os
+import json
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+from app.models import User, PanRecord, PanLike, PanCollect
+from app.services.pan_service import PanService
+from app.services.view_counter import view_counter
+
+RECORD_COUNT = 30
+
+
+# 内存数据库：3个作者各发布10条公开排盘记录，用户1点赞偶数ID、收藏3的倍数ID
+@pytest.fixture
+def db(db_session):
+    session = db_session
+    session.add_all([User(id=i, phone=f"1380000000{i}", nickname=f"用户{i}" if i != 3 else None) for i in (1, 2, 3)])
+    session.add_all([
+        PanRecord(id=i, user_id=i % 3 + 1, pan_params=json.dumps({"n": i}), pan_result="not-json",
+                  create_time=1700000000 + i, audit_status=1, like_count=i % 5)
+        for i in range(1, RECORD_COUNT + 1)
+    ])
+    session.add_all([PanLike(user_id=1, pan_id=i) for i in range(2, RECORD_COUNT + 1, 2)])
+    session.add_all([PanCollect(user_id=1, pan_id=i) for i in range(3, RECORD_COUNT + 1, 3)])
+    session.commit()
+    session.expire_all()
+    return session
+
+
+# 统计一次调用执行的SQL语句数
+def count_queries(db, func, *args, **kwargs):
+    db.expire_all()
+    db.statements.clear()
+    result = func(*args, **kwargs)
+    return result, len(db.statements)
+
+
+# 测试公开列表的查询次数与每页数量无关：匿名用户2次（记录、作者），登录用户3次（另加一次点赞、收藏合并查询）
+@pytest.mark.parametrize("size", [1, 5, 12, RECORD_COUNT])
+@pytest.mark.parametrize("sort", ["newest", "hottest"])
+def test_public_list_query_count(db, size, sort):
+    service = PanService(db)
+    items, anonymous_queries = count_queries(db, service.get_public_pan_list, size=size, sort=sort)
+    assert len(items) == size and anonymous_queries == 2
+    items, user_queries = count_queries(db, service.get_public_pan_list, size=size, sort=sort, user_id=1)
+    assert len(items) == size and user_queries == 3
+
+
+# 测试批量组装的结果与逐条查询时一致
+def test_public_list_items(db):
+    items = PanService(db).get_public_pan_list(size=RECORD_COUNT, user_id=1)
+    assert [item["id"] for item in items] == list(range(RECORD_COUNT, 0, -1))
+    for item in items:
+        record_id = item["id"]
+        assert item["pan_params"] == {"n": record_id} and item["pan_result"] == "not-json"
+        assert item["user"]["id"] == record_id % 3 + 1
+        assert item["user"]["nickname"] == ("六爻用户" if record_id % 3 + 1 == 3 else f"用户{record_id % 3 + 1}")
+        assert item["is_liked"] == (record_id % 2 == 0)
+        assert item["is_collected"] == (record_id % 3 == 0)
+
+    items = PanService(db).get_public_pan_list(size=RECORD_COUNT, user_id=2)
+    assert not any(item["is_liked"] or item["is_collected"] for item in items)
+
+    # 匿名访问得到与用户无关的共享页，不含点赞/收藏字段
+    items = PanService(db).get_public_pan_list(size=RECORD_COUNT)
+    assert not any("is_liked" in item or "is_collected" in item for item in items)
+
+
+# 测试空页不执行作者和点赞/收藏查询
+def test_empty_page(db):
+    items, queries = count_queries(db, PanService(db).get_public_pan_list, page=10, user_id=1)
+    assert items == [] and queries == 1
+
+
+# 测试详情复用批量组装且只读：查询次数固定，不执行写语句，浏览数包含尚未写回的部分
+def test_detail_query_count(db):
+    service = PanService(db)
+    view_counter.clear()
+    detail, queries = count_queries(db, service.get_pan_detail, 6, user_id=1)
+    assert detail["is_liked"] and detail["is_collected"] and detail["view_count"] == 1
+    assert queries == 3  # 记录、作者、点赞和收藏
+    assert all(statement.lstrip().startswith("SELECT") for statement in db.statements)
+    view_counter.clear()
+    assert service.get_pan_detail(RECORD_COUNT + 1) is None
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,120 @@
+"""
+ * @file            backend/tests/test_pan_toggle.py
+ * @description     点赞/收藏原子切换测试：单事务语句数、计数与热度分在同一条UPDATE中更新、记录不存在时回滚，以及多线程并发切换同一排盘记录后计数与关联记录一致
+ * @author          Gordon <gordon_cao@qq.com>
+ * @createTime      2026-10-18 21:40:00
+ * @lastModified    2026-10-18 22:20:00
+ * Copyright © All rights reserved
+"""
+
+import sys
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.db.database import Base
+from app.models import User, PanRecord, PanLike, PanCollect
+from app.services.collect_service import CollectService
+from app.services.hot_score_service import HOT_SCORE_WEIGHTS
+from app.services.like_service import LikeService
+
+USER_COUNT = 16
+
+
+# 写入用户和一条排盘记录
+def seed(session):
+    session.add_all([User(id=i, phone=f"138000000{i:02d}") for i in range(1, USER_COUNT + 1)])
+    session.add(PanRecord(id=1, user_id=1, pan_params="{}", pan_result="{}", audit_status=1,
+                          hot_score=HOT_SCORE_WEIGHTS["publish"]))
+    session.commit()
+
+
+# 内存数据库：用户和一条排盘记录
+@pytest.fixture
+def db(db_session):
+    seed(db_session)
+    db_session.statements.clear()
+    return db_session
+
+
+# 测试点赞一次事务三条语句（删除、插入、更新计数并返回），取消点赞两条语句，不再先查询
+@pytest.mark.parametrize("service_class, method, flag, count", [
+    (LikeService, "toggle_like", "is_liked", "like_count"),
+    (CollectService, "toggle_collect", "is_collected", "collect_count"),
+])
+def test_toggle_statements(db, service_class, method, flag, count):
+    toggle = getattr(service_class(db), method)
+    assert toggle(2, 1) == {flag: True, count: 1}
+    assert [statement.split()[0] for statement in db.statements] == ["DELETE", "INSERT", "UPDATE"]
+    assert "RETURNING" in db.statements[-1] and "hot_score" in db.statements[-1]
+
+    db.statements.clear()
+    assert toggle(3, 1) == {flag: True, count: 2}
+    assert toggle(2, 1) == {flag: False, count: 1}
+    assert [statement.split()[0] for statement in db.statements] == ["DELETE", "INSERT", "UPDATE", "DELETE", "UPDATE"]
+
+
+# 测试排盘记录不存在时回滚，不留下点赞/收藏记录
+def test_toggle_missing_record(db):
+    for service, method, model in ((LikeService(db), "toggle_like", PanLike), (CollectService(db), "toggle_collect", PanCollect)):
+        with pytest.raises(ValueError) as exc_info:
+            getattr(service, method)(2, 99)
+        assert "[Service层验证]" in str(exc_info.value)
+        assert db.query(model).count() == 0
+
+
+# 测试计数已为0时取消不会减成负数
+def test_count_never_negative(db):
+    db.add(PanLike(user_id=2, pan_id=1))
+    db.commit()
+    assert LikeService(db).toggle_like(2, 1) == {"is_liked": False, "like_count": 0}
+
+
+# 多线程并发：每个用户各自点赞3次、收藏2次，另有多个线程同时切换同一用户的点赞；结束后计数必须与关联记录数一致
+def test_concurrent_toggles(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'toggle.db'}", connect_args={"check_same_thread": False, "timeout": 30})
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as session:
+        seed(session)
+
+    jobs = [(user_id, "like") for user_id in range(2, USER_COUNT + 1) for _ in range(3)]
+    jobs += [(user_id, "collect") for user_id in range(2, USER_COUNT + 1) for _ in range(2)]
+    jobs += [(1, "like")] * 7  # 同一用户并发切换7次，最终为已点赞
+    barrier = threading.Barrier(8)
+
+    def run(job):
+        user_id, kind = job
+        with Session() as session:
+            if kind == "like":
+                LikeService(session).toggle_like(user_id, 1)
+            else:
+                CollectService(session).toggle_collect(user_id, 1)
+
+    def worker(chunk):
+        barrier.wait()
+        for job in chunk:
+            run(job)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(worker, [jobs[i::8] for i in range(8)]))
+
+    with Session() as session:
+        record = session.get(PanRecord, 1)
+        likes = session.query(PanLike).filter(PanLike.pan_id == 1).count()
+        collects = session.query(PanCollect).filter(PanCollect.pan_id == 1).count()
+        assert likes == USER_COUNT and record.like_count == likes
+        assert collects == 0 and record.collect_count == 0
+        assert record.hot_score == pytest.approx(HOT_SCORE_WEIGHTS["publish"] + USER_COUNT * HOT_SCORE_WEIGHTS["like"])
+    engine.dispose()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
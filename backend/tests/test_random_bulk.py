@@ -0,0 +1,100 @@
+"""
+ * @file            backend/tests/test_random_bulk.py
+ * @description     批量随机抽取测试：查表结果与逐个生成规则一致、同一种子可复现、JSON与NDJSON结果一致、参数验证
+ * @author          Gordon <gordon_cao@qq.com>
+ * @createTime      2026-10-18 19:50:00
+ * @lastModified    2026-10-18 19:50:00
+ * Copyright © All rights reserved
+"""
+
+import sys
+import os
+import json
+from collections import Counter
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import random_number_api
+from app.divination.random_number_divination import RandomNumberDivination, RandomDrawStream
+from app.services import random_number_service as random_number_service_module
+from app.services.random_number_service import random_number_service
+from data.sixty_jiazi_data import SIXTY_JIAZI
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(random_number_api.router, prefix="/random")
+    return TestClient(app)
+
+
+# 测试各类型结果的格式与逐个生成的规则一致（背正、奇数个数、六十甲子序号）
+def test_bulk_draw_formats():
+    stream = RandomDrawStream(7)
+    assert all(0 <= digit <= 9 for digit in RandomNumberDivination.generate_bulk_draws(stream, "digit", 1000))
+    for draw in RandomNumberDivination.generate_bulk_draws(stream, "three-digits", 1000):
+        digits = draw["three_digits"]
+        assert len(digits) == 3 and digits.isdigit()
+        assert draw["parity_str"] == "".join("背" if int(d) % 2 else "正" for d in digits)
+        assert draw["odd_count"] == sum(int(d) % 2 for d in digits)
+    for draw in RandomNumberDivination.generate_bulk_draws(stream, "sixty-jiazi", 100):
+        assert SIXTY_JIAZI[draw["index"] - 1] == draw["jiazi"]
+    for cast in RandomNumberDivination.generate_bulk_draws(stream, "six-yao", 100):
+        assert len(cast["numbers"]) == 6
+        assert cast["odd_counts"] == [sum(int(d) % 2 for d in yao) for yao in cast["numbers"]]
+
+
+# 测试奇数个数分布接近三枚铜钱的理论分布1:3:3:1
+def test_odd_count_distribution():
+    counts = Counter(draw["odd_count"] for draw in RandomNumberDivination.generate_bulk_draws(RandomDrawStream(2026), "three-digits", 80000))
+    for odd_count, expected in ((0, 10000), (1, 30000), (2, 30000), (3, 10000)):
+        assert abs(counts[odd_count] - expected) < expected * 0.05
+
+
+# 测试同一种子可复现、不同种子和不同块结果不同，未指定种子时返回生成的种子且可复现
+def test_seeded_streams_replay():
+    first = random_number_service.get_bulk_draws("six-yao", 50, seed=42)
+    assert random_number_service.get_bulk_draws("six-yao", 50, seed=42)["draws"] == first["draws"]
+    assert random_number_service.get_bulk_draws("six-yao", 50, seed=43)["draws"] != first["draws"]
+    stream = RandomDrawStream(42)
+    assert stream.integers(1000, 20, 0) != stream.integers(1000, 20, 1)
+
+    unseeded = random_number_service.get_bulk_draws("digit", 100)
+    assert random_number_service.get_bulk_draws("digit", 100, seed=unseeded["seed"])["draws"] == unseeded["draws"]
+
+
+# 测试接口：JSON和NDJSON在同一种子下结果一致（跨越多个块），NDJSON响应头返回种子
+def test_bulk_endpoint_json_and_ndjson(client, monkeypatch):
+    monkeypatch.setattr(random_number_service_module, "_BULK_CHUNK_SIZE", 7)  # 缩小块大小，使少量结果也跨越多个块
+    response = client.get("/random/bulk", params={"kind": "three-digits", "count": 30, "seed": 5})
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert data["count"] == 30 and data["seed"] == 5 and len(data["draws"]) == 30
+
+    response = client.get("/random/bulk", params={"kind": "three-digits", "count": 30, "seed": 5, "format": "ndjson"})
+    assert response.status_code == 200 and response.headers["content-type"].startswith("application/x-ndjson")
+    assert response.headers["x-random-seed"] == "5"
+    assert [json.loads(line) for line in response.text.splitlines()] == data["draws"]
+
+
+# 测试参数验证：类型、个数上限、种子范围和输出格式
+@pytest.mark.parametrize("params", [
+    {"kind": "coin"},
+    {"count": 0},
+    {"count": 10001},
+    {"seed": -1},
+    {"format": "xml"},
+])
+def test_bulk_validation(client, params):
+    response = client.get("/random/bulk", params=params)
+    assert response.status_code == 400
+    assert response.json()["detail"]["error_code"] == 1001
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
@@ -0,0 +1,75 @@
+"""
+ * @file            backend/tests/test_random_cast.py
+ * @description     随机起卦排盘接口测试：一次请求返回六个爻位的随机数字和排盘结果，排盘与按相同数列排盘一致，当前时间起卦和日期验证
+ * @author          Gordon <gordon_cao@qq.com>
+ * @createTime      2026-10-18 19:30:00
+ * @lastModified    2026-10-18 19:30:00
+ * Copyright © All rights reserved
+"""
+
+import sys
+import os
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import random_number_api
+from app.services.liuyao_service import liuyao_service
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.include_router(random_number_api.router, prefix="/random")
+    return TestClient(app)
+
+
+# 测试指定公历时间起卦：六个爻位的随机数字与起卦数列一致，排盘结果与按相同数列排盘一致
+def test_cast_with_solar_datetime(client):
+    response = client.post("/random/cast-liuyao", json={"year": 2024, "month": 2, "day": 4, "hour": 16, "minute": 30})
+    assert response.status_code == 200
+    data = response.json()["data"]
+    assert len(data["draws"]) == 6
+    assert [draw["three_digits"] for draw in data["draws"]] == data["numbers"]
+    for draw in data["draws"]:
+        assert draw["odd_count"] == sum(int(digit) % 2 for digit in draw["three_digits"])
+        assert draw["parity_str"] == "".join("背" if int(digit) % 2 else "正" for digit in draw["three_digits"])
+    expected = liuyao_service.calculate_liuyao_with_solar_calendar(yao_list=data["numbers"], year=2024, month=2, day=4, hour=16, minute=30)
+    assert data["paipan"] == expected
+
+
+# 测试农历时间起卦和输出配置
+def test_cast_with_lunar_datetime(client):
+    response = client.post("/random/cast-liuyao", json={"lunar_year": 2023, "lunar_month": 2, "lunar_day": 1, "is_leap_month": True,
+                                                        "hour": 10, "calendar_profile": "ganzhi"})
+    assert response.status_code == 200
+    data = response.json()["data"]
+    expected = liuyao_service.calculate_liuyao_with_lunar_calendar(yao_list=data["numbers"], lunar_year=2023, lunar_month=2, lunar_day=1,
+                                                                   hour=10, is_leap_month=True, calendar_profile="ganzhi")
+    assert data["paipan"] == expected
+
+
+# 测试不提供日期时按当前时间起卦
+def test_cast_now(client):
+    response = client.post("/random/cast-liuyao", json={})
+    assert response.status_code == 200
+    assert "liuyao_config_data" in response.json()["data"]["paipan"]
+
+
+# 测试日期验证：取值超出范围返回400，字段不完整或同时提供两种历法返回422
+def test_cast_validation(client):
+    response = client.post("/random/cast-liuyao", json={"year": 2024, "month": 2, "day": 30})
+    assert response.status_code == 400
+    assert response.json()["detail"]["error_message"].startswith("[API层验证]")
+    assert client.post("/random/cast-liuyao", json={"year": 2024}).status_code == 422
+    assert client.post("/random/cast-liuyao", json={"year": 2024, "month": 1, "day": 1,
+                                                    "lunar_year": 2023, "lunar_month": 1, "lunar_day": 1}).status_code == 422
+    assert client.post("/random/cast-liuyao", json={"calendar_profile": "bad"}).status_code == 422
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
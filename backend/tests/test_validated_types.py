@@ -0,0 +1,131 @@
+"""
+ * @file            backend/tests/test_validated_types.py
+ * @description     已验证请求值类型测试：不可变与slots、验证消息、日值下限与闰月天数规则、跨进程传递、下游不重复验证
+ * @author          Gordon <gordon_cao@qq.com>
+ * @createTime      2026-10-18 17:50:00
+ * @lastModified    2026-10-18 22:40:00
+ * Copyright © All rights reserved
+"""
+
+import sys
+import os
+import dataclasses
+import pickle
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.api import liuyao_api
+from app.services.calendar_service import calendar_service
+from app.services.liuyao_service import liuyao_service
+from app.validators.calendar_validator import calendar_validator
+from app.validators.liuyao_validator import liuyao_validator
+from app.validators.validated_types import ValidatedCast, ValidatedDateTime
+from core.liuyao_algorithm_core import LiuYaoAlgorithmCore
+
+YAO_LIST = ["111", "000", "123", "456", "789", "246"]
+
+
+# 测试值类型不可变且没有实例字典
+def test_frozen_and_slotted():
+    moment = ValidatedDateTime.solar(2024, 2, 4, 16, 30, 0)
+    cast = ValidatedCast.create(YAO_LIST, moment)
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        moment.year = 2025
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        cast.calendar_profile = "ganzhi"
+    assert not hasattr(moment, "__dict__") and not hasattr(cast, "__dict__")
+    assert cast.odd_counts == (3, 0, 2, 1, 2, 0)
+    assert hash(moment) == hash(ValidatedDateTime.solar("2024", "2", "4", "16", "30", "0"))  # 数字字符串与整数得到相同的时刻
+
+
+# 测试公历和农历时刻的取值范围验证
+@pytest.mark.parametrize("factory, args, message", [
+    (ValidatedDateTime.solar, (2024, 2, 30), "2024年2月只有29天"),
+    (ValidatedDateTime.solar, (2024, 2, 0), "日期必须大于等于1"),
+    (ValidatedDateTime.solar, (2024, 1, 1, 24), "小时"),
+    (ValidatedDateTime.solar, ("2024x", 1, 1), "参数类型转换失败"),
+    (ValidatedDateTime.lunar, (2020, 4, 30, 0, 0, 0, True), "2020年4月只有29天"),
+    (ValidatedDateTime.lunar, (2024, 1, 0), "日期必须大于等于1"),
+])
+def test_moment_validation_messages(factory, args, message):
+    with pytest.raises(ValueError) as exc_info:
+        factory(*args)
+    assert message in str(exc_info.value)
+    assert "层验证]" not in str(exc_info.value)  # 层标识由调用方添加
+
+
+# 测试日值规则：公历和农历日值为0时拒绝；闰月按闰月自身的天数验证，而不是同数字的正常月
+# （2020年闰四月29天、四月30天；2017年闰六月30天、六月29天）
+@pytest.mark.parametrize("args, error", [
+    (("2024", "2", "0", "0", "0", "0"), "日期必须大于等于1，当前值：0"),
+    (("2024", "2", "1", "0", "0", "0"), None),
+])
+def test_solar_day_rules(args, error):
+    result = calendar_validator.validate_solar_input(*args)
+    assert result.get("error") == error and result["valid"] == (error is None)
+
+
+@pytest.mark.parametrize("args, error", [
+    (("2024", "1", "0", "0", "0", "0", "false"), "日期必须大于等于1，当前值：0"),
+    (("2020", "4", "30", "0", "0", "0", "true"), "2020年4月只有29天，当前值：30"),  # 闰月比正常月短
+    (("2020", "4", "30", "0", "0", "0", "false"), None),
+    (("2017", "6", "30", "0", "0", "0", "true"), None),  # 闰月比正常月长
+    (("2017", "6", "30", "0", "0", "0", "false"), "2017年6月只有29天，当前值：30"),
+])
+def test_lunar_day_rules(args, error):
+    result = calendar_validator.validate_lunar_input(*args)
+    assert result.get("error") == error and result["valid"] == (error is None)
+
+
+# 测试按请求字段创建起卦请求时先验证起卦数列，再验证时刻
+def test_from_values_checks_numbers_first():
+    with pytest.raises(ValueError) as exc_info:
+        ValidatedCast.from_values({"numbers": ["12a"] + YAO_LIST[1:], "year": 2024, "month": 2, "day": 30})
+    assert "爻位" in str(exc_info.value)
+
+    cast = ValidatedCast.from_values({"yao_list": YAO_LIST, "lunar_year": 2023, "lunar_month": 2, "lunar_day": 1,
+                                      "is_leap_month": "true", "calendar_profile": None})
+    assert cast.moment.is_lunar and cast.moment.is_leap_month and cast.calendar_profile == "full"
+
+
+# 测试值类型可以被pickle往返（进程模式的CPU执行器需要）
+def test_pickle_round_trip():
+    cast = ValidatedCast.create(YAO_LIST, ValidatedDateTime.lunar(2023, 2, 1, 10, 0, 0, True), "ganzhi")
+    assert pickle.loads(pickle.dumps(cast)) == cast
+
+
+# 测试已验证的起卦请求在Core层不再重复验证，结果与原有接口一致
+def test_core_does_not_revalidate(monkeypatch):
+    cast = ValidatedCast.create(YAO_LIST, ValidatedDateTime.solar(2024, 3, 1, 10, 0, 0))
+    expected = liuyao_service.calculate_liuyao_with_solar_calendar(yao_list=YAO_LIST, year=2024, month=3, day=1, hour=10)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("下游不应重复验证")
+
+    for validator, method in ((calendar_validator, "check_solar_values"), (calendar_validator, "validate_solar_input"),
+                              (liuyao_validator, "validate_yao_data")):
+        monkeypatch.setattr(validator, method, fail)
+    assert LiuYaoAlgorithmCore().calculate_paipan_with_cast(cast) == expected
+
+
+# 测试服务层和接口层的验证错误带有对应的层标识
+def test_layer_tags():
+    with pytest.raises(Exception) as exc_info:
+        calendar_service.convert_solar_to_lunar(2024, 2, 30)
+    assert "[Service层验证]" in str(exc_info.value)
+
+    app = FastAPI()
+    app.include_router(liuyao_api.router)
+    client = TestClient(app)
+    response = client.post("/assemble-liuya", json={"numbers": YAO_LIST, "year": 2024, "month": 2, "day": 30})
+    assert response.status_code == 400
+    assert response.json()["detail"].startswith("[API层验证]")
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
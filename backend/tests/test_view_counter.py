@@ -0,0 +1,145 @@
+"""
+ * @file            backend/tests/test_view_counter.py
+ * @description     排盘记录浏览数写回缓冲测试：内存累加后一次批量写回、写回失败保留增量、登录用户去重窗口、关闭时写回剩余浏览数、详情接口不写数据库
+ * @author          Gordon <gordon_cao@qq.com>
+ * @createTime      2026-10-18 21:20:00
+ * @lastModified    2026-10-18 22:20:00
+ * Copyright © All rights reserved
+"""
+
+import sys
+import os
+import asyncio
+import time
+
+# 添加当前目录到Python路径
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import sessionmaker
+
+from app.api import pan
+from app.db.database import get_db
+from app.models import User, PanRecord
+from app.services.hot_score_service import HOT_SCORE_WEIGHTS
+from app.services.view_counter import ViewCounter, view_counter
+
+
+# 内存数据库：三条排盘记录
+@pytest.fixture
+def db(db_session):
+    session = db_session
+    session.add(User(id=1, phone="13800000001"))
+    session.add_all([
+        PanRecord(id=i, user_id=1, pan_params="{}", pan_result="{}", audit_status=1, view_count=10, hot_score=1.0)
+        for i in (1, 2, 3)
+    ])
+    session.commit()
+    session.statements.clear()
+    return session
+
+
+# 读取记录的浏览数和热度分
+def counts_of(db, record_id):
+    db.expire_all()
+    record = db.get(PanRecord, record_id)
+    return record.view_count, record.hot_score
+
+
+# 测试多次浏览在内存中累加，写回时一条批量UPDATE累加浏览数和浏览热度分
+def test_flush_batches_deltas(db):
+    counter = ViewCounter()
+    for pan_id in (1, 1, 1, 2):
+        assert counter.record(pan_id)
+    assert counter.pending(1) == 3 and db.statements == []
+
+    assert counter.flush(db) == 2
+    updates = [(statement, executemany) for statement, _, executemany in db.executions if statement.startswith("UPDATE")]
+    assert len(updates) == 1 and updates[0][1]
+    assert "view_count=(pan_record.view_count + ?)" in updates[0][0]
+    assert counts_of(db, 1) == (13, pytest.approx(1.0 + 3 * HOT_SCORE_WEIGHTS["view"]))
+    assert counts_of(db, 2) == (11, pytest.approx(1.0 + HOT_SCORE_WEIGHTS["view"]))
+    assert counts_of(db, 3) == (10, 1.0)
+    assert counter.pending(1) == 0 and counter.flush(db) == 0
+
+
+# 测试写回失败时增量放回缓冲，期间新增的浏览数一并保留
+def test_flush_failure_keeps_deltas(db):
+    counter = ViewCounter()
+    counter.record(1)
+    counter.record(1)
+
+    class BrokenSession:
+        def connection(self):
+            counter.record(1)  # 写回期间又有一次浏览
+            raise RuntimeError("database is locked")
+
+        def rollback(self):
+            pass
+
+    with pytest.raises(RuntimeError):
+        counter.flush(BrokenSession())
+    assert counter.pending(1) == 3
+    counter.flush(db)
+    assert counts_of(db, 1)[0] == 13
+
+
+# 测试登录用户在去重窗口内重复浏览只计一次，匿名浏览不去重，窗口过后重新计数
+def test_dedup_window():
+    counter = ViewCounter(dedup_seconds=0.05)
+    assert counter.record(1, viewer=7)
+    assert not counter.record(1, viewer=7)
+    assert counter.record(2, viewer=7) and counter.record(1, viewer=8)
+    assert counter.record(1) and counter.record(1)
+    assert counter.pending(1) == 4
+    time.sleep(0.06)
+    assert counter.record(1, viewer=7)
+    assert counter.pending(1) == 5
+
+    bounded = ViewCounter(dedup_seconds=60, max_dedup_entries=2)
+    for viewer in (1, 2, 3):
+        bounded.record(1, viewer=viewer)
+    assert bounded.record(1, viewer=1)  # 最早的去重记录已被丢弃
+    assert not bounded.record(1, viewer=3)
+
+
+# 测试后台任务定期写回，关闭时写回剩余浏览数
+def test_background_flush_and_stop(db, monkeypatch):
+    counter = ViewCounter()
+    monkeypatch.setattr("app.services.view_counter.SessionLocal", sessionmaker(bind=db.bind))
+
+    async def run():
+        counter.start(interval=0.02)
+        counter.record(1)
+        await asyncio.sleep(0.1)
+        assert counts_of(db, 1)[0] == 11
+        counter.record(2)
+        await counter.stop()
+
+    asyncio.run(run())
+    assert counts_of(db, 2)[0] == 11 and counter.pending(2) == 0
+
+
+# 测试详情接口只读：不执行写语句，返回的浏览数包含尚未写回的部分
+def test_detail_api_is_read_only(db):
+    app = FastAPI()
+    app.include_router(pan.router)
+    app.dependency_overrides[get_db] = lambda: db
+    client = TestClient(app)
+    view_counter.clear()
+    try:
+        db.statements.clear()
+        assert client.get("/detail/1").json()["data"]["view_count"] == 11
+        assert client.get("/detail/1").json()["data"]["view_count"] == 12
+        assert all(statement.startswith("SELECT") for statement in db.statements)
+        view_counter.flush(db)
+        assert counts_of(db, 1)[0] == 12
+        assert client.get("/detail/99").status_code == 404
+    finally:
+        view_counter.clear()
+
+
+if __name__ == "__main__":
+    pytest.main([__file__])
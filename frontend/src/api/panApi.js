@@ -82,6 +82,20 @@ export const getPublicPanList = async (params) => {
   }
 };
 
+// 获取当前用户对一组排盘记录的点赞/收藏位图（与公开列表页叠加使用）
+export const getPanInteractions = async (panIds) => {
+  try {
+    const params = new URLSearchParams();
+    panIds.forEach((panId) => params.append('pan_ids', panId)); // 重复参数形式：pan_ids=1&pan_ids=2
+    const response = await api.get('/pan/public/interactions', {
+      params
+    });
+    return response;
+  } catch (error) {
+    throw error;
+  }
+};
+
 // 获取排盘记录详情
 export const getPanDetail = async (recordId) => {
   try {
@@ -12,7 +12,7 @@
 import React, { useState, useEffect } from 'react'; // 导入 React 核心库和 Hooks：useState（状态管理）、useEffect（副作用处理）
 import Navigation from '../components/Header/Navigation/Navigation'; // 导入导航栏组件
 import BackToTop from '../components/BackToTop/BackToTop'; // 导入返回顶部按钮组件
-import { getPublicPanList } from '../api/panApi'; // 导入获取公开排盘列表的 API 接口
+import { getPublicPanList, getPanInteractions } from '../api/panApi'; // 导入获取公开排盘列表和点赞/收藏状态的 API 接口
 import hexagram1 from '../assets/images/hexagram-1.svg'; // 导入卦象图片资源 1
 import hexagram2 from '../assets/images/hexagram-2.svg'; // 导入卦象图片资源 2
 import hexagram3 from '../assets/images/hexagram-3.svg'; // 导入卦象图片资源 3
@@ -93,14 +93,28 @@ const HomePage = () => {
         page: 1, // 页码：第1页
         size: 12, // 每页数量：12条
         sort: "newest", // 排序方式：最新优先
-        pan_type: "liuyao", // 排盘类型：六爻
-        user_id: userId // 用户 ID：用于个性化推荐
+        pan_type: "liuyao" // 排盘类型：六爻
       });
 
       // 检查 API 响应是否成功
       if (response.code === 200 || response.success) {
         // 处理API返回的数据，提取记录列表
         const records = response.data || [];
+
+        // 公开列表是与用户无关的共享页，登录用户再按本页记录 ID 查询点赞/收藏位图并叠加
+        if (userId && records.length > 0) {
+          try {
+            const interactions = await getPanInteractions(records.map((record) => record.id));
+            const { liked = '', collected = '' } = interactions.data || {};
+            records.forEach((record, index) => {
+              record.is_liked = liked[index] === '1'; // 第 index 位为 1 表示已点赞
+              record.is_collected = collected[index] === '1'; // 第 index 位为 1 表示已收藏
+            });
+          } catch (e) {
+            // 状态查询失败不影响列表展示，按未点赞处理
+            console.error('获取点赞/收藏状态失败:', e);
+          }
+        }
         
         // 格式化数据，确保与组件期望的结构一致
         const formattedRecords = records.map((record, index) => {